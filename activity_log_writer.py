@@ -0,0 +1,160 @@
+"""
+Asynchronous Batched Activity Log Writer
+- log_activity()는 큐에 레코드만 넣고 즉시 반환 (요청 경로에서 fsync 제거)
+- 백그라운드 스레드가 N건 또는 M밀리초마다 executemany 한 번으로 기록
+- 종료 시(atexit) 남은 레코드를 모두 flush
+- flush 완료 시 Condition으로 알림 → SSE 스트림이 즉시 조회 가능
+"""
+import os
+import queue
+import atexit
+import logging
+import threading
+import time
+
+import db_pool
+
+logger = logging.getLogger(__name__)
+
+LOG_BATCH_SIZE = 100          # N: 이만큼 쌓이면 즉시 flush
+LOG_FLUSH_INTERVAL_MS = 200   # M: 첫 레코드 이후 최대 대기 시간
+SHUTDOWN_TIMEOUT_SEC = 5
+
+_INSERT_SQL = '''
+    INSERT INTO activity_logs (action_type, description, status, details_json, created_at)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_STOP = object()
+
+_queue = queue.Queue()
+_start_lock = threading.Lock()
+_writer_thread = None
+_writer_pid = None
+
+_flushed = threading.Condition()
+_flush_seq = 0
+_stats = {'enqueued': 0, 'written': 0, 'batches': 0, 'failed': 0}
+
+
+def enqueue(record):
+    """
+    Queue one activity_logs row: (action_type, description, status, details_json, created_at)
+    """
+    _ensure_started()
+    _stats['enqueued'] += 1
+    _queue.put(record)
+
+
+def flush(timeout=SHUTDOWN_TIMEOUT_SEC):
+    """Block until everything queued so far has been written"""
+    if _writer_thread is None or not _writer_thread.is_alive():
+        return
+    done = threading.Event()
+    _queue.put(done)
+    done.wait(timeout)
+
+
+def wait_for_flush(last_seq, timeout):
+    """
+    Wait until a batch newer than last_seq has been written (or timeout).
+    Returns the current flush sequence number.
+    """
+    with _flushed:
+        if _flush_seq == last_seq:
+            _flushed.wait(timeout)
+        return _flush_seq
+
+
+def get_writer_stats():
+    return {**_stats, 'pending': _queue.qsize(), 'flush_seq': _flush_seq}
+
+
+def _ensure_started():
+    global _writer_thread, _writer_pid, _queue
+    if _writer_thread is not None and _writer_pid == os.getpid() and _writer_thread.is_alive():
+        return
+    with _start_lock:
+        if _writer_thread is not None and _writer_pid == os.getpid() and _writer_thread.is_alive():
+            return
+        if _writer_pid is not None and _writer_pid != os.getpid():
+            # Forked worker: the parent's thread doesn't exist here
+            _queue = queue.Queue()
+        _writer_pid = os.getpid()
+        _writer_thread = threading.Thread(target=_run, name='activity-log-writer', daemon=True)
+        _writer_thread.start()
+
+
+def _write_batch(batch):
+    global _flush_seq
+    for attempt in range(2):
+        try:
+            with db_pool.transaction() as conn:
+                conn.executemany(_INSERT_SQL, batch)
+            _stats['written'] += len(batch)
+            _stats['batches'] += 1
+            break
+        except Exception as e:
+            if attempt == 0:
+                time.sleep(0.5)
+                continue
+            _stats['failed'] += len(batch)
+            logger.error(f'[Activity Log] ❌ Dropped {len(batch)} log record(s): {e}')
+
+    with _flushed:
+        _flush_seq += 1
+        _flushed.notify_all()
+
+
+def _run():
+    interval = LOG_FLUSH_INTERVAL_MS / 1000
+    stopping = False
+
+    while not stopping:
+        item = _queue.get()
+        batch, waiters = [], []
+        deadline = time.monotonic() + interval
+
+        while True:
+            if item is _STOP:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            else:
+                batch.append(item)
+
+            if stopping or waiters or len(batch) >= LOG_BATCH_SIZE:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+        if stopping:
+            # Drain whatever is left before exiting
+            while True:
+                try:
+                    item = _queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif item is not _STOP:
+                    batch.append(item)
+
+        if batch:
+            _write_batch(batch)
+        for waiter in waiters:
+            waiter.set()
+
+
+@atexit.register
+def _shutdown():
+    """Flush remaining records on interpreter exit"""
+    if _writer_thread is None or _writer_pid != os.getpid() or not _writer_thread.is_alive():
+        return
+    _queue.put(_STOP)
+    _writer_thread.join(SHUTDOWN_TIMEOUT_SEC)
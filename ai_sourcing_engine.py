@@ -13,7 +13,8 @@ from datetime import datetime
 from ai_market_analyzer import AIMarketAnalyzer
 from coupang_api import analyze_coupang_market
 from naver_api_enhanced import analyze_naver_market_enhanced
-from product_matcher import clean_product_title, translate_english_to_korean
+from product_matcher import clean_product_title, translate_titles_to_korean, has_hangul
+import pricing
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +58,8 @@ class AISourcer:
     def analyze_product(
         self,
         product_info: Dict[str, Any],
-        blue_ocean_category: Optional[str] = None
+        blue_ocean_category: Optional[str] = None,
+        korean_keyword: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Complete AI analysis for a single product
@@ -65,6 +67,7 @@ class AISourcer:
         Args:
             product_info: AliExpress product data
             blue_ocean_category: Optional blue ocean category keyword
+            korean_keyword: Optional precomputed Korean keyword (batch_analyze_products)
         
         Returns:
             Comprehensive analysis report with AI recommendations
@@ -74,7 +77,8 @@ class AISourcer:
         logger.info(f"[AI Sourcer] 🤖 Starting AI analysis for: {product_title[:50]}...")
         
         # Step 1: Generate Korean keyword
-        korean_keyword = self._generate_korean_keyword(product_info, blue_ocean_category)
+        if not korean_keyword:
+            korean_keyword = self._generate_korean_keyword(product_info, blue_ocean_category)
         
         if not korean_keyword:
             logger.error("[AI Sourcer] ❌ Failed to generate Korean keyword")
@@ -183,11 +187,15 @@ class AISourcer:
         logger.info(f"[AI Sourcer] 🚀 Starting batch analysis for {min(len(products), max_products)} products")
         
         results = []
+        targets = products[:max_products]
+        
+        # 모든 상품명을 한 번의 AI 요청으로 번역
+        korean_keywords = self._generate_korean_keywords(targets, blue_ocean_category)
         
-        for idx, product in enumerate(products[:max_products], 1):
-            logger.info(f"[AI Sourcer] Analyzing product {idx}/{min(len(products), max_products)}")
+        for idx, (product, korean_keyword) in enumerate(zip(targets, korean_keywords), 1):
+            logger.info(f"[AI Sourcer] Analyzing product {idx}/{len(targets)}")
             
-            analysis = self.analyze_product(product, blue_ocean_category)
+            analysis = self.analyze_product(product, blue_ocean_category, korean_keyword=korean_keyword)
             
             if analysis.get('success'):
                 results.append(analysis)
@@ -214,26 +222,32 @@ class AISourcer:
         blue_ocean_category: Optional[str] = None
     ) -> str:
         """Generate Korean keyword for market search"""
+        return self._generate_korean_keywords([product_info], blue_ocean_category)[0]
+    
+    def _generate_korean_keywords(
+        self,
+        products: List[Dict[str, Any]],
+        blue_ocean_category: Optional[str] = None
+    ) -> List[str]:
+        """Generate Korean keywords for several products (one batched translation request)"""
         
         if blue_ocean_category:
             # Use blue ocean category if provided
             logger.info(f"[AI Sourcer] Using Blue Ocean category: {blue_ocean_category}")
-            return blue_ocean_category
-        
-        # Clean and translate product title
-        product_title = product_info.get('title', '')
-        cleaned_title = clean_product_title(product_title)
+            return [blue_ocean_category] * len(products)
         
-        # Translate to Korean
-        korean_keyword = translate_english_to_korean(cleaned_title)
+        # Clean and translate product titles
+        cleaned_titles = [clean_product_title(p.get('title', '')) for p in products]
+        korean_keywords = translate_titles_to_korean(cleaned_titles)
         
-        # Validate Korean keyword
-        if not korean_keyword or not any('\uac00' <= c <= '\ud7a3' for c in korean_keyword):
-            # Fallback: use original title
-            logger.warning("[AI Sourcer] Korean translation failed, using original title")
-            korean_keyword = cleaned_title
+        # Validate Korean keywords
+        for idx, korean_keyword in enumerate(korean_keywords):
+            if not has_hangul(korean_keyword):
+                # Fallback: use original title
+                logger.warning("[AI Sourcer] Korean translation failed, using original title")
+                korean_keywords[idx] = cleaned_titles[idx]
         
-        return korean_keyword
+        return korean_keywords
     
     def _collect_coupang_data(self, keyword: str) -> Dict[str, Any]:
         """Collect Coupang market data"""
@@ -312,46 +326,33 @@ class AISourcer:
         # Get AliExpress price
         price_cny = product_info.get('price', 0)
         
-        # Constants
-        cny_to_krw = 190
-        exchange_buffer = 1.05
-        shipping_cost = 5000
-        customs_tax_rate = 0.10
-        customs_threshold = 150000
-        naver_fee_rate = 0.06
-        
-        # Calculate cost
-        base_cost_krw = price_cny * cny_to_krw * exchange_buffer
-        total_cost = base_cost_krw + shipping_cost
+        # Constants: same config snapshot + formula as every other pricing call site
+        config = pricing.load_pricing_config()
         
         # Get Naver average price
         naver_avg_price = naver_data.get('price_analysis', {}).get('avg_price', 0)
         
+        # Calculate target price (competitive): 5% below average
+        analysis = pricing.price_one(price_cny, config, market_price=naver_avg_price,
+                                     price_factor=0.95)
+        total_cost = analysis['total_cost']
+        
         if naver_avg_price == 0:
             logger.warning("[AI Sourcer] ⚠️ No Naver price data available")
             return {
                 'success': False,
                 'error': 'No market price data available',
-                'total_cost': int(total_cost),
+                'total_cost': total_cost,
                 'target_price': 0,
                 'profit_margin': 0,
                 'profit_per_unit': 0
             }
         
-        # Calculate target price (competitive)
-        target_price = int(naver_avg_price * 0.95)  # 5% below average
-        
-        # Add customs tax if applicable
-        if target_price > customs_threshold:
-            total_cost += target_price * customs_tax_rate
-        
-        # Calculate Naver net revenue
-        naver_fee = target_price * naver_fee_rate
+        target_price = analysis['sale_price']
+        naver_fee = analysis['marketplace_fee']
         net_revenue = target_price - naver_fee
-        
-        # Calculate profit
-        profit_per_unit = net_revenue - total_cost
-        profit_margin = (profit_per_unit / net_revenue * 100) if net_revenue > 0 else 0
+        profit_per_unit = analysis['profit']
+        profit_margin = analysis['margin']
         
         logger.info(f"[AI Sourcer] 💰 Profitability:")
         logger.info(f"  - Cost: ₩{int(total_cost):,}")
@@ -361,14 +362,14 @@ class AISourcer:
         return {
             'success': True,
             'price_cny': price_cny,
-            'cny_to_krw_rate': cny_to_krw,
-            'base_cost_krw': int(base_cost_krw),
-            'shipping_cost': shipping_cost,
-            'total_cost': int(total_cost),
+            'cny_to_krw_rate': config['cny_exchange_rate'],
+            'base_cost_krw': analysis['purchase_price_krw'],
+            'shipping_cost': analysis['shipping_cost'],
+            'total_cost': total_cost,
             'target_price': target_price,
-            'naver_fee': int(naver_fee),
-            'net_revenue': int(net_revenue),
-            'profit_per_unit': int(profit_per_unit),
+            'naver_fee': naver_fee,
+            'net_revenue': net_revenue,
+            'profit_per_unit': profit_per_unit,
             'profit_margin': round(profit_margin, 2),
             'market_avg_price': naver_avg_price,
             'is_profitable': profit_margin >= 25
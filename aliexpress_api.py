@@ -7,6 +7,9 @@ API Endpoint: https://api-sg.aliexpress.com/sync
 import hashlib
 import time
 import requests
+import http_client
+import rate_limiter
+import aliexpress_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -78,7 +81,19 @@ def search_aliexpress_products(app_key, app_secret, keyword, page_size=50, page_
             'error': str (if failed)
         }
     """
-    
+    # 💾 응답 캐시 (aliexpress_cache: TTL + stale-while-revalidate), 성공 응답만 저장
+    return aliexpress_cache.cached_search(
+        aliexpress_cache.make_key('affiliate_router', keyword, page=page_no, page_size=page_size,
+                                  sort='SALE_PRICE_ASC', currency='USD',
+                                  min_price=min_price, max_price=max_price),
+        lambda: _search_aliexpress_products_uncached(app_key, app_secret, keyword, page_size, page_no,
+                                                     min_price, max_price),
+        cacheable=lambda result: bool(result.get('success') and result.get('products'))
+    )
+
+
+def _search_aliexpress_products_uncached(app_key, app_secret, keyword, page_size, page_no, min_price, max_price):
+    """Signed product query (see search_aliexpress_products)"""
     logger.info(f'[AliExpress API] ========================================')
     logger.info(f'[AliExpress API] 🔍 Searching for: {keyword}')
     logger.info(f'[AliExpress API] Page: {page_no}, Size: {page_size}')
@@ -118,7 +133,8 @@ def search_aliexpress_products(app_key, app_secret, keyword, page_size=50, page_
     logger.info(f'[AliExpress API] 📡 Sending request to: {api_url}')
     
     try:
-        response = requests.get(api_url, params=params, timeout=30)
+        rate_limiter.acquire('aliexpress', key=app_key)
+        response = http_client.get(api_url, params=params, timeout=30)
         
         logger.info(f'[AliExpress API] 📥 Response status: {response.status_code}')
         
@@ -288,7 +304,8 @@ def get_product_details(app_key, app_secret, product_ids):
     params['sign'] = sign_api_request(app_secret, params)
     
     try:
-        response = requests.get(api_url, params=params, timeout=30)
+        rate_limiter.acquire('aliexpress', key=app_key)
+        response = http_client.get(api_url, params=params, timeout=30)
         
         if response.status_code != 200:
             return {'success': False, 'error': f'Status {response.status_code}'}
@@ -0,0 +1,217 @@
+"""
+AliExpress Search Response Cache (in-memory LRU + SQLite aliexpress_search_cache table)
+- 키: (API, 정규화된 키워드, page, page_size, sort, currency, min/max price)
+- TTL 이내: 캐시된 응답을 바로 반환 (API 호출/서명 없음)
+- TTL 경과 ~ TTL + stale 구간: 이전 응답을 즉시 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+- 그보다 오래되었거나 없으면: 동기 호출 후 저장
+- 성공 응답만 저장 (인증 누락/HTTP 오류/빈 결과는 저장하지 않음)
+- 응답은 JSON 문자열로 보관 → 조회마다 새 객체 반환 (호출자가 결과를 수정해도 캐시는 그대로)
+
+Config (초, 비우면 기본값):
+    aliexpress_cache_ttl_sec     기본 1800 (30분)
+    aliexpress_cache_stale_sec   기본 21600 (TTL 이후 6시간까지 stale 응답 사용)
+"""
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import db_pool
+import translation_cache
+
+logger = logging.getLogger(__name__)
+
+LRU_MAX_ENTRIES = 500          # 응답 1개 ≈ 상품 50개 → 메모리에는 최근 키워드만
+DEFAULT_TTL_SEC = 30 * 60
+DEFAULT_STALE_SEC = 6 * 3600
+REFRESH_WORKERS = 2
+
+_lru = OrderedDict()   # cache_key → (response_json, created_at)
+_lock = threading.Lock()
+_refreshing = set()    # 백그라운드 갱신 중인 cache_key (키당 1개만)
+_refresh_pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='ali-cache-refresh')
+_config_source = None
+_stats = {'fresh_hits': 0, 'stale_hits': 0, 'misses': 0, 'writes': 0,
+          'refreshes': 0, 'refresh_failures': 0, 'uncacheable': 0}
+
+
+def set_config_source(source):
+    """source(): {key: raw value} snapshot (app.get_config_snapshot)"""
+    global _config_source
+    _config_source = source
+
+
+def _config_seconds(key, default):
+    if _config_source is None:
+        return default
+    try:
+        value = (_config_source() or {}).get(key)
+        return float(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        logger.warning(f'[AliExpressCache] ⚠️ Invalid {key} - using {default}s')
+        return default
+    except Exception as e:
+        logger.warning(f'[AliExpressCache] ⚠️ Config read failed: {e}')
+        return default
+
+
+def get_ttls():
+    """(ttl, stale window) in seconds"""
+    return (_config_seconds('aliexpress_cache_ttl_sec', DEFAULT_TTL_SEC),
+            _config_seconds('aliexpress_cache_stale_sec', DEFAULT_STALE_SEC))
+
+
+def make_key(api, keyword, page=1, page_size=50, sort='', currency='USD', min_price=None, max_price=None):
+    """Cache key for one search request (keyword normalized like the translation cache)"""
+    keyword_norm = translation_cache.normalize(keyword)
+    parts = [api, keyword_norm, int(page), int(page_size), sort or '', currency or '',
+             '' if min_price is None else float(min_price),
+             '' if max_price is None else float(max_price)]
+    return json.dumps(parts, ensure_ascii=False), keyword_norm
+
+
+def _remember(cache_key, response_json, created_at):
+    with _lock:
+        _lru[cache_key] = (response_json, created_at)
+        _lru.move_to_end(cache_key)
+        while len(_lru) > LRU_MAX_ENTRIES:
+            _lru.popitem(last=False)
+
+
+def _lookup(cache_key):
+    """(response_json, created_at) from the LRU, then the DB; None if absent"""
+    with _lock:
+        entry = _lru.get(cache_key)
+        if entry is not None:
+            _lru.move_to_end(cache_key)
+            return entry
+    try:
+        conn = db_pool.get_connection()
+        try:
+            # 읽기 전용: 조회 경로에서 쓰기 잠금을 잡지 않음 (hit 수는 _stats, 만료는 created_at 기준)
+            row = conn.execute('''
+                SELECT response_json, created_at FROM aliexpress_search_cache WHERE cache_key = ?
+            ''', (cache_key,)).fetchone()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning(f'[AliExpressCache] ⚠️ DB lookup failed: {e}')
+        return None
+    if not row:
+        return None
+    _remember(cache_key, row['response_json'], row['created_at'])
+    return row['response_json'], row['created_at']
+
+
+def _store(cache_key, keyword_norm, response):
+    response_json = json.dumps(response, ensure_ascii=False)
+    now = time.time()
+    _remember(cache_key, response_json, now)
+    try:
+        with db_pool.transaction() as conn:
+            conn.execute('''
+                INSERT INTO aliexpress_search_cache (cache_key, keyword_norm, response_json, created_at, last_hit_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    response_json = excluded.response_json, created_at = excluded.created_at
+            ''', (cache_key, keyword_norm, response_json, now, now))
+        with _lock:
+            _stats['writes'] += 1
+    except Exception as e:
+        logger.warning(f'[AliExpressCache] ⚠️ DB write failed: {e}')
+
+
+def _fetch_and_store(cache_key, keyword_norm, fetch, cacheable):
+    response = fetch()
+    if cacheable(response):
+        _store(cache_key, keyword_norm, response)
+    else:
+        with _lock:
+            _stats['uncacheable'] += 1
+    return response
+
+
+def _refresh(cache_key, keyword_norm, fetch, cacheable):
+    try:
+        response = _fetch_and_store(cache_key, keyword_norm, fetch, cacheable)
+        with _lock:
+            _stats['refreshes' if cacheable(response) else 'refresh_failures'] += 1
+    except Exception as e:
+        logger.warning(f'[AliExpressCache] ⚠️ Background refresh failed for {keyword_norm}: {e}')
+        with _lock:
+            _stats['refresh_failures'] += 1
+    finally:
+        with _lock:
+            _refreshing.discard(cache_key)
+
+
+def cached_search(key, fetch, cacheable, refresh=None):
+    """
+    Serve a search response through the cache.
+
+    Args:
+        key: make_key(...) result
+        fetch: () → response dict (the real API call)
+        cacheable: response → bool (only successful responses are stored)
+        refresh: () → response for the background refresh of a stale entry
+                 (default: fetch; e.g. the same call without the request deadline)
+
+    Returns:
+        response dict (a fresh copy on every call)
+    """
+    cache_key, keyword_norm = key
+    ttl, stale = get_ttls()
+    entry = _lookup(cache_key) if ttl > 0 else None
+
+    if entry is not None:
+        response_json, created_at = entry
+        age = time.time() - created_at
+        if age < ttl:
+            with _lock:
+                _stats['fresh_hits'] += 1
+            logger.info(f'[AliExpressCache] ✅ Hit: {keyword_norm} ({age:.0f}s old)')
+            return json.loads(response_json)
+        if age < ttl + stale:
+            with _lock:
+                _stats['stale_hits'] += 1
+                start_refresh = cache_key not in _refreshing
+                if start_refresh:
+                    _refreshing.add(cache_key)
+            if start_refresh:
+                _refresh_pool.submit(_refresh, cache_key, keyword_norm, refresh or fetch, cacheable)
+            logger.info(f'[AliExpressCache] ♻️ Stale hit: {keyword_norm} ({age:.0f}s old) - refreshing in background')
+            return json.loads(response_json)
+
+    with _lock:
+        _stats['misses'] += 1
+    return _fetch_and_store(cache_key, keyword_norm, fetch, cacheable)
+
+
+def prune():
+    """Delete rows older than TTL + stale window. Returns the number of rows deleted."""
+    ttl, stale = get_ttls()
+    cutoff = time.time() - ttl - stale
+    with db_pool.transaction() as conn:
+        deleted = conn.execute('DELETE FROM aliexpress_search_cache WHERE created_at <= ?',
+                               (cutoff,)).rowcount
+    with _lock:
+        for cache_key in [k for k, (_, created_at) in _lru.items() if created_at <= cutoff]:
+            del _lru[cache_key]
+    return deleted
+
+
+def clear_memory():
+    with _lock:
+        _lru.clear()
+
+
+def get_stats():
+    with _lock:
+        stats = dict(_stats)
+        stats['memory_entries'] = len(_lru)
+        stats['refreshing'] = len(_refreshing)
+    lookups = stats['fresh_hits'] + stats['stale_hits'] + stats['misses']
+    stats['hit_rate'] = round((stats['fresh_hits'] + stats['stale_hits']) / lookups, 3) if lookups else None
+    return stats
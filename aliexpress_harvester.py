@@ -0,0 +1,119 @@
+"""
+Multi-Page AliExpress Candidate Harvester
+- 검색 결과 1..N 페이지를 동시에 요청 (한 번에 최대 HARVEST_WORKERS 페이지, 호출 속도는 rate_limiter의 app key별 버킷)
+- enough가 있으면 1페이지만 먼저 요청하고, 페이지당 생존 수로 부족분을 채울 페이지 수를 추정해서
+  그만큼만 동시에 요청 (1페이지로 충분하면 추가 호출 없음)
+- product_id 기준 중복 제거 (같은 상품이 여러 페이지에 나와도 1개)
+- 페이지가 도착하는 대로 count_survivors(새 상품) 로 필터 통과 예상 수를 누적
+  → enough 이상이면 다음 페이지는 요청하지 않음 (깊은 퍼널, 필요한 만큼만 호출)
+- 결과는 페이지 순서대로 정렬 (도착 순서와 무관하게 결정적)
+- deadline: 예산이 떨어지면 새 페이지를 요청하지 않고, 진행 중인 페이지도 기다리지 않음
+"""
+import math
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+HARVEST_WORKERS = 3       # 동시에 요청하는 페이지 수
+HARVEST_MAX_PAGES = 10    # config 값이 커도 이 이상은 요청하지 않음
+
+
+def product_identity(product):
+    """Dedupe key: product_id, falling back to the URL"""
+    return str(product.get('product_id') or product.get('id') or product.get('url') or id(product))
+
+
+def _window(stats, enough, workers):
+    """Pages to keep in flight: enough for the survivors still missing, at most `workers`"""
+    if enough is None:
+        return workers
+    fetched = stats['pages_fetched'] + stats['pages_failed']
+    if fetched == 0:
+        return 1
+    per_page = stats['survivors'] / fetched
+    if per_page <= 0:
+        return workers
+    return max(1, min(workers, math.ceil((enough - stats['survivors']) / per_page)))
+
+
+def harvest(fetch_page, max_pages, count_survivors=None, enough=None, max_workers=HARVEST_WORKERS,
+            deadline=None):
+    """
+    Fetch pages 1..max_pages concurrently.
+
+    Args:
+        fetch_page: page_no → list of parsed products (empty list when the page has none)
+        max_pages: number of pages to request (capped at HARVEST_MAX_PAGES)
+        count_survivors: new products → how many are expected to pass the filters
+        enough: stop requesting further pages once this many survivors were seen
+        deadline: deadline.Deadline; pages still unfetched when it runs out are skipped
+
+    Returns:
+        {'products': [...], 'pages_fetched', 'pages_failed', 'pages_skipped',
+         'duplicates', 'survivors', 'stopped_early', 'deadline_exceeded'}
+    """
+    max_pages = max(1, min(int(max_pages), HARVEST_MAX_PAGES))
+    seen = set()
+    pages = {}
+    stats = {'pages_fetched': 0, 'pages_failed': 0, 'pages_skipped': 0,
+             'duplicates': 0, 'survivors': 0, 'stopped_early': False, 'deadline_exceeded': False}
+
+    workers = min(max_workers, max_pages)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ali-harvest')
+    next_page = 1
+    running = {}
+    try:
+        # 동시에 최대 _window() 페이지만 요청 → 결과를 보고 다음 페이지를 요청할지 결정
+        while next_page <= max_pages or running:
+            while next_page <= max_pages and len(running) < _window(stats, enough, workers):
+                running[executor.submit(fetch_page, next_page)] = next_page
+                next_page += 1
+            done, _ = wait(running, timeout=deadline.remaining() if deadline is not None else None,
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                # 예산 소진: 진행 중인 페이지 결과는 버리고 지금까지 모은 것만 사용
+                stats['deadline_exceeded'] = True
+                stats['pages_skipped'] = max_pages - stats['pages_fetched'] - stats['pages_failed']
+                stats['stopped_early'] = True
+                logger.warning(f'[Harvester] ⏱️ Deadline reached, {stats["pages_skipped"]} page(s) skipped')
+                break
+            for future in sorted(done, key=running.get):
+                page_no = running.pop(future)
+                try:
+                    page_products = future.result() or []
+                except Exception as e:
+                    stats['pages_failed'] += 1
+                    logger.warning(f'[Harvester] ⚠️ Page {page_no} failed: {e}')
+                    continue
+                stats['pages_fetched'] += 1
+
+                fresh = []
+                for product in page_products:
+                    identity = product_identity(product)
+                    if identity in seen:
+                        stats['duplicates'] += 1
+                        continue
+                    seen.add(identity)
+                    fresh.append(product)
+                pages[page_no] = fresh
+
+                if count_survivors is not None and fresh:
+                    stats['survivors'] += count_survivors(fresh)
+                logger.info(f'[Harvester] 📄 Page {page_no}: {len(page_products)} products, '
+                            f'{len(fresh)} new, {stats["survivors"]} survivors so far')
+
+            out_of_time = deadline is not None and deadline.expired() and (running or next_page <= max_pages)
+            if (enough is not None and stats['survivors'] >= enough) or out_of_time:
+                stats['deadline_exceeded'] = out_of_time
+                stats['pages_skipped'] = max_pages - stats['pages_fetched'] - stats['pages_failed']
+                stats['stopped_early'] = stats['pages_skipped'] > 0
+                break
+    finally:
+        # in-flight pages are abandoned (their results are not used)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    stats['products'] = [product for page_no in sorted(pages) for product in pages[page_no]]
+    logger.info(f'[Harvester] ✅ {len(stats["products"])} unique products from {stats["pages_fetched"]} page(s) '
+                f'({stats["duplicates"]} duplicates, {stats["pages_skipped"]} page(s) skipped)')
+    return stats
@@ -4,17 +4,31 @@ AliExpress ↔ Naver Real-time Matching & Validation
 """
 
 import logging
-import sqlite3
+import db_pool
+import pricing
+import keyword_matcher
+from phrase_trie import PhraseTrie
+import rate_limiter
+import translation_cache
+from deadline import call_timeout
+from product_matcher import has_hangul
 import requests
 from typing import Optional, Dict, List
 
 logger = logging.getLogger(__name__)
 
+AI_TIMEOUT_SEC = 30   # Gemini 번역 요청 1회 최대 대기 (요청 deadline이 있으면 남은 예산 이내)
+
+
+def _is_english(text: str) -> bool:
+    """한→영 AI 응답 검증: 비어 있거나 한글이 남아 있으면 캐시하지 않음"""
+    return bool(text) and not has_hangul(text)
+
 
 def get_config(key: str, default=None):
     """설정값 조회"""
     try:
-        conn = sqlite3.connect('dropship.db')
+        conn = db_pool.get_connection()  # 절대 경로 + 풀링된 연결
         cursor = conn.cursor()
         cursor.execute('SELECT value FROM config WHERE key = ?', (key,))
         row = cursor.fetchone()
@@ -25,16 +39,154 @@ def get_config(key: str, default=None):
         return default
 
 
-def translate_keyword_to_english(korean_keyword: str) -> str:
+# 📋 규칙 기반 번역 사전 (AI 실패 시 폴백) - import 시 트라이로 한 번만 컴파일
+# 긴 구문이 항상 우선 매칭되므로 순서와 무관 ("마우스 패드" > "마우스")
+KOR_TO_ENG_MAP = {
+    # 🎯 복합어 (트라이가 단어보다 먼저 매칭)
+    '실리콘 몰드': 'silicone mold',
+    '실리콘 금형': 'silicone mold',
+    '실리콘 조리도구': 'silicone cooking utensil',
+    '실리콘 주방용품': 'silicone kitchenware',
+    '실리콘 베이킹': 'silicone baking',
+    '실리콘 케이크': 'silicone cake mold',
+    
+    # 가전제품
+    '드라이기': 'hair dryer',
+    '헤어드라이기': 'hair dryer',
+    '공기청정기': 'air purifier',
+    '가습기': 'humidifier',
+    '선풍기': 'fan',
+    '청소기': 'vacuum cleaner',
+    '세척기': 'washer',
+    '세탁기': 'washing machine',
+    '건조기': 'dryer',
+    '냉장고': 'refrigerator',
+    '전자레인지': 'microwave',
+    '에어프라이어': 'air fryer',
+    '믹서기': 'blender',
+    '주전자': 'kettle',
+    
+    # 차량용품
+    '차량용': 'car',
+    '자동차': 'car',
+    '오토바이': 'motorcycle',
+    '자전거': 'bicycle',
+    
+    # 전자제품
+    '무선': 'wireless',
+    '블루투스': 'bluetooth',
+    '이어폰': 'earphone',
+    '헤드폰': 'headphone',
+    '스피커': 'speaker',
+    '보조배터리': 'power bank',
+    '충전기': 'charger',
+    '휴대폰': 'phone',
+    '스마트폰': 'smartphone',
+    '거치대': 'holder',
+    '케이블': 'cable',
+    '키보드': 'keyboard',
+    '마우스 패드': 'mouse pad',  # 🔧 추가: 복합어 우선
+    '마우스패드': 'mousepad',    # 🔧 추가: 붙여쓰기
+    '게이밍 마우스패드': 'gaming mouse pad',  # 🔧 추가
+    # '마우스': 'mouse',  # 🔧 제거: "마우스 패드"를 "mouse"로 오역 방지
+    '게이밍': 'gaming',
+    '기계식': 'mechanical',
+    '웹캠': 'webcam',
+    '마이크': 'microphone',
+    
+    # 반려동물
+    '반려동물': 'pet',
+    '강아지': 'dog',
+    '고양이': 'cat',
+    '급식기': 'feeder',
+    '급수기': 'water dispenser',
+    '화장실': 'litter box',
+    '장난감': 'toy',
+    
+    # 패션/악세서리
+    '주얼리': 'jewelry',
+    '목걸이': 'necklace',
+    '반지': 'ring',
+    '귀걸이': 'earring',
+    '팔찌': 'bracelet',
+    '시계': 'watch',
+    '가방': 'bag',
+    '지갑': 'wallet',
+    
+    # 주방/조리 (복합어 먼저, 긴 것부터)
+    '실리콘 조리도구 세트': 'silicone cooking utensil set',
+    '실리콘 주방용품 세트': 'silicone kitchenware set',
+    '조리도구': 'cooking utensil',
+    '세트': 'set',
+    '냄비': 'pot',
+    '프라이팬': 'frying pan',
+    '칼': 'knife',
+    '도마': 'cutting board',
+    
+    # 🚫 주의: '실리콘' 단독은 제거 (실리콘 실란트 오류 방지)
+    # '실리콘': 'silicone',  # ← 이거 때문에 문제 발생!
+    
+    # 기타
+    '자동': 'automatic',
+    '고압': 'high pressure',
+    '청소': 'cleaning',
+    '측정': 'measurement',
+    '반도체': 'semiconductor',
+    'IC칩': 'ic chip',
+    '다용도': 'multi purpose',
+}
+_KOR_TO_ENG_TRIE = PhraseTrie(KOR_TO_ENG_MAP)
+
+
+def translate_keyword_to_english_rules(korean_keyword: str) -> str:
+    """
+    규칙 기반 한→영 변환 (KOR_TO_ENG_MAP, 1패스 최장 일치)
+    
+    - 구문 전체가 사전에 있으면 그 번역
+    - 아니면 단어별로: 사전 구문이 포함된 단어는 매칭된 번역만, 매칭 없는 단어는 원문 유지
+    """
+    text = ' '.join(korean_keyword.split())
+    exact = _KOR_TO_ENG_TRIE.lookup(text)
+    if exact:
+        logger.info(f"[Translation-RuleBased] ✅ {korean_keyword} → {exact}")
+        return exact
+    
+    folded = text.lower()
+    english_words = []
+    for start, end, phrase, en in _KOR_TO_ENG_TRIE.tokenize(text):
+        if phrase is not None:
+            english_words.append(en)
+            continue
+        pieces = folded[start:end].split(' ')
+        # 매칭된 구문에 붙어 있는 조각은 그 단어의 일부 → 버림 (예: "미니가습기" → "humidifier")
+        if start > 0 and folded[start] != ' ':
+            pieces[0] = ''
+        if end < len(folded) and folded[end - 1] != ' ':
+            pieces[-1] = ''
+        english_words.extend(piece for piece in pieces if piece)
+    
+    english = ' '.join(english_words) if english_words else korean_keyword
+    logger.info(f"[Translation-RuleBased] ⚠️ {korean_keyword} → {english}")
+    return english
+
+
+def translate_keyword_to_english(korean_keyword: str, deadline=None) -> str:
     """
     한글 키워드 → 영문 키워드 변환 (Gemini → OpenAI → 규칙 기반 순)
     
     Args:
         korean_keyword: 한글 키워드 (예: "차량용 USB 공기청정기", "드라이기")
+        deadline: 요청 단위 Deadline (남은 예산이 없으면 AI 호출 없이 규칙 기반)
     
     Returns:
         영문 키워드 (예: "car usb air purifier", "hair dryer")
     """
+    # 💾 번역 캐시 (메모리 LRU → DB)
+    cached = translation_cache.get('ko-en', korean_keyword)
+    if cached:
+        logger.info(f"[Translation-Cache] ✅ {korean_keyword} → {cached}")
+        return cached
+    
     try:
         import google.generativeai as genai
     except:
@@ -64,142 +216,24 @@ Rules:
 Korean: {korean_keyword}
 English:"""
             
-            response = model.generate_content(prompt)
+            timeout = call_timeout(deadline, AI_TIMEOUT_SEC, 'Gemini translation')
+            rate_limiter.acquire('gemini', deadline=deadline)
+            response = model.generate_content(prompt, request_options={'timeout': timeout})
             english = response.text.strip().lower()
             
-            logger.info(f"[Translation-Gemini] ✅ {korean_keyword} → {english}")
-            return english
+            # 🔧 FIX: 번역되지 않은 응답은 캐시하지 않고 규칙 기반으로
+            if _is_english(english):
+                logger.info(f"[Translation-Gemini] ✅ {korean_keyword} → {english}")
+                translation_cache.put('ko-en', korean_keyword, english, 'gemini')
+                return english
+            logger.warning(f"[Translation-Gemini] ⚠️ Not English, ignored: {korean_keyword} → {english}")
             
         except Exception as e:
             logger.warning(f"[Translation-Gemini] ❌ Failed: {e}")
     
     # 📋 규칙 기반 번역 (2순위, 폴백)
     # AI 실패 시 100% 번역 보장
-    translation_map = {
-        # 🎯 핵심: 복합어는 항상 먼저 체크 (긴 것부터)
-        '실리콘 몰드': 'silicone mold',
-        '실리콘 금형': 'silicone mold',
-        '실리콘 조리도구': 'silicone cooking utensil',
-        '실리콘 주방용품': 'silicone kitchenware',
-        '실리콘 베이킹': 'silicone baking',
-        '실리콘 케이크': 'silicone cake mold',
-        
-        # 가전제품
-        '드라이기': 'hair dryer',
-        '헤어드라이기': 'hair dryer',
-        '공기청정기': 'air purifier',
-        '가습기': 'humidifier',
-        '선풍기': 'fan',
-        '청소기': 'vacuum cleaner',
-        '세척기': 'washer',
-        '세탁기': 'washing machine',
-        '건조기': 'dryer',
-        '냉장고': 'refrigerator',
-        '전자레인지': 'microwave',
-        '에어프라이어': 'air fryer',
-        '믹서기': 'blender',
-        '주전자': 'kettle',
-        
-        # 차량용품
-        '차량용': 'car',
-        '자동차': 'car',
-        '오토바이': 'motorcycle',
-        '자전거': 'bicycle',
-        
-        # 전자제품
-        '무선': 'wireless',
-        '블루투스': 'bluetooth',
-        '이어폰': 'earphone',
-        '헤드폰': 'headphone',
-        '스피커': 'speaker',
-        '보조배터리': 'power bank',
-        '충전기': 'charger',
-        '휴대폰': 'phone',
-        '스마트폰': 'smartphone',
-        '거치대': 'holder',
-        '케이블': 'cable',
-        '키보드': 'keyboard',
-        '마우스 패드': 'mouse pad',  # 🔧 추가: 복합어 우선
-        '마우스패드': 'mousepad',    # 🔧 추가: 붙여쓰기
-        '게이밍 마우스패드': 'gaming mouse pad',  # 🔧 추가
-        # '마우스': 'mouse',  # 🔧 제거: "마우스 패드"를 "mouse"로 오역 방지
-        '게이밍': 'gaming',
-        '기계식': 'mechanical',
-        '웹캠': 'webcam',
-        '마이크': 'microphone',
-        
-        # 반려동물
-        '반려동물': 'pet',
-        '강아지': 'dog',
-        '고양이': 'cat',
-        '급식기': 'feeder',
-        '급수기': 'water dispenser',
-        '화장실': 'litter box',
-        '장난감': 'toy',
-        
-        # 패션/악세서리
-        '주얼리': 'jewelry',
-        '목걸이': 'necklace',
-        '반지': 'ring',
-        '귀걸이': 'earring',
-        '팔찌': 'bracelet',
-        '시계': 'watch',
-        '가방': 'bag',
-        '지갑': 'wallet',
-        
-        # 주방/조리 (복합어 먼저, 긴 것부터)
-        '실리콘 조리도구 세트': 'silicone cooking utensil set',
-        '실리콘 주방용품 세트': 'silicone kitchenware set',
-        '조리도구': 'cooking utensil',
-        '세트': 'set',
-        '냄비': 'pot',
-        '프라이팬': 'frying pan',
-        '칼': 'knife',
-        '도마': 'cutting board',
-        
-        # 🚫 주의: '실리콘' 단독은 제거 (실리콘 실란트 오류 방지)
-        # '실리콘': 'silicone',  # ← 이거 때문에 문제 발생!
-        
-        # 기타
-        '자동': 'automatic',
-        '고압': 'high pressure',
-        '청소': 'cleaning',
-        '측정': 'measurement',
-        '반도체': 'semiconductor',
-        'IC칩': 'ic chip',
-        '다용도': 'multi purpose',
-    }
-    
-    # 🔧 FIX: 복합어 우선 매칭 (긴 키워드부터)
-    # "마우스 패드"를 통째로 매칭한 후, 개별 단어 매칭
-    for ko, en in sorted(translation_map.items(), key=lambda x: -len(x[0])):
-        if ko == korean_keyword:
-            logger.info(f"[Translation-RuleBased] ✅ {korean_keyword} → {en}")
-            return en
-    
-    # 개별 단어 번역
-    words = korean_keyword.split()
-    english_words = []
-    
-    for word in words:
-        # 직접 매칭
-        if word in translation_map:
-            english_words.append(translation_map[word])
-        else:
-            # 부분 매칭
-            matched = False
-            for ko, en in translation_map.items():
-                if ko in word:
-                    english_words.append(en)
-                    matched = True
-                    break
-            # 매칭 안 되면 원문 유지
-            if not matched:
-                english_words.append(word)
-    
-    english = ' '.join(english_words) if english_words else korean_keyword
-    logger.info(f"[Translation-RuleBased] ⚠️ {korean_keyword} → {english}")
-    return english
+    return translate_keyword_to_english_rules(korean_keyword)
 
 
 def search_aliexpress_official(keyword: str, max_results: int = 50) -> List[Dict]:
@@ -225,46 +259,8 @@ def search_aliexpress_official(keyword: str, max_results: int = 50) -> List[Dict
         return []
 
 
-def calculate_dropship_feasibility(ali_price_usd, naver_avg_price_krw, shipping_days=None):
-    """
-    드롭쉬핑 가능성 계산
-    
-    Args:
-        ali_price_usd: 알리 가격 (USD)
-        naver_avg_price_krw: 네이버 평균 가격 (KRW)
-        shipping_days: 배송 기간 (일) - 선택
-    
-    Returns:
-        dict: {
-            'feasible': True/False,
-            'margin_rate': 마진율 (%),
-            'profit_krw': 실제 이익 (원),
-            'cost_breakdown': {...},
-            'score': 0~10점
-        }
-    """
-    # 설정값 로드
-    cny_rate = float(get_config('cny_exchange_rate') or 190)
-    exchange_buffer = float(get_config('exchange_rate_buffer') or 1.05)
-    shipping_cost = float(get_config('shipping_cost_base') or 5000)
-    customs_rate = float(get_config('customs_tax_rate') or 0.10)
-    naver_fee_rate = float(get_config('naver_fee_rate') or 0.06)
-    
-    # 비용 계산
-    ali_price_krw = ali_price_usd * cny_rate * exchange_buffer  # USD → KRW
-    customs_tax = ali_price_krw * customs_rate if ali_price_krw > 150000 else 0  # 15만원 이상만
-    total_cost = ali_price_krw + shipping_cost + customs_tax
-    
-    # 수익 계산
-    naver_fee = naver_avg_price_krw * naver_fee_rate
-    net_revenue = naver_avg_price_krw - naver_fee
-    profit = net_revenue - total_cost
-    margin_rate = (profit / net_revenue * 100) if net_revenue > 0 else -100
-    
-    # 드롭쉬핑 가능성 판단
-    feasible = margin_rate >= 25  # 최소 25% 마진
-    
-    # 점수 계산 (0~10)
+def _feasibility_score(margin_rate, shipping_days=None):
+    """마진율 → 드롭쉬핑 점수 (0~10), 배송 기간 패널티 포함"""
     if margin_rate >= 50:
         score = 10.0
     elif margin_rate >= 40:
@@ -286,22 +282,68 @@ def calculate_dropship_feasibility(ali_price_usd, naver_avg_price_krw, shipping_
             score *= 0.7
         elif shipping_days > 20:
             score *= 0.85
+    return score
+
+
+def calculate_dropship_feasibility_batch(ali_prices_usd, naver_avg_price_krw, shipping_days=None, config=None):
+    """
+    드롭쉬핑 가능성 일괄 계산 (pricing 엔진으로 한 번에 벡터 계산)
     
-    return {
-        'feasible': feasible,
-        'margin_rate': round(margin_rate, 1),
-        'profit_krw': int(profit),
-        'score': round(score, 1),
-        'cost_breakdown': {
-            'ali_price_krw': int(ali_price_krw),
-            'shipping_cost': int(shipping_cost),
-            'customs_tax': int(customs_tax),
-            'total_cost': int(total_cost),
-            'naver_price': int(naver_avg_price_krw),
-            'naver_fee': int(naver_fee),
-            'net_revenue': int(net_revenue),
+    Args:
+        ali_prices_usd: 알리 가격 목록 (USD)
+        naver_avg_price_krw: 네이버 평균 가격 (KRW) - 판매가로 사용
+        shipping_days: 배송 기간 (일) - 선택
+        config: pricing.load_pricing_config() 결과 (없으면 DB에서 한 번 로드)
+    
+    Returns:
+        list[dict]: calculate_dropship_feasibility() 와 같은 형식
+    """
+    config = config or pricing.load_pricing_config()
+    analyses = pricing.price_rows(
+        [float(price) * pricing.USD_TO_CNY for price in ali_prices_usd], config,
+        market_prices=naver_avg_price_krw
+    )
+    
+    results = []
+    for analysis in analyses:
+        margin_rate = analysis['margin']
+        results.append({
+            'feasible': margin_rate >= 25,  # 최소 25% 마진
+            'margin_rate': round(margin_rate, 1),
+            'profit_krw': analysis['profit'],
+            'score': round(_feasibility_score(margin_rate, shipping_days), 1),
+            'cost_breakdown': {
+                'ali_price_krw': analysis['purchase_price_krw'],
+                'shipping_cost': analysis['shipping_cost'],
+                'customs_tax': analysis['customs_tax'],
+                'total_cost': analysis['total_cost'],
+                'naver_price': analysis['sale_price'],
+                'naver_fee': analysis['marketplace_fee'],
+                'net_revenue': analysis['sale_price'] - analysis['marketplace_fee'],
+            }
+        })
+    return results
+
+
+def calculate_dropship_feasibility(ali_price_usd, naver_avg_price_krw, shipping_days=None, config=None):
+    """
+    드롭쉬핑 가능성 계산
+    
+    Args:
+        ali_price_usd: 알리 가격 (USD)
+        naver_avg_price_krw: 네이버 평균 가격 (KRW)
+        shipping_days: 배송 기간 (일) - 선택
+    
+    Returns:
+        dict: {
+            'feasible': True/False,
+            'margin_rate': 마진율 (%),
+            'profit_krw': 실제 이익 (원),
+            'cost_breakdown': {...},
+            'score': 0~10점
         }
-    }
+    """
+    return calculate_dropship_feasibility_batch([ali_price_usd], naver_avg_price_krw, shipping_days, config)[0]
 
 
 def translate_to_english_ai(korean_keyword):
@@ -321,6 +363,11 @@ def translate_to_english_ai(korean_keyword):
     """
     from app import get_config
     
+    cached = translation_cache.get('ko-en', korean_keyword)
+    if cached:
+        logger.info(f'[Translation] Cache: {korean_keyword} → {cached}')
+        return cached
+    
     prompt = f"""다음 한국어 이커머스 키워드를 알리익스프레스 검색용 영어로 번역해주세요.
 
 한국어: {korean_keyword}
@@ -344,10 +391,14 @@ def translate_to_english_ai(korean_keyword):
             import google.generativeai as genai
             genai.configure(api_key=gemini_key)
             model = genai.GenerativeModel('gemini-2.5-flash')  # ✅ 작동하는 최신 모델
+            rate_limiter.acquire('gemini')
             response = model.generate_content(prompt)
             result = response.text.strip().lower()
-            logger.info(f'[Translation] Gemini: {korean_keyword} → {result}')
-            return result
+            if _is_english(result):
+                logger.info(f'[Translation] Gemini: {korean_keyword} → {result}')
+                translation_cache.put('ko-en', korean_keyword, result, 'gemini')
+                return result
+            logger.warning(f'[Translation] Gemini not English, ignored: {korean_keyword} → {result}')
         except Exception as e:
             logger.warning(f'[Translation] Gemini failed: {str(e)[:50]}')
     
@@ -357,6 +408,7 @@ def translate_to_english_ai(korean_keyword):
         try:
             from openai import OpenAI
             client = OpenAI(api_key=openai_key)
+            rate_limiter.acquire('openai')
             response = client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
@@ -367,8 +419,11 @@ def translate_to_english_ai(korean_keyword):
                 temperature=0.3
             )
             result = response.choices[0].message.content.strip().lower()
-            logger.info(f'[Translation] OpenAI: {korean_keyword} → {result}')
-            return result
+            if _is_english(result):
+                logger.info(f'[Translation] OpenAI: {korean_keyword} → {result}')
+                translation_cache.put('ko-en', korean_keyword, result, 'openai')
+                return result
+            logger.warning(f'[Translation] OpenAI not English, ignored: {korean_keyword} → {result}')
         except Exception as e:
             logger.warning(f'[Translation] OpenAI failed: {str(e)[:50]}')
     
@@ -379,6 +434,16 @@ def translate_to_english_ai(korean_keyword):
     return result
 
 
+# 유명 브랜드 리스트 (config 'brand_keywords_json' 으로 덮어쓰기 가능)
+FAMOUS_BRANDS = {
+    '식기/주방': ['lenox', 'wedgwood', 'royal doulton', 'noritake', 'villeroy', 'boch'],
+    '전자': ['apple', 'samsung', 'lg', 'sony', 'bose', 'jbl'],
+    '패션': ['nike', 'adidas', 'puma', 'gucci', 'prada', 'louis vuitton'],
+    '화장품': ['chanel', 'dior', 'lancome', 'estee lauder'],
+}
+keyword_matcher.register('brand', FAMOUS_BRANDS, config_key='brand_keywords_json')
+
+
 def is_brand_product(title):
     """
     브랜드 제품 여부 확인
@@ -389,24 +454,7 @@ def is_brand_product(title):
     Returns:
         bool: True if 브랜드 제품
     """
-    # 유명 브랜드 리스트
-    famous_brands = [
-        # 식기/주방
-        'lenox', 'wedgwood', 'royal doulton', 'noritake', 'villeroy', 'boch',
-        # 전자
-        'apple', 'samsung', 'lg', 'sony', 'bose', 'jbl',
-        # 패션
-        'nike', 'adidas', 'puma', 'gucci', 'prada', 'louis vuitton',
-        # 화장품
-        'chanel', 'dior', 'lancome', 'estee lauder',
-    ]
-    
-    title_lower = title.lower()
-    for brand in famous_brands:
-        if brand in title_lower:
-            return True
-    
-    return False
+    return keyword_matcher.get('brand').contains_any(title)
 
 
 def match_aliexpress_suppliers(keyword_kr, naver_market_data, min_margin=25, max_results=20):
@@ -463,21 +511,20 @@ def match_aliexpress_suppliers(keyword_kr, naver_market_data, min_margin=25, max
     # 3. 각 제품 검증 및 마진 계산
     matched_products = []
     
-    for product in ali_result['products']:
-        price_usd = product.get('price', 0)
+    # 브랜드 제품 필터링 (후보 전체를 한 번에)
+    priced = [p for p in ali_result['products'] if p.get('price', 0) != 0]
+    candidates, brand_products = keyword_matcher.get('brand').partition(
+        priced, key=lambda p: p.get('title', ''))
+    for product, (_, brand) in brand_products:
+        logger.info(f"[AliMatch] Skipping brand product ({brand}): {product.get('title', '')[:50]}")
+    
+    # 드롭쉬핑 가능성 계산 (전체 후보를 한 번에)
+    feasibilities = calculate_dropship_feasibility_batch([p['price'] for p in candidates], naver_avg_price)
+    
+    for product, feasibility in zip(candidates, feasibilities):
+        price_usd = product['price']
         title = product.get('title', '')
         
-        if price_usd == 0:
-            continue
-        
-        # 브랜드 제품 필터링
-        if is_brand_product(title):
-            logger.info(f'[AliMatch] Skipping brand product: {title[:50]}')
-            continue
-        
-        # 드롭쉬핑 가능성 계산
-        feasibility = calculate_dropship_feasibility(price_usd, naver_avg_price)
-        
         # 최소 마진율 필터링
         if feasibility['margin_rate'] >= min_margin:
             matched_products.append({
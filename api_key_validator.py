@@ -118,9 +118,9 @@ def validate_openai_api_key(api_key: str, skip_api_call: bool = False) -> Tuple[
     
     # 실제 API 호출
     try:
-        import requests
+        import http_client
         
-        response = requests.post(
+        response = http_client.post(
             'https://api.openai.com/v1/chat/completions',
             headers={
                 'Authorization': f'Bearer {api_key}',
@@ -20,6 +20,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 import sqlite3
 import json
 import requests
+import http_client
 import hashlib
 import hmac
 import base64
@@ -33,6 +34,7 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill
 import schedule
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 import logging
 from logging.handlers import RotatingFileHandler
 from market_analysis import analyze_naver_market, get_naver_keyword_trend
@@ -68,295 +70,61 @@ if not os.path.isabs(DB_PATH):
 
 print(f"[INIT] ✅ DB_PATH verification passed: {DB_PATH}")
 
+# Pooled WAL-mode connections (see db_pool.py)
+import db_pool
+db_pool.configure(DB_PATH)
+import activity_log_writer
+import revenue_rollup
+import product_content
+import log_retention
+import pricing
+import title_index
+import keyword_matcher
+from phrase_trie import PhraseTrie
+import aliexpress_cache
+import aliexpress_harvester
+import naver_search_cache
+import rate_limiter
+import sourcing_jobs
+import stage_metrics
+import stage_planner
+from deadline import Deadline, DeadlineExceeded
+import translation_cache
+
 # ============================================================================
 # CRITICAL: AUTO DATABASE INITIALIZATION (BEFORE FLASK APP)
 # ============================================================================
 
 def auto_init_database():
     """
-    Automatically initialize database if it doesn't exist or is missing tables.
+    Automatically initialize / upgrade the database schema.
     This prevents sqlite3.OperationalError: no such table errors.
     CRITICAL: Must run BEFORE Flask app initialization.
+    
+    The schema lives in migrations.py (numbered, idempotent, tracked in
+    schema_version); this just applies whatever is pending.
     """
-    needs_init = False
+    from migrations import run_migrations, LATEST_VERSION
     
-    # Check if database file exists
     if not os.path.exists(DB_PATH):
         print(f'[DB-INIT] Database file not found: {DB_PATH}')
-        needs_init = True
-    else:
-        # Check if required tables exist
-        try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-            if not cursor.fetchone():
-                print('[DB-INIT] Required table "users" not found in database')
-                needs_init = True
-            conn.close()
-        except Exception as e:
-            print(f'[DB-INIT] Error checking database: {e}')
-            needs_init = True
-    
-    if needs_init:
         print('[DB-INIT] 🔧 Initializing database automatically...')
-        try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            # Create users table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create config table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS config (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create sourced_products table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS sourced_products (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    original_url TEXT NOT NULL,
-                    title_cn TEXT,
-                    title_kr TEXT,
-                    description_cn TEXT,
-                    description_kr TEXT,
-                    marketing_copy TEXT,
-                    price_cny REAL,
-                    price_krw INTEGER,
-                    profit_margin REAL,
-                    estimated_profit INTEGER,
-                    traffic_score INTEGER,
-                    safety_status TEXT,
-                    images_json TEXT,
-                    processed_images_json TEXT,
-                    status TEXT DEFAULT 'pending',
-                    keywords TEXT,
-                    source_site TEXT DEFAULT 'alibaba',
-                    moq INTEGER DEFAULT 1,
-                    trend_score INTEGER DEFAULT 0,
-                    competition_score INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    approved_at TIMESTAMP,
-                    registered_at TIMESTAMP
-                )
-            ''')
-            
-            # CRITICAL: Add new columns if they don't exist (migration)
-            migrations = [
-                ('keywords', 'TEXT'),
-                ('source_site', "TEXT DEFAULT 'alibaba'"),
-                ('moq', 'INTEGER DEFAULT 1'),
-                ('trend_score', 'INTEGER DEFAULT 0'),
-                ('competition_score', 'INTEGER DEFAULT 0')
-            ]
-            
-            for column_name, column_type in migrations:
-                try:
-                    cursor.execute(f'ALTER TABLE sourced_products ADD COLUMN {column_name} {column_type}')
-                    app.logger.info(f'[DB Init] ✅ Added {column_name} column to sourced_products table')
-                except:
-                    pass  # Column already exists
-            
-            # Create orders table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS orders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    order_number TEXT UNIQUE NOT NULL,
-                    marketplace TEXT NOT NULL,
-                    product_id INTEGER,
-                    customer_name TEXT,
-                    customer_phone TEXT,
-                    customer_address TEXT,
-                    pccc TEXT NOT NULL,
-                    pccc_validated BOOLEAN DEFAULT 0,
-                    quantity INTEGER DEFAULT 1,
-                    sale_price INTEGER NOT NULL,
-                    purchase_price_cny REAL,
-                    purchase_price_krw INTEGER,
-                    applied_exchange_rate REAL NOT NULL,
-                    shipping_cost INTEGER,
-                    customs_tax INTEGER,
-                    marketplace_fee INTEGER,
-                    net_profit INTEGER,
-                    original_product_url TEXT,
-                    tracking_number TEXT,
-                    order_status TEXT DEFAULT 'pending',
-                    payment_status TEXT DEFAULT 'paid',
-                    shipping_deadline TIMESTAMP,
-                    ordered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    shipped_at TIMESTAMP,
-                    delivered_at TIMESTAMP,
-                    FOREIGN KEY (product_id) REFERENCES sourced_products (id)
-                )
-            ''')
-            
-            # Create activity_logs table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS activity_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    action_type TEXT NOT NULL,
-                    description TEXT,
-                    status TEXT,
-                    details_json TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create tax_records table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS tax_records (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    order_id INTEGER,
-                    order_number TEXT,
-                    sale_date DATE,
-                    sale_amount INTEGER,
-                    purchase_amount INTEGER,
-                    shipping_cost INTEGER,
-                    marketplace_fee INTEGER,
-                    net_profit INTEGER,
-                    applied_exchange_rate REAL,
-                    exported BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (order_id) REFERENCES orders (id)
-                )
-            ''')
-            
-            # Create marketplace_listings table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS marketplace_listings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    product_id INTEGER,
-                    marketplace TEXT NOT NULL,
-                    external_product_id TEXT,
-                    listing_url TEXT,
-                    current_stock INTEGER DEFAULT 0,
-                    status TEXT DEFAULT 'active',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP,
-                    FOREIGN KEY (product_id) REFERENCES sourced_products (id)
-                )
-            ''')
-            
-            # Create stock_monitor_log table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS stock_monitor_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    product_id INTEGER,
-                    original_url TEXT,
-                    check_status TEXT,
-                    action_taken TEXT,
-                    checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (product_id) REFERENCES sourced_products (id)
-                )
-            ''')
-            
-            # Check if default admin user exists
-            cursor.execute("SELECT COUNT(*) FROM users WHERE username='admin'")
-            if cursor.fetchone()[0] == 0:
-                default_password = 'admin123'
-                password_hash = generate_password_hash(default_password, method='pbkdf2:sha256')
-                cursor.execute('INSERT INTO users (username, password_hash) VALUES (?, ?)',
-                             ('admin', password_hash))
-                print('[DB-INIT] ✅ Default admin user created (username: admin, password: admin123)')
-            
-            # Insert default configuration if config table is empty
-            cursor.execute("SELECT COUNT(*) FROM config")
-            if cursor.fetchone()[0] == 0:
-                default_configs = [
-                    ('target_margin_rate', '30'),
-                    ('cny_exchange_rate', '190'),
-                    ('exchange_rate_buffer', '1.05'),
-                    ('shipping_cost_base', '5000'),
-                    ('customs_tax_rate', '0.10'),
-                    ('naver_fee_rate', '0.06'),
-                    ('coupang_fee_rate', '0.11'),
-                    ('auto_register', 'false'),
-                    ('gemini_api_key', ''),
-                    ('openai_api_key', ''),
-                    ('naver_client_id', ''),
-                    ('naver_client_secret', ''),
-                    ('coupang_access_key', ''),
-                    ('coupang_secret_key', ''),
-                    ('server_static_ip', ''),
-                    ('debug_mode_ignore_filters', 'false'),  # NEW: Debug mode for diagnostics
-                ]
-                cursor.executemany('INSERT INTO config (key, value) VALUES (?, ?)', default_configs)
-                print('[DB-INIT] ✅ Default configuration inserted')
-            
-            conn.commit()
-            conn.close()
-            
-            print('[DB-INIT] ✅ Database initialized successfully!')
-            print(f'[DB-INIT] 📁 Database: {DB_PATH}')
-            print('[DB-INIT] ⚠️  Default credentials: admin / admin123')
-            
-        except Exception as e:
-            print(f'[DB-INIT] ❌ Failed to initialize database: {e}')
-            import traceback
-            traceback.print_exc()
-            raise
-    else:
-        print(f'[DB-INIT] ✅ Database OK: {DB_PATH}')
     
     # ============================================================================
     # CRITICAL: Run migrations ALWAYS (even if database already exists)
     # ============================================================================
-    print('[DB-MIGRATE] 🔄 Running column migrations...')
+    print('[DB-MIGRATE] 🔄 Running schema migrations...')
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Check existing columns
-        cursor.execute("PRAGMA table_info(sourced_products)")
-        existing_columns = {row[1] for row in cursor.fetchall()}
-        print(f'[DB-MIGRATE] Existing columns: {sorted(existing_columns)}')
-        
-        # Define required columns with their types
-        required_columns = {
-            'keywords': 'TEXT',
-            'source_site': "TEXT DEFAULT 'alibaba'",
-            'moq': 'INTEGER DEFAULT 1',
-            'trend_score': 'INTEGER DEFAULT 0',
-            'competition_score': 'INTEGER DEFAULT 0'
-        }
-        
-        # Add missing columns
-        migrations_applied = 0
-        for column_name, column_type in required_columns.items():
-            if column_name not in existing_columns:
-                try:
-                    cursor.execute(f'ALTER TABLE sourced_products ADD COLUMN {column_name} {column_type}')
-                    conn.commit()
-                    print(f'[DB-MIGRATE] ✅ Added column: {column_name}')
-                    migrations_applied += 1
-                except sqlite3.OperationalError as e:
-                    print(f'[DB-MIGRATE] ⚠️ Column {column_name} error: {e}')
-            else:
-                print(f'[DB-MIGRATE] ✓ Column {column_name} exists')
-        
-        conn.close()
-        if migrations_applied > 0:
-            print(f'[DB-MIGRATE] ✅ Applied {migrations_applied} migration(s)')
+        applied = run_migrations(DB_PATH)
+        if applied:
+            print(f'[DB-MIGRATE] ✅ Applied {len(applied)} migration(s): {applied} (schema v{LATEST_VERSION})')
         else:
-            print('[DB-MIGRATE] ✅ All columns up to date')
-        
+            print(f'[DB-MIGRATE] ✅ Schema up to date (v{LATEST_VERSION})')
     except Exception as e:
         print(f'[DB-MIGRATE] ❌ Migration error: {e}')
         import traceback
         traceback.print_exc()
-        # Don't raise - app should still work even if migration partially fails
+        raise
     
     # CRITICAL: Verify tables exist before proceeding
     print('[DB-VERIFY] Verifying all tables exist...')
@@ -368,7 +136,11 @@ def auto_init_database():
         conn.close()
         
         required_tables = ['users', 'config', 'sourced_products', 'orders', 
-                          'activity_logs', 'tax_records', 'marketplace_listings', 'stock_monitor_log']
+                          'activity_logs', 'tax_records', 'marketplace_listings', 'stock_monitor_log',
+                          'config_version', 'rejected_products', 'blue_ocean_cache', 'schema_version',
+                          'daily_revenue', 'monthly_revenue', 'sourced_product_content',
+                          'sync_watermarks', 'title_index_keywords', 'title_index_buckets',
+                          'sourcing_jobs', 'translation_cache', 'aliexpress_search_cache']
         missing_tables = [t for t in required_tables if t not in tables]
         
         if missing_tables:
@@ -381,7 +153,34 @@ def auto_init_database():
     except Exception as e:
         print(f'[DB-VERIFY] ❌ Verification failed: {e}')
         raise
-    
+
+    # 제목 중복 인덱스는 현재 해시 코드로 계산되는 파생 데이터 → migration이 아닌 여기서 backfill
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        indexed = title_index.backfill_if_empty(conn.cursor())
+        conn.execute('COMMIT')
+        if indexed:
+            print(f'[DB-MIGRATE] ✅ Title index backfilled: {indexed} product(s)')
+    except Exception as e:
+        conn.execute('ROLLBACK')
+        print(f'[DB-MIGRATE] ⚠️ Title index backfill failed: {e}')
+    finally:
+        conn.close()
+
+    # migration 009가 평문으로 옮긴 상품 콘텐츠 압축 → 비워진 페이지 반환
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    try:
+        compressed = product_content.compress_all(conn)
+    except Exception as e:
+        compressed = 0
+        print(f'[DB-MIGRATE] ⚠️ Product content compression failed: {e}')
+    finally:
+        conn.close()
+    if compressed:
+        freed = log_retention.incremental_vacuum(max_pages=0)
+        print(f'[DB-MIGRATE] ✅ Compressed content of {compressed} product(s), freed {freed} page(s)')
+
     # Always print completion marker
     print('='*70)
     print('!!! DATABASE INITIALIZATION COMPLETE !!!')
@@ -520,36 +319,97 @@ def fix_image_url(url):
 # ============================================================================
 
 def get_db():
-    """Get database connection"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """
+    Get database connection from the pool (WAL, busy_timeout, row_factory=Row).
+    conn.close() returns it to the pool; uncommitted work is rolled back.
+    """
+    return db_pool.get_connection()
+
+def db_transaction(conn=None):
+    """Context-managed transaction: `with db_transaction() as conn: ...`"""
+    return db_pool.transaction(conn)
 
 def log_activity(action_type, description, status='success', details=None):
-    """Log system activity with KST timestamp"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
+    """
+    Log system activity with KST timestamp.
+    Non-blocking: the row is queued and written in batches by activity_log_writer.
+    """
     # 🚀 FIX: Explicitly set KST timestamp instead of relying on DEFAULT
     kst_now = get_kst_now().strftime('%Y-%m-%d %H:%M:%S')
     
-    cursor.execute('''
-        INSERT INTO activity_logs (action_type, description, status, details_json, created_at)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (action_type, description, status, json.dumps(details) if details else None, kst_now))
-    conn.commit()
-    conn.close()
+    activity_log_writer.enqueue(
+        (action_type, description, status, json.dumps(details) if details else None, kst_now)
+    )
+
+# ============================================================================
+# CONFIG SNAPSHOT CACHE
+# ============================================================================
+# The whole config table is loaded once into memory and served from a dict.
+# set_config()/set_configs() bump config_version in the same transaction and
+# reload the snapshot locally; other worker processes notice the bump on their next
+# version check (at most once per CONFIG_VERSION_CHECK_INTERVAL seconds).
+
+CONFIG_VERSION_CHECK_INTERVAL = 1.0  # seconds
+
+_config_lock = threading.Lock()
+_config_snapshot = None          # {key: raw value}
+_config_snapshot_version = None  # config_version.version at load time
+_config_last_check = 0.0         # time.monotonic() of last version check
+
+def _read_config_version(cursor):
+    """Read the cross-process config version counter (-1 if unavailable)"""
+    try:
+        cursor.execute('SELECT version FROM config_version WHERE id = 1')
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    except sqlite3.OperationalError:
+        return -1
+
+def _load_config_snapshot():
+    """Load the config table and its version in one read"""
+    global _config_snapshot, _config_snapshot_version, _config_last_check
+    conn = get_db()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT key, value FROM config')
+        snapshot = {row['key']: row['value'] for row in cursor.fetchall()}
+        version = _read_config_version(cursor)
+    finally:
+        conn.close()
+
+    _config_snapshot = snapshot
+    _config_snapshot_version = version
+    _config_last_check = time.monotonic()
+    return snapshot
+
+def get_config_snapshot():
+    """
+    Return the current config snapshot (raw values, not stripped).
+    Reloads if another process bumped config_version since the last load.
+    """
+    global _config_last_check
+    with _config_lock:
+        if _config_snapshot is None:
+            return _load_config_snapshot()
+
+        now = time.monotonic()
+        if now - _config_last_check >= CONFIG_VERSION_CHECK_INTERVAL:
+            conn = get_db()
+            try:
+                version = _read_config_version(conn.cursor())
+            finally:
+                conn.close()
+            _config_last_check = now
+            if version != _config_snapshot_version or version == -1:
+                return _load_config_snapshot()
+
+        return _config_snapshot
 
 def get_config(key, default=None):
     """Get configuration value with defensive handling"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT value FROM config WHERE key = ?', (key,))
-    row = cursor.fetchone()
-    conn.close()
-    
-    if row:
-        value = row['value']
+    value = get_config_snapshot().get(key)
+
+    if value is not None:
         # Strip whitespace from string values
         if isinstance(value, str):
             value = value.strip()
@@ -560,16 +420,31 @@ def get_config(key, default=None):
     return default
 
 def set_config(key, value):
-    """Set configuration value"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT INTO config (key, value, updated_at) 
-        VALUES (?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(key) DO UPDATE SET value = ?, updated_at = CURRENT_TIMESTAMP
-    ''', (key, value, value))
-    conn.commit()
-    conn.close()
+    """Set configuration value (write-through: bumps version and reloads snapshot)"""
+    set_configs({key: value})
+
+def set_configs(values):
+    """
+    Set several configuration values in one transaction
+    (one version bump and one snapshot reload for the whole batch)
+    """
+    if not values:
+        return
+    with db_transaction() as conn:
+        conn.executemany('''
+            INSERT INTO config (key, value, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+        ''', list(values.items()))
+        conn.execute('UPDATE config_version SET version = version + 1 WHERE id = 1')
+
+    with _config_lock:
+        _load_config_snapshot()
+
+# 금지어/브랜드/제외 키워드 사전 override를 config 스냅샷에서 읽음 (변경 시 자동 재컴파일)
+keyword_matcher.set_config_source(get_config_snapshot)
+# AliExpress 검색 캐시 TTL (aliexpress_cache_ttl_sec / aliexpress_cache_stale_sec)
+aliexpress_cache.set_config_source(get_config_snapshot)
 
 def system_check_critical_configs():
     """
@@ -759,10 +634,11 @@ BANNED_KEYWORDS = {
     ]
 }
 
-def analyze_blue_ocean_market(user_keyword=''):
+def analyze_blue_ocean_market(user_keyword='', deadline=None):
     """
     Advanced Blue Ocean Market Analysis using GPT-4o-mini
     Finds niche opportunities with rising demand and low competition
+    deadline: request Deadline (OpenAI timeout = min(30s, remaining budget))
     """
     api_key = get_config('openai_api_key')
     
@@ -918,8 +794,9 @@ def analyze_blue_ocean_market(user_keyword=''):
         # Log request details
         app.logger.info(f'📡 Calling OpenAI API: model=gpt-4o-mini, max_tokens=1000, temperature=0.8')
         
-        response = requests.post(
+        response = http_client.post(
             'https://api.openai.com/v1/chat/completions',
+            idempotent=True,
             headers={
                 'Authorization': f'Bearer {api_key}',
                 'Content-Type': 'application/json'
@@ -940,7 +817,8 @@ def analyze_blue_ocean_market(user_keyword=''):
                 'max_tokens': 1000,
                 'response_format': {'type': 'json_object'}  # JSON mode enabled
             },
-            timeout=30
+            timeout=30,
+            deadline=deadline
         )
         
         # Log response status
@@ -1009,6 +887,14 @@ def analyze_blue_ocean_market(user_keyword=''):
                 'analysis_performed': False
             }
     
+    except DeadlineExceeded as de:
+        app.logger.error(f'❌ Blue Ocean analysis skipped: {de}')
+        deadline.degrade('blue_ocean_analysis', str(de))
+        return {
+            'suggested_keyword': user_keyword if user_keyword else '무선이어폰',
+            'reasoning': 'AI 분석 생략 (요청 시간 예산 초과)',
+            'analysis_performed': False
+        }
     except requests.exceptions.Timeout:
         app.logger.error('❌ OpenAI API timeout (30s)')
         return {
@@ -1032,15 +918,18 @@ def analyze_blue_ocean_market(user_keyword=''):
             'analysis_performed': False
         }
 
+# 🔧 금지어 사전은 한 번만 컴파일 (config 'banned_keywords_json' 으로 덮어쓰기 가능)
+keyword_matcher.register('safety', BANNED_KEYWORDS, config_key='banned_keywords_json')
+
+def _safety_reason(hit):
+    category, keyword = hit
+    return f'Banned category: {category} (keyword: {keyword})'
+
 def check_safety_filter(title, description=''):
     """Check if product passes safety filter"""
-    text = (title + ' ' + description).lower()
-    
-    for category, keywords in BANNED_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword.lower() in text:
-                return False, f'Banned category: {category} (keyword: {keyword})'
-    
+    hit = keyword_matcher.get('safety').first(title + ' ' + description)
+    if hit:
+        return False, _safety_reason(hit)
     return True, 'Pass'
 
 def scrape_1688_search(keyword, max_results=50):
@@ -1077,6 +966,94 @@ def parse_smart_price(price_text):
     prices = [float(n) for n in numbers]
     return min(prices)
 
+# 🔥 규칙 기반 키워드 추출 사전 (import 시 트라이로 한 번만 컴파일)
+# 구체적인 사전을 먼저 보고, 같은 사전 안에서는 가장 긴 키워드가 우선 ("mousepad" > "mouse")
+# 1️⃣ 전자제품 & 전문 장비 (구체적)
+RULE_PRIORITY_KEYWORDS = {
+    # 전문 장비 (전자/물리/화학)
+    'oscilloscope': '오실로스코프',
+    'cathode ray tube': '측정 장비',  # 더 구체적 매핑
+    'experiment equipment': '실험 장비',
+    'physics teaching': '교육 장비',
+    'mechanical effect': '기계 장치',
+    'multimeter': '멀티미터',
+    'power supply': '전원 공급기',
+    
+    # 전자부품
+    'resistor': '저항',
+    'capacitor': '커패시터',
+    'transistor': '트랜지스터',
+    'ic chip': '반도체',
+    'circuit board': '회로 기판',
+    
+    # 청소/세차 장비
+    'pressure washer': '고압 세척기',
+    'car wash': '세차 용품',
+    'water gun': '물총',
+    'foam generator': '세차 거품기',
+    'sewer drain': '하수구 청소',
+    'drain cleaning': '배수관 청소',
+    
+    # 패션 (구체적)
+    'snake pattern': '애니멀 패턴',
+    'high heel': '하이힐',
+    'winter boots': '겨울 부츠',
+    'fashion boots': '패션 부츠',
+    'custom jewelry': '맞춤 주얼리',
+    'personalized necklace': '맞춤 목걸이',
+}
+
+# 2️⃣ 일반 카테고리 (넓은 범위)
+RULE_GENERAL_KEYWORDS = {
+    # 주얼리
+    'jewelry': '주얼리',
+    'necklace': '목걸이',
+    'ring': '반지',
+    'bracelet': '팔찌',
+    'earring': '귀걸이',
+    'pendant': '펜던트',
+    
+    # 신발
+    'boots': '부츠',
+    'shoes': '신발',
+    'sneakers': '운동화',
+    'sandals': '샌들',
+    
+    # 의류
+    'dress': '원피스',
+    'shirt': '셔츠',
+    'pants': '바지',
+    'jacket': '자켓',
+    
+    # 가방/액세서리
+    'bag': '가방',
+    'wallet': '지갑',
+    'watch': '시계',
+    
+    # 전자기기
+    'phone case': '폰케이스',
+    'charger': '충전기',
+    'cable': '케이블',
+    'headphone': '헤드폰',
+    'earphone': '이어폰',
+    'speaker': '스피커',
+    'keyboard': '키보드',
+    'mouse': '마우스',
+    'mousepad': '마우스패드',
+    
+    # 생활용품
+    'hose': '호스',
+    'pipe': '파이프',
+    'cleaner': '청소기',
+    'washer': '세척기',
+    'tool': '공구',
+    'plumbing': '배관 용품',
+}
+
+_RULE_PRIORITY_TRIE = PhraseTrie(RULE_PRIORITY_KEYWORDS)
+_RULE_GENERAL_TRIE = PhraseTrie(RULE_GENERAL_KEYWORDS)
+
+
 def extract_keyword_rule_based(title):
     """
     규칙 기반 키워드 추출 (AI 폴백용)
@@ -1089,103 +1066,16 @@ def extract_keyword_rule_based(title):
     2. 일반 카테고리 매칭 (넓은 범위)
     3. 첫 3단어 폴백
     """
-    title_lower = title.lower()
-    
-    # 🔥 우선순위 기반 카테고리 매핑
-    # 더 구체적인 키워드가 먼저 매칭되도록 순서 중요!
-    
-    # 1️⃣ 전자제품 & 전문 장비 (구체적)
-    priority_map = {
-        # 전문 장비 (전자/물리/화학)
-        'oscilloscope': '오실로스코프',
-        'cathode ray tube': '측정 장비',  # 더 구체적 매핑
-        'experiment equipment': '실험 장비',
-        'physics teaching': '교육 장비',
-        'mechanical effect': '기계 장치',
-        'multimeter': '멀티미터',
-        'power supply': '전원 공급기',
-        
-        # 전자부품
-        'resistor': '저항',
-        'capacitor': '커패시터',
-        'transistor': '트랜지스터',
-        'ic chip': '반도체',
-        'circuit board': '회로 기판',
-        
-        # 청소/세차 장비
-        'pressure washer': '고압 세척기',
-        'car wash': '세차 용품',
-        'water gun': '물총',
-        'foam generator': '세차 거품기',
-        'sewer drain': '하수구 청소',
-        'drain cleaning': '배수관 청소',
-        
-        # 패션 (구체적)
-        'snake pattern': '애니멀 패턴',
-        'high heel': '하이힐',
-        'winter boots': '겨울 부츠',
-        'fashion boots': '패션 부츠',
-        'custom jewelry': '맞춤 주얼리',
-        'personalized necklace': '맞춤 목걸이',
-    }
+    # 우선순위 매칭 (구체적 → 일반), 각 단계에서는 가장 긴 키워드 우선
+    hit = _RULE_PRIORITY_TRIE.longest(title)
+    if hit:
+        app.logger.info(f'[Rule-based Priority] Matched: {hit[0]} → {hit[1]}')
+        return hit[1]
     
-    # 2️⃣ 일반 카테고리 (넓은 범위)
-    general_map = {
-        # 주얼리
-        'jewelry': '주얼리',
-        'necklace': '목걸이',
-        'ring': '반지',
-        'bracelet': '팔찌',
-        'earring': '귀걸이',
-        'pendant': '펜던트',
-        
-        # 신발
-        'boots': '부츠',
-        'shoes': '신발',
-        'sneakers': '운동화',
-        'sandals': '샌들',
-        
-        # 의류
-        'dress': '원피스',
-        'shirt': '셔츠',
-        'pants': '바지',
-        'jacket': '자켓',
-        
-        # 가방/액세서리
-        'bag': '가방',
-        'wallet': '지갑',
-        'watch': '시계',
-        
-        # 전자기기
-        'phone case': '폰케이스',
-        'charger': '충전기',
-        'cable': '케이블',
-        'headphone': '헤드폰',
-        'earphone': '이어폰',
-        'speaker': '스피커',
-        'keyboard': '키보드',
-        'mouse': '마우스',
-        'mousepad': '마우스패드',
-        
-        # 생활용품
-        'hose': '호스',
-        'pipe': '파이프',
-        'cleaner': '청소기',
-        'washer': '세척기',
-        'tool': '공구',
-        'plumbing': '배관 용품',
-    }
-    
-    # 우선순위 매칭 (구체적 → 일반)
-    for eng, kor in priority_map.items():
-        if eng in title_lower:
-            app.logger.info(f'[Rule-based Priority] Matched: {eng} → {kor}')
-            return kor
-    
-    for eng, kor in general_map.items():
-        if eng in title_lower:
-            app.logger.info(f'[Rule-based General] Matched: {eng} → {kor}')
-            return kor
+    hit = _RULE_GENERAL_TRIE.longest(title)
+    if hit:
+        app.logger.info(f'[Rule-based General] Matched: {hit[0]} → {hit[1]}')
+        return hit[1]
     
     # 매칭 실패 시 첫 3단어만 사용
     words = title.split()[:3]
@@ -1205,6 +1095,11 @@ def extract_keyword_hybrid_ai(title):
     Returns:
         str: 추출된 한국어 키워드
     """
+    cached = translation_cache.get('title-keyword', title)
+    if cached:
+        app.logger.info(f'[Hybrid AI] 💾 Cached keyword: {cached}')
+        return cached
+    
     # 🎯 개선된 프롬프트: 제품의 실제 용도와 카테고리를 파악
     prompt = f"""다음 상품명을 분석하여 네이버/쿠팡에서 검색할 수 있는 한국어 키워드를 추출해주세요.
 
@@ -1233,11 +1128,13 @@ def extract_keyword_hybrid_ai(title):
             genai.configure(api_key=gemini_api_key)
             model = genai.GenerativeModel('gemini-2.0-flash-exp')
             
+            rate_limiter.acquire('gemini')
             response = model.generate_content(prompt)
             extracted = response.text.strip()
             keyword = extracted.split(',')[0].strip()
             
             app.logger.info(f'[Hybrid AI] ✅ Gemini extracted keyword: {keyword}')
+            translation_cache.put('title-keyword', title, keyword, 'gemini')
             return keyword
             
         except Exception as e:
@@ -1250,6 +1147,7 @@ def extract_keyword_hybrid_ai(title):
             from openai import OpenAI
             client = OpenAI(api_key=openai_api_key)
             
+            rate_limiter.acquire('openai')
             response = client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
@@ -1264,6 +1162,7 @@ def extract_keyword_hybrid_ai(title):
             keyword = extracted.split(',')[0].strip()
             
             app.logger.info(f'[Hybrid AI] ✅ OpenAI extracted keyword: {keyword}')
+            translation_cache.put('title-keyword', title, keyword, 'openai')
             return keyword
             
         except Exception as e:
@@ -1277,7 +1176,7 @@ def extract_keyword_hybrid_ai(title):
 # ALIEXPRESS OFFICIAL API INTEGRATION
 # ============================================================================
 
-def search_aliexpress_official(keyword, max_results=50):
+def search_aliexpress_official(keyword, max_results=50, page_no=1, deadline=None):
     """
     Search AliExpress using Official Affiliate API
     
@@ -1290,6 +1189,8 @@ def search_aliexpress_official(keyword, max_results=50):
     Args:
         keyword (str): Search keyword
         max_results (int): Maximum products to return (default 50)
+        page_no (int): Result page (1-based)
+        deadline (Deadline): request budget (API timeout = min(30s, remaining))
     
     Returns:
         dict: {
@@ -1311,6 +1212,19 @@ def search_aliexpress_official(keyword, max_results=50):
             'count': int
         }
     """
+    # 💾 응답 캐시 (TTL 이내 즉시 반환, 만료 직후에는 stale 응답 + 백그라운드 갱신)
+    page_size = min(max_results, 50)
+    return aliexpress_cache.cached_search(
+        aliexpress_cache.make_key('affiliate_sync', keyword, page=page_no, page_size=page_size,
+                                  sort='SALE_PRICE_ASC', currency='USD'),
+        lambda: _search_aliexpress_official_uncached(keyword, max_results, page_no, deadline=deadline),
+        cacheable=lambda result: bool(result.get('count')),
+        # 백그라운드 갱신은 요청이 끝난 뒤에도 돌 수 있으므로 요청 예산과 무관
+        refresh=lambda: _search_aliexpress_official_uncached(keyword, max_results, page_no)
+    )
+
+def _search_aliexpress_official_uncached(keyword, max_results=50, page_no=1, deadline=None):
+    """Signed aliexpress.affiliate.product.query call (see search_aliexpress_official)"""
     import time
     import hashlib
     
@@ -1343,6 +1257,7 @@ def search_aliexpress_official(keyword, max_results=50):
         'v': '2.0',
         'sign_method': 'md5',
         'keywords': keyword,
+        'page_no': str(page_no),
         'page_size': str(min(max_results, 50)),  # API max: 50
         'target_currency': 'USD',
         'target_language': 'EN',
@@ -1357,7 +1272,8 @@ def search_aliexpress_official(keyword, max_results=50):
     
     try:
         app.logger.info(f'[AliExpress API] 📡 Sending request...')
-        response = requests.get(endpoint, params=params, timeout=30)
+        rate_limiter.acquire('aliexpress', key=app_key, deadline=deadline)
+        response = http_client.get(endpoint, params=params, timeout=30, deadline=deadline)
         
         app.logger.info(f'[AliExpress API] 📊 Status: {response.status_code}')
         
@@ -1516,7 +1432,7 @@ def scrape_alibaba_search(keyword, max_results=50):
             app.logger.info(f'[Alibaba Scraping] 🌐 Sending request to ScrapingAnt...')
             app.logger.info(f'[Alibaba Scraping] Target: {search_url}')
             
-            response = requests.get(
+            response = http_client.get(
                 'https://api.scrapingant.com/v2/general',
                 params=params,
                 headers=headers,
@@ -1744,7 +1660,7 @@ def scrape_aliexpress_search(keyword, max_results=50):
             app.logger.info(f'[AliExpress Scraping] 🌐 Sending request to ScrapingAnt...')
             app.logger.info(f'[AliExpress Scraping] Target: {search_url}')
             
-            response = requests.get(
+            response = http_client.get(
                 'https://api.scrapingant.com/v2/general',
                 params=params,
                 headers=headers,
@@ -1877,7 +1793,8 @@ def scrape_aliexpress_search(keyword, max_results=50):
         app.logger.error(f'[AliExpress Scraping] ❌ Exception: {str(e)}')
         return {'products': [], 'count': 0}
 
-def search_integrated_hybrid(keyword, max_results=50):
+def search_integrated_hybrid(keyword, max_results=50, max_pages=1, count_survivors=None, enough=None,
+                             deadline=None):
     """
     🚀 OFFICIAL API SOURCING ENGINE (Updated 2026-03-05)
     
@@ -1888,6 +1805,10 @@ def search_integrated_hybrid(keyword, max_results=50):
     
     Search AliExpress only using Official API
     Filter by margin and select best products
+    
+    max_pages > 1: pages 1..max_pages are harvested concurrently (aliexpress_harvester),
+    de-duplicated by product_id, stopping once count_survivors() reports `enough`
+    deadline: request Deadline shared by the translation and every page request
     """
     app.logger.info(f'[Search Engine] ========================================')
     app.logger.info(f'[Search Engine] 🚀 Starting Official API search for: {keyword}')
@@ -1899,7 +1820,7 @@ def search_integrated_hybrid(keyword, max_results=50):
         app.logger.info(f'[Search Engine] 🔤 Detected Korean keyword, translating...')
         from aliexpress_matcher import translate_keyword_to_english  # 🔧 FIX: Import from correct module
         try:
-            search_keyword = translate_keyword_to_english(keyword)
+            search_keyword = translate_keyword_to_english(keyword, deadline=deadline)
             app.logger.info(f'[Search Engine] ✅ Translation: "{keyword}" → "{search_keyword}"')
         except Exception as e:
             app.logger.warning(f'[Search Engine] ⚠️  Translation failed: {e}, using original')
@@ -1907,8 +1828,18 @@ def search_integrated_hybrid(keyword, max_results=50):
     
     # Search AliExpress using Official API
     app.logger.info(f'[Search Engine] Searching AliExpress via Official API for: {search_keyword}...')
-    aliexpress_result = search_aliexpress_official(search_keyword, max_results)
-    all_products = aliexpress_result.get('products', [])
+    harvest_stats = None
+    if max_pages > 1:
+        # bind: 수집 스레드의 API 호출도 현재 단계(search)의 outbound_calls로 집계
+        harvest_stats = aliexpress_harvester.harvest(
+            stage_metrics.bind(lambda page_no: search_aliexpress_official(
+                search_keyword, max_results, page_no=page_no, deadline=deadline).get('products', [])),
+            max_pages, count_survivors=count_survivors, enough=enough, deadline=deadline
+        )
+        all_products = harvest_stats.pop('products')
+    else:
+        aliexpress_result = search_aliexpress_official(search_keyword, max_results, deadline=deadline)
+        all_products = aliexpress_result.get('products', [])
     app.logger.info(f'[Search Engine] ✅ Found: {len(all_products)} products')
     
     # Changed from: Alibaba + AliExpress scraping
@@ -1921,12 +1852,13 @@ def search_integrated_hybrid(keyword, max_results=50):
         app.logger.error('[Search Engine] ℹ️  Try different keyword or check API credentials')
         return {'products': [], 'count': 0, 'error': 'No products found'}
     
-    # Calculate profitability for each product
-    for product in all_products:
+    # Calculate profitability for all products in one vectorized pass
+    pricing_config = pricing.load_pricing_config(get_config_snapshot())
+    # Convert USD to CNY for uniform calculation (1 USD ≈ 7.2 CNY)
+    prices_cny = [float(p.get('price') or 0) * pricing.USD_TO_CNY for p in all_products]
+    analyses = pricing.price_rows(prices_cny, pricing_config)
+    for product, price_cny, analysis in zip(all_products, prices_cny, analyses):
         try:
-            # Convert USD to CNY for uniform calculation (1 USD ≈ 7.2 CNY)
-            price_cny = product['price'] * 7.2
-            analysis = analyze_product_profitability(price_cny)
             product['analysis'] = analysis
             product['price_cny'] = price_cny  # Store for DB
             
@@ -2018,53 +1950,87 @@ def search_integrated_hybrid(keyword, max_results=50):
     all_products.sort(key=lambda x: x.get('hybrid_score', 0), reverse=True)
     
     app.logger.info(f'[Search Engine] ✅ Search complete: {len(all_products)} products analyzed')
-    return {'products': all_products, 'count': len(all_products)}
+    result = {'products': all_products, 'count': len(all_products)}
+    if harvest_stats is not None:
+        result['harvest'] = harvest_stats
+    return result
 
-def analyze_product_profitability(price_cny):
-    """Calculate profit margin and KRW price"""
-    exchange_rate = float(get_config('cny_exchange_rate', 190))
-    buffer = float(get_config('exchange_rate_buffer', 1.05))
-    shipping = int(get_config('shipping_cost_base', 5000))
-    customs_rate = float(get_config('customs_tax_rate', 0.10))
-    
-    # Use highest price for safety (prevent loss)
-    purchase_price_krw = int(price_cny * exchange_rate * buffer)
-    
-    # Calculate costs
-    customs_tax = int(purchase_price_krw * customs_rate)
-    total_cost = purchase_price_krw + shipping + customs_tax
-    
-    # Calculate sale price with target margin
-    target_margin = float(get_config('target_margin_rate', 30)) / 100
-    sale_price = int(total_cost / (1 - target_margin))
-    
-    # Round to nearest 100
-    sale_price = ((sale_price + 99) // 100) * 100
-    
-    # Calculate actual profit
-    actual_profit = sale_price - total_cost
-    actual_margin = (actual_profit / sale_price * 100) if sale_price > 0 else 0
-    
-    return {
-        'purchase_price_krw': purchase_price_krw,
-        'shipping_cost': shipping,
-        'customs_tax': customs_tax,
-        'total_cost': total_cost,
-        'sale_price': sale_price,
-        'profit': actual_profit,
-        'margin': actual_margin,
-        'exchange_rate': exchange_rate
-    }
+def analyze_product_profitability(price_cny, config=None, marketplace='naver'):
+    """
+    Calculate profit margin and KRW price (single product)
+    Same math as the batch path: see pricing.py
+    """
+    config = config or pricing.load_pricing_config(get_config_snapshot())
+    return pricing.price_one(price_cny, config, marketplace=marketplace)
 
 # generate_test_products() DELETED - No mock data allowed
 
-def execute_smart_sourcing(keyword, max_products=3):
+# 🚫 가격 상한선 (Step 3 가격 필터)
+MAX_PURCHASE_PRICE_KRW = 100000  # 구매가 10만원 이하만 허용
+MAX_SALE_PRICE_KRW = 150000      # 판매가 15만원 이하만 허용
+
+# 🔍 멀티 페이지 후보 수집 (config 'aliexpress_harvest_pages', 1이면 기존처럼 1페이지)
+HARVEST_DEFAULT_PAGES = 3
+HARVEST_SURVIVORS_PER_PRODUCT = 5  # 중복/거절 필터로 더 빠질 것을 감안한 여유분
+
+# 🎯 네이버 카테고리 검증: 같은 카테고리 네이버 상품이 이보다 적으면 low_match 태그
+NAVER_VERIFICATION_MIN_MATCHES = 5
+
+# ⏱️ 요청 단위 시간 예산 (config 'sourcing_deadline_sec')
+SOURCING_DEADLINE_DEFAULT_SEC = 120
+# 백그라운드 작업은 HTTP 타임아웃과 무관 → 더 큰 예산 (config 'sourcing_job_deadline_sec')
+SOURCING_JOB_DEADLINE_DEFAULT_SEC = 900
+OPTIONAL_STAGE_MIN_SEC = 15        # 네이버 검증/시장 분석: 이만큼 남지 않으면 건너뜀 (호출 10초 + 저장 여유)
+SAVE_MIN_BUSY_TIMEOUT_MS = 1000    # 예산이 다 떨어져도 저장의 DB 잠금 대기는 최소 이만큼
+
+def _sourcing_deadline(config_key='sourcing_deadline_sec', default=SOURCING_DEADLINE_DEFAULT_SEC):
+    """New Deadline for one sourcing run (budget from config, default 120s for HTTP requests)"""
+    try:
+        budget = float(get_config(config_key, default))
+    except (TypeError, ValueError):
+        budget = default
+    return Deadline(budget if budget > 0 else default)
+
+def _funnel_survivor_counter(pricing_config, target_margin, debug_mode_enabled):
+    """
+    count(products) → how many harvested products would pass the safety and
+    price/margin stages (same rules as Step 2/3), used to stop harvesting early
+    """
+    safety = keyword_matcher.get('safety')
+    
+    def count(products):
+        if not debug_mode_enabled:
+            products = [p for p in products if safety.first(p['title']) is None]
+        if not products:
+            return 0
+        analyses = pricing.price_rows([float(p.get('price') or 0) * pricing.USD_TO_CNY for p in products],
+                                      pricing_config)
+        return sum(1 for a in analyses
+                   if a['purchase_price_krw'] <= MAX_PURCHASE_PRICE_KRW
+                   and a['sale_price'] <= MAX_SALE_PRICE_KRW
+                   and (debug_mode_enabled or a['margin'] >= target_margin))
+    return count
+
+def _report_progress(progress, stage, stage_stats):
+    """Forward a finished stage to the job queue (progress failures never break sourcing)"""
+    if progress is None:
+        return
+    try:
+        progress(stage, dict(stage_stats) if stage_stats is not None else None)
+    except Exception as e:
+        app.logger.warning(f'[Smart Sniper] ⚠️ Progress update failed ({stage}): {e}')
+
+@stage_metrics.instrumented('smart_sourcing')
+def execute_smart_sourcing(keyword, max_products=3, progress=None, deadline=None):
     """
     Unified [Smart Sniper] engine for both keyword search and AI discovery
     
     Args:
         keyword: 검색 키워드
         max_products: 반환할 최대 상품 개수 (기본값: 3, AI 소싱 시 1 사용)
+        progress: optional progress(stage, stage_stats) callback, called as each stage completes
+        deadline: request Deadline; every outbound call uses the remaining budget as its
+                  timeout and the optional Naver stages are skipped when it runs low
     
     Execution steps:
     1. Hybrid search (Alibaba + AliExpress)
@@ -2074,16 +2040,18 @@ def execute_smart_sourcing(keyword, max_products=3):
     5. Slice to Top N (max_products)
     6. Use ScrapingAnt tokens ONLY for these items to fetch details
     
-    Returns: dict with 'success', 'products' (Top N), 'stats', 'stage_stats'
+    Returns: dict with 'success', 'products' (Top N), 'stats', 'stage_stats',
+             'timings' (per-stage wall/CPU ms, outbound calls, DB queries)
     """
     app.logger.info(f'[Smart Sniper] ========================================')
     app.logger.info(f'[Smart Sniper] Executing REAL sourcing for keyword: {keyword}')
     app.logger.info(f'[Smart Sniper] NO TEST DATA - Only real Alibaba/AliExpress products')
     
+    stage_metrics.begin('translation')
     # 🌐 CRITICAL FIX: Translate Korean keywords to English for AliExpress API
     from aliexpress_matcher import translate_keyword_to_english
     original_keyword = keyword
-    keyword = translate_keyword_to_english(keyword)
+    keyword = translate_keyword_to_english(keyword, deadline=deadline)
     app.logger.info(f'[Smart Sniper] 🌐 Keyword translation: "{original_keyword}" → "{keyword}"')
     
     # Initialize stage-by-stage tracking for UI feedback
@@ -2096,6 +2064,7 @@ def execute_smart_sourcing(keyword, max_products=3):
         'highest_margin_value': 0
     }
     
+    stage_metrics.begin('system_check')
     # ========================================================================
     # CRITICAL: SYSTEM CHECK - Verify DB and load configurations
     # ========================================================================
@@ -2145,11 +2114,28 @@ def execute_smart_sourcing(keyword, max_products=3):
             'stage_stats': stage_stats
         }
     
+    stage_metrics.begin('search')
     # Step 1: 🚀 AliExpress Official API Search
+    _report_progress(progress, 'searching', stage_stats)
     log_activity('sourcing', f'Step 1/5: 🚀 AliExpress Official API Search for "{keyword}"', 'in_progress')
     
     # 🚀 Real API search via AliExpress Affiliate API
-    results = search_integrated_hybrid(keyword, max_results=50)
+    # 여러 페이지를 동시에 수집하고, 필터 통과 예상 수가 충분하면 남은 페이지는 건너뜀
+    try:
+        harvest_pages = int(get_config('aliexpress_harvest_pages', HARVEST_DEFAULT_PAGES))
+    except (TypeError, ValueError):
+        harvest_pages = HARVEST_DEFAULT_PAGES
+    survivor_counter = _funnel_survivor_counter(pricing.load_pricing_config(get_config_snapshot()),
+                                                float(get_config('target_margin_rate', 30)),
+                                                debug_mode_enabled)
+    results = search_integrated_hybrid(keyword, max_results=50, max_pages=harvest_pages,
+                                       count_survivors=survivor_counter,
+                                       enough=max(max_products, 1) * HARVEST_SURVIVORS_PER_PRODUCT,
+                                       deadline=deadline)
+    if results.get('harvest'):
+        app.logger.info(f'[Smart Sniper] 📄 Harvest: {results["harvest"]}')
+        if results['harvest'].get('deadline_exceeded'):
+            deadline.degrade('search', f'{results["harvest"]["pages_skipped"]} result page(s) not fetched')
     
     if 'error' in results:
         error_msg = results['error']
@@ -2169,6 +2155,7 @@ def execute_smart_sourcing(keyword, max_products=3):
     # 📊 STAGE 1: Record scraped count
     stage_stats['stage1_scraped'] = len(products)
     app.logger.info(f'[Smart Sniper] 📊 STAGE 1 COMPLETE: {len(products)} products scraped')
+    _report_progress(progress, 'stage1_scraped', stage_stats)
     
     # Critical check: if no products, FAIL EXPLICITLY
     if len(products) == 0:
@@ -2181,311 +2168,275 @@ def execute_smart_sourcing(keyword, max_products=3):
             'stage_stats': stage_stats
         }
     
-    # 🎯 NEW: Product Matcher v2.0 - Naver Category Verification
-    log_activity('sourcing', 'Step 1.5/5: 🔍 Verifying product relevance with Naver market', 'in_progress')
-    app.logger.info(f'[Smart Sniper] 🔍 Starting Product Matcher v2.0 category filtering...')
-    
+    # ========================================================================
+    # 🧭 Stage planner: 로컬 필터(싼 것)부터 실행하고, 네이버/LLM 단계는
+    # 최종 후보에만 실행 (건너뛴 단계와 아낀 호출 수는 stage_stats['planner'])
+    # ========================================================================
     from product_matcher import clean_product_title, classify_category, translate_english_to_korean
+    from product_matcher import translate_titles_to_korean, has_hangul
     from market_analysis import analyze_naver_market
+    from datetime import datetime, timedelta
     
-    # Clean and classify first product as reference
-    if len(products) > 0:
-        sample_product = products[0]
-        cleaned_title = clean_product_title(sample_product['title'])
-        expected_category = classify_category(sample_product['title'])
-        korean_keyword = translate_english_to_korean(cleaned_title)
-        
-        app.logger.info(f'[Product Matcher] Sample product: {sample_product["title"][:50]}...')
-        app.logger.info(f'[Product Matcher] Cleaned title: {cleaned_title}')
-        app.logger.info(f'[Product Matcher] Expected category: {expected_category}')
-        app.logger.info(f'[Product Matcher] Korean keyword: {korean_keyword}')
-        
-        # Analyze Naver market for category matching
-        naver_client_id = get_config('naver_client_id', '')
-        naver_client_secret = get_config('naver_client_secret', '')
-        
-        if not naver_client_id or not naver_client_secret:
-            app.logger.warning('[Product Matcher] ⚠️ Naver API credentials not configured - skipping category verification')
-            naver_result = {'success': False, 'error': 'Naver API not configured'}
-        else:
-            naver_result = analyze_naver_market(
-                korean_keyword, 
-                naver_client_id, 
-                naver_client_secret,
-                ali_product_title=sample_product['title'],
-                enable_category_filter=True
-            )
-        
-        if naver_result['success']:
-            total_naver = naver_result['total_products']
-            matched_count = naver_result.get('category_matched_count', 0)
-            
-            app.logger.info(f'[Product Matcher] Naver results: {total_naver} total, {matched_count} category-matched')
-            
-            if matched_count < 5:
-                app.logger.warning(f'[Product Matcher] ⚠️ Low category match ({matched_count}/5) - results may be less relevant')
-                log_activity('sourcing', f'⚠️ Found only {matched_count} relevant items in Naver', 'warning')
-        else:
-            app.logger.warning(f'[Product Matcher] ⚠️ Naver analysis failed: {naver_result.get("error", "Unknown")}')
-    
-    app.logger.info(f'[Smart Sniper] ✅ Product Matcher v2.0 verification complete')
-    
-    # Step 2: Safety Filter (SKIP if debug mode enabled)
-    log_activity('sourcing', 'Step 2/5: 🛡️ Applying safety filters', 'in_progress')
-    app.logger.info(f'[Smart Sniper] Starting safety filter on {len(products)} products')
-    
-    if debug_mode_enabled:
-        # 🐛 DEBUG MODE: Skip safety filter
-        app.logger.warning('[Smart Sniper] 🐛 DEBUG MODE: SKIPPING SAFETY FILTER')
-        safe_products = products
-        filtered_count = 0
-        log_activity('sourcing', f'🐛 Debug mode: All {len(products)} products marked as safe', 'warning')
-    else:
-        # Normal safety filtering
-        safe_products = []
-        filtered_count = 0
-        for product in products:
-            is_safe, reason = check_safety_filter(product['title'])
-            if is_safe:
-                safe_products.append(product)
-            else:
-                filtered_count += 1
-                app.logger.debug(f'[Safety Filter] Filtered: {product["title"][:40]} - {reason}')
-        
-        app.logger.info(f'[Smart Sniper] Safety filter result: {len(safe_products)} safe, {filtered_count} filtered')
-        log_activity('sourcing', f'{len(safe_products)}/{len(products)} items passed safety filter', 'success')
-    
-    # 📊 STAGE 2: Record safe count
-    stage_stats['stage2_safe'] = len(safe_products)
-    app.logger.info(f'[Smart Sniper] 📊 STAGE 2 COMPLETE: {len(safe_products)} products passed safety filter')
-    
-    # Step 3: Margin Simulation (SKIP if debug mode enabled)
-    log_activity('sourcing', 'Step 3/5: 💰 Margin simulation in progress', 'in_progress')
+    naver_client_id = get_config('naver_client_id', '')
+    naver_client_secret = get_config('naver_client_secret', '')
     target_margin = float(get_config('target_margin_rate', 30))
-    app.logger.info(f'[Smart Sniper] Target margin: {target_margin}%')
-    app.logger.info(f'[Smart Sniper] Analyzing profitability of {len(safe_products)} products')
+    ctx = {'candidates': products}
     
-    profitable_products = []
-    failed_margin_count = 0
-    highest_margin = 0
-    highest_margin_product = None
+    def no_candidates(ctx):
+        return None if ctx['candidates'] else 'no candidates left'
     
-    for idx, product in enumerate(safe_products):
-        try:
-            analysis = analyze_product_profitability(product['price'])
-            
-            app.logger.debug(f'[Margin Check {idx+1}] {product["title"][:30]}: '
-                           f'Price ¥{product["price"]}, '
-                           f'Margin {analysis["margin"]:.1f}%, '
-                           f'Profit ₩{analysis["profit"]:,}')
-            
-            # 🚫 CRITICAL: 가격 상한선 체크 (원가 기준)
-            # 사용자 요청: 원가 30만원 넘는 상품은 제외
-            MAX_PURCHASE_PRICE_KRW = 100000  # 구매가 10만원 이하만 허용
-            purchase_price = analysis['purchase_price_krw']
-            
-            if purchase_price > MAX_PURCHASE_PRICE_KRW:
-                app.logger.warning(
-                    f'[Price Filter] 🚫 Too expensive: {product["title"][:40]} | '
-                    f'Purchase price: ₩{purchase_price:,} > ₩{MAX_PURCHASE_PRICE_KRW:,}'
-                )
-                failed_margin_count += 1
-                continue
-            
-            # 🚫 추가 체크: 판매가 상한선 (15만원 이하만 허용)
-            MAX_SALE_PRICE_KRW = 150000
-            sale_price = analysis['sale_price']
-            
-            if sale_price > MAX_SALE_PRICE_KRW:
-                app.logger.warning(
-                    f'[Price Filter] 🚫 Sale price too high: {product["title"][:40]} | '
-                    f'Sale price: ₩{sale_price:,} > ₩{MAX_SALE_PRICE_KRW:,}'
-                )
-                failed_margin_count += 1
-                continue
-            
-            # Track highest margin product
-            if analysis['margin'] > highest_margin:
-                highest_margin = analysis['margin']
-                highest_margin_product = {
-                    'title': product['title'][:50],
-                    'price_cny': product['price'],
-                    'margin': analysis['margin'],
-                    'profit': analysis['profit']
-                }
+    def no_selection(ctx):
+        return None if ctx['results'].get('selection') else 'no products selected'
+    
+    def no_naver(ctx):
+        if not naver_client_id or not naver_client_secret:
+            return 'Naver API credentials not configured'
+        return no_selection(ctx)
+    
+    def optional_naver_stage(stage_name):
+        # 선택 단계: 남은 예산이 부족하면 SLA를 넘기지 않도록 건너뛰고 응답에 기록
+        def skip(ctx):
+            reason = no_naver(ctx)
+            if reason is None and deadline is not None and not deadline.allows(OPTIONAL_STAGE_MIN_SEC):
+                reason = f'deadline budget low ({deadline.remaining():.1f}s left)'
+                deadline.degrade(stage_name, reason)
+            return reason
+        return skip
+    
+    def note_rule_based(stage_name):
+        if deadline is not None and deadline.expired():
+            deadline.degrade(stage_name, 'deadline exceeded - rule-based translation only')
+    
+    def run_safety_filter(ctx):
+        # Step 2: Safety Filter (SKIP if debug mode enabled)
+        candidates = ctx['candidates']
+        log_activity('sourcing', 'Step 2/5: 🛡️ Applying safety filters', 'in_progress')
+        app.logger.info(f'[Smart Sniper] Starting safety filter on {len(candidates)} products')
+        
+        if debug_mode_enabled:
+            # 🐛 DEBUG MODE: Skip safety filter
+            app.logger.warning('[Smart Sniper] 🐛 DEBUG MODE: SKIPPING SAFETY FILTER')
+            safe_products = candidates
+            filtered_count = 0
+            log_activity('sourcing', f'🐛 Debug mode: All {len(candidates)} products marked as safe', 'warning')
+        else:
+            # Normal safety filtering
+            safe_products, rejected = keyword_matcher.get('safety').partition(candidates, key=lambda p: p['title'])
+            filtered_count = len(rejected)
+            for product, hit in rejected:
+                app.logger.debug(f'[Safety Filter] Filtered: {product["title"][:40]} - {_safety_reason(hit)}')
             
-            # Drop items not meeting target margin (UNLESS debug mode enabled)
-            if debug_mode_enabled or analysis['margin'] >= target_margin:
-                product['analysis'] = analysis
-                profitable_products.append(product)
-            else:
+            app.logger.info(f'[Smart Sniper] Safety filter result: {len(safe_products)} safe, {filtered_count} filtered')
+            log_activity('sourcing', f'{len(safe_products)}/{len(candidates)} items passed safety filter', 'success')
+        
+        # 📊 STAGE 2: Record safe count
+        stage_stats['stage2_safe'] = len(safe_products)
+        app.logger.info(f'[Smart Sniper] 📊 STAGE 2 COMPLETE: {len(safe_products)} products passed safety filter')
+        _report_progress(progress, 'stage2_safe', stage_stats)
+        ctx['candidates'] = ctx['safe_products'] = safe_products
+        return filtered_count
+    
+    def run_pricing(ctx):
+        # Step 3: Margin Simulation (margin filter SKIPPED if debug mode enabled)
+        safe_products = ctx['candidates']
+        log_activity('sourcing', 'Step 3/5: 💰 Margin simulation in progress', 'in_progress')
+        app.logger.info(f'[Smart Sniper] Target margin: {target_margin}%')
+        app.logger.info(f'[Smart Sniper] Analyzing profitability of {len(safe_products)} products')
+        
+        profitable_products = []
+        failed_margin_count = 0
+        highest_margin = 0
+        highest_margin_product = None
+        
+        # One config snapshot + one vectorized pass for every candidate.
+        # Purchase price basis is price_cny (USD converted in the search step), same as the DB row.
+        pricing_config = pricing.load_pricing_config(get_config_snapshot())
+        prices_cny = [float(p.get('price_cny', p.get('price')) or 0) for p in safe_products]
+        analyses = pricing.price_rows(prices_cny, pricing_config)
+        
+        for idx, (product, price_cny, analysis) in enumerate(zip(safe_products, prices_cny, analyses)):
+            try:
+                app.logger.debug(f'[Margin Check {idx+1}] {product["title"][:30]}: '
+                               f'Price ¥{price_cny}, '
+                               f'Margin {analysis["margin"]:.1f}%, '
+                               f'Profit ₩{analysis["profit"]:,}')
+                
+                # 🚫 CRITICAL: 가격 상한선 체크 (원가 기준)
+                # 사용자 요청: 원가 30만원 넘는 상품은 제외
+                purchase_price = analysis['purchase_price_krw']
+                
+                if purchase_price > MAX_PURCHASE_PRICE_KRW:
+                    app.logger.warning(
+                        f'[Price Filter] 🚫 Too expensive: {product["title"][:40]} | '
+                        f'Purchase price: ₩{purchase_price:,} > ₩{MAX_PURCHASE_PRICE_KRW:,}'
+                    )
+                    failed_margin_count += 1
+                    continue
+                
+                # 🚫 추가 체크: 판매가 상한선 (15만원 이하만 허용)
+                sale_price = analysis['sale_price']
+                
+                if sale_price > MAX_SALE_PRICE_KRW:
+                    app.logger.warning(
+                        f'[Price Filter] 🚫 Sale price too high: {product["title"][:40]} | '
+                        f'Sale price: ₩{sale_price:,} > ₩{MAX_SALE_PRICE_KRW:,}'
+                    )
+                    failed_margin_count += 1
+                    continue
+                
+                # Track highest margin product
+                if analysis['margin'] > highest_margin:
+                    highest_margin = analysis['margin']
+                    highest_margin_product = {
+                        'title': product['title'][:50],
+                        'price_cny': price_cny,
+                        'margin': analysis['margin'],
+                        'profit': analysis['profit']
+                    }
+                
+                # Drop items not meeting target margin (UNLESS debug mode enabled)
+                if debug_mode_enabled or analysis['margin'] >= target_margin:
+                    product['analysis'] = analysis
+                    profitable_products.append(product)
+                else:
+                    failed_margin_count += 1
+            except Exception as e:
+                app.logger.error(f'[Margin Check] Failed for product {idx+1}: {str(e)}')
                 failed_margin_count += 1
-        except Exception as e:
-            app.logger.error(f'[Margin Check] Failed for product {idx+1}: {str(e)}')
-            failed_margin_count += 1
-    
-    # 📊 Record highest margin for diagnostics
-    stage_stats['highest_margin_value'] = highest_margin
-    stage_stats['highest_margin_product'] = highest_margin_product
-    
-    app.logger.info(f'[Smart Sniper] 📊 Highest margin found: {highest_margin:.1f}%')
-    if highest_margin_product:
-        app.logger.info(f'[Smart Sniper] 📊 Highest margin product: {highest_margin_product["title"]}')
-    
-    if debug_mode_enabled:
-        app.logger.warning(f'[Smart Sniper] 🐛 DEBUG MODE: SKIPPING MARGIN FILTER - All {len(profitable_products)} products accepted')
-        log_activity('sourcing', f'🐛 Debug mode: All {len(profitable_products)} products marked as profitable', 'warning')
-    else:
-        app.logger.info(f'[Smart Sniper] Profitability result: {len(profitable_products)} profitable, {failed_margin_count} rejected')
-        log_activity('sourcing', f'{len(profitable_products)} items meet target margin {target_margin}%', 'success')
-    
-    # 📊 STAGE 3: Record profitable count
-    stage_stats['stage3_profitable'] = len(profitable_products)
-    app.logger.info(f'[Smart Sniper] 📊 STAGE 3 COMPLETE: {len(profitable_products)} products are profitable')
-    
-    # Step 4: Sort by net profit (descending)
-    profitable_products.sort(key=lambda x: x['analysis']['profit'], reverse=True)
-    
-    # Step 4.3: 🎯 Remove duplicate products (same title or similar)
-    app.logger.info(f'[Smart Sniper] Removing duplicate products...')
-    
-    def calculate_title_similarity(title1, title2):
-        """제목 유사도 계산 (0-100%)"""
-        import re
         
-        # 불용어 목록 (의미 없는 단어)
-        stopwords = {
-            'for', 'with', 'and', 'the', 'from', 'tws', 'new', 'hot', 'sale',
-            'pro', 'mini', 'max', 'ultra', 'plus', 'lite'
-        }
+        # 📊 Record highest margin for diagnostics
+        stage_stats['highest_margin_value'] = highest_margin
+        stage_stats['highest_margin_product'] = highest_margin_product
         
-        # 핵심 키워드 추출 (4글자 이상, 알파벳만, 불용어 제외)
-        def extract_keywords(title):
-            words = re.findall(r'\b[a-z]{4,}\b', title.lower())
-            return set(w for w in words if w not in stopwords)
+        app.logger.info(f'[Smart Sniper] 📊 Highest margin found: {highest_margin:.1f}%')
+        if highest_margin_product:
+            app.logger.info(f'[Smart Sniper] 📊 Highest margin product: {highest_margin_product["title"]}')
         
-        words1 = extract_keywords(title1)
-        words2 = extract_keywords(title2)
+        if debug_mode_enabled:
+            app.logger.warning(f'[Smart Sniper] 🐛 DEBUG MODE: SKIPPING MARGIN FILTER - All {len(profitable_products)} products accepted')
+            log_activity('sourcing', f'🐛 Debug mode: All {len(profitable_products)} products marked as profitable', 'warning')
+        else:
+            app.logger.info(f'[Smart Sniper] Profitability result: {len(profitable_products)} profitable, {failed_margin_count} rejected')
+            log_activity('sourcing', f'{len(profitable_products)} items meet target margin {target_margin}%', 'success')
+        
+        # 📊 STAGE 3: Record profitable count
+        stage_stats['stage3_profitable'] = len(profitable_products)
+        app.logger.info(f'[Smart Sniper] 📊 STAGE 3 COMPLETE: {len(profitable_products)} products are profitable')
+        _report_progress(progress, 'stage3_profitable', stage_stats)
+        
+        # Step 4: Sort by net profit (descending)
+        profitable_products.sort(key=lambda x: x['analysis']['profit'], reverse=True)
+        ctx['candidates'] = profitable_products
+        ctx['highest_margin'] = highest_margin
+        return failed_margin_count
+    
+    def run_rejected_filter(ctx):
+        # Step 4.5: 🚫 Filter out previously rejected products (only non-expired)
+        candidates = ctx['candidates']
+        app.logger.info(f'[Smart Sniper] Checking for previously rejected products...')
+        conn = get_db()
+        cursor = conn.cursor()
         
-        if not words1 or not words2:
-            return 0.0
+        # Only get rejections that haven't expired yet
+        cursor.execute('''
+            SELECT product_url, expires_at 
+            FROM rejected_products 
+            WHERE keyword = ? 
+            AND (expires_at IS NULL OR expires_at > ?)
+        ''', (keyword, datetime.now().isoformat()))
         
-        common = words1 & words2
-        total = words1 | words2
-        return len(common) / len(total) * 100
-    
-    # 🔍 Load existing products from DB (last 30 days) for global duplicate check
-    from datetime import datetime, timedelta
-    thirty_days_ago = (datetime.now() - timedelta(days=30)).isoformat()
-    
-    conn_dup = get_db()
-    cursor_dup = conn_dup.cursor()
-    cursor_dup.execute("""
-        SELECT title_cn
-        FROM sourced_products
-        WHERE created_at >= ?
-        AND status = 'pending'
-    """, (thirty_days_ago,))
-    
-    existing_titles = [row[0] for row in cursor_dup.fetchall()]
-    conn_dup.close()
-    
-    app.logger.info(f'[Smart Sniper] Loaded {len(existing_titles)} existing products for similarity check')
-    
-    unique_products = []
-    duplicate_count = 0
-    global_duplicate_count = 0
+        rejected_urls = set(row[0] for row in cursor.fetchall())
+        
+        # Clean up expired rejections
+        cursor.execute('''
+            DELETE FROM rejected_products 
+            WHERE expires_at IS NOT NULL 
+            AND expires_at <= ?
+        ''', (datetime.now().isoformat(),))
+        
+        deleted_count = cursor.rowcount
+        if deleted_count > 0:
+            app.logger.info(f'[Smart Sniper] ♻️ Cleaned up {deleted_count} expired rejection(s)')
+        
+        conn.commit()
+        conn.close()
+        
+        if not rejected_urls:
+            app.logger.info(f'[Smart Sniper] No active rejections found')
+            return 0
+        app.logger.info(f'[Smart Sniper] Found {len(rejected_urls)} currently rejected products for keyword: {keyword}')
+        ctx['candidates'] = [p for p in candidates if p['url'] not in rejected_urls]
+        rejected_count = len(candidates) - len(ctx['candidates'])
+        app.logger.info(f'[Smart Sniper] Filtered out {rejected_count} rejected products')
+        return rejected_count
     
-    for product in profitable_products:
-        is_duplicate = False
-        current_title = product['title']
+    def run_dedupe(ctx):
+        # Step 4.3: 🎯 Remove duplicate products (same title or similar)
+        app.logger.info(f'[Smart Sniper] Removing duplicate products...')
+        
+        # 🔍 Near-duplicate check via MinHash/LSH (title_index): only bucket-sharing
+        # candidates are verified with exact Jaccard, against the current batch and
+        # the pending products of the last 30 days in the DB
+        thirty_days_ago = (datetime.now() - timedelta(days=30)).isoformat()
+        
+        batch_index = title_index.BatchTitleIndex()
+        conn_dup = get_db()
+        cursor_dup = conn_dup.cursor()
+        
+        unique_products = []
+        duplicate_count = 0
+        global_duplicate_count = 0
         
-        # 1️⃣ 현재 검색 결과 내 중복 검사
-        for existing in unique_products:
-            similarity = calculate_title_similarity(current_title, existing['title'])
+        for product in ctx['candidates']:
+            current_title = product['title']
             
-            # 70% 이상 유사하면 중복으로 간주
-            if similarity >= 70:
-                is_duplicate = True
+            # 1️⃣ 현재 검색 결과 내 중복 검사 (70% 이상 유사하면 중복)
+            batch_match = batch_index.find(current_title)
+            if batch_match:
                 duplicate_count += 1
                 app.logger.debug(
-                    f'[Smart Sniper] 🔄 Current-batch duplicate removed ({similarity:.1f}% similar)\n'
-                    f'  Original: {existing["title"][:60]}...\n'
+                    f'[Smart Sniper] 🔄 Current-batch duplicate removed ({batch_match[1] * 100:.1f}% similar)\n'
+                    f'  Original: {batch_match[0][:60]}...\n'
                     f'  Duplicate: {current_title[:60]}...'
                 )
-                break
-        
-        # 2️⃣ DB에 저장된 기존 상품과 중복 검사 (최근 30일)
-        if not is_duplicate:
-            for existing_title in existing_titles:
-                similarity = calculate_title_similarity(current_title, existing_title)
-                
-                # 70% 이상 유사하면 중복으로 간주
-                if similarity >= 70:
-                    is_duplicate = True
-                    global_duplicate_count += 1
-                    app.logger.info(
-                        f'[Smart Sniper] ⚠️ Global duplicate detected ({similarity:.1f}% similar)\n'
-                        f'  Existing in DB: {existing_title[:60]}...\n'
-                        f'  New (blocked): {current_title[:60]}...'
-                    )
-                    break
-        
-        if not is_duplicate:
+                continue
+            
+            # 2️⃣ DB에 저장된 기존 상품과 중복 검사 (최근 30일, pending)
+            db_match = title_index.find_similar(cursor_dup, current_title, status='pending',
+                                                created_since=thirty_days_ago)
+            if db_match:
+                _, existing_title, similarity = db_match[0]
+                global_duplicate_count += 1
+                app.logger.info(
+                    f'[Smart Sniper] ⚠️ Global duplicate detected ({similarity * 100:.1f}% similar)\n'
+                    f'  Existing in DB: {existing_title[:60]}...\n'
+                    f'  New (blocked): {current_title[:60]}...'
+                )
+                continue
+            
+            batch_index.add(current_title)
             unique_products.append(product)
-    
-    app.logger.info(
-        f'[Smart Sniper] Removed {duplicate_count} current-batch duplicates + '
-        f'{global_duplicate_count} global duplicates (DB check), '
-        f'{len(unique_products)} unique products remain'
-    )
-    profitable_products = unique_products
-    
-    # Step 4.5: 🚫 Filter out previously rejected products (only non-expired)
-    app.logger.info(f'[Smart Sniper] Checking for previously rejected products...')
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    # Only get rejections that haven't expired yet
-    cursor.execute('''
-        SELECT product_url, expires_at 
-        FROM rejected_products 
-        WHERE keyword = ? 
-        AND (expires_at IS NULL OR expires_at > ?)
-    ''', (keyword, datetime.now().isoformat()))
-    
-    rejected_urls = set(row[0] for row in cursor.fetchall())
-    
-    # Clean up expired rejections
-    cursor.execute('''
-        DELETE FROM rejected_products 
-        WHERE expires_at IS NOT NULL 
-        AND expires_at <= ?
-    ''', (datetime.now().isoformat(),))
-    
-    deleted_count = cursor.rowcount
-    if deleted_count > 0:
-        app.logger.info(f'[Smart Sniper] ♻️ Cleaned up {deleted_count} expired rejection(s)')
-    
-    conn.commit()
-    conn.close()
-    
-    if rejected_urls:
-        app.logger.info(f'[Smart Sniper] Found {len(rejected_urls)} currently rejected products for keyword: {keyword}')
-        filtered_products = [p for p in profitable_products if p['url'] not in rejected_urls]
-        rejected_count = len(profitable_products) - len(filtered_products)
-        app.logger.info(f'[Smart Sniper] Filtered out {rejected_count} rejected products')
-        profitable_products = filtered_products
-    else:
-        app.logger.info(f'[Smart Sniper] No active rejections found')
-    
-    # Step 5: Select diverse Top N (configurable via max_products parameter)
-    if debug_mode_enabled:
-        # 🐛 DEBUG MODE: Return ALL products
-        top_products = profitable_products[:50]  # Cap at 50 to avoid UI overload
-        app.logger.warning(f'[Smart Sniper] 🐛 DEBUG MODE: Returning TOP {len(top_products)} products')
-        log_activity('sourcing', f'Step 4/5: 🐛 Debug mode: Top {len(top_products)} selected', 'warning')
-    else:
+        
+        conn_dup.close()
+        
+        app.logger.info(
+            f'[Smart Sniper] Removed {duplicate_count} current-batch duplicates + '
+            f'{global_duplicate_count} global duplicates (DB check), '
+            f'{len(unique_products)} unique products remain'
+        )
+        ctx['candidates'] = unique_products
+        return duplicate_count + global_duplicate_count
+    
+    def run_selection(ctx):
+        # Step 5: Select diverse Top N (configurable via max_products parameter)
+        profitable_products = ctx['candidates']
+        if debug_mode_enabled:
+            # 🐛 DEBUG MODE: Return ALL products
+            top_products = profitable_products[:50]  # Cap at 50 to avoid UI overload
+            app.logger.warning(f'[Smart Sniper] 🐛 DEBUG MODE: Returning TOP {len(top_products)} products')
+            log_activity('sourcing', f'Step 4/5: 🐛 Debug mode: Top {len(top_products)} selected', 'warning')
+            return top_products
+        
         # 🎯 Select diverse products (different price ranges)
         if max_products == 1:
             # AI 소싱 모드: 각 키워드당 1개씩만
@@ -2521,10 +2472,148 @@ def execute_smart_sourcing(keyword, max_products=3):
             top_products = profitable_products[:max_products]
         
         log_activity('sourcing', f'Step 4/5: 🎯 Top {len(top_products)} selected (diverse products, rejected excluded)', 'success')
+        return top_products
+    
+    def record_selection(ctx):
+        top_products = run_selection(ctx)
+        # 📊 STAGE 4: Record final count
+        stage_stats['stage4_final'] = len(top_products)
+        app.logger.info(f'[Smart Sniper] 📊 STAGE 4 COMPLETE: {len(top_products)} products in final selection')
+        _report_progress(progress, 'stage4_final', stage_stats)
+        return top_products
+    
+    def run_category_keyword(ctx):
+        # 🔧 FIX: Translate English keyword to Korean for Naver search
+        note_rule_based('category_keyword')
+        return translate_english_to_korean(keyword, deadline=deadline)
+    
+    def run_title_translation(ctx):
+        # 🔧 FIX: Translate each product's title for accurate Naver matching
+        # (all titles in one batched LLM request instead of one request per product)
+        top_products = ctx['results']['selection']
+        note_rule_based('title_translation')
+        cleaned_titles = [clean_product_title(p['title']) for p in top_products]
+        product_keywords = translate_titles_to_korean(cleaned_titles, deadline=deadline)
+        
+        # 🚨 VALIDATION: 영어 키워드면 원본 제목으로 재시도 (실패한 것만 다시 한 번에)
+        retry_idx = [i for i, (kw, cleaned) in enumerate(zip(product_keywords, cleaned_titles))
+                     if kw == cleaned or not has_hangul(kw)]
+        if retry_idx:
+            app.logger.warning(f'[DB Save] ⚠️ Translation failed for {len(retry_idx)} title(s), retrying with original titles')
+            retried = translate_titles_to_korean([top_products[i]['title'] for i in retry_idx], deadline=deadline)
+            for i, kw in zip(retry_idx, retried):
+                product_keywords[i] = kw
+        return product_keywords
+    
+    def run_naver_verification(ctx):
+        # 🎯 Product Matcher v2.0 - Naver Category Verification (best selected product)
+        log_activity('sourcing', 'Step 4.5/5: 🔍 Verifying product relevance with Naver market', 'in_progress')
+        sample_product = ctx['results']['selection'][0]
+        korean_keyword = ctx['results']['title_translation'][0]
+        if not has_hangul(korean_keyword):
+            korean_keyword = ctx['results']['category_keyword']
+        
+        app.logger.info(f'[Product Matcher] Sample product: {sample_product["title"][:50]}...')
+        app.logger.info(f'[Product Matcher] Expected category: {classify_category(sample_product["title"])}')
+        app.logger.info(f'[Product Matcher] Korean keyword: {korean_keyword}')
+        
+        naver_result = analyze_naver_market(
+            korean_keyword, 
+            naver_client_id, 
+            naver_client_secret,
+            ali_product_title=sample_product['title'],
+            enable_category_filter=True,
+            deadline=deadline
+        )
+        
+        # 🔧 FIX: 카테고리 일치 수는 category_info에 있음 (전부 불일치면 success=False + category_info)
+        category_info = naver_result.get('category_info')
+        if category_info:
+            matched_count = category_info.get('filtered_items', 0)
+            app.logger.info(f'[Product Matcher] Naver results: {category_info.get("total_items", 0)} searched, '
+                            f'{matched_count} category-matched')
+            
+            # 검증 결과를 상품에 태그 → 응답과 저장되는 market_analysis에 포함
+            sample_product['naver_verification'] = {
+                'keyword': korean_keyword,
+                'category': category_info.get('ali_category'),
+                'matched_count': matched_count,
+                'searched_count': category_info.get('total_items', 0),
+                'low_match': matched_count < NAVER_VERIFICATION_MIN_MATCHES,
+            }
+            if matched_count < NAVER_VERIFICATION_MIN_MATCHES:
+                app.logger.warning(f'[Product Matcher] ⚠️ Low category match ({matched_count}/{NAVER_VERIFICATION_MIN_MATCHES}) '
+                                   f'- results may be less relevant')
+                log_activity('sourcing', f'⚠️ Found only {matched_count} relevant items in Naver', 'warning')
+        elif not naver_result['success']:
+            app.logger.warning(f'[Product Matcher] ⚠️ Naver analysis failed: {naver_result.get("error", "Unknown")}')
+        return naver_result
     
-    # 📊 STAGE 4: Record final count
-    stage_stats['stage4_final'] = len(top_products)
-    app.logger.info(f'[Smart Sniper] 📊 STAGE 4 COMPLETE: {len(top_products)} products in final selection')
+    def run_market_analysis(ctx):
+        # Step 5.5: 📊 Market Analysis (Naver Shopping)
+        korean_keyword = ctx['results']['category_keyword']
+        app.logger.info(f'[Smart Sniper] 📊 Starting market analysis for keyword: {keyword} → {korean_keyword}')
+        log_activity('sourcing', 'Step 5/5: 📊 Analyzing market prices (Naver Shopping)', 'in_progress')
+        _report_progress(progress, 'market_analysis', stage_stats)
+        
+        try:
+            # Use Korean keyword for Naver search
+            market_data = analyze_naver_market(korean_keyword, naver_client_id, naver_client_secret,
+                                               deadline=deadline)
+            
+            if market_data.get('success'):
+                app.logger.info(f'[Market Analysis] ✅ SUCCESS')
+                app.logger.info(f'[Market Analysis] Total products analyzed: {market_data["analyzed_products"]}')
+                app.logger.info(f'[Market Analysis] Average price: ₩{market_data["avg_price"]:,}')
+                app.logger.info(f'[Market Analysis] Price range: ₩{market_data["min_price"]:,} ~ ₩{market_data["max_price"]:,}')
+                app.logger.info(f'[Market Analysis] Recommended price: ₩{market_data["recommended_price"]:,}')
+                app.logger.info(f'[Market Analysis] Market position: {market_data["analysis_summary"]["market_position"]}')
+                
+                log_activity('sourcing', f'✅ Market analysis: Avg ₩{market_data["avg_price"]:,}, Recommend ₩{market_data["recommended_price"]:,}', 'success')
+            else:
+                app.logger.warning(f'[Market Analysis] ⚠️ Failed: {market_data.get("error")}')
+                log_activity('sourcing', f'⚠️ Market analysis failed: {market_data.get("error")}', 'warning')
+        except Exception as e:
+            app.logger.error(f'[Market Analysis] ❌ Exception: {str(e)}')
+            market_data = None
+        return market_data
+    
+    planner = stage_planner.StagePlanner([
+        stage_planner.Stage('safety_filter', stage_planner.COST_LOCAL, run_safety_filter),
+        stage_planner.Stage('pricing', stage_planner.COST_LOCAL * 2, run_pricing,
+                            skip=no_candidates),
+        stage_planner.Stage('rejected_filter', stage_planner.COST_DB, run_rejected_filter,
+                            skip=no_candidates, calls=lambda ctx: {'db': 2}),
+        stage_planner.Stage('dedupe', stage_planner.COST_DB * 2, run_dedupe,
+                            skip=no_candidates, calls=lambda ctx: {'db': len(ctx['candidates'])}),
+        stage_planner.Stage('selection', stage_planner.COST_LOCAL, record_selection,
+                            after=('safety_filter', 'pricing', 'rejected_filter', 'dedupe')),
+        # 검색 키워드(영문)의 한글 키워드: 사용자가 한글로 입력했다면 처음 번역의 원문을 재사용
+        stage_planner.Stage('category_keyword', stage_planner.COST_LLM, run_category_keyword,
+                            skip=no_selection, reuse_key=lambda ctx: ('en-ko', keyword),
+                            after=('selection',), calls=lambda ctx: {'llm': 1}),
+        stage_planner.Stage('title_translation', stage_planner.COST_LLM, run_title_translation,
+                            skip=no_selection, after=('selection',), calls=lambda ctx: {'llm': 1}),
+        stage_planner.Stage('naver_verification', stage_planner.COST_NETWORK, run_naver_verification,
+                            skip=optional_naver_stage('naver_verification'), after=('category_keyword', 'title_translation'),
+                            calls=lambda ctx: {'naver': 1}),
+        stage_planner.Stage('market_analysis', stage_planner.COST_NETWORK, run_market_analysis,
+                            skip=optional_naver_stage('market_analysis'), after=('category_keyword',), calls=lambda ctx: {'naver': 1}),
+    ])
+    if has_hangul(original_keyword) and original_keyword != keyword:
+        planner.seed(('en-ko', keyword), original_keyword)
+    
+    planner.run(ctx)
+    
+    stage_stats['planner'] = planner.summary()
+    app.logger.info(f'[Smart Sniper] 🧭 Stage order: {" → ".join(stage_stats["planner"]["order"])}, '
+                    f'saved calls: {stage_stats["planner"]["saved_calls"]}')
+    
+    safe_products = ctx['safe_products']
+    profitable_products = ctx['candidates']
+    top_products = ctx['results']['selection']
+    highest_margin = ctx.get('highest_margin', 0)
+    highest_margin_product = stage_stats['highest_margin_product']
     
     if len(top_products) == 0:
         # 🚨 CRITICAL: No products after all filters
@@ -2553,47 +2642,25 @@ def execute_smart_sourcing(keyword, max_products=3):
             'suggestion': f'No products found. Highest margin was {highest_margin:.1f}% (target: {target_margin}%). Consider lowering margin target or enabling Debug Mode.'
         }
     
-    # Step 5.5: 📊 Market Analysis (Naver Shopping)
-    # 🔧 FIX: Translate English keyword to Korean for Naver search
-    from product_matcher import translate_english_to_korean
-    korean_keyword = translate_english_to_korean(keyword)
-    
-    app.logger.info(f'[Smart Sniper] 📊 Starting market analysis for keyword: {keyword} → {korean_keyword}')
-    log_activity('sourcing', 'Step 5/5: 📊 Analyzing market prices (Naver Shopping)', 'in_progress')
-    
-    market_data = None
-    naver_client_id = get_config('naver_client_id', '')
-    naver_client_secret = get_config('naver_client_secret', '')
-    
-    if naver_client_id and naver_client_secret:
-        try:
-            # Use Korean keyword for Naver search
-            market_data = analyze_naver_market(korean_keyword, naver_client_id, naver_client_secret)
-            
-            if market_data.get('success'):
-                app.logger.info(f'[Market Analysis] ✅ SUCCESS')
-                app.logger.info(f'[Market Analysis] Total products analyzed: {market_data["analyzed_products"]}')
-                app.logger.info(f'[Market Analysis] Average price: ₩{market_data["avg_price"]:,}')
-                app.logger.info(f'[Market Analysis] Price range: ₩{market_data["min_price"]:,} ~ ₩{market_data["max_price"]:,}')
-                app.logger.info(f'[Market Analysis] Recommended price: ₩{market_data["recommended_price"]:,}')
-                app.logger.info(f'[Market Analysis] Market position: {market_data["analysis_summary"]["market_position"]}')
-                
-                log_activity('sourcing', f'✅ Market analysis: Avg ₩{market_data["avg_price"]:,}, Recommend ₩{market_data["recommended_price"]:,}', 'success')
-            else:
-                app.logger.warning(f'[Market Analysis] ⚠️ Failed: {market_data.get("error")}')
-                log_activity('sourcing', f'⚠️ Market analysis failed: {market_data.get("error")}', 'warning')
-        except Exception as e:
-            app.logger.error(f'[Market Analysis] ❌ Exception: {str(e)}')
-            market_data = None
-    else:
-        app.logger.warning('[Market Analysis] ⚠️ Naver API credentials not configured')
-        log_activity('sourcing', '⚠️ Market analysis skipped (API credentials missing)', 'warning')
-    
+    stage_metrics.begin('save')
     # Step 6: Save Top 3 to Database
     log_activity('sourcing', 'Step 6/6: 💾 Saving Top 3 to database', 'in_progress')
+    _report_progress(progress, 'saving', stage_stats)
     app.logger.info(f'[Smart Sniper] Attempting to save {len(top_products)} products to database')
     
+    # 상품별 한글 키워드/카테고리 키워드/시장 분석은 planner 단계 결과 재사용
+    product_keywords = ctx['results']['title_translation']
+    korean_keyword = ctx['results']['category_keyword']
+    market_data = ctx['results']['market_analysis']
+    if market_data is None and not (naver_client_id and naver_client_secret):
+        app.logger.warning('[Market Analysis] ⚠️ Naver API credentials not configured')
+        log_activity('sourcing', '⚠️ Market analysis skipped (API credentials missing)', 'warning')
+    
     conn = get_db()
+    if deadline is not None:
+        # 🔒 저장은 건너뛰지 않지만 DB 잠금 대기는 남은 예산 이내
+        db_pool.set_busy_timeout(conn, min(db_pool.BUSY_TIMEOUT_MS,
+                                           max(SAVE_MIN_BUSY_TIMEOUT_MS, deadline.remaining() * 1000)))
     cursor = conn.cursor()
     
     saved_count = 0
@@ -2605,18 +2672,10 @@ def execute_smart_sourcing(keyword, max_products=3):
             app.logger.info(f'[DB Save {idx+1}] Margin: {product["analysis"]["margin"]:.1f}%')
             app.logger.info(f'[DB Save {idx+1}] Profit: ₩{product["analysis"]["profit"]:,}')
             
-            # 🔧 FIX: Translate each product's title individually for accurate Naver matching
-            from product_matcher import clean_product_title, translate_english_to_korean
-            cleaned_title = clean_product_title(product['title'])
-            product_korean_keyword = translate_english_to_korean(cleaned_title)
-            
-            # 🚨 VALIDATION: 영어 키워드면 원본 제목으로 재시도
-            if product_korean_keyword == cleaned_title or not any('\uac00' <= c <= '\ud7a3' for c in product_korean_keyword):
-                app.logger.warning(f'[DB Save {idx+1}] ⚠️ Translation failed (got: {product_korean_keyword}), retrying with original title')
-                product_korean_keyword = translate_english_to_korean(product['title'])
+            product_korean_keyword = product_keywords[idx]
             
             # 🚨 FINAL FALLBACK: 여전히 영어면 Blue Ocean 키워드 사용
-            if not any('\uac00' <= c <= '\ud7a3' for c in product_korean_keyword):
+            if not has_hangul(product_korean_keyword):
                 app.logger.error(f'[DB Save {idx+1}] ❌ Translation completely failed, using category keyword')
                 product_korean_keyword = korean_keyword
             
@@ -2627,15 +2686,16 @@ def execute_smart_sourcing(keyword, max_products=3):
                 'keyword': product_korean_keyword,  # 🔧 FIX: Use product-specific keyword
                 'english_title': product['title'],
                 'category_keyword': korean_keyword,  # Original Blue Ocean keyword
-                'naver_data': market_data  # Include Naver market data if available
+                'naver_data': market_data,  # Include Naver market data if available
+                'category_verification': product.get('naver_verification')  # 네이버 카테고리 검증 (검증한 상품만)
             }, ensure_ascii=False)
             
             cursor.execute('''
                 INSERT INTO sourced_products 
                 (original_url, title_cn, price_cny, price_krw, profit_margin, 
                  estimated_profit, safety_status, images_json, status,
-                 source_site, moq, traffic_score, keywords, market_analysis_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 source_site, moq, traffic_score, keywords)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 product['url'],
                 product['title'],
@@ -2649,9 +2709,12 @@ def execute_smart_sourcing(keyword, max_products=3):
                 product.get('source_site', 'alibaba'),  # 🚀 Source: Alibaba/AliExpress
                 product.get('moq', 1),  # 🚀 NEW: MOQ
                 product.get('sales', 0),  # 🚀 NEW: traffic score (use sales as proxy)
-                product_korean_keyword,  # 🔧 FIX: Store product-specific Korean keyword
-                market_analysis_json  # 🔧 FIX: Store market analysis with product keyword
+                product_korean_keyword  # 🔧 FIX: Store product-specific Korean keyword
             ))
+            product_id = cursor.lastrowid
+            # 🔧 FIX: Store market analysis with product keyword (side table, compressed)
+            product_content.save_content(cursor, product_id, market_analysis_json=market_analysis_json)
+            title_index.index_title(cursor, product_id, product['title'])
             saved_count += 1
             app.logger.info(f'[DB Save {idx+1}] ✅ Successfully inserted')
         except Exception as e:
@@ -2659,6 +2722,8 @@ def execute_smart_sourcing(keyword, max_products=3):
             app.logger.exception(e)
     
     conn.commit()
+    if deadline is not None:
+        db_pool.set_busy_timeout(conn)
     conn.close()
     
     app.logger.info(f'[Smart Sniper] Completed: {saved_count}/{len(top_products)} products saved to database')
@@ -2680,61 +2745,155 @@ def execute_smart_sourcing(keyword, max_products=3):
         },
         'stage_stats': stage_stats,
         'debug_mode_enabled': debug_mode_enabled,
+        'harvest': results.get('harvest'),  # 멀티 페이지 수집 통계 (pages_fetched, stopped_early, ...)
         'market_analysis': market_data  # 시장 분석 데이터 추가
     }
 
-@app.route('/api/sourcing/start', methods=['POST'])
-@login_required
-def start_sourcing():
+# ============================================================================
+# AI DISCOVERY: 키워드별 소싱 파이프라인 동시 실행
+# ============================================================================
+# 키워드마다 번역 → AliExpress → 네이버 호출이 순차로 이어지므로 키워드끼리는
+# 병렬로 돌리고, 공급자별 호출 속도는 rate_limiter(토큰 버킷)가 전체적으로 제한
+
+SOURCING_MAX_WORKERS = 3          # 동시에 실행할 키워드 파이프라인 수
+SOURCING_KEYWORD_TIMEOUT = 180    # 키워드 하나가 이보다 오래 걸리면 결과에서 제외 (초)
+
+def _merge_stage_stats(stage_stats_list):
+    """Sum the per-keyword funnel counts; keep the single highest-margin product"""
+    merged = {
+        'stage1_scraped': 0,
+        'stage2_safe': 0,
+        'stage3_profitable': 0,
+        'stage4_final': 0,
+        'highest_margin_product': None,
+        'highest_margin_value': 0
+    }
+    for stats in stage_stats_list:
+        for key in ('stage1_scraped', 'stage2_safe', 'stage3_profitable', 'stage4_final'):
+            merged[key] += stats.get(key, 0) or 0
+        if (stats.get('highest_margin_value') or 0) > merged['highest_margin_value']:
+            merged['highest_margin_value'] = stats['highest_margin_value']
+            merged['highest_margin_product'] = stats.get('highest_margin_product')
+    return merged
+
+def run_keyword_pipelines(keywords_list, max_products=1, progress=None, deadline=None):
+    """
+    Run execute_smart_sourcing() for several keywords concurrently.
+    A failing or slow keyword only loses its own result.
+    progress(stage, stage_stats) receives the merged stage_stats of all keywords.
+    deadline: request Deadline shared by every keyword (also caps the wait for them)
+
+    Returns:
+        list (same order as keywords_list) of
+        {'keyword', 'category', 'result' | None, 'error' | None}
     """
-    Unified sourcing endpoint supporting two modes:
+    rate_limiter.configure(get_config_snapshot())
+    total = len(keywords_list)
+    latest_stats = {}
+    progress_lock = threading.Lock()
+
+    def keyword_progress(idx, kw):
+        if progress is None:
+            return None
+        def report(stage, stage_stats):
+            with progress_lock:
+                latest_stats[idx] = stage_stats or {}
+                progress(f'[{idx}/{total}] {kw}: {stage}', _merge_stage_stats(latest_stats.values()))
+        return report
+
+    def run_one(idx, kw_obj):
+        kw = kw_obj['keyword']
+        category = kw_obj.get('category', '알 수 없음')
+        app.logger.info(f'[Keyword {idx}/{total}] 🔍 Sourcing: "{kw}" ({category})')
+        log_activity('sourcing', f'[{idx}/{total}] 🔍 Sourcing: "{kw}" ({category})', 'in_progress')
+        return execute_smart_sourcing(kw, max_products=max_products, progress=keyword_progress(idx, kw),
+                                      deadline=deadline)
+
+    wait_timeout = SOURCING_KEYWORD_TIMEOUT
+    if deadline is not None:
+        wait_timeout = min(wait_timeout, deadline.remaining())
+    executor = ThreadPoolExecutor(max_workers=max(1, min(SOURCING_MAX_WORKERS, total)),
+                                  thread_name_prefix='sourcing')
+    try:
+        futures = [executor.submit(run_one, idx, kw_obj) for idx, kw_obj in enumerate(keywords_list, 1)]
+        wait(futures, timeout=wait_timeout)
+    finally:
+        # Don't block the response on a stuck keyword; its thread finishes in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    outcomes = []
+    for idx, (kw_obj, future) in enumerate(zip(keywords_list, futures), 1):
+        outcome = {'keyword': kw_obj['keyword'], 'category': kw_obj.get('category', '알 수 없음'),
+                   'result': None, 'error': None}
+        if not future.done():
+            outcome['error'] = f'Timed out after {wait_timeout:.0f}s'
+            if deadline is not None:
+                deadline.degrade(f'keyword:{kw_obj["keyword"]}', outcome['error'])
+        elif future.cancelled():
+            outcome['error'] = 'Cancelled'
+        elif future.exception() is not None:
+            outcome['error'] = str(future.exception())
+            app.logger.error(f'[Keyword {idx}/{total}] ❌ "{kw_obj["keyword"]}" failed: {outcome["error"]}')
+        else:
+            outcome['result'] = future.result()
+        if outcome['error']:
+            log_activity('sourcing', f'[{idx}/{total}] ❌ "{kw_obj["keyword"]}": {outcome["error"]}', 'error')
+        outcomes.append(outcome)
+    return outcomes
+
+def run_sourcing(mode, user_keyword='', progress=None, deadline=None):
+    """
+    Unified sourcing run supporting two modes (used by the HTTP endpoint and the job queue):
     - Case A (Direct search): Use user-provided keyword
     - Case B (AI Blue Ocean): Run GPT-4 analysis first, then use suggested keyword
-    """
-    data = request.json
-    user_keyword = data.get('keyword', '')
-    mode = data.get('mode', 'direct')  # 'direct' or 'ai_discovery'
     
-    app.logger.info(f'=== Sourcing Started by {current_user.username} ===')
-    app.logger.info(f'Mode: {mode}, User keyword: {user_keyword}')
+    deadline: request Deadline created by the caller (default: _sourcing_deadline()).
+    The response carries 'deadline' (budget/elapsed) and 'degraded' (stages skipped
+    or cut short to stay within it).
+    
+    Returns: (response dict, HTTP status)
+    """
+    if deadline is None:
+        deadline = _sourcing_deadline()
+    app.logger.info(f'Mode: {mode}, User keyword: {user_keyword}, Budget: {deadline.budget_sec:.0f}s')
     
     # Determine target keyword based on mode
     if mode == 'ai_discovery':
         # Case B: AI Blue Ocean Discovery - NEW: Multi-keyword support
         log_activity('sourcing', 'Step 0: 🌊 Blue Ocean Market Analysis', 'in_progress')
         
-        blue_ocean_result = analyze_blue_ocean_market(user_keyword)
+        blue_ocean_result = analyze_blue_ocean_market(user_keyword, deadline=deadline)
+        _report_progress(progress, 'blue_ocean_analysis', None)
         
         # ✅ NEW: Check if multi-keyword mode (3 diverse keywords)
         if blue_ocean_result.get('multi_keyword_mode'):
             keywords_list = blue_ocean_result.get('keywords', [])
             app.logger.info(f'🎯 Multi-keyword mode: {len(keywords_list)} diverse keywords')
             
-            # Execute sourcing for each keyword (limit 1 product per keyword)
+            # Execute sourcing for all keywords concurrently (limit 1 product per keyword)
             all_products = []
             all_stats = []
+            total = len(keywords_list)
             
-            for idx, kw_obj in enumerate(keywords_list, 1):
-                kw = kw_obj['keyword']
-                category = kw_obj.get('category', '알 수 없음')
-                
-                app.logger.info(f'[Keyword {idx}/3] 🔍 Sourcing: "{kw}" ({category})')
-                log_activity('sourcing', f'[{idx}/3] 🔍 Sourcing: "{kw}" ({category})', 'in_progress')
-                
-                # Execute Smart Sniper for this keyword (max_products=1 for diversity)
-                result = execute_smart_sourcing(kw, max_products=1)
-                
-                if result['success'] and result['stats']['final_count'] > 0:
+            outcomes = run_keyword_pipelines(keywords_list, max_products=1, progress=progress,
+                                             deadline=deadline)
+            for idx, outcome in enumerate(outcomes, 1):
+                kw = outcome['keyword']
+                result = outcome['result']
+                if result and result['success'] and result['stats']['final_count'] > 0:
                     # Take only 1 product (best one) from this keyword
                     all_products.extend(result['products'][:1])
                     all_stats.append({
                         'keyword': kw,
-                        'category': category,
-                        'stats': result['stats']
+                        'category': outcome['category'],
+                        'stats': result['stats'],
+                        'stage_stats': result.get('stage_stats', {}),
+                        'timings': result.get('timings')
                     })
-                    app.logger.info(f'[Keyword {idx}/3] ✅ Found {result["stats"]["final_count"]} products, selected 1')
+                    app.logger.info(f'[Keyword {idx}/{total}] ✅ Found {result["stats"]["final_count"]} products, selected 1')
                 else:
-                    app.logger.warning(f'[Keyword {idx}/3] ⚠️ No products found for "{kw}"')
+                    app.logger.warning(f'[Keyword {idx}/{total}] ⚠️ No products found for "{kw}"'
+                                       + (f' ({outcome["error"]})' if outcome['error'] else ''))
             
             # Build multi-keyword response
             blue_ocean_data = {
@@ -2753,6 +2912,8 @@ def start_sourcing():
                     'profitable': sum(s['stats']['profitable'] for s in all_stats),
                     'final_count': len(all_products)
                 },
+                'stage_stats': _merge_stage_stats(
+                    o['result'].get('stage_stats', {}) for o in outcomes if o['result']),
                 'multi_keyword_stats': all_stats,
                 'debug_mode_enabled': False
             }
@@ -2781,7 +2942,7 @@ def start_sourcing():
             }
             
             # Execute unified Smart Sniper engine - REAL DATA ONLY
-            result = execute_smart_sourcing(target_keyword)
+            result = execute_smart_sourcing(target_keyword, progress=progress, deadline=deadline)
             
     else:
         # Case A: Direct keyword search
@@ -2790,10 +2951,17 @@ def start_sourcing():
         log_activity('sourcing', f'📌 Direct search mode: "{target_keyword}"', 'info')
         
         # Execute unified Smart Sniper engine - REAL DATA ONLY
-        result = execute_smart_sourcing(target_keyword)
+        result = execute_smart_sourcing(target_keyword, progress=progress, deadline=deadline)
+    
+    deadline_summary = deadline.summary()
+    if deadline_summary['degraded']:
+        app.logger.warning(f'[Deadline] ⏱️ Degraded within {deadline.budget_sec:.0f}s budget: '
+                           f'{[d["stage"] for d in deadline_summary["degraded"]]}')
     
     if not result['success']:
-        return jsonify({'error': result.get('error', 'Unknown error'), 'stage_stats': result.get('stage_stats', {})}), 500
+        return {'success': False, 'error': result.get('error', 'Unknown error'),
+                'stage_stats': result.get('stage_stats', {}), 'timings': result.get('timings'),
+                'deadline': deadline_summary, 'degraded': deadline_summary['degraded']}, 500
     
     # Build response
     response_data = {
@@ -2802,8 +2970,11 @@ def start_sourcing():
         'keyword': target_keyword if mode == 'direct' else '다양한 카테고리',
         'stats': result['stats'],
         'stage_stats': result.get('stage_stats', {}),  # NEW: Stage-by-stage breakdown
+        'timings': result.get('timings'),  # Per-stage wall/CPU ms, outbound calls, DB queries
         'debug_mode_enabled': result.get('debug_mode_enabled', False),
-        'suggestion': result.get('suggestion', '')  # NEW: Suggestion when no products found
+        'suggestion': result.get('suggestion', ''),  # NEW: Suggestion when no products found
+        'deadline': deadline_summary,  # 시간 예산 (budget/elapsed/remaining)
+        'degraded': deadline_summary['degraded']  # 예산 때문에 건너뛴/축소된 단계
     }
     
     if blue_ocean_data:
@@ -2815,7 +2986,134 @@ def start_sourcing():
     
     app.logger.info(f'=== Sourcing Completed: {result["stats"]["final_count"]} products ===')
     
-    return jsonify(response_data)
+    return response_data, 200
+
+@app.route('/api/sourcing/start', methods=['POST'])
+@login_required
+def start_sourcing():
+    """
+    Synchronous sourcing (kept for API clients); the dashboard submits a
+    background job via /api/sourcing/jobs instead.
+    """
+    data = request.json
+    user_keyword = data.get('keyword', '')
+    mode = data.get('mode', 'direct')  # 'direct' or 'ai_discovery'
+    
+    # ⏱️ 요청 단위 시간 예산: 이후 모든 외부 호출/선택 단계가 이 deadline을 공유
+    deadline = _sourcing_deadline()
+    app.logger.info(f'=== Sourcing Started by {current_user.username} ===')
+    response_data, status = run_sourcing(mode, user_keyword, deadline=deadline)
+    return jsonify(response_data), status
+
+# ============================================================================
+# BACKGROUND SOURCING JOBS (sourcing_jobs.py)
+# ============================================================================
+
+SOURCING_MODES = ('direct', 'ai_discovery')
+SOURCING_STREAM_KEEPALIVE_SEC = 15
+
+def run_sourcing_job(job, progress):
+    """
+    Job queue runner: same pipeline as /api/sourcing/start, progress persisted per stage.
+    Jobs are not bound by the HTTP timeout, so they get the larger job budget.
+    """
+    deadline = _sourcing_deadline('sourcing_job_deadline_sec', SOURCING_JOB_DEADLINE_DEFAULT_SEC)
+    response_data, _ = run_sourcing(job['mode'], job.get('keyword') or '', progress=progress,
+                                    deadline=deadline)
+    return response_data
+
+@app.route('/api/sourcing/jobs', methods=['POST'])
+@login_required
+def submit_sourcing_job():
+    """Queue a sourcing run and return its job id immediately (202)"""
+    data = request.json or {}
+    user_keyword = (data.get('keyword') or '').strip()
+    mode = data.get('mode') or ('direct' if user_keyword else 'ai_discovery')
+    if mode not in SOURCING_MODES:
+        return jsonify({'success': False, 'error': f'Invalid mode: {mode}'}), 400
+    if mode == 'direct' and not user_keyword:
+        return jsonify({'success': False, 'error': 'keyword is required for direct mode'}), 400
+    
+    job_id = sourcing_jobs.submit(mode, user_keyword, created_by=current_user.id)
+    app.logger.info(f'[Sourcing Jobs] 📥 {job_id} queued by {current_user.username} ({mode}, "{user_keyword}")')
+    log_activity('sourcing', f'📥 Sourcing job queued ({mode}{": " + user_keyword if user_keyword else ""})', 'info',
+                 {'job_id': job_id})
+    return jsonify({'success': True, 'job_id': job_id, 'status': sourcing_jobs.STATUS_QUEUED}), 202
+
+@app.route('/api/sourcing/jobs', methods=['GET'])
+@login_required
+def list_sourcing_jobs():
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    return jsonify({'success': True, 'jobs': sourcing_jobs.list_jobs(limit)})
+
+@app.route('/api/sourcing/jobs/<job_id>', methods=['GET'])
+@login_required
+def get_sourcing_job(job_id):
+    """Progress polling: status, current stage, stage_stats (and result once finished)"""
+    job = sourcing_jobs.get_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+@app.route('/api/sourcing/jobs/<job_id>/stream')
+@login_required
+def stream_sourcing_job(job_id):
+    """Job progress (SSE): one event per change, 'done' event when the job finishes"""
+    if not sourcing_jobs.get_job(job_id):
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    def generate():
+        last_state = None
+        update_seq = -1
+        last_sent = time.monotonic()
+        while True:
+            job = sourcing_jobs.get_job(job_id)
+            if job is None:
+                return
+            state = (job['status'], job['stage'], job['updated_at'])
+            if state != last_state:
+                last_state = state
+                last_sent = time.monotonic()
+                if job['status'] in sourcing_jobs.TERMINAL_STATUSES:
+                    yield f"event: done\ndata: {json.dumps(job, default=str)}\n\n"
+                    return
+                yield f"data: {json.dumps(job, default=str)}\n\n"
+            elif time.monotonic() - last_sent >= SOURCING_STREAM_KEEPALIVE_SEC:
+                last_sent = time.monotonic()
+                yield ': keepalive\n\n'
+            
+            # Wake on local job updates (1s fallback for workers in other processes)
+            update_seq = sourcing_jobs.wait_for_update(update_seq, timeout=1.0)
+    
+    return app.response_class(generate(), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/admin/metrics', methods=['GET'])
+@login_required
+def admin_metrics():
+    """
+    Rolling per-stage latency histograms (p50/p95/p99 wall & CPU ms, avg outbound
+    calls / DB queries) of the last stage_metrics.HISTOGRAM_WINDOW runs in this
+    process, plus DB pool and log writer counters. ?reset=1 clears the histograms.
+    """
+    metrics = stage_metrics.snapshot(request.args.get('pipeline') or None)
+    if request.args.get('reset') in ('1', 'true'):
+        stage_metrics.reset()
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'window': stage_metrics.HISTOGRAM_WINDOW,
+        'pipelines': metrics,
+        'db_pool': db_pool.get_pool_stats(),
+        'activity_log_writer': activity_log_writer.get_writer_stats(),
+        'translation_cache': translation_cache.get_stats(),
+        'aliexpress_cache': aliexpress_cache.get_stats(),
+        'http_clients': http_client.get_stats(),
+        'naver_search_cache': naver_search_cache.get_stats()
+    })
+
+# Start the job workers (queued jobs from before a restart are picked up here)
+sourcing_jobs.start_workers(run_sourcing_job)
 
 @app.route('/api/sourcing/ai-analyze', methods=['POST'])
 @login_required
@@ -3005,9 +3303,7 @@ def reject_product():
         cursor = conn.cursor()
         
         # Get rejection expiry days from config
-        cursor.execute("SELECT value FROM config WHERE key = 'rejection_expiry_days'")
-        row = cursor.fetchone()
-        expiry_days = int(row[0]) if row else 30
+        expiry_days = int(get_config('rejection_expiry_days', 30))
         
         # Calculate expiration date
         from datetime import timedelta
@@ -3107,8 +3403,9 @@ def generate_marketing_copy(title, price):
     
     try:
         # CRITICAL: Using gpt-4o-mini (universal access, no 404 errors)
-        response = requests.post(
+        response = http_client.post(
             'https://api.openai.com/v1/chat/completions',
+            idempotent=True,
             headers={
                 'Authorization': f'Bearer {api_key}',
                 'Content-Type': 'application/json'
@@ -3338,8 +3635,9 @@ End with SEO tags: [TAGS]: keyword1, keyword2, ...
 """
     
     try:
-        response = requests.post(
+        response = http_client.post(
             'https://api.openai.com/v1/chat/completions',
+            idempotent=True,
             headers={
                 'Authorization': f'Bearer {api_key}',
                 'Content-Type': 'application/json'
@@ -3653,7 +3951,7 @@ def process_product_image(image_url, chinese_text_regions=None):
         app.logger.info(f'[Image Pro] 🎨 Starting ULTIMATE processing for: {image_url}')
         
         # Download image
-        response = requests.get(image_url, timeout=15)
+        response = http_client.get(image_url, timeout=15)
         original_image = Image.open(io.BytesIO(response.content))
         
         # Convert to RGB
@@ -3822,7 +4120,7 @@ def process_product_image(image_url, chinese_text_regions=None):
         import numpy as np
         
         # Download image
-        response = requests.get(image_url, timeout=10)
+        response = http_client.get(image_url, timeout=10)
         img = Image.open(io.BytesIO(response.content))
         
         # Convert to RGB if necessary
@@ -4004,24 +4302,25 @@ def generate_content(product_id):
     processed_images.append(notice_path)
     
     # 🔥 EMERGENCY FIX: Store SEO tags in dedicated keywords column
-    cursor.execute('''
-        UPDATE sourced_products
-        SET marketing_copy = ?,
-            description_kr = ?,
-            processed_images_json = ?,
-            title_kr = ?,
-            keywords = ?
-        WHERE id = ?
-    ''', (
-        marketing_copy,
-        winning_html,  # Full winning structure in description_kr
-        json.dumps(processed_images),
-        korean_title,  # 🔥 FIX: Store Korean title
-        seo_tags,  # 🔥 FIXED: Store in keywords column, NOT description_cn
-        product_id
-    ))
+    with db_transaction(conn):
+        cursor.execute('''
+            UPDATE sourced_products
+            SET title_kr = ?,
+                keywords = ?
+            WHERE id = ?
+        ''', (
+            korean_title,  # 🔥 FIX: Store Korean title
+            seo_tags,  # 🔥 FIXED: Store in keywords column, NOT description_cn
+            product_id
+        ))
+        # Heavy content lives in sourced_product_content (compressed)
+        product_content.save_content(
+            cursor, product_id,
+            marketing_copy=marketing_copy,
+            description_kr=winning_html,  # Full winning structure in description_kr
+            processed_images_json=json.dumps(processed_images)
+        )
     
-    conn.commit()
     conn.close()
     
     app.logger.info(f'[Content Generation] ✅ WINNING content generated: {len(winning_html)} chars')
@@ -4108,7 +4407,7 @@ def register_to_naver(product_data):
     }
     
     try:
-        response = requests.post(
+        response = http_client.post(
             f'https://api.commerce.naver.com{path}',
             headers=headers,
             json=product_data,
@@ -4149,7 +4448,7 @@ def register_to_coupang(product_data):
     }
     
     try:
-        response = requests.post(
+        response = http_client.post(
             f'https://api-gateway.coupang.com{path}',
             headers=headers,
             json=product_data,
@@ -4227,11 +4526,11 @@ def create_order():
     price_cny = data.get('price_cny', 0)
     quantity = data.get('quantity', 1)
     
-    analysis = analyze_product_profitability(price_cny)
-    marketplace_fee_rate = float(get_config(f"{data.get('marketplace', 'naver')}_fee_rate", 0.06))
-    marketplace_fee = int(analysis['sale_price'] * marketplace_fee_rate)
+    # Marketplace fee is part of the unified pricing result (profit is already net of it)
+    analysis = analyze_product_profitability(price_cny, marketplace=data.get('marketplace', 'naver'))
+    marketplace_fee = analysis['marketplace_fee']
     
-    net_profit = analysis['profit'] - marketplace_fee
+    net_profit = analysis['profit']
     
     # Set shipping deadline (3 days from now)
     shipping_deadline = get_kst_now() + timedelta(days=3)
@@ -4279,23 +4578,23 @@ def create_order():
 @login_required
 def confirm_order(order_id):
     """Mark order as confirmed and update marketplace status"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT * FROM orders WHERE id = ?', (order_id,))
-    order = cursor.fetchone()
-    
-    if not order:
-        conn.close()
-        return jsonify({'error': 'Order not found'}), 404
-    
-    # Update local status
-    cursor.execute('''
-        UPDATE orders SET order_status = 'confirmed' WHERE id = ?
-    ''', (order_id,))
-    
-    conn.commit()
-    conn.close()
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM orders WHERE id = ?', (order_id,))
+        order = cursor.fetchone()
+        
+        if not order:
+            return jsonify({'error': 'Order not found'}), 404
+        
+        # A delivered order moved back leaves the revenue rollups (same transaction)
+        if order['order_status'] == 'delivered':
+            revenue_rollup.remove_delivered_orders(cursor, [order_id])
+        
+        # Update local status
+        cursor.execute('''
+            UPDATE orders SET order_status = 'confirmed', delivered_at = NULL WHERE id = ?
+        ''', (order_id,))
     
     # Update marketplace
     result = update_marketplace_status(
@@ -4318,27 +4617,28 @@ def ship_order(order_id):
     if not tracking_number:
         return jsonify({'error': 'Tracking number required'}), 400
     
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT * FROM orders WHERE id = ?', (order_id,))
-    order = cursor.fetchone()
-    
-    if not order:
-        conn.close()
-        return jsonify({'error': 'Order not found'}), 404
-    
-    # Update order
-    cursor.execute('''
-        UPDATE orders 
-        SET tracking_number = ?,
-            order_status = 'shipped',
-            shipped_at = CURRENT_TIMESTAMP
-        WHERE id = ?
-    ''', (tracking_number, order_id))
-    
-    conn.commit()
-    conn.close()
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM orders WHERE id = ?', (order_id,))
+        order = cursor.fetchone()
+        
+        if not order:
+            return jsonify({'error': 'Order not found'}), 404
+        
+        # A delivered order moved back leaves the revenue rollups (same transaction)
+        if order['order_status'] == 'delivered':
+            revenue_rollup.remove_delivered_orders(cursor, [order_id])
+        
+        # Update order
+        cursor.execute('''
+            UPDATE orders 
+            SET tracking_number = ?,
+                order_status = 'shipped',
+                shipped_at = CURRENT_TIMESTAMP,
+                delivered_at = NULL
+            WHERE id = ?
+        ''', (tracking_number, order_id))
     
     # Update marketplace
     result = update_marketplace_status(
@@ -4355,44 +4655,43 @@ def ship_order(order_id):
 @login_required
 def deliver_order(order_id):
     """Mark order as delivered and create tax record"""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT * FROM orders WHERE id = ?', (order_id,))
-    order = cursor.fetchone()
-    
-    if not order:
-        conn.close()
-        return jsonify({'error': 'Order not found'}), 404
-    
-    # Update order status
-    cursor.execute('''
-        UPDATE orders 
-        SET order_status = 'delivered',
-            delivered_at = CURRENT_TIMESTAMP
-        WHERE id = ?
-    ''', (order_id,))
-    
-    # Create tax record
-    cursor.execute('''
-        INSERT INTO tax_records (
-            order_id, order_number, sale_date, sale_amount,
-            purchase_amount, shipping_cost, marketplace_fee,
-            net_profit, applied_exchange_rate
-        ) VALUES (?, ?, DATE('now'), ?, ?, ?, ?, ?, ?)
-    ''', (
-        order_id,
-        order['order_number'],
-        order['sale_price'],
-        order['purchase_price_krw'],
-        order['shipping_cost'],
-        order['marketplace_fee'],
-        order['net_profit'],
-        order['applied_exchange_rate']
-    ))
-    
-    conn.commit()
-    conn.close()
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM orders WHERE id = ?', (order_id,))
+        order = cursor.fetchone()
+        
+        if not order:
+            return jsonify({'error': 'Order not found'}), 404
+        
+        # Re-delivery moves the order to today's bucket
+        revenue_rollup.remove_delivered_orders(cursor, [order_id])
+        
+        # Update order status + rollups + tax record (same transaction)
+        cursor.execute('''
+            UPDATE orders 
+            SET order_status = 'delivered',
+                delivered_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (order_id,))
+        revenue_rollup.add_delivered_orders(cursor, [order_id])
+        
+        cursor.execute('''
+            INSERT INTO tax_records (
+                order_id, order_number, sale_date, sale_amount,
+                purchase_amount, shipping_cost, marketplace_fee,
+                net_profit, applied_exchange_rate
+            ) VALUES (?, ?, DATE('now'), ?, ?, ?, ?, ?, ?)
+        ''', (
+            order_id,
+            order['order_number'],
+            order['sale_price'],
+            order['purchase_price_krw'],
+            order['shipping_cost'],
+            order['marketplace_fee'],
+            order['net_profit'],
+            order['applied_exchange_rate']
+        ))
     
     log_activity('order', f'Order {order["order_number"]} delivered', 'success')
     
@@ -4419,7 +4718,7 @@ def check_product_stock_status(product_url):
             'browser': 'true'
         }
         
-        response = requests.get('https://api.scrapingant.com/v2/general', params=params, timeout=30)
+        response = http_client.get('https://api.scrapingant.com/v2/general', params=params, timeout=30)
         
         if response.status_code == 404:
             return {'available': False, 'reason': 'Product deleted'}
@@ -4450,50 +4749,67 @@ def run_stock_monitor():
     ''')
     
     listings = cursor.fetchall()
+    conn.close()
     
-    for listing in listings:
-        status = check_product_stock_status(listing['original_url'])
-        
-        if not status['available']:
-            # Mark as out of stock
-            cursor.execute('''
-                UPDATE marketplace_listings
-                SET status = 'out_of_stock', updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (listing['id'],))
+    # 🔧 FIX: Check stock first (network), then write results in one short
+    # transaction so the write lock isn't held across HTTP calls
+    results = [(listing, check_product_stock_status(listing['original_url'])) for listing in listings]
+    
+    with db_transaction() as conn:
+        for listing, status in results:
+            if not status['available']:
+                # Mark as out of stock
+                conn.execute('''
+                    UPDATE marketplace_listings
+                    SET status = 'out_of_stock', updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (listing['id'],))
             
-            # Log action
-            cursor.execute('''
+            conn.execute('''
                 INSERT INTO stock_monitor_log (product_id, original_url, check_status, action_taken)
                 VALUES (?, ?, ?, ?)
             ''', (
                 listing['product_id'],
                 listing['original_url'],
-                'unavailable',
-                f"Marked as out of stock: {status['reason']}"
+                'available' if status['available'] else 'unavailable',
+                'No action needed' if status['available'] else f"Marked as out of stock: {status['reason']}"
             ))
-            
+    
+    for listing, status in results:
+        if not status['available']:
             log_activity('stock_monitor', 
                         f"Product {listing['product_id']} marked out of stock: {status['reason']}", 
                         'warning')
-        else:
-            cursor.execute('''
-                INSERT INTO stock_monitor_log (product_id, original_url, check_status, action_taken)
-                VALUES (?, ?, ?, ?)
-            ''', (
-                listing['product_id'],
-                listing['original_url'],
-                'available',
-                'No action needed'
-            ))
-    
-    conn.commit()
-    conn.close()
     
     log_activity('stock_monitor', f'Stock check completed. Checked {len(listings)} products', 'success')
 
+def run_log_retention():
+    """Daily log retention job: archive old activity/stock logs to logs/archive/, then vacuum"""
+    try:
+        summary = log_retention.run_retention({
+            'activity_logs': int(get_config('log_retention_days', 30)),
+            'stock_monitor_log': int(get_config('stock_log_retention_days', 90)),
+        })
+    except Exception as e:
+        app.logger.error(f'[Retention] ❌ Log retention failed: {str(e)}')
+        log_activity('retention', f'Log retention failed: {str(e)}', 'error')
+        return None
+    
+    try:
+        app.logger.info(f'[AliExpressCache] 🧹 Pruned {aliexpress_cache.prune()} expired search response(s)')
+    except Exception as e:
+        app.logger.warning(f'[AliExpressCache] ⚠️ Prune failed: {e}')
+    
+    archived = {r['table']: r['archived'] for r in summary['tables']}
+    log_activity('retention', 
+                 f"Archived {sum(archived.values())} log rows, freed {summary['freed_pages']} pages", 
+                 'success', details=archived)
+    return summary
+
 # Schedule daily stock monitoring
 schedule.every().day.at("02:00").do(run_stock_monitor)
+# Schedule daily log retention (after the stock monitor has written its rows)
+schedule.every().day.at("03:00").do(run_log_retention)
 
 def run_scheduler():
     """Run scheduled tasks in background thread"""
@@ -4505,6 +4821,12 @@ def run_scheduler():
 scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
 scheduler_thread.start()
 
+# Warm the translation cache with the most recently used translations
+try:
+    app.logger.info(f'[TranslationCache] 🔥 Warmed {translation_cache.warm_up()} translation(s)')
+except Exception as e:
+    app.logger.warning(f'[TranslationCache] ⚠️ Warm-up failed: {e}')
+
 # ============================================================================
 # MODULE 7: TAX AUTOMATION & EXCEL EXPORT
 # ============================================================================
@@ -4620,17 +4942,25 @@ def dashboard():
     cursor.execute('SELECT COUNT(*) as count FROM orders WHERE datetime(shipping_deadline) < datetime("now", "+1 day")')
     urgent_orders = cursor.fetchone()['count']
     
-    cursor.execute('SELECT SUM(net_profit) as total FROM orders WHERE order_status = "delivered"')
+    # 📊 Revenue figures come from the daily/monthly rollups (see revenue_rollup.py)
+    cursor.execute('SELECT COALESCE(SUM(profit), 0) as total FROM monthly_revenue')
     total_profit = cursor.fetchone()['total'] or 0
+    # 롤업은 날짜가 필요 → delivered_at 없는 배송완료 주문은 빠져 있으므로 따로 합산
+    # (idx_orders_status_delivered 커버링 인덱스로 처리)
+    cursor.execute('''
+        SELECT COALESCE(SUM(net_profit), 0) as total FROM orders
+        WHERE order_status = 'delivered' AND delivered_at IS NULL
+    ''')
+    total_profit += cursor.fetchone()['total'] or 0
     
     # NEW: Financial analytics for Version 2.0
     # Today's revenue
     cursor.execute('''
         SELECT 
-            COALESCE(SUM(sale_price), 0) as today_sales,
-            COALESCE(SUM(net_profit), 0) as today_profit
-        FROM orders 
-        WHERE DATE(delivered_at) = DATE('now') AND order_status = 'delivered'
+            COALESCE(SUM(sales), 0) as today_sales,
+            COALESCE(SUM(profit), 0) as today_profit
+        FROM daily_revenue 
+        WHERE day = DATE('now')
     ''')
     today_stats = cursor.fetchone()
     today_sales = today_stats['today_sales']
@@ -4639,11 +4969,10 @@ def dashboard():
     # This month's revenue
     cursor.execute('''
         SELECT 
-            COALESCE(SUM(sale_price), 0) as month_sales,
-            COALESCE(SUM(net_profit), 0) as month_profit
-        FROM orders 
-        WHERE strftime('%Y-%m', delivered_at) = strftime('%Y-%m', 'now') 
-        AND order_status = 'delivered'
+            COALESCE(SUM(sales), 0) as month_sales,
+            COALESCE(SUM(profit), 0) as month_profit
+        FROM monthly_revenue 
+        WHERE month = strftime('%Y-%m', 'now')
     ''')
     month_stats = cursor.fetchone()
     month_sales = month_stats['month_sales']
@@ -4652,27 +4981,25 @@ def dashboard():
     # Last 7 days daily revenue for chart
     cursor.execute('''
         SELECT 
-            DATE(delivered_at) as date,
-            COALESCE(SUM(sale_price), 0) as daily_sales,
-            COALESCE(SUM(net_profit), 0) as daily_profit
-        FROM orders 
-        WHERE delivered_at >= DATE('now', '-7 days') 
-        AND order_status = 'delivered'
-        GROUP BY DATE(delivered_at)
-        ORDER BY date
+            day as date,
+            sales as daily_sales,
+            profit as daily_profit
+        FROM daily_revenue 
+        WHERE day >= DATE('now', '-7 days')
+        ORDER BY day
     ''')
     daily_stats = cursor.fetchall()
     
     # Monthly revenue for last 6 months
+    # (rolling window like before: daily rows since 6 months ago, so the first month is partial)
     cursor.execute('''
         SELECT 
-            strftime('%Y-%m', delivered_at) as month,
-            COALESCE(SUM(sale_price), 0) as monthly_sales,
-            COALESCE(SUM(net_profit), 0) as monthly_profit
-        FROM orders 
-        WHERE delivered_at >= DATE('now', '-6 months')
-        AND order_status = 'delivered'
-        GROUP BY strftime('%Y-%m', delivered_at)
+            substr(day, 1, 7) as month,
+            SUM(sales) as monthly_sales,
+            SUM(profit) as monthly_profit
+        FROM daily_revenue 
+        WHERE day >= DATE('now', '-6 months')
+        GROUP BY substr(day, 1, 7)
         ORDER BY month
     ''')
     monthly_stats = cursor.fetchall()
@@ -4714,17 +5041,150 @@ def dashboard():
 #     """Blue Ocean Discovery page"""
 #     return render_template('blue_ocean.html')
 
+# ============================================================================
+# LIST PAGINATION (keyset on (created_at, id) - page cost stays flat)
+# ============================================================================
+
+LIST_PAGE_SIZE = 50
+LIST_PAGE_SIZE_MAX = 200
+
+# Only the columns the list templates display (no description_kr / JSON blobs)
+PRODUCT_LIST_COLUMNS = [
+    'id', 'title_kr', 'title_cn', 'original_url', 'price_krw', 'profit_margin',
+    'estimated_profit', 'status', 'keywords', 'created_at'
+]
+ORDER_LIST_COLUMNS = [
+    'o.id', 'o.order_number', 'o.marketplace', 'o.customer_name', 'o.pccc',
+    'o.sale_price', 'o.net_profit', 'o.shipping_deadline', 'o.order_status',
+    'o.ordered_at', 'sp.title_kr', 'sp.original_url'
+]
+
+def encode_page_cursor(sort_value, row_id):
+    """Opaque cursor for the last row of a page"""
+    raw = json.dumps([sort_value, row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_page_cursor(cursor_str):
+    """Returns (sort_value, row_id) or None for a missing/invalid cursor"""
+    if not cursor_str:
+        return None
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor_str.encode('ascii')))
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+def _page_limit(value):
+    try:
+        return max(1, min(int(value), LIST_PAGE_SIZE_MAX))
+    except (TypeError, ValueError):
+        return LIST_PAGE_SIZE
+
+def fetch_products_page(status=None, keyword=None, cursor=None, limit=LIST_PAGE_SIZE):
+    """
+    One page of products, newest first.
+    Returns (rows, next_cursor) - next_cursor is None on the last page.
+    """
+    where, params = [], []
+    if status:
+        where.append('status = ?')
+        params.append(status)
+    if keyword:
+        like = f'%{keyword}%'
+        where.append('(title_kr LIKE ? OR title_cn LIKE ? OR keywords LIKE ?)')
+        params.extend([like, like, like])
+    position = decode_page_cursor(cursor)
+    if position:
+        where.append('(created_at, id) < (?, ?)')
+        params.extend(position)
+    
+    sql = f"SELECT {', '.join(PRODUCT_LIST_COLUMNS)} FROM sourced_products"
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    sql += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+    params.append(limit + 1)
+    
+    conn = get_db()
+    rows = conn.execute(sql, params).fetchall()
+    conn.close()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_page_cursor(rows[-1]['created_at'], rows[-1]['id'])
+    return rows, next_cursor
+
+def fetch_orders_page(status=None, keyword=None, cursor=None, limit=LIST_PAGE_SIZE):
+    """
+    One page of orders, newest first (keyset on (ordered_at, id)).
+    Returns (rows, next_cursor).
+    """
+    where, params = [], []
+    if status:
+        where.append('o.order_status = ?')
+        params.append(status)
+    if keyword:
+        like = f'%{keyword}%'
+        where.append('(o.order_number LIKE ? OR o.customer_name LIKE ? OR sp.title_kr LIKE ?)')
+        params.extend([like, like, like])
+    position = decode_page_cursor(cursor)
+    if position:
+        where.append('(o.ordered_at, o.id) < (?, ?)')
+        params.extend(position)
+    
+    sql = f"""
+        SELECT {', '.join(ORDER_LIST_COLUMNS)}
+        FROM orders o
+        LEFT JOIN sourced_products sp ON o.product_id = sp.id
+    """
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    sql += ' ORDER BY o.ordered_at DESC, o.id DESC LIMIT ?'
+    params.append(limit + 1)
+    
+    conn = get_db()
+    rows = conn.execute(sql, params).fetchall()
+    conn.close()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_page_cursor(rows[-1]['ordered_at'], rows[-1]['id'])
+    return rows, next_cursor
+
 @app.route('/products')
 @login_required
 def products():
-    """Products management page"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM sourced_products ORDER BY created_at DESC')
-    products = cursor.fetchall()
-    conn.close()
+    """Products management page (first page; more rows via /api/products/list)"""
+    status = request.args.get('status', '').strip() or None
+    keyword = request.args.get('q', '').strip() or None
+    products, next_cursor = fetch_products_page(status, keyword, request.args.get('cursor'),
+                                                _page_limit(request.args.get('limit', LIST_PAGE_SIZE)))
     
-    return render_template('products.html', products=products)
+    return render_template('products.html', products=products, next_cursor=next_cursor,
+                           status_filter=status or '', keyword_filter=keyword or '')
+
+@app.route('/api/products/list')
+@login_required
+def api_products_list():
+    """
+    Lazy-load API for the products page
+    Query: status, q, cursor, limit, format=html (adds rendered <tr> rows)
+    """
+    status = request.args.get('status', '').strip() or None
+    keyword = request.args.get('q', '').strip() or None
+    rows, next_cursor = fetch_products_page(status, keyword, request.args.get('cursor'),
+                                            _page_limit(request.args.get('limit', LIST_PAGE_SIZE)))
+    
+    result = {
+        'success': True,
+        'items': [dict(row) for row in rows],
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    }
+    if request.args.get('format') == 'html':
+        result['html'] = render_template('_product_rows.html', products=rows)
+    return jsonify(result)
 
 @app.route('/products/<int:product_id>')
 @login_required
@@ -4734,6 +5194,8 @@ def product_detail(product_id):
     cursor = conn.cursor()
     cursor.execute('SELECT * FROM sourced_products WHERE id = ?', (product_id,))
     product = cursor.fetchone()
+    if product:
+        product = product_content.with_content(cursor, product)
     conn.close()
     
     if not product:
@@ -4760,8 +5222,6 @@ def update_product(product_id):
                 price_krw = ?,
                 profit_margin = ?,
                 estimated_profit = ?,
-                marketing_copy = ?,
-                description_kr = ?,
                 description_cn = ?,
                 tags = ?
             WHERE id = ?
@@ -4771,12 +5231,21 @@ def update_product(product_id):
             data.get('price_krw'),
             data.get('profit_margin'),
             data.get('estimated_profit'),
-            data.get('marketing_copy'),
-            data.get('description_kr'),
             data.get('description_cn'),
             data.get('tags'),
             product_id
         ))
+        # 🔧 FIX: 없는 상품이면 side table/제목 인덱스에 고아 행을 만들지 않음
+        if cursor.rowcount == 0:
+            conn.close()
+            return jsonify({'success': False, 'error': '상품을 찾을 수 없습니다'}), 404
+
+        product_content.save_content(
+            cursor, product_id,
+            marketing_copy=data.get('marketing_copy'),
+            description_kr=data.get('description_kr')
+        )
+        title_index.index_title(cursor, product_id, data.get('title_cn'))
         
         conn.commit()
         conn.close()
@@ -4807,6 +5276,8 @@ def delete_product(product_id):
         
         # Delete product
         cursor.execute('DELETE FROM sourced_products WHERE id = ?', (product_id,))
+        product_content.delete_content(cursor, [product_id])
+        title_index.remove_titles(cursor, [product_id])
         
         conn.commit()
         conn.close()
@@ -4820,47 +5291,344 @@ def delete_product(product_id):
         app.logger.error(f'[Product Delete] ❌ Error: {str(e)}')
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# ============================================================================
+# BULK PRODUCT OPERATIONS
+# ============================================================================
+# One transaction per request: a single SELECT ... WHERE id IN (...) resolves
+# which ids exist, then one IN / executemany statement applies the change.
+# Each response carries per-id results plus one summarized activity log entry.
+
+BULK_MAX_IDS = 1000
+BULK_IN_CHUNK = 500  # stay under SQLite's bound-parameter limit
+BULK_PRODUCT_STATUSES = ('pending', 'approved', 'registered')
+
+def _parse_bulk_ids(data):
+    """Validated, de-duplicated product ids from {'product_ids': [...]} (order kept)"""
+    raw_ids = (data or {}).get('product_ids') or []
+    if not isinstance(raw_ids, list):
+        raise ValueError('product_ids must be a list')
+    product_ids = []
+    for value in raw_ids:
+        try:
+            product_id = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid product id: {value!r}')
+        if product_id not in product_ids:
+            product_ids.append(product_id)
+    if len(product_ids) > BULK_MAX_IDS:
+        raise ValueError(f'Too many products (max {BULK_MAX_IDS})')
+    return product_ids
+
+def _id_chunks(ids):
+    for i in range(0, len(ids), BULK_IN_CHUNK):
+        chunk = ids[i:i + BULK_IN_CHUNK]
+        yield chunk, ', '.join('?' for _ in chunk)
+
+def _fetch_products_by_ids(cursor, ids, columns='id, status'):
+    """{id: row} for the ids that exist"""
+    found = {}
+    for chunk, placeholders in _id_chunks(ids):
+        cursor.execute(f'SELECT {columns} FROM sourced_products WHERE id IN ({placeholders})', chunk)
+        for row in cursor.fetchall():
+            found[row['id']] = row
+    return found
+
+def _bulk_response(action, results):
+    """Per-id results → JSON body; one summarized activity log entry"""
+    done = [r['id'] for r in results if r['success']]
+    failed = [r for r in results if not r['success']]
+    log_activity('product_bulk', f'일괄 {action}: {len(done)}개 성공, {len(failed)}개 실패',
+                 'success' if not failed else 'warning',
+                 details={'action': action, 'ids': done, 'failed': failed} if failed else {'action': action, 'ids': done})
+    app.logger.info(f'[Bulk {action}] ✅ {len(done)} succeeded, {len(failed)} failed')
+    return {'success': True, 'action': action, 'processed_count': len(done),
+            'failed_count': len(failed), 'results': results}
+
+def _bulk_set_status(product_ids, status):
+    """Move products to `status` in one UPDATE ... WHERE id IN (...)"""
+    results = []
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        found = _fetch_products_by_ids(cursor, product_ids)
+        to_update = [pid for pid in product_ids if pid in found and found[pid]['status'] != status]
+        
+        approved_at = ', approved_at = CURRENT_TIMESTAMP' if status == 'approved' else ''
+        for chunk, placeholders in _id_chunks(to_update):
+            cursor.execute(f'UPDATE sourced_products SET status = ?{approved_at} WHERE id IN ({placeholders})',
+                           [status] + chunk)
+    
+    for pid in product_ids:
+        if pid not in found:
+            results.append({'id': pid, 'success': False, 'error': 'not_found'})
+        else:
+            results.append({'id': pid, 'success': True, 'previous_status': found[pid]['status'], 'status': status})
+    return results
+
 @app.route('/api/products/bulk-delete', methods=['POST'])
 @login_required
 def bulk_delete_products():
-    """Bulk delete products"""
+    """Bulk delete products (single DELETE ... WHERE id IN (...))"""
     try:
-        data = request.json
-        product_ids = data.get('product_ids', [])
-        
+        product_ids = _parse_bulk_ids(request.json)
         if not product_ids:
             return jsonify({'success': False, 'error': '삭제할 상품을 선택해주세요'}), 400
         
-        conn = get_db()
-        cursor = conn.cursor()
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            found = _fetch_products_by_ids(cursor, product_ids)
+            existing = [pid for pid in product_ids if pid in found]
+            for chunk, placeholders in _id_chunks(existing):
+                cursor.execute(f'DELETE FROM sourced_products WHERE id IN ({placeholders})', chunk)
+            product_content.delete_content(cursor, existing)
+            title_index.remove_titles(cursor, existing)
+        
+        results = [{'id': pid, 'success': True} if pid in found else {'id': pid, 'success': False, 'error': 'not_found'}
+                   for pid in product_ids]
+        body = _bulk_response('delete', results)
+        body.update({'deleted_count': len(existing), 'message': f'{len(existing)}개의 상품이 삭제되었습니다'})
+        return jsonify(body)
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f'[Bulk Delete] ❌ Error: {str(e)}')
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/products/bulk-approve', methods=['POST'])
+@login_required
+def bulk_approve_products():
+    """Bulk approve products"""
+    try:
+        product_ids = _parse_bulk_ids(request.json)
+        if not product_ids:
+            return jsonify({'success': False, 'error': '승인할 상품을 선택해주세요'}), 400
         
-        # Delete all selected products
-        deleted_count = 0
-        for product_id in product_ids:
-            cursor.execute('SELECT title_kr, title_cn FROM sourced_products WHERE id = ?', (product_id,))
-            product = cursor.fetchone()
-            
-            if product:
-                cursor.execute('DELETE FROM sourced_products WHERE id = ?', (product_id,))
-                deleted_count += 1
-                app.logger.info(f'[Bulk Delete] Deleted product ID {product_id}: {product["title_kr"] or product["title_cn"]}')
+        return jsonify(_bulk_response('approve', _bulk_set_status(product_ids, 'approved')))
         
-        conn.commit()
-        conn.close()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f'[Bulk Approve] ❌ Error: {str(e)}')
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/products/bulk-status', methods=['POST'])
+@login_required
+def bulk_update_product_status():
+    """
+    Bulk status change
+    
+    Request JSON: {"product_ids": [...], "status": "pending|approved|registered"}
+    """
+    try:
+        data = request.json or {}
+        product_ids = _parse_bulk_ids(data)
+        status = data.get('status')
+        if status not in BULK_PRODUCT_STATUSES:
+            return jsonify({'success': False, 'error': f'status must be one of {", ".join(BULK_PRODUCT_STATUSES)}'}), 400
+        if not product_ids:
+            return jsonify({'success': False, 'error': '상태를 변경할 상품을 선택해주세요'}), 400
         
-        log_activity('product_bulk_delete', f'일괄 삭제: {deleted_count}개 상품', 'success')
-        app.logger.info(f'[Bulk Delete] ✅ Successfully deleted {deleted_count} products')
+        return jsonify(_bulk_response(f'status:{status}', _bulk_set_status(product_ids, status)))
         
-        return jsonify({'success': True, 'deleted_count': deleted_count, 'message': f'{deleted_count}개의 상품이 삭제되었습니다'})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f'[Bulk Status] ❌ Error: {str(e)}')
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/products/bulk-reject', methods=['POST'])
+@login_required
+def bulk_reject_products():
+    """
+    Bulk reject: record each product in rejected_products (with expiry) and
+    remove it from sourced_products, same as the single reject flow.
+    
+    Request JSON: {"product_ids": [...], "expiry_days": 30 (optional, default: config)}
+    """
+    try:
+        data = request.json or {}
+        product_ids = _parse_bulk_ids(data)
+        if not product_ids:
+            return jsonify({'success': False, 'error': '거절할 상품을 선택해주세요'}), 400
+        
+        expiry_days = int(data.get('expiry_days') or get_config('rejection_expiry_days', 30))
+        from datetime import timedelta
+        expires_at = (datetime.now() + timedelta(days=expiry_days)).isoformat()
         
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            found = _fetch_products_by_ids(cursor, product_ids, 'id, original_url, title_kr, title_cn, keywords')
+            existing = [pid for pid in product_ids if pid in found]
+            
+            cursor.executemany('''
+                INSERT OR REPLACE INTO rejected_products 
+                (product_url, product_title, keyword, rejected_at, expires_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?)
+            ''', [(found[pid]['original_url'], found[pid]['title_kr'] or found[pid]['title_cn'] or '',
+                   found[pid]['keywords'] or '', expires_at)
+                  for pid in existing if found[pid]['original_url']])
+            
+            for chunk, placeholders in _id_chunks(existing):
+                cursor.execute(f'DELETE FROM sourced_products WHERE id IN ({placeholders})', chunk)
+            product_content.delete_content(cursor, existing)
+            title_index.remove_titles(cursor, existing)
+        
+        results = [{'id': pid, 'success': True, 'expires_at': expires_at} if pid in found
+                   else {'id': pid, 'success': False, 'error': 'not_found'}
+                   for pid in product_ids]
+        body = _bulk_response('reject', results)
+        body.update({'expiry_days': expiry_days, 'expires_at': expires_at})
+        return jsonify(body)
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
-        app.logger.error(f'[Bulk Delete] ❌ Error: {str(e)}')
+        app.logger.error(f'[Bulk Reject] ❌ Error: {str(e)}')
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# ============================================================================
+# INCREMENTAL ORDER SYNC (per-marketplace watermark + batched upsert)
+# ============================================================================
+# Each cycle asks the marketplace only for orders changed since the last
+# successful sync (minus a small overlap for late-arriving changes), follows the
+# API's pagination to the end, and writes everything with one executemany
+# INSERT ... ON CONFLICT(order_number) DO UPDATE. The watermark is advanced in
+# the same transaction, so a failed cycle is simply retried from the old one.
+
+ORDER_SYNC_OVERLAP = timedelta(minutes=10)
+ORDER_SYNC_INITIAL_LOOKBACK = timedelta(days=7)
+ORDER_SYNC_MAX_PAGES = 50
+# Coupang의 발주서 목록 API는 생성일(createdAt) 기준 조회만 지원하고 변경일 필터가 없음
+# → 최근 이 기간에 생성된 주문은 매번 다시 받아 상태 변경(배송중/배송완료)을 반영
+ORDER_SYNC_COUPANG_STATUS_WINDOW = timedelta(days=14)
+
+# 로컬 주문 상태 (confirm/ship/deliver 엔드포인트와 같은 값), 진행 순서
+ORDER_STATUS_RANK = {'pending': 0, 'confirmed': 1, 'shipped': 2, 'delivered': 3}
+
+# 마켓 상태 → 로컬 상태 (없는 값은 None: 신규 주문은 'pending', 기존 주문은 상태 유지)
+# 취소/반품은 로컬 워크플로에 상태가 없으므로 동기화로 바꾸지 않음
+NAVER_ORDER_STATUS_MAP = {
+    'PAYMENT_WAITING': 'pending',
+    'PAYED': 'pending',
+    'DELIVERING': 'shipped',
+    'DELIVERED': 'delivered',
+    'PURCHASE_DECIDED': 'delivered',
+}
+COUPANG_ORDER_STATUS_MAP = {
+    'ACCEPT': 'pending',
+    'INSTRUCT': 'confirmed',
+    'DEPARTURE': 'shipped',
+    'DELIVERING': 'shipped',
+    'FINAL_DELIVERY': 'delivered',
+}
+
+def _status_rank_sql(column):
+    """SQL rank of a local order status (unknown/legacy values rank lowest)"""
+    cases = ' '.join(f"WHEN '{status}' THEN {rank}" for status, rank in ORDER_STATUS_RANK.items())
+    return f'CASE {column} {cases} ELSE -1 END'
+
+# 상태는 앞으로만 진행: 로컬에서 shipped/delivered 된 주문을 겹치는 구간에서 다시 받아도
+# 이전 상태로 되돌리지 않음 (되돌리면 배송완료 매출이 롤업에서 빠짐)
+_ORDER_UPSERT_SQL = f'''
+    INSERT INTO orders (
+        order_number, marketplace, customer_name, customer_phone,
+        customer_address, pccc, quantity, sale_price, applied_exchange_rate,
+        order_status, payment_status, ordered_at, delivered_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, 'pending'), ?, ?, ?)
+    ON CONFLICT(order_number) DO UPDATE SET
+        quantity = excluded.quantity,
+        sale_price = excluded.sale_price,
+        order_status = CASE
+            WHEN {_status_rank_sql('excluded.order_status')} > {_status_rank_sql('orders.order_status')}
+            THEN excluded.order_status
+            ELSE orders.order_status
+        END,
+        payment_status = excluded.payment_status,
+        delivered_at = CASE
+            WHEN excluded.order_status != 'delivered' THEN orders.delivered_at
+            ELSE COALESCE(orders.delivered_at, excluded.delivered_at)
+        END
+    WHERE orders.marketplace = excluded.marketplace
+'''
+
+def get_order_sync_window(marketplace):
+    """
+    (since, started_at) for the next sync of `marketplace`.
+    since = last watermark - overlap, or the initial lookback on first run.
+    """
+    started_at = datetime.now()
+    conn = get_db()
+    row = conn.execute('SELECT last_synced_at FROM sync_watermarks WHERE marketplace = ?',
+                       (marketplace,)).fetchone()
+    conn.close()
+    
+    if row and row['last_synced_at']:
+        since = datetime.fromisoformat(row['last_synced_at']) - ORDER_SYNC_OVERLAP
+    else:
+        since = started_at - ORDER_SYNC_INITIAL_LOOKBACK
+    return since, started_at
+
+def upsert_marketplace_orders(cursor, marketplace, rows, synced_at):
+    """
+    Batch upsert of order rows (column order of _ORDER_UPSERT_SQL) + watermark update.
+    Revenue rollups are kept consistent: orders already counted as delivered are
+    subtracted first and re-added from their updated rows.
+    
+    Order numbers already used by another marketplace are left untouched and
+    reported as conflicts.
+    
+    Returns:
+        (inserted_count, updated_count, conflict_count)
+    """
+    order_numbers = list(dict.fromkeys(row[0] for row in rows))
+    
+    existing = {}
+    conflicts = []
+    for chunk, placeholders in _id_chunks(order_numbers):
+        cursor.execute(f'''
+            SELECT id, order_number, order_status, marketplace FROM orders
+            WHERE order_number IN ({placeholders})
+        ''', chunk)
+        for row in cursor.fetchall():
+            if row['marketplace'] == marketplace:
+                existing[row['order_number']] = row
+            else:
+                conflicts.append(row['order_number'])
+    if conflicts:
+        app.logger.warning(f'[Order Sync] ⚠️ {marketplace}: {len(conflicts)} order number(s) already belong to '
+                           f'another marketplace, skipped: {conflicts[:10]}')
+    
+    # 📊 Take previously-delivered orders out of the rollups before they change
+    revenue_rollup.remove_delivered_orders(
+        cursor, [row['id'] for row in existing.values() if row['order_status'] == 'delivered'])
+    
+    cursor.executemany(_ORDER_UPSERT_SQL, rows)
+    
+    delivered_ids = []
+    for chunk, placeholders in _id_chunks(order_numbers):
+        cursor.execute(f'''
+            SELECT id FROM orders
+            WHERE order_number IN ({placeholders}) AND marketplace = ? AND order_status = 'delivered'
+        ''', chunk + [marketplace])
+        delivered_ids.extend(row['id'] for row in cursor.fetchall())
+    revenue_rollup.add_delivered_orders(cursor, delivered_ids)
+    
+    cursor.execute('''
+        INSERT INTO sync_watermarks (marketplace, last_synced_at, last_order_count, updated_at)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(marketplace) DO UPDATE SET
+            last_synced_at = excluded.last_synced_at,
+            last_order_count = excluded.last_order_count,
+            updated_at = CURRENT_TIMESTAMP
+    ''', (marketplace, synced_at.isoformat(), len(order_numbers)))
+    
+    inserted = len(order_numbers) - len(existing) - len(conflicts)
+    return inserted, len(existing), len(conflicts)
+
 def sync_naver_orders():
     """
     Sync orders from Naver SmartStore API
-    Fetches new orders and updates local database
+    Fetches orders changed since the last sync and upserts them
     """
     try:
         client_id = get_config('naver_client_id')
@@ -4875,84 +5643,88 @@ def sync_naver_orders():
         import hashlib
         
         # Naver Commerce API endpoint
-        timestamp = str(int(time.time() * 1000))
         method = 'GET'
         path = '/v1/pay-order/seller/orders'
         
-        # Create signature
-        message = f"{timestamp}.{method}.{path}"
-        signature = hmac.new(
-            client_secret.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        headers = {
-            'Content-Type': 'application/json',
-            'X-Naver-Client-Id': client_id,
-            'X-Timestamp': timestamp,
-            'X-API-Signature': signature
-        }
+        def signed_headers():
+            # Signature is timestamp-bound → re-sign every page
+            timestamp = str(int(time.time() * 1000))
+            message = f"{timestamp}.{method}.{path}"
+            signature = hmac.new(
+                client_secret.encode('utf-8'),
+                message.encode('utf-8'),
+                hashlib.sha256
+            ).hexdigest()
+            return {
+                'Content-Type': 'application/json',
+                'X-Naver-Client-Id': client_id,
+                'X-Timestamp': timestamp,
+                'X-API-Signature': signature
+            }
         
-        # Fetch orders from last 7 days
+        # Only orders changed since the last successful sync (with overlap)
+        since, started_at = get_order_sync_window('naver')
         params = {
-            'lastChangedFrom': (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'),
-            'lastChangedTo': datetime.now().strftime('%Y-%m-%d')
+            'lastChangedFrom': since.isoformat(timespec='milliseconds'),
+            'lastChangedTo': started_at.isoformat(timespec='milliseconds')
         }
         
-        response = requests.get(
-            f'https://api.commerce.naver.com{path}',
-            headers=headers,
-            params=params,
-            timeout=30
-        )
-        
-        if response.status_code != 200:
-            app.logger.error(f'[Naver Sync] API error: {response.status_code}')
-            return {'success': False, 'error': f'API error: {response.status_code}'}
-        
-        data = response.json()
-        orders_data = data.get('data', {}).get('orders', [])
-        
-        conn = get_db()
-        cursor = conn.cursor()
-        synced_count = 0
+        orders_data = []
+        for page in range(ORDER_SYNC_MAX_PAGES):
+            response = http_client.get(
+                f'https://api.commerce.naver.com{path}',
+                headers=signed_headers(),
+                params=params,
+                timeout=30
+            )
+            
+            if response.status_code != 200:
+                app.logger.error(f'[Naver Sync] API error: {response.status_code}')
+                return {'success': False, 'error': f'API error: {response.status_code}'}
+            
+            data = response.json().get('data', {})
+            orders_data.extend(data.get('orders', []))
+            
+            # Follow pagination until the API reports no more pages
+            more = data.get('more')
+            if not more:
+                break
+            params['lastChangedFrom'] = more.get('moreFrom', params['lastChangedFrom'])
+            params['moreSequence'] = more.get('moreSequence')
+        else:
+            app.logger.warning(f'[Naver Sync] ⚠️ Stopped after {ORDER_SYNC_MAX_PAGES} pages')
         
+        # Exchange rate is locked in when an order is first inserted (not changed on update)
+        current_rate = float(get_config('cny_exchange_rate', 190))
+        rows = []
         for order in orders_data:
-            # Check if order already exists
-            cursor.execute('SELECT id FROM orders WHERE order_number = ? AND marketplace = ?',
-                          (order['orderNumber'], 'naver'))
-            existing = cursor.fetchone()
-            
-            if not existing:
-                # Create new order
-                cursor.execute('''
-                    INSERT INTO orders (
-                        order_number, marketplace, customer_name, customer_phone,
-                        customer_address, quantity, sale_price, order_status,
-                        payment_status, ordered_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    order['orderNumber'],
-                    'naver',
-                    order.get('ordererName', ''),
-                    order.get('ordererTel', ''),
-                    order.get('shippingAddress', ''),
-                    order.get('quantity', 1),
-                    order.get('paymentAmount', 0),
-                    order.get('orderStatus', 'pending'),
-                    order.get('paymentStatus', 'paid'),
-                    order.get('orderedAt', datetime.now().isoformat())
-                ))
-                synced_count += 1
+            order_status = NAVER_ORDER_STATUS_MAP.get(order.get('orderStatus'))
+            rows.append((
+                order['orderNumber'],
+                'naver',
+                order.get('ordererName', ''),
+                order.get('ordererTel', ''),
+                order.get('shippingAddress', ''),
+                order.get('individualCustomUniqueCode', ''),
+                order.get('quantity', 1),
+                order.get('paymentAmount', 0),
+                current_rate,
+                order_status,
+                order.get('paymentStatus', 'paid'),
+                order.get('orderedAt', datetime.now().isoformat()),
+                datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S') if order_status == 'delivered' else None
+            ))
         
-        conn.commit()
-        conn.close()
+        with db_transaction() as conn:
+            synced_count, updated_count, conflict_count = upsert_marketplace_orders(
+                conn.cursor(), 'naver', rows, started_at)
         
-        app.logger.info(f'[Naver Sync] ✅ Synced {synced_count} new orders')
-        log_activity('marketplace', f'Naver orders synced: {synced_count} new', 'success')
+        app.logger.info(f'[Naver Sync] ✅ Synced {synced_count} new / {updated_count} updated orders'
+                        + (f' ({conflict_count} order number conflicts skipped)' if conflict_count else ''))
+        log_activity('marketplace', f'Naver orders synced: {synced_count} new, {updated_count} updated', 'success')
         
-        return {'success': True, 'synced_count': synced_count}
+        return {'success': True, 'synced_count': synced_count, 'updated_count': updated_count,
+                'conflict_count': conflict_count}
         
     except Exception as e:
         app.logger.error(f'[Naver Sync] ❌ Error: {str(e)}')
@@ -4963,7 +5735,7 @@ def sync_naver_orders():
 def sync_coupang_orders():
     """
     Sync orders from Coupang Wing API
-    Fetches new orders and updates local database
+    Fetches orders since the last sync and upserts them
     """
     try:
         access_key = get_config('coupang_access_key')
@@ -4980,74 +5752,84 @@ def sync_coupang_orders():
         # Coupang Wing API endpoint
         method = 'GET'
         path = '/v2/providers/seller_api/apis/api/v1/marketplace/orders'
-        query = f'createdAtFrom={int((datetime.now() - timedelta(days=7)).timestamp() * 1000)}'
-        
-        # Create signature
-        timestamp = str(int(time.time() * 1000))
-        message = f"{timestamp}{method}{path}?{query}"
-        signature = hmac.new(
-            secret_key.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'CEA algorithm=HmacSHA256, access-key={access_key}, signed-date={timestamp}, signature={signature}'
-        }
-        
-        response = requests.get(
-            f'https://api-gateway.coupang.com{path}?{query}',
-            headers=headers,
-            timeout=30
-        )
-        
-        if response.status_code != 200:
-            app.logger.error(f'[Coupang Sync] API error: {response.status_code}')
-            return {'success': False, 'error': f'API error: {response.status_code}'}
-        
-        data = response.json()
-        orders_data = data.get('data', [])
         
-        conn = get_db()
-        cursor = conn.cursor()
-        synced_count = 0
+        # Orders since the last successful sync (with overlap). Coupang can only filter by
+        # creation time, so the window always reaches back ORDER_SYNC_COUPANG_STATUS_WINDOW
+        # to pick up status changes of orders created earlier.
+        since, started_at = get_order_sync_window('coupang')
+        since = min(since, started_at - ORDER_SYNC_COUPANG_STATUS_WINDOW)
+        base_query = f'createdAtFrom={int(since.timestamp() * 1000)}'
+        
+        orders_data = []
+        next_token = None
+        for page in range(ORDER_SYNC_MAX_PAGES):
+            query = f'{base_query}&nextToken={next_token}' if next_token else base_query
+            
+            # Create signature (per page: the query string is part of the message)
+            timestamp = str(int(time.time() * 1000))
+            message = f"{timestamp}{method}{path}?{query}"
+            signature = hmac.new(
+                secret_key.encode('utf-8'),
+                message.encode('utf-8'),
+                hashlib.sha256
+            ).hexdigest()
+            
+            headers = {
+                'Content-Type': 'application/json',
+                'Authorization': f'CEA algorithm=HmacSHA256, access-key={access_key}, signed-date={timestamp}, signature={signature}'
+            }
+            
+            response = http_client.get(
+                f'https://api-gateway.coupang.com{path}?{query}',
+                headers=headers,
+                timeout=30
+            )
+            
+            if response.status_code != 200:
+                app.logger.error(f'[Coupang Sync] API error: {response.status_code}')
+                return {'success': False, 'error': f'API error: {response.status_code}'}
+            
+            data = response.json()
+            orders_data.extend(data.get('data', []))
+            
+            # Follow pagination until nextToken is empty
+            next_token = data.get('nextToken')
+            if not next_token:
+                break
+        else:
+            app.logger.warning(f'[Coupang Sync] ⚠️ Stopped after {ORDER_SYNC_MAX_PAGES} pages')
         
+        # Exchange rate is locked in when an order is first inserted (not changed on update)
+        current_rate = float(get_config('cny_exchange_rate', 190))
+        rows = []
         for order in orders_data:
-            # Check if order already exists
-            cursor.execute('SELECT id FROM orders WHERE order_number = ? AND marketplace = ?',
-                          (order['orderId'], 'coupang'))
-            existing = cursor.fetchone()
-            
-            if not existing:
-                # Create new order
-                cursor.execute('''
-                    INSERT INTO orders (
-                        order_number, marketplace, customer_name, customer_phone,
-                        customer_address, quantity, sale_price, order_status,
-                        payment_status, ordered_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    order['orderId'],
-                    'coupang',
-                    order.get('ordererName', ''),
-                    order.get('ordererContact', ''),
-                    order.get('shippingAddress', ''),
-                    order.get('orderedQuantity', 1),
-                    order.get('paidAmount', 0),
-                    order.get('shipmentBoxId') and 'confirmed' or 'pending',
-                    'paid',
-                    order.get('orderedAt', datetime.now().isoformat())
-                ))
-                synced_count += 1
+            order_status = COUPANG_ORDER_STATUS_MAP.get(order.get('status'))
+            rows.append((
+                order['orderId'],
+                'coupang',
+                order.get('ordererName', ''),
+                order.get('ordererContact', ''),
+                order.get('shippingAddress', ''),
+                order.get('personalCustomsClearanceCode', ''),
+                order.get('orderedQuantity', 1),
+                order.get('paidAmount', 0),
+                current_rate,
+                order_status,
+                'paid',
+                order.get('orderedAt', datetime.now().isoformat()),
+                datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S') if order_status == 'delivered' else None
+            ))
         
-        conn.commit()
-        conn.close()
+        with db_transaction() as conn:
+            synced_count, updated_count, conflict_count = upsert_marketplace_orders(
+                conn.cursor(), 'coupang', rows, started_at)
         
-        app.logger.info(f'[Coupang Sync] ✅ Synced {synced_count} new orders')
-        log_activity('marketplace', f'Coupang orders synced: {synced_count} new', 'success')
+        app.logger.info(f'[Coupang Sync] ✅ Synced {synced_count} new / {updated_count} updated orders'
+                        + (f' ({conflict_count} order number conflicts skipped)' if conflict_count else ''))
+        log_activity('marketplace', f'Coupang orders synced: {synced_count} new, {updated_count} updated', 'success')
         
-        return {'success': True, 'synced_count': synced_count}
+        return {'success': True, 'synced_count': synced_count, 'updated_count': updated_count,
+                'conflict_count': conflict_count}
         
     except Exception as e:
         app.logger.error(f'[Coupang Sync] ❌ Error: {str(e)}')
@@ -5100,29 +5882,42 @@ def sync_marketplace_orders():
 @app.route('/orders')
 @login_required
 def orders():
-    """Orders management page"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT o.*, sp.title_kr, sp.original_url
-        FROM orders o
-        LEFT JOIN sourced_products sp ON o.product_id = sp.id
-        ORDER BY o.ordered_at DESC
-    ''')
-    orders = cursor.fetchall()
-    conn.close()
+    """Orders management page (first page; more rows via /api/orders/list)"""
+    status = request.args.get('status', '').strip() or None
+    keyword = request.args.get('q', '').strip() or None
+    orders, next_cursor = fetch_orders_page(status, keyword, request.args.get('cursor'),
+                                            _page_limit(request.args.get('limit', LIST_PAGE_SIZE)))
     
-    return render_template('orders.html', orders=orders)
+    return render_template('orders.html', orders=orders, next_cursor=next_cursor,
+                           status_filter=status or '', keyword_filter=keyword or '')
+
+@app.route('/api/orders/list')
+@login_required
+def api_orders_list():
+    """
+    Lazy-load API for the orders page
+    Query: status, q, cursor, limit, format=html (adds rendered <tr> rows)
+    """
+    status = request.args.get('status', '').strip() or None
+    keyword = request.args.get('q', '').strip() or None
+    rows, next_cursor = fetch_orders_page(status, keyword, request.args.get('cursor'),
+                                          _page_limit(request.args.get('limit', LIST_PAGE_SIZE)))
+    
+    result = {
+        'success': True,
+        'items': [dict(row) for row in rows],
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    }
+    if request.args.get('format') == 'html':
+        result['html'] = render_template('_order_rows.html', orders=rows)
+    return jsonify(result)
 
 @app.route('/config')
 @login_required
 def config_page():
     """Configuration page"""
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM config')
-    configs = {row['key']: row['value'] for row in cursor.fetchall()}
-    conn.close()
+    configs = dict(get_config_snapshot())
     
     return render_template('config.html', configs=configs)
 
@@ -5160,7 +5955,6 @@ def update_config():
     app.logger.info('[Config Update] ========================================')
     app.logger.info(f'[Config Update] Received {len(data)} config items to update')
     
-    saved_configs = []
     for key, value in data.items():
         # Log what's being saved (mask sensitive data)
         if 'key' in key.lower() or 'secret' in key.lower() or 'password' in key.lower():
@@ -5169,10 +5963,12 @@ def update_config():
             display_value = value
         
         app.logger.info(f'[Config Update] Saving: {key} = {display_value}')
-        
-        set_config(key, value)
-        saved_configs.append(key)
-        
+    
+    # 🚀 한 번의 트랜잭션으로 저장 (버전 증가/스냅샷 재로드도 한 번)
+    set_configs(data)
+    saved_configs = list(data)
+    
+    for key, value in data.items():
         # Immediately verify it was saved
         verify_value = get_config(key)
         if verify_value == value:
@@ -5242,6 +6038,7 @@ def stream_logs():
     """Stream activity logs (SSE endpoint)"""
     def generate():
         last_id = 0
+        flush_seq = -1
         while True:
             conn = get_db()
             cursor = conn.cursor()
@@ -5254,10 +6051,52 @@ def stream_logs():
                 for log in logs:
                     yield f"data: {json.dumps(dict(log))}\n\n"
             
-            time.sleep(2)
+            # Wake as soon as the log writer flushes a batch (1s fallback for other processes)
+            flush_seq = activity_log_writer.wait_for_flush(flush_seq, timeout=1.0)
     
     return app.response_class(generate(), mimetype='text/event-stream')
 
+@app.route('/api/logs/archive', methods=['GET'])
+@login_required
+def query_log_archive():
+    """
+    Search archived logs (logs/archive/<table>/<date>.jsonl.gz)
+    
+    Query params: table (activity_logs|stock_monitor_log), start, end (YYYY-MM-DD),
+                  action_type, status, q, limit
+    Without start: returns the list of archived dates.
+    """
+    table = request.args.get('table', 'activity_logs')
+    start = request.args.get('start')
+    
+    if table not in log_retention.ARCHIVED_TABLES:
+        return jsonify({'success': False, 'error': f'Unknown table: {table}'}), 400
+    
+    if not start:
+        return jsonify({'success': True, 'table': table, 'dates': log_retention.list_partitions(table)})
+    
+    try:
+        rows = log_retention.query_archive(
+            table, start, request.args.get('end'),
+            action_type=request.args.get('action_type'),
+            status=request.args.get('status'),
+            keyword=request.args.get('q'),
+            limit=request.args.get('limit', 500, type=int)
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({'success': True, 'table': table, 'count': len(rows), 'logs': rows})
+
+@app.route('/api/logs/retention/run', methods=['POST'])
+@login_required
+def run_log_retention_now():
+    """Run the log retention job immediately"""
+    summary = run_log_retention()
+    if summary is None:
+        return jsonify({'success': False, 'error': 'Log retention failed (see server log)'}), 500
+    return jsonify({'success': True, **summary})
+
 @app.route('/api/products/<int:product_id>/approve', methods=['POST'])
 @login_required
 def approve_product(product_id):
@@ -5294,6 +6133,8 @@ def register_product(product_id):
         conn.close()
         return jsonify({'error': 'Product not found'}), 404
     
+    product = product_content.with_content(cursor, product, ('marketing_copy', 'processed_images_json'))
+    
     # Prepare product data for marketplace
     product_data = {
         'title': product['title_kr'] or product['title_cn'],
@@ -5343,6 +6184,8 @@ def analyze_product_market(product_id):
         conn.close()
         return jsonify({'error': 'Product not found'}), 404
     
+    product = product_content.with_content(cursor, product, ('market_analysis_json',))
+    
     # 이미 분석된 데이터가 있는지 확인 (GET 요청 시)
     if request.method == 'GET' and product['market_analysis_json']:
         try:
@@ -5521,11 +6364,8 @@ def analyze_product_market(product_id):
     if coupang_data:
         analysis_data['sources'].append('coupang')
     
-    cursor.execute('''
-        UPDATE sourced_products 
-        SET market_analysis_json = ? 
-        WHERE id = ?
-    ''', (json.dumps(analysis_data, ensure_ascii=False), product_id))
+    product_content.save_content(cursor, product_id,
+                                 market_analysis_json=json.dumps(analysis_data, ensure_ascii=False))
     
     conn.commit()
     conn.close()
@@ -5611,9 +6451,8 @@ def discover_blue_ocean():
         
         # 캐시에 저장
         if opportunities:
-            conn = get_db()
-            save_opportunities_to_cache(conn, opportunities)
-            conn.close()
+            with db_transaction() as conn:
+                save_opportunities_to_cache(conn, opportunities)
         
         log_activity('blue_ocean', f'Discovered {len(opportunities)} opportunities', 'success')
         
@@ -5721,32 +6560,26 @@ def match_aliexpress_suppliers():
                 'error': f'알리익스프레스에서 "{english_keyword}" 검색 결과가 없습니다.'
             }), 404
         
-        # 3. 마진 필터링
-        cny_rate = float(get_config('cny_exchange_rate') or 190)
-        shipping_cost = float(get_config('shipping_cost_base') or 5000)
-        naver_fee = float(get_config('naver_fee_rate') or 0.06)
+        # 3. 마진 필터링 (unified pricing, one vectorized pass at the Naver selling price)
+        candidates = [p for p in ali_products['products'] if p.get('price', 0)]
         
         matched_products = []
         
-        for product in ali_products['products']:
-            price_usd = product.get('price', 0)
-            if price_usd == 0:
-                continue
-            
-            # USD → KRW
-            price_krw = price_usd * cny_rate * 1.05  # 5% 환율 버퍼
+        if naver_avg_price > 0 and candidates:
+            pricing_config = pricing.load_pricing_config(get_config_snapshot())
+            analyses = pricing.price_rows(
+                [p['price'] * pricing.USD_TO_CNY for p in candidates], pricing_config,
+                market_prices=naver_avg_price
+            )
             
-            # 마진 계산
-            if naver_avg_price > 0:
-                total_cost = price_krw + shipping_cost
-                revenue = naver_avg_price * (1 - naver_fee)
-                margin = (revenue - total_cost) / revenue * 100
+            for product, analysis in zip(candidates, analyses):
+                margin = analysis['margin']
                 
                 if margin >= target_margin:
                     matched_products.append({
                         'title': product.get('title', ''),
-                        'price_usd': price_usd,
-                        'price_krw': int(price_krw),
+                        'price_usd': product['price'],
+                        'price_krw': analysis['purchase_price_krw'],
                         'estimated_margin': round(margin, 1),
                         'naver_selling_price': naver_avg_price,
                         'url': product.get('url', ''),
@@ -5775,37 +6608,40 @@ def match_aliexpress_suppliers():
         }), 500
 
 
+# 간단한 카테고리 매핑 (import 시 트라이로 한 번만 컴파일)
+CATEGORY_TRANSLATION_MAP = {
+    '차량용 공기청정기': 'car air purifier',
+    '반려동물 자동 급식기': 'automatic pet feeder',
+    '무선 이어폰': 'wireless earphones',
+    '블루투스 스피커': 'bluetooth speaker',
+    '보조배터리': 'power bank',
+    '휴대폰 거치대': 'phone holder',
+    '차량용 충전기': 'car charger',
+    '공기청정기': 'air purifier',
+    '가습기': 'humidifier',
+    '로봇청소기': 'robot vacuum',
+    '마사지건': 'massage gun',
+    'LED 조명': 'LED light',
+    # 더 많은 매핑 추가...
+}
+_CATEGORY_TRANSLATION_TRIE = PhraseTrie(CATEGORY_TRANSLATION_MAP)
+
+
 def translate_to_english(korean_keyword):
     """
     한국어 키워드를 영어로 번역 (간단한 매핑)
     
     TODO: Gemini/OpenAI API 사용하여 더 정교하게 번역
     """
-    # 간단한 카테고리 매핑
-    translation_map = {
-        '차량용 공기청정기': 'car air purifier',
-        '반려동물 자동 급식기': 'automatic pet feeder',
-        '무선 이어폰': 'wireless earphones',
-        '블루투스 스피커': 'bluetooth speaker',
-        '보조배터리': 'power bank',
-        '휴대폰 거치대': 'phone holder',
-        '차량용 충전기': 'car charger',
-        '공기청정기': 'air purifier',
-        '가습기': 'humidifier',
-        '로봇청소기': 'robot vacuum',
-        '마사지건': 'massage gun',
-        'LED 조명': 'LED light',
-        # 더 많은 매핑 추가...
-    }
-    
     # 정확한 매칭
-    if korean_keyword in translation_map:
-        return translation_map[korean_keyword]
-    
-    # 부분 매칭
-    for kr, en in translation_map.items():
-        if kr in korean_keyword:
-            return en
+    exact = _CATEGORY_TRANSLATION_TRIE.lookup(korean_keyword)
+    if exact:
+        return exact
+    
+    # 부분 매칭 (가장 긴 구문 우선)
+    hit = _CATEGORY_TRANSLATION_TRIE.longest(korean_keyword)
+    if hit:
+        return hit[1]
     
     # 매핑 실패 시 원문 반환 (알리 API가 다국어 지원)
     return korean_keyword
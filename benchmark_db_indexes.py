@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+DB 인덱스 벤치마크 (migration 006_hot_path_indexes 전/후 비교)
+- 임시 DB를 만들어 주요 테이블에 100k행씩 시드
+- 핫 쿼리별 EXPLAIN QUERY PLAN + 평균 실행 시간 출력
+
+Usage:
+    python3 benchmark_db_indexes.py [rows] [repeat]
+"""
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from migrations import run_migrations
+
+INDEX_MIGRATION = 6  # 006_hot_path_indexes
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+REPEAT = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+NOW = datetime.now()
+CUTOFF_30D = (NOW - timedelta(days=30)).isoformat()
+
+# (label, sql, params)
+HOT_QUERIES = [
+    ('30-day duplicate check',
+     "SELECT title_cn FROM sourced_products WHERE created_at >= ? AND status = 'pending'",
+     (CUTOFF_30D,)),
+    ('rejected filter',
+     'SELECT product_url, expires_at FROM rejected_products '
+     'WHERE keyword = ? AND (expires_at IS NULL OR expires_at > ?)',
+     ('keyword-42', NOW.isoformat())),
+    ('order sync lookup',
+     'SELECT id FROM orders WHERE order_number = ? AND marketplace = ?',
+     ('ORD-0050000', 'naver')),
+    ('dashboard total profit',
+     "SELECT SUM(net_profit) FROM orders WHERE order_status = 'delivered'",
+     ()),
+    ('dashboard 7-day revenue',
+     "SELECT DATE(delivered_at), SUM(sale_price), SUM(net_profit) FROM orders "
+     "WHERE delivered_at >= DATE('now', '-7 days') AND order_status = 'delivered' "
+     "GROUP BY DATE(delivered_at)",
+     ()),
+    ('recent activity logs',
+     'SELECT * FROM activity_logs ORDER BY created_at DESC LIMIT 20',
+     ()),
+]
+
+
+def _ts(days_ago):
+    return (NOW - timedelta(days=days_ago, seconds=random.randint(0, 86400))).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def seed(conn, rows):
+    random.seed(42)
+    statuses = ['pending', 'approved', 'registered', 'rejected']
+    conn.executemany(
+        'INSERT INTO sourced_products (original_url, title_cn, status, created_at) VALUES (?, ?, ?, ?)',
+        ((f'https://aliexpress.com/item/{i}.html', f'wireless earbuds model {i}',
+          random.choice(statuses), _ts(random.randint(0, 365))) for i in range(rows)))
+    conn.executemany(
+        'INSERT INTO rejected_products (product_url, product_title, keyword, rejected_at, expires_at) '
+        'VALUES (?, ?, ?, ?, ?)',
+        ((f'https://aliexpress.com/item/r{i}.html', f'title {i}', f'keyword-{i % 500}',
+          _ts(random.randint(0, 60)), (NOW + timedelta(days=random.randint(-30, 30))).isoformat())
+         for i in range(rows)))
+    order_statuses = ['pending', 'confirmed', 'shipped', 'delivered']
+    conn.executemany(
+        'INSERT INTO orders (order_number, marketplace, pccc, sale_price, applied_exchange_rate, '
+        'net_profit, order_status, delivered_at, ordered_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        ((f'ORD-{i:07d}', random.choice(['naver', 'coupang']), 'P000000000000',
+          random.randint(10000, 90000), 190.0, random.randint(1000, 20000),
+          status, _ts(random.randint(0, 365)) if status == 'delivered' else None, _ts(random.randint(0, 365)))
+         for i, status in ((i, random.choice(order_statuses)) for i in range(rows))))
+    conn.executemany(
+        'INSERT INTO activity_logs (action_type, description, status, created_at) VALUES (?, ?, ?, ?)',
+        ((random.choice(['sourcing', 'order', 'config']), f'log entry {i}', 'success',
+          _ts(random.randint(0, 365))) for i in range(rows)))
+    conn.commit()
+
+
+def bench(conn):
+    results = {}
+    for label, sql, params in HOT_QUERIES:
+        plan = ' | '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params))
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            conn.execute(sql, params).fetchall()
+        elapsed_ms = (time.perf_counter() - start) / REPEAT * 1000
+        results[label] = (plan, elapsed_ms)
+    return results
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp(prefix='dropship_bench_')
+    db_path = os.path.join(tmp_dir, 'bench.db')
+
+    print('=' * 70)
+    print(f'🧪 DB index benchmark: {ROWS:,} rows/table, {REPEAT} runs/query')
+    print(f'📁 {db_path}')
+    print('=' * 70)
+
+    run_migrations(db_path, target_version=INDEX_MIGRATION - 1)
+    conn = sqlite3.connect(db_path)
+    t0 = time.perf_counter()
+    seed(conn, ROWS)
+    conn.execute('ANALYZE')
+    print(f'🌱 Seeded in {time.perf_counter() - t0:.1f}s')
+    before = bench(conn)
+    conn.close()
+
+    t0 = time.perf_counter()
+    run_migrations(db_path, target_version=INDEX_MIGRATION)
+    print(f'🧱 Migration {INDEX_MIGRATION:03d} (indexes) applied in {time.perf_counter() - t0:.1f}s')
+    conn = sqlite3.connect(db_path)
+    after = bench(conn)
+    conn.close()
+
+    for label, _, _ in HOT_QUERIES:
+        plan_b, ms_b = before[label]
+        plan_a, ms_a = after[label]
+        speedup = ms_b / ms_a if ms_a > 0 else float('inf')
+        print(f'\n📌 {label}')
+        print(f'   before: {ms_b:8.2f} ms  {plan_b}')
+        print(f'   after : {ms_a:8.2f} ms  {plan_a}')
+        print(f'   → {speedup:.1f}x')
+
+    for name in os.listdir(tmp_dir):
+        os.remove(os.path.join(tmp_dir, name))
+    os.rmdir(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@ Blue Ocean Discovery Module
 
 import requests
 import json
+import sqlite3
 from datetime import datetime, timedelta
 import logging
 from market_analysis import analyze_naver_market
@@ -333,17 +334,26 @@ def discover_blue_ocean_opportunities(client_id, client_secret, top_n=20, min_sc
     return top_opportunities
 
 
-def get_cached_opportunities(db_conn, max_age_hours=24):
+def get_cached_opportunities(db_conn=None, max_age_hours=24):
     """
     DB에서 캐시된 Blue Ocean 기회 조회
     
     Args:
-        db_conn: SQLite 연결
+        db_conn: SQLite 연결 (None이면 db_pool에서 가져옴)
         max_age_hours: 최대 캐시 시간 (기본 24시간)
     
     Returns:
         list: 캐시된 기회 리스트
     """
+    if db_conn is None:
+        from db_pool import get_connection
+        db_conn = get_connection()
+        try:
+            return get_cached_opportunities(db_conn, max_age_hours)
+        finally:
+            db_conn.close()
+    
+    db_conn.row_factory = sqlite3.Row
     cursor = db_conn.cursor()
     
     cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
@@ -373,38 +383,30 @@ def get_cached_opportunities(db_conn, max_age_hours=24):
 
 def save_opportunities_to_cache(db_conn, opportunities):
     """
-    Blue Ocean 기회를 DB 캐시에 저장
+    Blue Ocean 기회를 DB 캐시에 저장 (단일 트랜잭션)
     
     Args:
-        db_conn: SQLite 연결
+        db_conn: SQLite 연결 (None이면 db_pool에서 가져옴)
         opportunities: 기회 리스트
     """
-    cursor = db_conn.cursor()
+    from db_pool import transaction
     
-    # 테이블 생성 (없으면)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS blue_ocean_cache (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            keyword TEXT UNIQUE,
-            blue_ocean_score REAL,
-            market_data_json TEXT,
-            analyzed_at TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # 데이터 삽입 (중복 시 업데이트)
-    for opp in opportunities:
-        cursor.execute('''
+    with transaction(db_conn) as conn:
+        cursor = conn.cursor()
+        
+        # 데이터 삽입 (중복 시 업데이트) - 테이블은 migrations.py에서 생성
+        cursor.executemany('''
             INSERT OR REPLACE INTO blue_ocean_cache 
             (keyword, blue_ocean_score, market_data_json, analyzed_at)
             VALUES (?, ?, ?, ?)
-        ''', (
-            opp['keyword'],
-            opp['blue_ocean_score'],
-            json.dumps(opp.get('market_data', {})),
-            opp.get('timestamp', datetime.now().isoformat())
-        ))
-    
-    db_conn.commit()
+        ''', [
+            (
+                opp['keyword'],
+                opp['blue_ocean_score'],
+                json.dumps(opp.get('market_data', {})),
+                opp.get('timestamp', datetime.now().isoformat())
+            )
+            for opp in opportunities
+        ])
+    
     logger.info(f'💾 {len(opportunities)}개 기회를 캐시에 저장')
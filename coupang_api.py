@@ -7,6 +7,7 @@ Collects bestseller data, sales volume, and review information
 import hmac
 import hashlib
 import requests
+import http_client
 import json
 import logging
 from datetime import datetime
@@ -61,7 +62,7 @@ class CoupangAPI:
             headers = self._generate_headers("GET", endpoint, query=urlencode(params))
             
             # Make API request
-            response = requests.get(url, headers=headers, timeout=30)
+            response = http_client.get(url, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -134,7 +135,7 @@ class CoupangAPI:
             url = self._generate_request_url(endpoint)
             headers = self._generate_headers("GET", endpoint)
             
-            response = requests.get(url, headers=headers, timeout=30)
+            response = http_client.get(url, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -178,7 +179,7 @@ class CoupangAPI:
             url = self._generate_request_url(endpoint, params)
             headers = self._generate_headers("GET", endpoint, query=urlencode(params))
             
-            response = requests.get(url, headers=headers, timeout=30)
+            response = http_client.get(url, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,193 @@
+"""
+SQLite Connection Pool
+- 연결마다 PRAGMA(WAL, busy_timeout, synchronous, cache_size)를 한 번만 설정
+- close() 호출 시 실제로 닫지 않고 풀에 반납 (기존 conn.close() 호출부 호환)
+- transaction() 컨텍스트 매니저: 성공 시 commit, 예외 시 rollback
+"""
+import os
+import queue
+import sqlite3
+import logging
+import threading
+import itertools
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'dropship.db')
+
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 8192      # PRAGMA cache_size = -8192 (8 MB per connection)
+MAX_IDLE_CONNECTIONS = 8
+
+_pool = queue.LifoQueue(maxsize=MAX_IDLE_CONNECTIONS)
+_pool_lock = threading.Lock()
+_savepoint_ids = itertools.count(1)
+_stats = {'created': 0, 'reused': 0, 'discarded': 0}
+
+
+_query_hook = None
+
+
+def set_query_hook(hook):
+    """hook() is called for every statement executed on a pooled connection (stage_metrics)"""
+    global _query_hook
+    _query_hook = hook
+
+
+def _count_query():
+    if _query_hook is not None:
+        _query_hook()
+
+
+class CountingCursor(sqlite3.Cursor):
+    def execute(self, *args, **kwargs):
+        _count_query()
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        _count_query()
+        return super().executemany(*args, **kwargs)
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() returns it to the pool"""
+
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args, **kwargs):
+        _count_query()
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        _count_query()
+        return super().executemany(*args, **kwargs)
+
+    def close(self):
+        release_connection(self)
+
+    def close_for_real(self):
+        super().close()
+
+
+def configure(db_path):
+    """Point the pool at a different database file (drops idle connections)"""
+    global DB_PATH
+    with _pool_lock:
+        DB_PATH = db_path
+        _drain()
+
+
+def _drain():
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            break
+        conn.close_for_real()
+
+
+def _new_connection():
+    conn = sqlite3.connect(DB_PATH, factory=PooledConnection,
+                           check_same_thread=False,
+                           timeout=BUSY_TIMEOUT_MS / 1000)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KB}')
+    conn.execute('PRAGMA foreign_keys=OFF')
+    conn._db_path = DB_PATH
+    conn._in_pool = False
+    _stats['created'] += 1
+    return conn
+
+
+def get_connection():
+    """Check out a configured connection (row_factory = sqlite3.Row)"""
+    try:
+        conn = _pool.get_nowait()
+        _stats['reused'] += 1
+    except queue.Empty:
+        conn = _new_connection()
+    conn._in_pool = False
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def set_busy_timeout(conn, timeout_ms=None):
+    """Change how long this connection waits for a lock (None restores BUSY_TIMEOUT_MS)"""
+    conn.execute(f'PRAGMA busy_timeout={int(BUSY_TIMEOUT_MS if timeout_ms is None else timeout_ms)}')
+
+
+def release_connection(conn):
+    """Return a connection to the pool, rolling back any open transaction"""
+    if getattr(conn, '_in_pool', False):
+        return  # double close()
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except sqlite3.ProgrammingError:
+        return  # already closed for real
+
+    if getattr(conn, '_db_path', None) != DB_PATH:
+        conn.close_for_real()
+        return
+
+    conn._in_pool = True
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        _stats['discarded'] += 1
+        conn._in_pool = False
+        conn.close_for_real()
+
+
+@contextmanager
+def transaction(conn=None, immediate=True):
+    """
+    Context-managed write transaction: commit on success, rollback on error
+
+        with transaction() as conn:
+            conn.execute(...)
+
+    conn=None checks out a pooled connection and returns it afterwards.
+    An existing connection may be passed; if it is already inside a
+    transaction the block runs as a SAVEPOINT so callers can nest.
+    BEGIN IMMEDIATE takes the write lock up front so busy_timeout applies
+    before any work is done (no mid-transaction "database is locked").
+    """
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_connection()
+
+    try:
+        savepoint = None
+        if conn.in_transaction:
+            savepoint = f'sp_{next(_savepoint_ids)}'
+            conn.execute(f'SAVEPOINT {savepoint}')
+        else:
+            conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+
+        try:
+            yield conn
+            if savepoint:
+                conn.execute(f'RELEASE SAVEPOINT {savepoint}')
+            else:
+                conn.commit()
+        except Exception:
+            if savepoint:
+                conn.execute(f'ROLLBACK TO SAVEPOINT {savepoint}')
+                conn.execute(f'RELEASE SAVEPOINT {savepoint}')
+            else:
+                conn.rollback()
+            raise
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+def get_pool_stats():
+    """Pool counters for diagnostics"""
+    return {**_stats, 'idle': _pool.qsize(), 'db_path': DB_PATH}
@@ -0,0 +1,86 @@
+"""
+Request-Scoped Deadline Budget
+- 엔드포인트(/api/sourcing/start, 소싱 작업)에서 Deadline(초)을 만들어 호출 체인에 그대로 전달
+  (블루오션 분석 → 번역 → AliExpress 검색 → 네이버 분석 → DB 저장)
+- 각 외부 호출은 고정 타임아웃 대신 min(기본 타임아웃, 남은 예산)을 사용 → 전체 지연시간 상한 보장
+- 남은 예산이 MIN_CALL_SEC 미만이면 호출하지 않고 DeadlineExceeded (TimeoutError)
+- 선택 단계(네이버 검증/시장 분석)는 allows()로 확인 후 건너뛰고, degrade()로 기록 → 응답의 'degraded'
+
+Config:
+    sourcing_deadline_sec       기본 120 (동기 요청 1건 전체 예산)
+    sourcing_job_deadline_sec   기본 900 (백그라운드 소싱 작업 1건 전체 예산)
+"""
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_SEC = 120.0
+MIN_CALL_SEC = 1.0          # 이보다 적게 남으면 외부 호출을 시작하지 않음
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline:
+    """Absolute deadline shared by every stage of one request (thread-safe)"""
+
+    def __init__(self, budget_sec=DEFAULT_BUDGET_SEC):
+        self.budget_sec = float(budget_sec)
+        self.started = time.monotonic()
+        self.expires_at = self.started + self.budget_sec
+        self._degraded = []
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, cap=None, what='call'):
+        """
+        Timeout for one call: the remaining budget, capped at `cap`.
+        Raises DeadlineExceeded when less than MIN_CALL_SEC is left.
+        """
+        remaining = self.remaining()
+        if remaining < MIN_CALL_SEC:
+            raise DeadlineExceeded(f'Deadline exceeded before {what} '
+                                   f'({self.elapsed():.1f}s of {self.budget_sec:g}s used)')
+        return remaining if cap is None else min(cap, remaining)
+
+    def allows(self, needed_sec):
+        """Whether an optional stage expected to take `needed_sec` still fits"""
+        return self.remaining() >= needed_sec
+
+    def degrade(self, stage, reason):
+        """Record a stage that was skipped or cut short to stay within the budget"""
+        entry = {'stage': stage, 'reason': reason, 'at_sec': round(self.elapsed(), 1)}
+        with self._lock:
+            self._degraded.append(entry)
+        logger.warning(f'[Deadline] ⏱️ {stage} degraded: {reason}')
+
+    @property
+    def degraded(self):
+        with self._lock:
+            return list(self._degraded)
+
+    def summary(self):
+        return {
+            'budget_sec': self.budget_sec,
+            'elapsed_sec': round(self.elapsed(), 1),
+            'remaining_sec': round(self.remaining(), 1),
+            'degraded': self.degraded,
+        }
+
+
+def call_timeout(deadline, default, what='call'):
+    """Timeout for a call that may or may not run under a deadline"""
+    if deadline is None:
+        return default
+    return deadline.timeout(default, what)
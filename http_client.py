@@ -0,0 +1,216 @@
+"""
+Shared Outbound HTTP Clients (host별 keep-alive 세션)
+- 호스트마다 requests.Session 1개 (HTTPAdapter 커넥션 풀) → 같은 API 서버로의 호출은 TCP/TLS 연결 재사용
+  (기존: 호출마다 requests.get/post → 매번 새 핸드셰이크)
+- 기본 타임아웃 (connect, read); 호출자가 숫자 하나를 주면 read 타임아웃으로 사용
+- 429 / 5xx 재시도 (지수 백오프 + jitter, Retry-After 헤더 우선)
+  POST 등 비멱등 요청은 기본적으로 429만 재시도 (처리되지 않은 요청) → idempotent=True 로 확장
+- deadline=Deadline: 시도마다 타임아웃을 남은 예산으로 줄이고, 예산을 넘기는 재시도 대기는 하지 않음
+- set_call_hook(): 실제 HTTP 시도마다(재시도 포함) 호출 → stage_metrics 단계별 외부 호출 수
+- get_stats(): 호스트별 요청 수, 새 연결 수/재사용률, 재시도 수, 지연시간 → /api/admin/metrics
+
+requests 예외(requests.exceptions.*)는 그대로 전달되므로 기존 except 절은 바꿀 필요 없음.
+"""
+import time
+import random
+import logging
+import threading
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import deadline as deadline_budget
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+HOST_POOL_SIZES = {
+    # 동시 호출이 많은 호스트 (키워드 파이프라인 × 페이지 수집)
+    'openapi.naver.com': 16,
+    'api-sg.aliexpress.com': 12,
+    'api.taobao.com': 12,
+}
+CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+MAX_RETRIES = 3
+BACKOFF_BASE_SEC = 0.5
+MAX_RETRY_DELAY_SEC = 30.0        # Retry-After가 이보다 길면 이 값까지만 대기
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+NON_IDEMPOTENT_RETRY_STATUSES = frozenset({429})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+MAX_HOSTS = 64                    # 이미지 다운로드 등 임의 호스트가 많아도 세션 수 제한
+LATENCY_WINDOW = 200
+
+_sessions = OrderedDict()         # host → (session, adapter)
+_lock = threading.Lock()
+_host_stats = {}                  # host → counters
+_call_hook = None
+
+
+def set_call_hook(hook):
+    """hook(host) is called once per HTTP attempt, retries included (stage_metrics counts outbound calls)"""
+    global _call_hook
+    _call_hook = hook
+
+
+def _new_host_stats():
+    return {'requests': 0, 'retries': 0, 'errors': 0, 'status_429': 0, 'status_5xx': 0,
+            'latencies_ms': deque(maxlen=LATENCY_WINDOW)}
+
+
+def _session(host):
+    with _lock:
+        entry = _sessions.get(host)
+        if entry is not None:
+            _sessions.move_to_end(host)
+            return entry[0]
+        pool_size = HOST_POOL_SIZES.get(host, DEFAULT_POOL_SIZE)
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _sessions[host] = (session, adapter)
+        _host_stats.setdefault(host, _new_host_stats())
+        while len(_sessions) > MAX_HOSTS:
+            _, (old_session, _) = _sessions.popitem(last=False)
+            old_session.close()
+        return session
+
+
+def _retry_after(response):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt):
+    delay = BACKOFF_BASE_SEC * (2 ** attempt)
+    return delay + random.uniform(0, delay / 2)
+
+
+def _record(host, **increments):
+    with _lock:
+        stats = _host_stats.setdefault(host, _new_host_stats())
+        latency = increments.pop('latency_ms', None)
+        if latency is not None:
+            stats['latencies_ms'].append(latency)
+        for name, value in increments.items():
+            stats[name] += value
+
+
+def _past_deadline(deadline, delay):
+    """True when waiting `delay` seconds would leave no budget for another attempt"""
+    return deadline is not None and deadline.remaining() - delay < deadline_budget.MIN_CALL_SEC
+
+
+def request(method, url, timeout=None, retries=MAX_RETRIES, idempotent=None, deadline=None, **kwargs):
+    """
+    requests.request() through the host's pooled session, with retry.
+
+    Args:
+        timeout: (connect, read) tuple or read seconds (default DEFAULT_READ_TIMEOUT)
+        retries: extra attempts on retryable statuses / connection errors
+        idempotent: allow retrying 5xx and connection errors (default: by method)
+        deadline: deadline.Deadline; each attempt's timeouts are cut to the remaining
+                  budget and no retry is scheduled past it (DeadlineExceeded if none is left)
+    """
+    method = method.upper()
+    host = urlsplit(url).netloc.lower()
+    session = _session(host)
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+    elif not isinstance(timeout, tuple):
+        timeout = (min(CONNECT_TIMEOUT, timeout), timeout)
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    retry_statuses = RETRY_STATUSES if idempotent else NON_IDEMPOTENT_RETRY_STATUSES
+
+    attempt = 0
+    while True:
+        attempt_timeout = timeout
+        if deadline is not None:
+            read_timeout = deadline.timeout(timeout[1], f'{method} {host}')
+            attempt_timeout = (min(timeout[0], read_timeout), read_timeout)
+        if _call_hook is not None:
+            _call_hook(host)
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=attempt_timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            _record(host, requests=1, errors=1, latency_ms=(time.perf_counter() - started) * 1000)
+            delay = _backoff(attempt)
+            if not idempotent or attempt >= retries or _past_deadline(deadline, delay):
+                raise
+            logger.warning(f'[HTTP] ⚠️ {method} {host} failed ({type(e).__name__}), retry in {delay:.1f}s')
+        else:
+            status = response.status_code
+            _record(host, requests=1, latency_ms=(time.perf_counter() - started) * 1000,
+                    status_429=int(status == 429), status_5xx=int(status >= 500))
+            if status not in retry_statuses or attempt >= retries:
+                return response
+            retry_after = _retry_after(response)
+            delay = min(retry_after if retry_after is not None else _backoff(attempt), MAX_RETRY_DELAY_SEC)
+            if _past_deadline(deadline, delay):
+                return response
+            logger.warning(f'[HTTP] ⚠️ {method} {host} → {status}, retry {attempt + 1}/{retries} in {delay:.1f}s')
+            response.close()
+        _record(host, retries=1)
+        attempt += 1
+        time.sleep(delay)
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return round(sorted_values[min(rank, len(sorted_values)) - 1], 1)
+
+
+def get_stats():
+    """
+    Per-host counters: requests, new connections and reuse ratio (from the
+    urllib3 pools), retries, 429/5xx counts and latency percentiles
+    """
+    with _lock:
+        hosts = {host: dict(stats, latencies_ms=sorted(stats['latencies_ms']))
+                 for host, stats in _host_stats.items()}
+        adapters = {host: adapter for host, (_, adapter) in _sessions.items()}
+
+    result = {}
+    for host, stats in hosts.items():
+        connections = 0
+        adapter = adapters.get(host)
+        if adapter is not None:
+            for pool_key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(pool_key)
+                if pool is not None:
+                    connections += pool.num_connections
+        latencies = stats.pop('latencies_ms')
+        stats['new_connections'] = connections
+        stats['connection_reuse'] = (round(1 - connections / stats['requests'], 3)
+                                     if stats['requests'] and adapter is not None else None)
+        stats['latency_ms'] = {'p50': _percentile(latencies, 50), 'p95': _percentile(latencies, 95),
+                               'max': round(latencies[-1], 1) if latencies else None}
+        stats['pooled'] = adapter is not None
+        result[host] = stats
+    return result
@@ -163,10 +163,11 @@ def save_ai_analysis_to_db(
         True if successful, False otherwise
     """
     
+    from db_pool import transaction
+    from product_content import save_content
+    import title_index
+    
     try:
-        conn = get_db_func()
-        cursor = conn.cursor()
-        
         product = analysis['product']
         profitability = analysis['profitability']
         recommendation = analysis['ai_analysis']['recommendation']
@@ -198,33 +199,38 @@ def save_ai_analysis_to_db(
         # Prepare images
         images_json = json.dumps([product.get('image', '')])
         
-        # Insert into database
-        cursor.execute('''
-            INSERT INTO sourced_products 
-            (original_url, title_cn, title_kr, price_cny, price_krw, profit_margin, 
-             estimated_profit, safety_status, images_json, status,
-             source_site, moq, traffic_score, keywords, market_analysis_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            original_url,
-            title_cn,
-            title_kr,
-            price_cny,
-            price_krw,
-            profit_margin,
-            estimated_profit,
-            'ai_verified',  # Special status for AI-analyzed products
-            images_json,
-            'pending',
-            'aliexpress',
-            1,  # MOQ
-            sales_prediction['estimated_monthly_sales'],  # Use AI prediction as traffic score
-            analysis['korean_keyword'],
-            market_analysis_json
-        ))
-        
-        conn.commit()
-        conn.close()
+        # Insert into database (pooled connection, single transaction)
+        conn = get_db_func()
+        try:
+            with transaction(conn):
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT INTO sourced_products 
+                    (original_url, title_cn, title_kr, price_cny, price_krw, profit_margin, 
+                     estimated_profit, safety_status, images_json, status,
+                     source_site, moq, traffic_score, keywords)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    original_url,
+                    title_cn,
+                    title_kr,
+                    price_cny,
+                    price_krw,
+                    profit_margin,
+                    estimated_profit,
+                    'ai_verified',  # Special status for AI-analyzed products
+                    images_json,
+                    'pending',
+                    'aliexpress',
+                    1,  # MOQ
+                    sales_prediction['estimated_monthly_sales'],  # Use AI prediction as traffic score
+                    analysis['korean_keyword']
+                ))
+                product_id = cursor.lastrowid
+                save_content(cursor, product_id, market_analysis_json=market_analysis_json)
+                title_index.index_title(cursor, product_id, title_cn)
+        finally:
+            conn.close()
         
         app_logger.info(f"[AI Sourcer] ✅ Saved AI analysis to database: {title_cn[:50]}...")
         
@@ -0,0 +1,216 @@
+"""
+Compiled Keyword Matcher (Aho-Corasick)
+- 금지어(안전 필터), 브랜드, 네이버 제외 키워드 사전을 각각 한 번만 오토마톤으로 컴파일
+- 대소문자 처리는 빌드 시 키워드를 소문자로 정규화 → 검사 시 텍스트 lower() 1회 + 1패스 스캔
+  (기존: 키워드마다 keyword.lower() + 부분문자열 검색)
+- 사전은 config 값(JSON)으로 덮어쓸 수 있고, 값이 바뀌면 다음 조회 시 자동 재컴파일 (재시작 불필요)
+- partition(): 후보 리스트 전체를 한 번에 필터링
+
+Config override (JSON, 비우면 코드 기본값 사용):
+    banned_keywords_json   {"food": ["食品", ...], ...}
+    brand_keywords_json    ["apple", "samsung", ...]  또는 {"전자": [...], ...}
+    exclude_keywords_json  {"선물세트": [...], "식품": [...]}
+"""
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a {category: [keywords]} dictionary.
+    Matching is case-insensitive substring matching (same semantics as
+    `keyword.lower() in text.lower()`).
+    """
+
+    def __init__(self, dictionary):
+        # pattern id → (category, keyword) in dictionary order (used to pick the "first" hit)
+        self.patterns = []
+        self._goto = [{}]    # state → {char: state} (own edges + edges inherited via fail links)
+        self._output = [()]  # state → pattern ids ending here (including fail-chain outputs)
+
+        for category, keywords in dictionary.items():
+            for keyword in keywords:
+                folded = str(keyword).lower()
+                if not folded:
+                    continue
+                pattern_id = len(self.patterns)
+                self.patterns.append((category, keyword))
+                self._add(folded, pattern_id)
+        self._link()
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def _add(self, folded, pattern_id):
+        state = 0
+        for char in folded:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._output.append(())
+            state = nxt
+        self._output[state] += (pattern_id,)
+
+    def _link(self):
+        """BFS fail links; each state's edge map absorbs its fail state's (non-root) edges"""
+        fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            own = list(self._goto[state].items())
+            for char, child in own:
+                queue.append(child)
+                f = fail[state]
+                while f and char not in self._goto[f]:
+                    f = fail[f]
+                target = self._goto[f].get(char, 0) if state else 0
+                fail[child] = target if target != child else 0
+                self._output[child] += self._output[fail[child]]
+            # inherit transitions from the fail state (already complete - BFS order)
+            if state:
+                for char, target in self._goto[fail[state]].items():
+                    self._goto[state].setdefault(char, target)
+
+    def _scan(self, text):
+        goto = self._goto
+        root = goto[0]
+        output = self._output
+        state = 0
+        for char in (text or '').lower():
+            nxt = goto[state].get(char)
+            if nxt is None:
+                nxt = root.get(char, 0)
+            state = nxt
+            if output[state]:
+                yield from output[state]
+
+    def find_all(self, text):
+        """All distinct (category, keyword) hits, in order of first occurrence in text"""
+        seen = set()
+        hits = []
+        for pattern_id in self._scan(text):
+            if pattern_id not in seen:
+                seen.add(pattern_id)
+                hits.append(self.patterns[pattern_id])
+        return hits
+
+    def first(self, text):
+        """Hit that comes first in dictionary order (category, then keyword), or None"""
+        best = None
+        for pattern_id in self._scan(text):
+            if best is None or pattern_id < best:
+                best = pattern_id
+        return self.patterns[best] if best is not None else None
+
+    def contains_any(self, text):
+        for _ in self._scan(text):
+            return True
+        return False
+
+    def partition(self, items, key=None):
+        """
+        Batch filter.
+
+        Args:
+            items: candidate list
+            key: item → text (default: the item itself)
+
+        Returns:
+            (kept, rejected) where rejected is [(item, (category, keyword)), ...]
+        """
+        kept, rejected = [], []
+        for item in items:
+            hit = self.first(key(item) if key else item)
+            if hit is None:
+                kept.append(item)
+            else:
+                rejected.append((item, hit))
+        return kept, rejected
+
+
+# ============================================================================
+# Named dictionaries (registered by the modules that own the defaults)
+# ============================================================================
+
+_registry = {}
+_registry_lock = threading.Lock()
+_config_source = None
+
+
+def set_config_source(source):
+    """source(): {key: raw value} snapshot (app.get_config_snapshot)"""
+    global _config_source
+    _config_source = source
+
+
+def _as_dictionary(name, value):
+    if isinstance(value, dict):
+        return {category: list(keywords) for category, keywords in value.items()}
+    return {name: list(value)}
+
+
+def register(name, defaults, config_key=None):
+    """Register a dictionary ({category: [keywords]} or [keywords]) under `name`"""
+    with _registry_lock:
+        _registry[name] = {
+            'defaults': _as_dictionary(name, defaults),
+            'config_key': config_key,
+            'raw': None,
+            'matcher': None,
+        }
+
+
+def _override(entry):
+    if not entry['config_key'] or _config_source is None:
+        return None
+    try:
+        raw = (_config_source() or {}).get(entry['config_key'])
+    except Exception as e:
+        logger.warning(f'[KeywordMatcher] ⚠️ Config read failed: {e}')
+        return entry['raw']
+    return raw.strip() if isinstance(raw, str) and raw.strip() else None
+
+
+def _compile(name, entry, raw):
+    dictionary = entry['defaults']
+    if raw:
+        try:
+            parsed = json.loads(raw)
+            if not isinstance(parsed, (dict, list)):
+                raise ValueError('expected a JSON object or array')
+            dictionary = _as_dictionary(name, parsed)
+        except ValueError as e:
+            logger.warning(f"[KeywordMatcher] ⚠️ Invalid {entry['config_key']} ({e}) - using defaults")
+    matcher = KeywordMatcher(dictionary)
+    logger.info(f'[KeywordMatcher] Compiled {name}: {len(matcher)} keyword(s)')
+    return matcher
+
+
+def get(name):
+    """Compiled matcher for `name` (recompiled when its config override changed)"""
+    entry = _registry[name]
+    raw = _override(entry)
+    matcher = entry['matcher']
+    if matcher is not None and raw == entry['raw']:
+        return matcher
+    with _registry_lock:
+        if entry['matcher'] is None or raw != entry['raw']:
+            entry['matcher'] = _compile(name, entry, raw)
+            entry['raw'] = raw
+        return entry['matcher']
+
+
+def reload(name=None):
+    """Force recompilation (all dictionaries by default). Returns {name: keyword count}."""
+    names = [name] if name else list(_registry)
+    with _registry_lock:
+        for entry_name in names:
+            _registry[entry_name]['matcher'] = None
+    return {entry_name: len(get(entry_name)) for entry_name in names}
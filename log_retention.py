@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Log Retention / Archival (activity_logs, stock_monitor_log)
+- 보관 기간이 지난 행을 logs/archive/<table>/<YYYY-MM-DD>.jsonl.gz 로 이동
+  (날짜별 파티션, gzip 멤버 append → 여러 번 실행해도 같은 파일에 누적)
+- 아카이브 파일을 먼저 쓰고(fsync) 그 다음 id 범위를 작은 배치로 DELETE
+  → 쓰기 락을 짧게 잡아 요청 경로/로그 writer를 막지 않음
+- 마지막에 PRAGMA incremental_vacuum 으로 빈 페이지 반환
+- query_archive() 로 아카이브 검색 (/api/logs/archive)
+
+Usage:
+    python3 log_retention.py                              # 기본 보관 기간으로 1회 실행
+    python3 log_retention.py --enable-incremental-vacuum  # 기존 DB 1회 변환 (VACUUM, 서버 중지 후)
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import logging
+import sqlite3
+from datetime import datetime, timedelta, date, timezone
+
+import db_pool
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ARCHIVE_DIR = os.path.join(BASE_DIR, 'logs', 'archive')
+
+RETENTION_BATCH_SIZE = 1000     # 배치당 아카이브/삭제 행 수
+BATCH_PAUSE_SEC = 0.05          # 배치 사이 쉬는 시간 (다른 writer에게 락 양보)
+VACUUM_PAGES_PER_RUN = 2000     # incremental_vacuum 한 번에 반환할 최대 페이지 수
+ARCHIVE_QUERY_LIMIT_MAX = 5000
+
+# table → timestamp column
+ARCHIVED_TABLES = {
+    'activity_logs': 'created_at',
+    'stock_monitor_log': 'checked_at',
+}
+
+# table → 타임스탬프 컬럼을 기록하는 시계 (cutoff도 같은 시계로 계산)
+#   activity_logs.created_at: log_activity()가 KST로 기록 (get_kst_now)
+#   stock_monitor_log.checked_at: DEFAULT CURRENT_TIMESTAMP (SQLite, UTC)
+KST = timezone(timedelta(hours=9))
+TABLE_CLOCKS = {
+    'activity_logs': KST,
+    'stock_monitor_log': timezone.utc,
+}
+
+DEFAULT_RETENTION_DAYS = {
+    'activity_logs': 30,
+    'stock_monitor_log': 90,
+}
+
+
+def _partition_path(table, day):
+    return os.path.join(ARCHIVE_DIR, table, f'{day}.jsonl.gz')
+
+
+def _write_partitions(table, ts_column, rows):
+    """Append rows to their date partitions; fsync before the rows are deleted"""
+    by_day = {}
+    for row in rows:
+        record = dict(row)
+        day = str(record.get(ts_column) or '')[:10] or 'unknown'
+        by_day.setdefault(day, []).append(record)
+
+    os.makedirs(os.path.join(ARCHIVE_DIR, table), exist_ok=True)
+    for day, records in by_day.items():
+        with open(_partition_path(table, day), 'ab') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='ab') as gz:
+                for record in records:
+                    gz.write((json.dumps(record, ensure_ascii=False, default=str) + '\n').encode('utf-8'))
+            raw.flush()
+            os.fsync(raw.fileno())
+    return sorted(by_day)
+
+
+def archive_table(table, retention_days, now=None, batch_size=RETENTION_BATCH_SIZE):
+    """
+    Archive + delete rows older than retention_days from one table.
+    `now` (naive, in the table's clock) defaults to the current time in TABLE_CLOCKS[table].
+
+    Returns:
+        dict: {'table', 'cutoff', 'archived', 'batches', 'partitions'}
+    """
+    if table not in ARCHIVED_TABLES:
+        raise ValueError(f'Unknown archived table: {table}')
+    ts_column = ARCHIVED_TABLES[table]
+    if now is None:
+        now = datetime.now(TABLE_CLOCKS[table]).replace(tzinfo=None)
+    cutoff = (now - timedelta(days=int(retention_days))).strftime('%Y-%m-%d %H:%M:%S')
+
+    archived = 0
+    batches = 0
+    partitions = set()
+
+    while True:
+        conn = db_pool.get_connection()
+        try:
+            rows = conn.execute(f'''
+                SELECT * FROM {table}
+                WHERE {ts_column} < ?
+                ORDER BY {ts_column}, id
+                LIMIT ?
+            ''', (cutoff, batch_size)).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            break
+
+        # 1) archive first — a crash after this point only re-archives (never loses) rows
+        partitions.update(_write_partitions(table, ts_column, rows))
+
+        # 2) then delete exactly those ids in one short transaction
+        with db_pool.transaction() as conn:
+            conn.executemany(f'DELETE FROM {table} WHERE id = ?', [(row['id'],) for row in rows])
+
+        archived += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+        time.sleep(BATCH_PAUSE_SEC)
+
+    if archived:
+        logger.info(f'[Retention] 📦 {table}: archived {archived} row(s) older than {cutoff} '
+                    f'in {batches} batch(es)')
+    return {'table': table, 'cutoff': cutoff, 'archived': archived,
+            'batches': batches, 'partitions': sorted(partitions)}
+
+
+def incremental_vacuum(max_pages=VACUUM_PAGES_PER_RUN):
+    """
+    Return free pages to the OS. Only works when the DB uses auto_vacuum=INCREMENTAL
+    (new DBs are created that way; convert old ones with --enable-incremental-vacuum).
+
+    Args:
+        max_pages: pages to free in this run (0 = the whole free list)
+
+    Returns:
+        int: freed pages (0 if incremental vacuum isn't enabled)
+    """
+    conn = db_pool.get_connection()
+    try:
+        if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+            logger.warning('[Retention] ⚠️ auto_vacuum is not INCREMENTAL - skipping vacuum '
+                           '(run: python3 log_retention.py --enable-incremental-vacuum)')
+            return 0
+        before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        # executescript() steps the pragma to completion (execute() frees a single page)
+        conn.executescript(f'PRAGMA incremental_vacuum({int(max_pages)});')
+        after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        return before - after
+    finally:
+        conn.close()
+
+
+def run_retention(retention_days=None):
+    """
+    Archive every table in ARCHIVED_TABLES, then incremental vacuum.
+
+    Args:
+        retention_days: {table: days}; missing tables use DEFAULT_RETENTION_DAYS
+    """
+    days = {**DEFAULT_RETENTION_DAYS, **(retention_days or {})}
+    results = [archive_table(table, days[table]) for table in ARCHIVED_TABLES]
+    freed = incremental_vacuum() if any(r['archived'] for r in results) else 0
+    return {'tables': results, 'freed_pages': freed}
+
+
+def _daterange(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def query_archive(table, start_date, end_date=None, action_type=None, status=None,
+                  keyword=None, limit=500):
+    """
+    Search archived rows between start_date and end_date (inclusive, YYYY-MM-DD).
+    Newest partitions are read first; stops once `limit` matches are found.
+    """
+    if table not in ARCHIVED_TABLES:
+        raise ValueError(f'Unknown archived table: {table}')
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date) if end_date else start
+    if end < start:
+        start, end = end, start
+    limit = max(1, min(int(limit), ARCHIVE_QUERY_LIMIT_MAX))
+    ts_column = ARCHIVED_TABLES[table]
+
+    results = []
+    seen_ids = set()  # a crash between archive and delete can archive a row twice
+    for day in reversed(list(_daterange(start, end))):
+        path = _partition_path(table, day.isoformat())
+        if not os.path.exists(path):
+            continue
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            day_rows = [json.loads(line) for line in f if line.strip()]
+
+        for record in sorted(day_rows, key=lambda r: (str(r.get(ts_column)), r.get('id') or 0), reverse=True):
+            if record.get('id') in seen_ids:
+                continue
+            if action_type and record.get('action_type') != action_type:
+                continue
+            if status and record.get('status', record.get('check_status')) != status:
+                continue
+            if keyword and keyword.lower() not in json.dumps(record, ensure_ascii=False).lower():
+                continue
+            seen_ids.add(record.get('id'))
+            results.append(record)
+            if len(results) >= limit:
+                return results
+    return results
+
+
+def list_partitions(table):
+    """Archived dates for a table, newest first"""
+    table_dir = os.path.join(ARCHIVE_DIR, table)
+    if not os.path.isdir(table_dir):
+        return []
+    return sorted((name[:-len('.jsonl.gz')] for name in os.listdir(table_dir) if name.endswith('.jsonl.gz')),
+                  reverse=True)
+
+
+def enable_incremental_vacuum(db_path=None):
+    """One-off conversion of an existing DB (full VACUUM — stop the server first)"""
+    conn = sqlite3.connect(db_path or db_pool.DB_PATH, isolation_level=None)
+    try:
+        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        conn.execute('VACUUM')
+        return conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if '--enable-incremental-vacuum' in sys.argv:
+        ok = enable_incremental_vacuum()
+        print('✅ auto_vacuum=INCREMENTAL enabled' if ok else '❌ Failed to enable incremental vacuum')
+        sys.exit(0 if ok else 1)
+
+    summary = run_retention()
+    for result in summary['tables']:
+        print(f"📦 {result['table']}: {result['archived']} row(s) archived (cutoff {result['cutoff']})")
+    print(f"🧹 Freed pages: {summary['freed_pages']}")
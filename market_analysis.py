@@ -10,7 +10,9 @@ Market Analysis Module v2.0
 5. 🆕 카테고리 기반 결과 필터링 (product_matcher 통합)
 """
 
-import requests
+import http_client
+import naver_search_cache
+import rate_limiter
 import json
 from datetime import datetime, timedelta
 import statistics
@@ -18,7 +20,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def analyze_naver_market(keyword, client_id, client_secret, ali_product_title=None, enable_category_filter=True):
+def analyze_naver_market(keyword, client_id, client_secret, ali_product_title=None, enable_category_filter=True,
+                         deadline=None):
     """
     네이버 쇼핑 API로 시장 분석 (카테고리 필터링 지원)
     
@@ -28,6 +31,7 @@ def analyze_naver_market(keyword, client_id, client_secret, ali_product_title=No
         client_secret: 네이버 Client Secret
         ali_product_title: 알리익스프레스 제품명 (영문, 선택) - 카테고리 필터링에 사용
         enable_category_filter: 카테고리 필터링 활성화 여부 (기본 True)
+        deadline: 요청 단위 Deadline (있으면 네이버 호출 타임아웃 = min(10초, 남은 예산))
     
     Returns:
         dict: {
@@ -45,28 +49,19 @@ def analyze_naver_market(keyword, client_id, client_secret, ali_product_title=No
         }
     """
     try:
-        # 네이버 쇼핑 검색 API
-        url = "https://openapi.naver.com/v1/search/shop.json"
-        headers = {
-            "X-Naver-Client-Id": client_id,
-            "X-Naver-Client-Secret": client_secret
-        }
-        params = {
-            "query": keyword,
-            "display": 100,  # 최대 100개
-            "sort": "sim"  # 정확도순
-        }
+        # 네이버 쇼핑 검색 API (최대 100개, 정확도순)
+        # 원본 응답은 naver_search_cache에 캐시/공유, 필터링·통계는 여기서 매번 계산
+        status_code, data = naver_search_cache.search(keyword, client_id, client_secret,
+                                                      display=100, sort='sim', timeout=10,
+                                                      deadline=deadline)
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        
-        if response.status_code != 200:
+        if status_code != 200:
             return {
                 'success': False,
-                'error': f'HTTP {response.status_code}',
+                'error': f'HTTP {status_code}',
                 'timestamp': datetime.now().isoformat()
             }
         
-        data = response.json()
         items = data.get('items', [])
         
         if not items:
@@ -295,7 +290,8 @@ def get_naver_keyword_trend(keyword, client_id, client_secret):
             "ages": ["10", "20", "30", "40", "50", "60"]
         }
         
-        response = requests.post(url, headers=headers, json=body, timeout=10)
+        rate_limiter.acquire('naver')
+        response = http_client.post(url, headers=headers, json=body, timeout=10)
         
         if response.status_code != 200:
             return {
@@ -10,7 +10,7 @@ Market Intelligence Module
 4. 판매 가능성 예측 - AI 기반 점수 계산
 """
 
-import requests
+import http_client
 import hmac
 import hashlib
 import time
@@ -93,7 +93,7 @@ class CoupangMarketAnalyzer:
             url = f"{self.base_url}{path}?{query_string}"
             logger.info(f"[Coupang API] Searching for: {keyword}")
             
-            response = requests.get(url, headers=headers, timeout=30)
+            response = http_client.get(url, headers=headers, timeout=30)
             
             if response.status_code != 200:
                 logger.error(f"[Coupang API] Error {response.status_code}: {response.text[:200]}")
@@ -168,7 +168,7 @@ class CoupangMarketAnalyzer:
             url = f"{self.base_url}{path}?{query_string}"
             logger.info(f"[Coupang API] Getting bestsellers: {category}")
             
-            response = requests.get(url, headers=headers, timeout=30)
+            response = http_client.get(url, headers=headers, timeout=30)
             
             if response.status_code != 200:
                 logger.error(f"[Coupang API] Bestseller error: {response.status_code}")
@@ -257,7 +257,7 @@ class NaverMarketAnalyzer:
             
             logger.info(f"[Naver API] Searching: {keyword}")
             
-            response = requests.get(self.base_url, headers=headers, params=params, timeout=30)
+            response = http_client.get(self.base_url, headers=headers, params=params, timeout=30)
             
             if response.status_code != 200:
                 logger.error(f"[Naver API] Error {response.status_code}")
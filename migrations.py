@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+"""
+Versioned Schema Migrations
+- 스키마의 단일 정의 (init_db.py / auto_init_database / blue_ocean_discovery 통합)
+- schema_version 테이블에 적용된 번호를 기록, 미적용 migration만 순서대로 실행
+- 각 migration은 멱등(idempotent): 기존 DB(구 스키마)에 다시 실행해도 안전
+- migration마다 BEGIN IMMEDIATE 트랜잭션 → 여러 워커가 동시에 기동해도 한 번만 적용
+- append-only: 적용된 migration의 동작이 바뀌지 않도록 DDL/backfill SQL을 여기에 그대로 고정
+  (revenue_rollup, product_content 등 현재 모듈 코드를 호출하지 않음)
+
+Usage:
+    python3 migrations.py            # 최신 버전까지 적용
+    python3 migrations.py --status   # 현재 버전/미적용 목록 출력
+"""
+import os
+import sys
+import sqlite3
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'dropship.db')
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _columns(cursor, table):
+    cursor.execute(f'PRAGMA table_info({table})')
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _add_columns(cursor, table, columns):
+    """ALTER TABLE ADD COLUMN for each missing (name, type)"""
+    existing = _columns(cursor, table)
+    for name, col_type in columns:
+        if name not in existing:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {col_type}')
+
+
+# ============================================================================
+# MIGRATIONS
+# ============================================================================
+
+def _m001_base_schema(cursor):
+    """Core tables + default admin/config"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS config (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sourced_products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            original_url TEXT NOT NULL,
+            title_cn TEXT,
+            title_kr TEXT,
+            description_cn TEXT,
+            description_kr TEXT,
+            marketing_copy TEXT,
+            price_cny REAL,
+            price_krw INTEGER,
+            profit_margin REAL,
+            estimated_profit INTEGER,
+            traffic_score INTEGER,
+            safety_status TEXT,
+            images_json TEXT,
+            processed_images_json TEXT,
+            status TEXT DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            approved_at TIMESTAMP,
+            registered_at TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS marketplace_listings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_id INTEGER,
+            marketplace TEXT NOT NULL,
+            external_product_id TEXT,
+            listing_url TEXT,
+            current_stock INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'active',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP,
+            FOREIGN KEY (product_id) REFERENCES sourced_products (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_number TEXT UNIQUE NOT NULL,
+            marketplace TEXT NOT NULL,
+            product_id INTEGER,
+            customer_name TEXT,
+            customer_phone TEXT,
+            customer_address TEXT,
+            pccc TEXT NOT NULL,
+            pccc_validated BOOLEAN DEFAULT 0,
+            quantity INTEGER DEFAULT 1,
+            sale_price INTEGER NOT NULL,
+            purchase_price_cny REAL,
+            purchase_price_krw INTEGER,
+            applied_exchange_rate REAL NOT NULL,
+            shipping_cost INTEGER,
+            customs_tax INTEGER,
+            marketplace_fee INTEGER,
+            net_profit INTEGER,
+            original_product_url TEXT,
+            tracking_number TEXT,
+            order_status TEXT DEFAULT 'pending',
+            payment_status TEXT DEFAULT 'paid',
+            shipping_deadline TIMESTAMP,
+            ordered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            shipped_at TIMESTAMP,
+            delivered_at TIMESTAMP,
+            FOREIGN KEY (product_id) REFERENCES sourced_products (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stock_monitor_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_id INTEGER,
+            original_url TEXT,
+            check_status TEXT,
+            action_taken TEXT,
+            checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (product_id) REFERENCES sourced_products (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS activity_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            action_type TEXT NOT NULL,
+            description TEXT,
+            status TEXT,
+            details_json TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tax_records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER,
+            order_number TEXT,
+            sale_date DATE,
+            sale_amount INTEGER,
+            purchase_amount INTEGER,
+            shipping_cost INTEGER,
+            marketplace_fee INTEGER,
+            net_profit INTEGER,
+            applied_exchange_rate REAL,
+            exported BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (order_id) REFERENCES orders (id)
+        )
+    ''')
+
+    # Default admin user
+    cursor.execute("SELECT COUNT(*) FROM users WHERE username='admin'")
+    if cursor.fetchone()[0] == 0:
+        from werkzeug.security import generate_password_hash
+        password_hash = generate_password_hash('admin123', method='pbkdf2:sha256')
+        cursor.execute('INSERT INTO users (username, password_hash) VALUES (?, ?)',
+                       ('admin', password_hash))
+        logger.info('[DB-MIGRATE] ✅ Default admin user created (username: admin, password: admin123)')
+
+    # Default configuration (only on an empty config table)
+    cursor.execute('SELECT COUNT(*) FROM config')
+    if cursor.fetchone()[0] == 0:
+        default_configs = [
+            ('target_margin_rate', '30'),
+            ('cny_exchange_rate', '190'),
+            ('exchange_rate_buffer', '1.05'),
+            ('shipping_cost_base', '5000'),
+            ('customs_tax_rate', '0.10'),
+            ('naver_fee_rate', '0.06'),
+            ('coupang_fee_rate', '0.11'),
+            ('auto_register', 'false'),
+            ('gemini_api_key', ''),
+            ('openai_api_key', ''),
+            ('naver_client_id', ''),
+            ('naver_client_secret', ''),
+            ('coupang_access_key', ''),
+            ('coupang_secret_key', ''),
+            ('server_static_ip', ''),
+            ('debug_mode_ignore_filters', 'false'),  # Debug mode for diagnostics
+        ]
+        cursor.executemany('INSERT INTO config (key, value) VALUES (?, ?)', default_configs)
+
+
+def _m002_sourced_products_columns(cursor):
+    """Columns added after the first release (sourcing v2 / AI analysis)"""
+    _add_columns(cursor, 'sourced_products', [
+        ('keywords', 'TEXT'),
+        ('source_site', "TEXT DEFAULT 'alibaba'"),
+        ('moq', 'INTEGER DEFAULT 1'),
+        ('trend_score', 'INTEGER DEFAULT 0'),
+        ('competition_score', 'INTEGER DEFAULT 0'),
+        ('market_analysis_json', 'TEXT'),
+    ])
+
+
+def _m003_config_version(cursor):
+    """Cross-process config version counter (see get_config snapshot in app.py)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS config_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO config_version (id, version) VALUES (1, 0)')
+
+
+def _m004_rejected_products(cursor):
+    """Rejected product URLs (per keyword, with expiry)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rejected_products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_url TEXT UNIQUE NOT NULL,
+            product_title TEXT,
+            keyword TEXT,
+            rejected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP
+        )
+    ''')
+
+
+def _m005_blue_ocean_cache(cursor):
+    """
+    Blue Ocean cache table.
+    Older DBs created by migrate_blue_ocean_cache.py have market_data/no
+    UNIQUE(keyword): add the missing columns, keep the newest row per keyword.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS blue_ocean_cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyword TEXT UNIQUE,
+            blue_ocean_score REAL,
+            market_data_json TEXT,
+            analyzed_at TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    existing = _columns(cursor, 'blue_ocean_cache')
+    _add_columns(cursor, 'blue_ocean_cache', [
+        ('market_data_json', 'TEXT'),
+        ('analyzed_at', 'TEXT'),
+    ])
+    if 'market_data' in existing:
+        cursor.execute('''
+            UPDATE blue_ocean_cache
+            SET market_data_json = COALESCE(market_data_json, market_data),
+                analyzed_at = COALESCE(analyzed_at, created_at)
+        ''')
+    cursor.execute('''
+        DELETE FROM blue_ocean_cache
+        WHERE id NOT IN (SELECT MAX(id) FROM blue_ocean_cache GROUP BY keyword)
+    ''')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_blue_ocean_cache_keyword ON blue_ocean_cache(keyword)')
+
+
+def _m006_hot_path_indexes(cursor):
+    """
+    Secondary indexes for the hot queries (covering where cheap):
+    - 30-day duplicate check: status = 'pending' AND created_at >= ? → title_cn
+    - rejected filter: keyword = ? AND expires_at > ? → product_url
+    - expired rejection cleanup: expires_at <= ?
+    - order sync lookup (order_number = ? AND marketplace = ?) is already served
+      by the UNIQUE(order_number) autoindex, so no extra index for it
+    - dashboard aggregates: order_status / delivered_at → sale_price, net_profit
+    - activity log feed: ORDER BY created_at DESC
+    """
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_sourced_products_status_created
+        ON sourced_products(status, created_at, title_cn)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_rejected_products_keyword_expires
+        ON rejected_products(keyword, expires_at, product_url)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_rejected_products_expires
+        ON rejected_products(expires_at)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_orders_status_delivered
+        ON orders(order_status, delivered_at, sale_price, net_profit)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_activity_logs_created
+        ON activity_logs(created_at)
+    ''')
+    cursor.execute('ANALYZE')
+
+
+def _m007_revenue_rollups(cursor):
+    """daily_revenue / monthly_revenue rollups, backfilled from orders"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS daily_revenue (
+            day TEXT PRIMARY KEY,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            sales INTEGER NOT NULL DEFAULT 0,
+            profit INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_revenue (
+            month TEXT PRIMARY KEY,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            sales INTEGER NOT NULL DEFAULT 0,
+            profit INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('DELETE FROM daily_revenue')
+    cursor.execute('DELETE FROM monthly_revenue')
+    cursor.execute('''
+        INSERT INTO daily_revenue (day, order_count, sales, profit)
+        SELECT DATE(delivered_at), COUNT(*), COALESCE(SUM(sale_price), 0), COALESCE(SUM(net_profit), 0)
+        FROM orders
+        WHERE order_status = 'delivered' AND delivered_at IS NOT NULL
+        GROUP BY DATE(delivered_at)
+    ''')
+    cursor.execute('''
+        INSERT INTO monthly_revenue (month, order_count, sales, profit)
+        SELECT strftime('%Y-%m', delivered_at), COUNT(*), COALESCE(SUM(sale_price), 0), COALESCE(SUM(net_profit), 0)
+        FROM orders
+        WHERE order_status = 'delivered' AND delivered_at IS NOT NULL
+        GROUP BY strftime('%Y-%m', delivered_at)
+    ''')
+
+
+def _m008_list_pagination_indexes(cursor):
+    """Keyset pagination for /products and /orders: ORDER BY (created_at|ordered_at) DESC, id DESC"""
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_sourced_products_created_id
+        ON sourced_products(created_at, id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_orders_ordered_id
+        ON orders(ordered_at, id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_orders_status_ordered
+        ON orders(order_status, ordered_at)
+    ''')
+
+
+def _m009_product_content(cursor):
+    """
+    Heavy content (HTML/copy/analysis/processed images) → side table.
+    Moved as plain text (product_content.decode_blob reads it as-is);
+    new writes go through product_content.save_content and are compressed.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sourced_product_content (
+            product_id INTEGER PRIMARY KEY,
+            description_kr BLOB,
+            marketing_copy BLOB,
+            market_analysis_json BLOB,
+            processed_images_json BLOB,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (product_id) REFERENCES sourced_products (id)
+        )
+    ''')
+    cursor.execute('''
+        INSERT INTO sourced_product_content
+            (product_id, description_kr, marketing_copy, market_analysis_json, processed_images_json, updated_at)
+        SELECT id, description_kr, marketing_copy, market_analysis_json, processed_images_json, CURRENT_TIMESTAMP
+        FROM sourced_products
+        WHERE description_kr IS NOT NULL OR marketing_copy IS NOT NULL
+           OR market_analysis_json IS NOT NULL OR processed_images_json IS NOT NULL
+        ON CONFLICT(product_id) DO UPDATE SET
+            description_kr = COALESCE(excluded.description_kr, description_kr),
+            marketing_copy = COALESCE(excluded.marketing_copy, marketing_copy),
+            market_analysis_json = COALESCE(excluded.market_analysis_json, market_analysis_json),
+            processed_images_json = COALESCE(excluded.processed_images_json, processed_images_json),
+            updated_at = CURRENT_TIMESTAMP
+    ''')
+    cursor.execute('''
+        UPDATE sourced_products
+        SET description_kr = NULL, marketing_copy = NULL,
+            market_analysis_json = NULL, processed_images_json = NULL
+        WHERE description_kr IS NOT NULL OR marketing_copy IS NOT NULL
+           OR market_analysis_json IS NOT NULL OR processed_images_json IS NOT NULL
+    ''')
+
+
+def _m010_log_retention_indexes(cursor):
+    """log_retention.archive_table() scans stock_monitor_log by checked_at"""
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_stock_monitor_log_checked
+        ON stock_monitor_log(checked_at)
+    ''')
+
+
+def _m011_sync_watermarks(cursor):
+    """Per-marketplace order sync watermark (sync_naver_orders / sync_coupang_orders)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sync_watermarks (
+            marketplace TEXT PRIMARY KEY,
+            last_synced_at TEXT,
+            last_order_count INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _m012_title_index(cursor):
+    """
+    MinHash/LSH near-duplicate title index tables.
+    The signatures depend on the current hashing code, so the backfill is not
+    frozen here: app startup calls title_index.backfill_if_empty()
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS title_index_keywords (
+            product_id INTEGER PRIMARY KEY,
+            keywords TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS title_index_buckets (
+            band_key INTEGER NOT NULL,
+            product_id INTEGER NOT NULL,
+            PRIMARY KEY (band_key, product_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_title_index_buckets_product
+        ON title_index_buckets(product_id)
+    ''')
+
+
+def _m013_sourcing_jobs(cursor):
+    """Persistent background sourcing job queue"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sourcing_jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'queued',
+            mode TEXT NOT NULL,
+            keyword TEXT,
+            params_json TEXT,
+            stage TEXT,
+            stage_stats_json TEXT,
+            result_json TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_by INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            heartbeat_at TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_sourcing_jobs_status_created
+        ON sourcing_jobs(status, created_at)
+    ''')
+
+
+def _m014_translation_cache(cursor):
+    """Persistent tier of the keyword translation cache"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS translation_cache (
+            direction TEXT NOT NULL,
+            source_norm TEXT NOT NULL,
+            provider TEXT NOT NULL,
+            translated TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            last_hit_at REAL,
+            PRIMARY KEY (direction, source_norm, provider)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_translation_cache_last_hit
+        ON translation_cache(last_hit_at)
+    ''')
+
+
+def _m015_aliexpress_search_cache(cursor):
+    """Persistent tier of the AliExpress search response cache"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS aliexpress_search_cache (
+            cache_key TEXT PRIMARY KEY,
+            keyword_norm TEXT NOT NULL,
+            response_json TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            last_hit_at REAL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_aliexpress_search_cache_created
+        ON aliexpress_search_cache(created_at)
+    ''')
+
+
+# (version, name, function) — append only, never renumber
+MIGRATIONS = [
+    (1, 'base_schema', _m001_base_schema),
+    (2, 'sourced_products_columns', _m002_sourced_products_columns),
+    (3, 'config_version', _m003_config_version),
+    (4, 'rejected_products', _m004_rejected_products),
+    (5, 'blue_ocean_cache', _m005_blue_ocean_cache),
+    (6, 'hot_path_indexes', _m006_hot_path_indexes),
+    (7, 'revenue_rollups', _m007_revenue_rollups),
+    (8, 'list_pagination_indexes', _m008_list_pagination_indexes),
+    (9, 'product_content', _m009_product_content),
+    (10, 'log_retention_indexes', _m010_log_retention_indexes),
+    (11, 'sync_watermarks', _m011_sync_watermarks),
+    (12, 'title_index', _m012_title_index),
+    (13, 'sourcing_jobs', _m013_sourcing_jobs),
+    (14, 'translation_cache', _m014_translation_cache),
+    (15, 'aliexpress_search_cache', _m015_aliexpress_search_cache),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def _ensure_version_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def get_schema_version(conn):
+    """Highest applied migration number (0 for a fresh DB)"""
+    _ensure_version_table(conn)
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def run_migrations(db_path=None, target_version=None):
+    """
+    Apply pending migrations up to target_version (default: latest).
+
+    Returns:
+        list: applied migration versions
+    """
+    db_path = db_path or DB_PATH
+    target_version = target_version or LATEST_VERSION
+
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    applied = []
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table'").fetchone():
+            # Fresh DB: must be set before the first table exists (log_retention vacuums incrementally)
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        conn.execute('PRAGMA journal_mode=WAL')
+        _ensure_version_table(conn)
+
+        for version, name, migrate in MIGRATIONS:
+            if version > target_version:
+                break
+
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Re-check under the write lock (another worker may have applied it)
+                done = conn.execute('SELECT 1 FROM schema_version WHERE version = ?', (version,)).fetchone()
+                if done:
+                    conn.execute('COMMIT')
+                    continue
+
+                migrate(conn.cursor())
+                conn.execute('INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)',
+                             (version, name, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                conn.execute('COMMIT')
+                applied.append(version)
+                logger.info(f'[DB-MIGRATE] ✅ Applied migration {version:03d}_{name}')
+            except Exception:
+                conn.execute('ROLLBACK')
+                logger.error(f'[DB-MIGRATE] ❌ Migration {version:03d}_{name} failed')
+                raise
+    finally:
+        conn.close()
+
+    return applied
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    path = DB_PATH
+    if '--status' in sys.argv:
+        conn = sqlite3.connect(path)
+        current = get_schema_version(conn)
+        conn.close()
+        print(f'📁 Database: {path}')
+        print(f'📌 Schema version: {current} (latest: {LATEST_VERSION})')
+        for version, name, _ in MIGRATIONS:
+            mark = '✓' if version <= current else '·'
+            print(f'   {mark} {version:03d}_{name}')
+    else:
+        applied = run_migrations(path)
+        print(f'✅ Applied {len(applied)} migration(s): {applied}' if applied else '✅ Schema up to date')
@@ -5,6 +5,7 @@ Extends market_analysis.py with detailed review and rating analysis
 """
 
 import requests
+import naver_search_cache
 import json
 import logging
 from datetime import datetime
@@ -45,23 +46,17 @@ class NaverShoppingAPI:
         logger.info(f"[Naver API] Searching for: {keyword}")
         
         try:
-            params = {
-                "query": keyword,
-                "display": min(display, 100),
-                "sort": sort
-            }
-            
-            response = requests.get(self.BASE_URL, headers=self.headers, params=params, timeout=15)
+            status_code, data = naver_search_cache.search(keyword, self.client_id, self.client_secret,
+                                                          display=display, sort=sort, timeout=15)
             
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 items = data.get('items', [])
                 
                 logger.info(f"[Naver API] ✅ Found {len(items)} products")
                 
                 return self._parse_search_results(data, keyword)
             
-            elif response.status_code == 401:
+            elif status_code == 401:
                 logger.error("[Naver API] ❌ Authentication failed - check API credentials")
                 return {
                     'success': False,
@@ -69,7 +64,7 @@ class NaverShoppingAPI:
                     'products': []
                 }
             
-            elif response.status_code == 429:
+            elif status_code == 429:
                 logger.error("[Naver API] ❌ Rate limit exceeded")
                 return {
                     'success': False,
@@ -78,10 +73,10 @@ class NaverShoppingAPI:
                 }
             
             else:
-                logger.error(f"[Naver API] ❌ API error: {response.status_code}")
+                logger.error(f"[Naver API] ❌ API error: {status_code}")
                 return {
                     'success': False,
-                    'error': f'Naver API error: {response.status_code}',
+                    'error': f'Naver API error: {status_code}',
                     'products': []
                 }
         
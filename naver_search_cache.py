@@ -0,0 +1,158 @@
+"""
+Naver Shopping Search Payload Cache (in-memory TTL + single-flight)
+- 키: (정규화된 키워드, display, sort) → 네이버 쇼핑 검색 API 원본 응답(JSON)만 저장
+  카테고리 필터/가격 통계 등 파생 결과는 호출자가 매번 원본에서 계산 (필터 조건이 호출마다 다름)
+- 같은 키를 동시에 요청하면 첫 호출만 네이버에 요청하고 나머지는 그 결과를 공유 (single-flight)
+  → 같은 키워드로 동시에 도는 소싱 작업이 네이버를 한꺼번에 호출하지 않음
+- 200 응답만 저장; 오류 응답/예외는 기다리던 호출자 모두에게 그대로 전달하고 저장하지 않음
+  단, 첫 호출자 자신의 타임아웃/deadline 때문에 실패한 경우는 전달하지 않고
+  기다리던 호출자가 자기 예산으로 다시 시도 (예산이 넉넉한 호출자가 남의 이유로 실패하지 않도록)
+- 조회마다 새 객체 반환 (원본 JSON 문자열 보관)
+- deadline: 요청 타임아웃과 다른 호출 결과를 기다리는 시간 모두 남은 예산 이내
+"""
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+import requests
+
+import http_client
+import rate_limiter
+import translation_cache
+from deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+SEARCH_URL = 'https://openapi.naver.com/v1/search/shop.json'
+CACHE_TTL_SEC = 10 * 60
+MAX_ENTRIES = 256
+FLIGHT_WAIT_SEC = 60      # 다른 호출의 결과를 기다리는 최대 시간 (넘으면 직접 요청)
+
+_cache = OrderedDict()    # key → (payload_json, fetched_at)
+_flights = {}             # key → _Flight
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0, 'follower_retries': 0}
+
+# 요청한 호출자의 타임아웃/예산에 따른 실패 → 다른 호출자에게 공유하지 않음
+CALLER_SCOPED_ERRORS = (DeadlineExceeded, requests.exceptions.Timeout)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None      # (status_code, payload_json or None)
+        self.error = None
+        self.retry = False      # leader failed for its own reasons → followers request themselves
+
+
+def _key(keyword, display, sort):
+    return (translation_cache.normalize(keyword), int(display), sort)
+
+
+def _fetch(keyword, client_id, client_secret, display, sort, timeout, deadline):
+    rate_limiter.acquire('naver', deadline=deadline)
+    response = http_client.get(
+        SEARCH_URL,
+        headers={'X-Naver-Client-Id': client_id, 'X-Naver-Client-Secret': client_secret},
+        params={'query': keyword, 'display': display, 'sort': sort},
+        timeout=timeout,
+        deadline=deadline
+    )
+    if response.status_code != 200:
+        return response.status_code, None
+    return 200, response.text
+
+
+def search(keyword, client_id, client_secret, display=100, sort='sim', timeout=10, deadline=None):
+    """
+    Raw Naver Shopping search payload.
+
+    deadline (deadline.Deadline) bounds both the request and the wait for an
+    in-flight request of another caller (DeadlineExceeded when it runs out).
+
+    Returns:
+        (status_code, payload dict or None). Request exceptions propagate
+        (to every caller waiting on the same in-flight request).
+    """
+    display = min(int(display), 100)
+    key = _key(keyword, display, sort)
+
+    while True:
+        now = time.time()
+        with _lock:
+            entry = _cache.get(key)
+            if entry is not None and entry[1] > now - CACHE_TTL_SEC:
+                _cache.move_to_end(key)
+                _stats['hits'] += 1
+                return 200, json.loads(entry[0])
+            flight = _flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _flights[key] = _Flight()
+                _stats['misses'] += 1
+            else:
+                _stats['coalesced'] += 1
+
+        if leader:
+            break
+
+        logger.info(f'[NaverCache] ⏳ Waiting for in-flight search: {keyword}')
+        wait_sec = FLIGHT_WAIT_SEC if deadline is None else deadline.timeout(FLIGHT_WAIT_SEC, 'Naver search')
+        if flight.done.wait(wait_sec):
+            if flight.retry:
+                with _lock:
+                    _stats['follower_retries'] += 1
+                logger.info(f'[NaverCache] 🔁 In-flight search hit its caller\'s timeout, retrying: {keyword}')
+                continue
+            if flight.error is not None:
+                raise flight.error
+            status, payload_json = flight.result
+            return status, json.loads(payload_json) if payload_json else None
+        logger.warning(f'[NaverCache] ⚠️ In-flight search timed out, requesting directly: {keyword}')
+        status, payload_json = _fetch(keyword, client_id, client_secret, display, sort, timeout, deadline)
+        return status, json.loads(payload_json) if payload_json else None
+
+    try:
+        status, payload_json = _fetch(keyword, client_id, client_secret, display, sort, timeout, deadline)
+        flight.result = (status, payload_json)
+        with _lock:
+            if payload_json:
+                _cache[key] = (payload_json, time.time())
+                _cache.move_to_end(key)
+                while len(_cache) > MAX_ENTRIES:
+                    _cache.popitem(last=False)
+            else:
+                _stats['errors'] += 1
+    except CALLER_SCOPED_ERRORS:
+        flight.retry = True
+        with _lock:
+            _stats['errors'] += 1
+        raise
+    except Exception as e:
+        flight.error = e
+        with _lock:
+            _stats['errors'] += 1
+        raise
+    finally:
+        with _lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+    return status, json.loads(payload_json) if payload_json else None
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+
+
+def get_stats():
+    with _lock:
+        stats = dict(_stats)
+        stats['entries'] = len(_cache)
+        stats['in_flight'] = len(_flights)
+    lookups = stats['hits'] + stats['misses'] + stats['coalesced']
+    stats['hit_rate'] = round((stats['hits'] + stats['coalesced']) / lookups, 3) if lookups else None
+    return stats
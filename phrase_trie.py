@@ -0,0 +1,111 @@
+"""
+Compiled Phrase Dictionary (trie, greedy longest-match)
+- 규칙 기반 번역 사전({구문: 번역})을 모듈 import 시 한 번만 트라이로 컴파일
+  (기존: 호출마다 dict 리터럴 생성 + 키마다 부분문자열 검색, "긴 구문 우선"은 dict 순서에 의존)
+- tokenize(): 텍스트를 왼쪽부터 1패스로 훑으며 각 위치에서 가장 긴 구문을 매칭
+  → 결과가 사전 순서와 무관하게 결정적
+- 대소문자 무시 (빌드 시 키 소문자화, 검사 시 텍스트 lower() 1회)
+- word_boundary=True: 영문처럼 단어 경계에서만 매칭 ("cat"이 "cathode"에 매칭되지 않음)
+  한글 사전은 False (조사/붙여쓰기 때문에 부분문자열 매칭)
+"""
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+class PhraseTrie:
+    """Greedy longest-match tokenizer over a {phrase: value} dictionary"""
+
+    _END = object()  # trie node key holding (phrase, value)
+
+    def __init__(self, mapping, word_boundary=False):
+        self.word_boundary = word_boundary
+        self._root = {}
+        self._size = 0
+        for phrase, value in mapping.items():
+            folded = str(phrase).lower()
+            if not folded:
+                continue
+            node = self._root
+            for char in folded:
+                node = node.setdefault(char, {})
+            if self._END not in node:
+                self._size += 1
+            node[self._END] = (phrase, value)
+
+    def __len__(self):
+        return self._size
+
+    def _boundary(self, text, pos):
+        """\\b semantics: word/non-word transition (text edges count as non-word)"""
+        before = pos > 0 and _is_word_char(text[pos - 1])
+        after = pos < len(text) and _is_word_char(text[pos])
+        return before != after
+
+    def _longest_at(self, text, start):
+        """Longest phrase starting at `start` → (end, phrase, value) or None"""
+        if self.word_boundary and not self._boundary(text, start):
+            return None
+        node = self._root
+        best = None
+        pos = start
+        while pos < len(text):
+            node = node.get(text[pos])
+            if node is None:
+                break
+            pos += 1
+            hit = node.get(self._END)
+            if hit is not None and (not self.word_boundary or self._boundary(text, pos)):
+                best = (pos, hit[0], hit[1])
+        return best
+
+    def tokenize(self, text):
+        """
+        Split text into matched phrases and unmatched runs, left to right.
+
+        Returns:
+            [(start, end, phrase, value)] covering the whole text;
+            phrase/value are None for unmatched runs
+        """
+        folded = (text or '').lower()
+        tokens = []
+        run_start = 0
+        pos = 0
+        while pos < len(folded):
+            hit = self._longest_at(folded, pos)
+            if hit is None:
+                pos += 1
+                continue
+            if run_start < pos:
+                tokens.append((run_start, pos, None, None))
+            end, phrase, value = hit
+            tokens.append((pos, end, phrase, value))
+            pos = run_start = end
+        if run_start < len(folded):
+            tokens.append((run_start, len(folded), None, None))
+        return tokens
+
+    def matches(self, text):
+        """Matched (phrase, value) pairs in text order"""
+        return [(phrase, value) for _, _, phrase, value in self.tokenize(text) if phrase is not None]
+
+    def lookup(self, text):
+        """Value for an exact (case-insensitive) phrase, or None"""
+        node = self._root
+        for char in (text or '').lower():
+            node = node.get(char)
+            if node is None:
+                return None
+        hit = node.get(self._END)
+        return hit[1] if hit else None
+
+    def longest(self, text):
+        """Longest phrase found anywhere in text (leftmost on ties) → (phrase, value) or None"""
+        folded = (text or '').lower()
+        best = None
+        for pos in range(len(folded)):
+            hit = self._longest_at(folded, pos)
+            if hit is not None and (best is None or hit[0] - pos > best[0]):
+                best = (hit[0] - pos, hit[1], hit[2])
+        return (best[1], best[2]) if best else None
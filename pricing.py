@@ -0,0 +1,205 @@
+"""
+Unified Pricing Engine
+- 모든 마진/판매가 계산의 단일 구현 (소싱, 주문 생성, 알리 매칭, AI 소싱)
+- 설정값은 스냅샷으로 한 번만 읽고, 후보 리스트 전체를 NumPy 배열로 한 번에 계산
+- NumPy가 없으면 동일한 공식을 순수 Python으로 계산 (결과 동일)
+
+공식:
+    purchase_price_krw = floor(price_cny × 환율 × 환율버퍼)
+    customs_tax        = floor(purchase_price_krw × 관세율)   (purchase > customs_threshold_krw 일 때)
+    total_cost         = purchase_price_krw + 배송비 + customs_tax
+    sale_price         = 시장가 있음 → floor(시장가 × price_factor)
+                         시장가 없음 → total_cost / (1 - 목표마진 - 수수료율), 100원 단위 올림
+    marketplace_fee    = floor(sale_price × 수수료율)
+    profit             = sale_price - total_cost - marketplace_fee
+    margin             = profit / sale_price × 100
+
+목표마진 + 수수료율이 100%에 가까우면 원가 기준 판매가를 계산할 수 없음:
+load_pricing_config()가 목표마진을 MIN_COST_PLUS_DIVISOR를 남기는 값으로 제한하고,
+그래도 분모가 0 이하인 설정(직접 만든 config)은 sale_price=0, margin=0으로 계산 → 마진 필터에서 탈락
+"""
+import logging
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is in requirements.txt
+    np = None
+
+import db_pool
+
+logger = logging.getLogger(__name__)
+
+USD_TO_CNY = 7.2  # AliExpress API prices are USD (1 USD ≈ 7.2 CNY)
+
+PRICING_DEFAULTS = {
+    'cny_exchange_rate': 190.0,
+    'exchange_rate_buffer': 1.05,
+    'shipping_cost_base': 5000.0,
+    'customs_tax_rate': 0.10,
+    'customs_threshold_krw': 0.0,  # 0 = 항상 관세 적용 (보수적)
+    'target_margin_rate': 30.0,
+    'naver_fee_rate': 0.06,
+    'coupang_fee_rate': 0.11,
+}
+
+MIN_COST_PLUS_DIVISOR = 0.05   # 1 - 목표마진 - 수수료율 의 최소값 (판매가 ≤ 원가 × 20)
+
+RESULT_FIELDS = ('purchase_price_krw', 'shipping_cost', 'customs_tax', 'total_cost',
+                 'sale_price', 'marketplace_fee', 'profit', 'margin')
+
+
+def load_pricing_config(snapshot=None):
+    """
+    Pricing constants from a config snapshot ({key: raw value}).
+    Without a snapshot the config table is read once via db_pool.
+    """
+    if snapshot is None:
+        conn = db_pool.get_connection()
+        try:
+            placeholders = ', '.join('?' for _ in PRICING_DEFAULTS)
+            rows = conn.execute(f'SELECT key, value FROM config WHERE key IN ({placeholders})',
+                                list(PRICING_DEFAULTS)).fetchall()
+        finally:
+            conn.close()
+        snapshot = {row['key']: row['value'] for row in rows}
+
+    config = {}
+    for key, default in PRICING_DEFAULTS.items():
+        value = snapshot.get(key)
+        try:
+            config[key] = float(value) if value not in (None, '') else default
+        except (TypeError, ValueError):
+            logger.warning(f'[Pricing] ⚠️ Invalid config {key}={value!r}, using {default}')
+            config[key] = default
+
+    # 목표마진 + 가장 높은 수수료율이 분모를 0 이하로 만들지 않도록 제한
+    max_fee = max(config['naver_fee_rate'], config['coupang_fee_rate'])
+    max_margin = (1 - max_fee - MIN_COST_PLUS_DIVISOR) * 100
+    if config['target_margin_rate'] > max_margin:
+        logger.warning(f'[Pricing] ⚠️ target_margin_rate={config["target_margin_rate"]} leaves no room for '
+                       f'fees ({max_fee:.2f}), using {max_margin:.1f}')
+        config['target_margin_rate'] = max_margin
+    return config
+
+
+def _cost_plus_divisor(config, fee_rate):
+    """1 - target margin - fee rate (≤ 0 means no cost-plus price exists)"""
+    # 반올림: 94% + 0.06 처럼 정확히 0이어야 할 값이 1e-17로 남아 판매가가 폭주하지 않도록
+    return round(1 - config['target_margin_rate'] / 100 - fee_rate, 9)
+
+
+def _fee_rate(config, marketplace):
+    return config.get(f'{marketplace}_fee_rate', config['naver_fee_rate'])
+
+
+def _price_numpy(prices_cny, config, market_prices, price_factor, fee_rate):
+    price_cny = np.asarray(prices_cny, dtype=np.float64)
+    purchase = np.floor(price_cny * config['cny_exchange_rate'] * config['exchange_rate_buffer'])
+    customs = np.where(purchase > config['customs_threshold_krw'],
+                       np.floor(purchase * config['customs_tax_rate']), 0.0)
+    shipping = np.full_like(purchase, config['shipping_cost_base'])
+    total_cost = purchase + shipping + customs
+
+    if market_prices is None:
+        divisor = _cost_plus_divisor(config, fee_rate)
+        if divisor > 0:
+            sale_price = np.floor(total_cost / divisor)
+            sale_price = np.floor((sale_price + 99) / 100) * 100
+        else:
+            sale_price = np.zeros_like(total_cost)
+    else:
+        market = np.broadcast_to(np.asarray(market_prices, dtype=np.float64), purchase.shape)
+        sale_price = np.floor(np.maximum(market, 0.0) * price_factor)
+
+    fee = np.floor(sale_price * fee_rate)
+    profit = sale_price - total_cost - fee
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margin = np.where(sale_price > 0, profit / sale_price * 100, 0.0)
+
+    return {
+        'purchase_price_krw': purchase.astype(np.int64),
+        'shipping_cost': shipping.astype(np.int64),
+        'customs_tax': customs.astype(np.int64),
+        'total_cost': total_cost.astype(np.int64),
+        'sale_price': sale_price.astype(np.int64),
+        'marketplace_fee': fee.astype(np.int64),
+        'profit': profit.astype(np.int64),
+        'margin': margin,
+    }
+
+
+def _price_python(prices_cny, config, market_prices, price_factor, fee_rate):
+    if market_prices is None or isinstance(market_prices, (int, float)):
+        market_prices = [market_prices] * len(prices_cny)
+
+    result = {name: [] for name in RESULT_FIELDS}
+    for price_cny, market_price in zip(prices_cny, market_prices):
+        purchase = int(float(price_cny) * config['cny_exchange_rate'] * config['exchange_rate_buffer'] // 1)
+        customs = int(purchase * config['customs_tax_rate'] // 1) if purchase > config['customs_threshold_krw'] else 0
+        shipping = int(config['shipping_cost_base'])
+        total_cost = purchase + shipping + customs
+
+        if market_price is None:
+            divisor = _cost_plus_divisor(config, fee_rate)
+            if divisor > 0:
+                sale_price = int(total_cost / divisor // 1)
+                sale_price = ((sale_price + 99) // 100) * 100
+            else:
+                sale_price = 0
+        else:
+            sale_price = int(max(float(market_price), 0.0) * price_factor // 1)
+
+        fee = int(sale_price * fee_rate // 1)
+        profit = sale_price - total_cost - fee
+        margin = profit / sale_price * 100 if sale_price > 0 else 0.0
+
+        for name, value in zip(RESULT_FIELDS, (purchase, shipping, customs, total_cost,
+                                               sale_price, fee, profit, margin)):
+            result[name].append(value)
+    return result
+
+
+def price_candidates(prices_cny, config, market_prices=None, price_factor=1.0, marketplace='naver'):
+    """
+    Price a whole candidate list in one pass.
+
+    Args:
+        prices_cny: purchase prices in CNY (sequence)
+        config: load_pricing_config() result
+        market_prices: None → cost-plus pricing at target_margin_rate;
+                       scalar or sequence → sell at market_price × price_factor
+        marketplace: selects the fee rate (naver/coupang)
+
+    Returns:
+        dict of arrays (NumPy) / lists keyed by RESULT_FIELDS
+    """
+    fee_rate = _fee_rate(config, marketplace)
+    if np is not None:
+        return _price_numpy(prices_cny, config, market_prices, price_factor, fee_rate)
+    return _price_python(list(prices_cny), config, market_prices, price_factor, fee_rate)
+
+
+def to_rows(result, config=None):
+    """Column arrays → list of plain-Python dicts (one per candidate)"""
+    # ndarray.tolist() converts to Python int/float in C (much faster than per-item casts)
+    columns = [result[name].tolist() if hasattr(result[name], 'tolist') else result[name]
+               for name in RESULT_FIELDS]
+    rows = []
+    for values in zip(*columns):
+        row = dict(zip(RESULT_FIELDS, values))
+        row['margin'] = float(row['margin'])
+        if config is not None:
+            row['exchange_rate'] = config['cny_exchange_rate']
+        rows.append(row)
+    return rows
+
+
+def price_rows(prices_cny, config, **kwargs):
+    """price_candidates() + to_rows()"""
+    return to_rows(price_candidates(prices_cny, config, **kwargs), config)
+
+
+def price_one(price_cny, config, market_price=None, price_factor=1.0, marketplace='naver'):
+    """Single-product convenience wrapper (same math as the batch path)"""
+    return price_rows([price_cny], config, market_prices=market_price,
+                      price_factor=price_factor, marketplace=marketplace)[0]
@@ -0,0 +1,142 @@
+"""
+Product Content Side Table (sourced_product_content)
+- 큰 TEXT 필드(상세페이지 HTML, 마케팅 문구, 시장분석 JSON, 가공 이미지 JSON)를
+  sourced_products 행에서 분리 → 목록/중복검사/상태변경이 작은 행만 읽음
+- zlib 압축 BLOB으로 저장, 읽을 때 자동 복원 (압축 안 된 구 데이터도 그대로 읽힘)
+- 상세 화면(product_detail), 콘텐츠 생성(generate_content), 마켓 등록(register_product)
+  등 실제로 필요한 곳에서만 로드
+- migration 009가 옮긴 기존 데이터는 평문 → 앱 기동 시 compress_legacy_content()로 압축
+  (기존 DB에서 공간까지 반환하려면 서버 중지 후 --compact, 전체 VACUUM)
+
+Usage:
+    python3 product_content.py --compact    # 남은 평문 압축 + VACUUM
+"""
+import sys
+import zlib
+import sqlite3
+
+CONTENT_FIELDS = ('description_kr', 'marketing_copy', 'market_analysis_json', 'processed_images_json')
+
+COMPRESSION_LEVEL = 6
+
+
+def encode_blob(text):
+    """str → zlib-compressed bytes (None stays None)"""
+    if text is None:
+        return None
+    return zlib.compress(str(text).encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def decode_blob(value):
+    """zlib bytes → str; plain str (legacy / uncompressed) is returned as-is"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    try:
+        return zlib.decompress(value).decode('utf-8')
+    except zlib.error:
+        return bytes(value).decode('utf-8', errors='replace')
+
+
+def save_content(cursor, product_id, **fields):
+    """
+    Upsert the given content fields for one product (others are left untouched).
+
+    save_content(cursor, 12, description_kr=html, marketing_copy=copy)
+    """
+    unknown = set(fields) - set(CONTENT_FIELDS)
+    if unknown:
+        raise ValueError(f'Unknown content field(s): {", ".join(sorted(unknown))}')
+    if not fields:
+        return
+
+    names = list(fields)
+    placeholders = ', '.join('?' for _ in names)
+    updates = ', '.join(f'{name} = excluded.{name}' for name in names)
+    cursor.execute(f'''
+        INSERT INTO sourced_product_content (product_id, {', '.join(names)}, updated_at)
+        VALUES (?, {placeholders}, CURRENT_TIMESTAMP)
+        ON CONFLICT(product_id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+    ''', [product_id] + [encode_blob(fields[name]) for name in names])
+
+
+def load_content(cursor, product_id, fields=CONTENT_FIELDS):
+    """Decoded content fields for one product (missing row → all None)"""
+    cursor.execute(f'SELECT {", ".join(fields)} FROM sourced_product_content WHERE product_id = ?',
+                   (product_id,))
+    row = cursor.fetchone()
+    if not row:
+        return {name: None for name in fields}
+    return {name: decode_blob(row[i]) for i, name in enumerate(fields)}
+
+
+def with_content(cursor, product_row, fields=CONTENT_FIELDS):
+    """
+    sourced_products row + its content as one dict, so templates/code can keep
+    using product['description_kr'] etc. Legacy inline values are used as a
+    fallback for rows that haven't been migrated.
+    """
+    product = dict(product_row)
+    content = load_content(cursor, product['id'], fields)
+    for name in fields:
+        if content[name] is not None or name not in product:
+            product[name] = content[name]
+    return product
+
+
+def delete_content(cursor, product_ids):
+    cursor.executemany('DELETE FROM sourced_product_content WHERE product_id = ?',
+                       [(product_id,) for product_id in product_ids])
+
+
+def compress_legacy_content(cursor, batch_size=500):
+    """
+    Compress content still stored as plain text (rows moved by migration 009).
+    One batch per call → returns the number of products compressed (0 = done).
+    """
+    any_text = ' OR '.join(f"typeof({name}) = 'text'" for name in CONTENT_FIELDS)
+    cursor.execute(f'''
+        SELECT product_id, {', '.join(CONTENT_FIELDS)} FROM sourced_product_content
+        WHERE {any_text} LIMIT ?
+    ''', (batch_size,))
+    rows = cursor.fetchall()
+    cursor.executemany(
+        f'''UPDATE sourced_product_content SET {', '.join(f'{name} = ?' for name in CONTENT_FIELDS)}
+            WHERE product_id = ?''',
+        [[encode_blob(value) if isinstance(value, str) else value for value in row[1:]] + [row[0]]
+         for row in rows])
+    return len(rows)
+
+
+def compress_all(conn, batch_size=500):
+    """Compress every legacy row, one short BEGIN IMMEDIATE transaction per batch (autocommit conn)"""
+    total = 0
+    while True:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            compressed = compress_legacy_content(conn.cursor(), batch_size)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        total += compressed
+        if compressed < batch_size:
+            return total
+
+
+if __name__ == '__main__':
+    if '--compact' not in sys.argv:
+        print(__doc__)
+        sys.exit(0)
+
+    from migrations import run_migrations, DB_PATH
+    run_migrations(DB_PATH)
+
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    try:
+        total = compress_all(conn)
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+    print(f'✅ Compressed {total} product(s), database vacuumed')
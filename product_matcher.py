@@ -10,17 +10,25 @@ Product Matching Engine v2.0
 """
 
 import logging
-import sqlite3
+import db_pool
+import keyword_matcher
+from phrase_trie import PhraseTrie
+import rate_limiter
+import translation_cache
+from deadline import call_timeout
 import re
+import json
 from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+AI_TIMEOUT_SEC = 30   # Gemini/OpenAI 번역 요청 1회 최대 대기 (요청 deadline이 있으면 남은 예산 이내)
+
 
 def get_config(key: str, default=None):
     """설정값 조회"""
     try:
-        conn = sqlite3.connect('dropship.db')
+        conn = db_pool.get_connection()  # 절대 경로 + 풀링된 연결
         cursor = conn.cursor()
         cursor.execute('SELECT value FROM config WHERE key = ?', (key,))
         row = cursor.fetchone()
@@ -35,16 +43,167 @@ def get_config(key: str, default=None):
 # 1. 영문 → 한글 AI 번역 (Gemini → OpenAI → 규칙 기반)
 # ============================================================================
 
-def translate_english_to_korean(english_text: str) -> str:
+ENG_TO_KOR_MAP = {
+    # 🔧 복합어 우선 매칭 (긴 것부터!)
+    # 원예/정원 (NEW)
+    'automatic drip irrigation system': '자동 점적 관수 시스템',
+    'drip irrigation system': '점적 관수 시스템',
+    'drip irrigation': '점적 관수',
+    'irrigation system': '관수 시스템',
+    'watering device': '물주기 장치',
+    'self watering': '자동 물주기',
+    
+    # 의약품/파우치 (NEW)
+    'pill pouch bag': '약 파우치',
+    'pill organizer': '약 정리함',
+    'pill pouch': '약 파우치',
+    'medicine organizer': '약통 정리함',
+    'medication organizer': '약 정리함',
+    
+    # 실리콘 제품 (긴 복합어가 먼저 매칭됨)
+    'silicone cooking utensil': '실리콘 조리도구',
+    'silicone kitchenware': '실리콘 주방용품',
+    'silicone baking': '실리콘 베이킹',
+    'silicone mold': '실리콘 몰드',
+    'silicone mould': '실리콘 금형',
+    'baking mold': '베이킹 몰드',
+    'cake mold': '케이크 틀',
+    'silicone': '실리콘',  # 🔧 폴백: 위 패턴 실패 시
+    
+    # 가전/전자
+    'hair dryer': '헤어 드라이어',
+    'power bank': '보조배터리',
+    'air purifier': '공기청정기',
+    'phone holder': '휴대폰 거치대',
+    'car charger': '차량용 충전기',
+    'bluetooth speaker': '블루투스 스피커',
+    'pet feeder': '반려동물 급식기',
+    'fan blade': '선풍기 날개',
+    
+    # 게이밍/컴퓨터
+    'gaming mouse pad': '게이밍 마우스패드',
+    'mouse pad': '마우스 패드',
+    'mousepad': '마우스패드',
+    'wrist rest': '손목받침대',
+    'palm rest': '손목받침대',
+    'keyboard pad': '키보드 패드',
+    
+    # 전자제품
+    'phone': '휴대폰',
+    'mobile': '휴대폰',
+    'holder': '거치대',
+    'mount': '거치대',
+    'stand': '거치대',
+    'charger': '충전기',
+    'cable': '케이블',
+    'adapter': '어댑터',
+    'earphone': '이어폰',
+    'earphones': '이어폰',
+    'headphone': '헤드폰',
+    'speaker': '스피커',
+    'bluetooth': '블루투스',
+    'wireless': '무선',
+    'keyboard': '키보드',
+    # 'mouse': '마우스',  # 🔧 제거: "mouse pad"를 "마우스"로 오역 방지
+    'dryer': '드라이어',
+    'diffuser': '디퓨저',
+    'blower': '블로워',
+    
+    # 차량용품
+    'car': '차량용',
+    'vehicle': '차량용',
+    'automobile': '자동차',
+    'motorcycle': '오토바이',
+    'bike': '자전거',
+    'bicycle': '자전거',
+    
+    # 가전제품
+    'humidifier': '가습기',
+    # 'fan': '선풍기',  # 🔧 제거: "hair dryer fan"을 "선풍기"로 오역 방지
+    'heater': '히터',
+    'vacuum': '청소기',
+    'cleaner': '청소기',
+    'washer': '세척기',
+    
+    # 생활용품
+    'organizer': '정리함',
+    'storage': '수납',
+    'bag': '가방',
+    'case': '케이스',
+    'cover': '커버',
+    'clip': '집게',
+    'eyebrow': '눈썹',
+    'switch': '스위치',
+    'rocker': '로커',
+    'control': '제어',
+    'pad': '패드',  # 🔧 추가
+    'mat': '매트',  # 🔧 추가
+    'cushion': '쿠션',  # 🔧 추가
+    'foam': '폼',  # 🔧 추가
+    'memory foam': '메모리 폼',  # 🔧 추가
+    'gaming': '게이밍',  # 🔧 추가
+    'gamer': '게이머',  # 🔧 추가
+    'rgb': 'RGB',  # 🔧 추가
+    'led': 'LED',  # 🔧 추가
+    'large': '대형',  # 🔧 추가
+    'xxl': '초대형',  # 🔧 추가
+    
+    # 반려동물
+    'pet': '반려동물',
+    'dog': '강아지',
+    'cat': '고양이',
+    'feeder': '급식기',
+    'bowl': '밥그릇',
+    
+    # 형용사
+    'automatic': '자동',
+    'smart': '스마트',
+    'portable': '휴대용',
+    'mini': '미니',
+    'small': '소형',  # 🔧 추가
+    'usb': 'USB',
+    'high pressure': '고압',
+    'waterproof': '방수',
+    'plastic': '플라스틱',  # 🔧 추가
+}
+
+
+# import 시 한 번만 컴파일 (단어 경계 매칭: "cat"이 "cathode"에 매칭되지 않음)
+_ENG_TO_KOR_TRIE = PhraseTrie(ENG_TO_KOR_MAP, word_boundary=True)
+
+
+def translate_english_to_korean_rules(english_text: str) -> Optional[str]:
+    """
+    규칙 기반 영→한 변환 (ENG_TO_KOR_MAP, 왼쪽부터 가장 긴 구문 우선)
+    
+    Returns:
+        한글 키워드 (원문 등장 순서), 매칭되는 단어가 없으면 None
+    """
+    korean_words = []
+    for _, kor in _ENG_TO_KOR_TRIE.matches(' '.join(english_text.split())):
+        if kor not in korean_words:
+            korean_words.append(kor)
+    
+    return ' '.join(korean_words) if korean_words else None
+
+
+def translate_english_to_korean(english_text: str, deadline=None) -> str:
     """
     영문 제품명/키워드 → 한글 키워드 변환
     
     Args:
         english_text: 영문 제품명 (예: "Bicycle Phone Holder")
+        deadline: 요청 단위 Deadline (남은 예산이 없으면 AI 호출 없이 규칙 기반)
     
     Returns:
         한글 키워드 (예: "자전거 휴대폰 거치대")
     """
+    # 💾 번역 캐시 (메모리 LRU → DB): 같은 상품명/키워드를 하루 종일 다시 번역하지 않음
+    cached = translation_cache.get('en-ko', english_text)
+    if cached:
+        logger.info(f"[ENG→KOR Cache] ✅ {english_text} → {cached}")
+        return cached
+    
     import google.generativeai as genai
     import openai
     
@@ -73,11 +232,17 @@ Examples:
 English: {english_text}
 Korean:"""
             
-            response = model.generate_content(prompt)
+            timeout = call_timeout(deadline, AI_TIMEOUT_SEC, 'Gemini translation')
+            rate_limiter.acquire('gemini', deadline=deadline)
+            response = model.generate_content(prompt, request_options={'timeout': timeout})
             korean = response.text.strip()
             
-            logger.info(f"[ENG→KOR Gemini] ✅ {english_text} → {korean}")
-            return korean
+            # 🔧 FIX: 한글이 없는 응답은 캐시하지 않고 다음 단계로 (배치 번역과 동일한 검증)
+            if has_hangul(korean):
+                logger.info(f"[ENG→KOR Gemini] ✅ {english_text} → {korean}")
+                translation_cache.put('en-ko', english_text, korean, 'gemini')
+                return korean
+            logger.warning(f"[ENG→KOR Gemini] ⚠️ Not Korean, ignored: {english_text} → {korean}")
             
         except Exception as e:
             logger.warning(f"[ENG→KOR Gemini] ❌ Failed: {e}")
@@ -88,6 +253,8 @@ Korean:"""
         try:
             openai.api_key = openai_key
             
+            timeout = call_timeout(deadline, AI_TIMEOUT_SEC, 'OpenAI translation')
+            rate_limiter.acquire('openai', deadline=deadline)
             response = openai.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[{
@@ -99,167 +266,25 @@ English: {english_text}
 Korean:"""
                 }],
                 max_tokens=30,
-                temperature=0.3
+                temperature=0.3,
+                timeout=timeout
             )
             
             korean = response.choices[0].message.content.strip()
-            logger.info(f"[ENG→KOR OpenAI] ✅ {english_text} → {korean}")
-            return korean
+            if has_hangul(korean):
+                logger.info(f"[ENG→KOR OpenAI] ✅ {english_text} → {korean}")
+                translation_cache.put('en-ko', english_text, korean, 'openai')
+                return korean
+            logger.warning(f"[ENG→KOR OpenAI] ⚠️ Not Korean, ignored: {english_text} → {korean}")
             
         except Exception as e:
             logger.warning(f"[ENG→KOR OpenAI] ❌ Failed: {e}")
     
     # 3단계: 규칙 기반 매핑 (100% 폴백)
-    translation_map = {
-        # 🔧 복합어 우선 매칭 (긴 것부터!)
-        # 원예/정원 (NEW)
-        'automatic drip irrigation system': '자동 점적 관수 시스템',
-        'drip irrigation system': '점적 관수 시스템',
-        'drip irrigation': '점적 관수',
-        'irrigation system': '관수 시스템',
-        'watering device': '물주기 장치',
-        'self watering': '자동 물주기',
-        
-        # 의약품/파우치 (NEW)
-        'pill pouch bag': '약 파우치',
-        'pill organizer': '약 정리함',
-        'pill pouch': '약 파우치',
-        'medicine organizer': '약통 정리함',
-        'medication organizer': '약 정리함',
-        
-        # 실리콘 제품 (긴 복합어가 먼저 매칭됨)
-        'silicone cooking utensil': '실리콘 조리도구',
-        'silicone kitchenware': '실리콘 주방용품',
-        'silicone baking': '실리콘 베이킹',
-        'silicone mold': '실리콘 몰드',
-        'silicone mould': '실리콘 금형',
-        'baking mold': '베이킹 몰드',
-        'cake mold': '케이크 틀',
-        'silicone': '실리콘',  # 🔧 폴백: 위 패턴 실패 시
-        
-        # 가전/전자
-        'hair dryer': '헤어 드라이어',
-        'power bank': '보조배터리',
-        'air purifier': '공기청정기',
-        'phone holder': '휴대폰 거치대',
-        'car charger': '차량용 충전기',
-        'bluetooth speaker': '블루투스 스피커',
-        'pet feeder': '반려동물 급식기',
-        'fan blade': '선풍기 날개',
-        
-        # 게이밍/컴퓨터
-        'gaming mouse pad': '게이밍 마우스패드',
-        'mouse pad': '마우스 패드',
-        'mousepad': '마우스패드',
-        'wrist rest': '손목받침대',
-        'palm rest': '손목받침대',
-        'keyboard pad': '키보드 패드',
-        
-        # 전자제품
-        'phone': '휴대폰',
-        'mobile': '휴대폰',
-        'holder': '거치대',
-        'mount': '거치대',
-        'stand': '거치대',
-        'charger': '충전기',
-        'cable': '케이블',
-        'adapter': '어댑터',
-        'earphone': '이어폰',
-        'earphones': '이어폰',
-        'headphone': '헤드폰',
-        'speaker': '스피커',
-        'bluetooth': '블루투스',
-        'wireless': '무선',
-        'keyboard': '키보드',
-        # 'mouse': '마우스',  # 🔧 제거: "mouse pad"를 "마우스"로 오역 방지
-        'dryer': '드라이어',
-        'diffuser': '디퓨저',
-        'blower': '블로워',
-        
-        # 차량용품
-        'car': '차량용',
-        'vehicle': '차량용',
-        'automobile': '자동차',
-        'motorcycle': '오토바이',
-        'bike': '자전거',
-        'bicycle': '자전거',
-        
-        # 가전제품
-        'humidifier': '가습기',
-        # 'fan': '선풍기',  # 🔧 제거: "hair dryer fan"을 "선풍기"로 오역 방지
-        'heater': '히터',
-        'vacuum': '청소기',
-        'cleaner': '청소기',
-        'washer': '세척기',
-        
-        # 생활용품
-        'organizer': '정리함',
-        'storage': '수납',
-        'bag': '가방',
-        'case': '케이스',
-        'cover': '커버',
-        'clip': '집게',
-        'eyebrow': '눈썹',
-        'switch': '스위치',
-        'rocker': '로커',
-        'control': '제어',
-        'pad': '패드',  # 🔧 추가
-        'mat': '매트',  # 🔧 추가
-        'cushion': '쿠션',  # 🔧 추가
-        'foam': '폼',  # 🔧 추가
-        'memory foam': '메모리 폼',  # 🔧 추가
-        'gaming': '게이밍',  # 🔧 추가
-        'gamer': '게이머',  # 🔧 추가
-        'rgb': 'RGB',  # 🔧 추가
-        'led': 'LED',  # 🔧 추가
-        'large': '대형',  # 🔧 추가
-        'xxl': '초대형',  # 🔧 추가
-        
-        # 반려동물
-        'pet': '반려동물',
-        'dog': '강아지',
-        'cat': '고양이',
-        'feeder': '급식기',
-        'bowl': '밥그릇',
-        
-        # 형용사
-        'automatic': '자동',
-        'smart': '스마트',
-        'portable': '휴대용',
-        'mini': '미니',
-        'small': '소형',  # 🔧 추가
-        'usb': 'USB',
-        'high pressure': '고압',
-        'waterproof': '방수',
-        'plastic': '플라스틱',  # 🔧 추가
-    }
-    
-    # 영문 소문자 변환
-    text_lower = english_text.lower()
-    
-    # 🔧 복합어 우선 매칭 (긴 구문부터)
-    korean_words = []
-    matched_positions = []  # 매칭된 위치 저장
-    
-    # 복합어 먼저 찾기 (예: "hair dryer" > "hair", "dryer")
-    for eng, kor in sorted(translation_map.items(), key=lambda x: -len(x[0])):
-        # 🚨 FIX: 단어 경계 확인 (부분 문자열 매칭 방지)
-        # "cat"이 "cathode"에 매칭되는 것 방지
-        import re
-        # \b는 단어 경계 (word boundary)
-        pattern = r'\b' + re.escape(eng) + r'\b'
-        match = re.search(pattern, text_lower)
-        
-        if match:
-            pos = match.start()
-            # 이미 매칭된 부분이 아닌지 확인
-            if not any(start <= pos < match.end() or start < match.end() <= end 
-                      for start, end in matched_positions):
-                korean_words.append(kor)
-                matched_positions.append((pos, match.end()))
+    korean = translate_english_to_korean_rules(english_text)
     
     # 🔧 키워드가 없으면 AI 재시도 (Gemini만, 빠르게)
-    if not korean_words:
+    if not korean:
         gemini_key = get_config('gemini_api_key')
         if gemini_key:
             try:
@@ -270,16 +295,157 @@ Korean:"""
                 prompt = f"""Translate to Korean shopping keyword (output ONLY Korean, no explanation):
 {english_text}"""
                 
-                response = model.generate_content(prompt)
+                timeout = call_timeout(deadline, AI_TIMEOUT_SEC, 'Gemini translation')
+                rate_limiter.acquire('gemini', deadline=deadline)
+                response = model.generate_content(prompt, request_options={'timeout': timeout})
                 korean = response.text.strip()
                 logger.info(f"[ENG→KOR RuleBased→Gemini Retry] ✅ {english_text} → {korean}")
                 return korean
             except Exception as e:
                 logger.warning(f"[ENG→KOR Gemini Retry] ❌ {e}")
     
-    korean = ' '.join(korean_words) if korean_words else english_text
-    logger.info(f"[ENG→KOR RuleBased] {'✅' if korean_words else '⚠️'} {english_text} → {korean}")
-    return korean
+    logger.info(f"[ENG→KOR RuleBased] {'✅' if korean else '⚠️'} {english_text} → {korean or english_text}")
+    return korean or english_text
+
+
+# ----------------------------------------------------------------------------
+# 1-1. 배치 번역: 여러 상품명을 한 번의 Gemini/OpenAI 요청으로 (JSON 배열 응답)
+# ----------------------------------------------------------------------------
+
+TRANSLATION_BATCH_SIZE = 50   # 요청 1회에 넣는 최대 상품명 수
+
+_JSON_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+
+def has_hangul(text: str) -> bool:
+    return bool(text) and any('\uac00' <= c <= '\ud7a3' for c in text)
+
+
+def _batch_prompt(titles: List[str]) -> str:
+    return f"""Translate each English product name to a Korean keyword for Naver shopping search.
+
+Rules:
+1. Focus on product category and function
+2. Remove brand names and model numbers
+3. Use common Korean shopping terms
+4. Keep each keyword concise (2-5 words)
+
+Return ONLY a JSON object: {{"translations": [...]}} with exactly {len(titles)} Korean strings,
+in the same order as the input.
+
+Examples:
+"Bicycle Phone Holder" → "자전거 휴대폰 거치대"
+"Wireless Bluetooth Earphones" → "무선 블루투스 이어폰"
+
+Input:
+{json.dumps(titles, ensure_ascii=False)}"""
+
+
+def _parse_batch_response(text: str, expected: int) -> Optional[List[str]]:
+    """JSON array (or {"translations": [...]}) of `expected` strings, else None"""
+    try:
+        parsed = json.loads(_JSON_FENCE_RE.sub('', (text or '').strip()))
+    except ValueError:
+        return None
+    if isinstance(parsed, dict):
+        parsed = parsed.get('translations')
+    if not isinstance(parsed, list) or len(parsed) != expected:
+        return None
+    return [item.strip() if isinstance(item, str) else '' for item in parsed]
+
+
+def _translate_batch_gemini(titles: List[str], deadline=None) -> Optional[List[str]]:
+    gemini_key = get_config('gemini_api_key')
+    if not gemini_key:
+        return None
+    try:
+        import google.generativeai as genai
+        genai.configure(api_key=gemini_key)
+        model = genai.GenerativeModel('gemini-2.5-flash')
+        timeout = call_timeout(deadline, AI_TIMEOUT_SEC, 'Gemini batch translation')
+        rate_limiter.acquire('gemini', deadline=deadline)
+        response = model.generate_content(
+            _batch_prompt(titles),
+            generation_config={'response_mime_type': 'application/json', 'temperature': 0.3},
+            request_options={'timeout': timeout})
+        return _parse_batch_response(response.text, len(titles))
+    except Exception as e:
+        logger.warning(f"[ENG→KOR Batch Gemini] ❌ Failed: {e}")
+        return None
+
+
+def _translate_batch_openai(titles: List[str], deadline=None) -> Optional[List[str]]:
+    openai_key = get_config('openai_api_key')
+    if not openai_key:
+        return None
+    try:
+        from openai import OpenAI
+        client = OpenAI(api_key=openai_key)
+        timeout = call_timeout(deadline, AI_TIMEOUT_SEC, 'OpenAI batch translation')
+        rate_limiter.acquire('openai', deadline=deadline)
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": _batch_prompt(titles)}],
+            response_format={"type": "json_object"},
+            max_tokens=40 * len(titles) + 50,
+            temperature=0.3,
+            timeout=timeout
+        )
+        return _parse_batch_response(response.choices[0].message.content, len(titles))
+    except Exception as e:
+        logger.warning(f"[ENG→KOR Batch OpenAI] ❌ Failed: {e}")
+        return None
+
+
+def translate_titles_to_korean(titles: List[str], batch_size: int = TRANSLATION_BATCH_SIZE,
+                               deadline=None) -> List[str]:
+    """
+    영문 상품명 여러 개 → 한글 키워드 (입력 순서 유지)
+    
+    - 번역 캐시에 있는 항목은 그대로 사용, 나머지는 batch_size개씩 한 번의 요청으로 번역
+      (Gemini → OpenAI 순, 응답은 JSON 배열)
+    - AI 결과가 없거나 한글이 아닌 항목만 규칙 기반(ENG_TO_KOR_MAP)으로 개별 폴백
+    - 규칙으로도 안 되면 원문 그대로 반환 (translate_english_to_korean과 동일)
+    - deadline: 요청 1회 타임아웃 = min(AI_TIMEOUT_SEC, 남은 예산), 예산이 없으면 규칙 기반만
+    """
+    results = [None] * len(titles)
+    pending = {}  # 원문 → 인덱스 목록 (같은 상품명은 한 번만 번역)
+    for idx, title in enumerate(titles):
+        cached = translation_cache.get('en-ko', title)
+        if cached:
+            results[idx] = cached
+        elif title and title.strip():
+            pending.setdefault(title, []).append(idx)
+        else:
+            results[idx] = title or ''
+
+    unique = list(pending)
+    for offset in range(0, len(unique), batch_size):
+        chunk = unique[offset:offset + batch_size]
+        for provider, translate in (('gemini', _translate_batch_gemini), ('openai', _translate_batch_openai)):
+            translated = translate(chunk, deadline)
+            if translated is None:
+                continue
+            ok = 0
+            for title, korean in zip(chunk, translated):
+                if has_hangul(korean):
+                    translation_cache.put('en-ko', title, korean, provider)
+                    for idx in pending[title]:
+                        results[idx] = korean
+                    ok += 1
+            logger.info(f"[ENG→KOR Batch {provider}] ✅ {ok}/{len(chunk)} titles in one request")
+            break
+
+    fallback = 0
+    for title, indexes in pending.items():
+        if results[indexes[0]] is None:
+            korean = translate_english_to_korean_rules(title) or title
+            fallback += 1
+            for idx in indexes:
+                results[idx] = korean
+    if fallback:
+        logger.info(f"[ENG→KOR Batch] ⚠️ {fallback} title(s) fell back to rule-based translation")
+    return results
 
 
 # ============================================================================
@@ -411,6 +577,7 @@ EXCLUDE_KEYWORDS = {
              '망고', '키위', '체리', '블루베리', '복숭아', '자두', '살구', '감', '곶감',
              '과일세트', '혼합과일', '제철과일', '국산과일'],
 }
+keyword_matcher.register('exclude', EXCLUDE_KEYWORDS, config_key='exclude_keywords_json')
 
 
 def classify_category(title: str) -> str:
@@ -472,11 +639,10 @@ def calculate_category_similarity(ali_category: str, naver_title: str) -> float:
     # 🚫 STEP 1: 제외 키워드 체크 (선물세트, 식품 등)
     naver_lower = naver_title.lower()
     
-    for exclude_category, exclude_words in EXCLUDE_KEYWORDS.items():
-        for word in exclude_words:
-            if word in naver_title or word in naver_lower:
-                logger.debug(f"[Exclude] '{naver_title[:40]}...' → 제외 키워드 '{word}' 발견")
-                return 0.0  # 즉시 미스매치
+    excluded = keyword_matcher.get('exclude').first(naver_title)
+    if excluded:
+        logger.debug(f"[Exclude] '{naver_title[:40]}...' → 제외 키워드 '{excluded[1]}' 발견")
+        return 0.0  # 즉시 미스매치
     
     # STEP 2: 카테고리 키워드 추출
     if ali_category not in CATEGORY_KEYWORDS:
@@ -0,0 +1,133 @@
+"""
+Per-Provider Rate Limiter (token bucket)
+- 외부 API 호출 직전에 acquire('naver') 처럼 호출 → 토큰이 없으면 필요한 만큼만 대기
+- 여러 키워드 파이프라인이 동시에 돌아도 공급자별 초당 호출 수가 한도를 넘지 않음
+- 프로세스 단위 (스레드 안전), 한도는 config 'rate_limit_<provider>' (초당 요청 수)로 조정 가능
+- acquire('aliexpress', key=app_key): 같은 공급자라도 API 키(계정)마다 별도 버킷
+- acquire(..., deadline=d): 남은 예산(호출 1회분 MIN_CALL_SEC 제외)보다 오래 기다려야 하면
+  기다리지 않고 DeadlineExceeded
+"""
+import time
+import logging
+import threading
+
+import deadline as deadline_budget
+
+logger = logging.getLogger(__name__)
+
+# provider → (requests per second, burst)
+PROVIDER_RATE_LIMITS = {
+    'naver': (8.0, 8),        # 네이버 검색 API: 초당 10회 제한 → 여유 있게 8
+    'aliexpress': (4.0, 4),
+    'openai': (3.0, 3),
+    'gemini': (2.0, 2),
+}
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self._lock = threading.Lock()
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def set_rate(self, rate, burst=None):
+        with self._lock:
+            self.rate = float(rate)
+            if burst is not None:
+                self.burst = max(1, int(burst))
+                self._tokens = min(self._tokens, self.burst)
+
+    def acquire(self, timeout=None):
+        """Take one token, sleeping until one is available. Returns seconds waited (None on timeout)."""
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - started
+                wait = (1 - self._tokens) / self.rate if self.rate > 0 else 1.0
+            if timeout is not None and now + wait - started > timeout:
+                return None
+            time.sleep(wait)
+
+
+_buckets = {}          # (provider, key) → TokenBucket
+_buckets_lock = threading.Lock()
+_rate_overrides = {}   # provider → requests/sec from config (applies to every key's bucket)
+_call_hook = None
+
+
+def set_call_hook(hook):
+    """hook(provider) is called for every acquire() (stage_metrics counts outbound calls)"""
+    global _call_hook
+    _call_hook = hook
+
+
+def _bucket(provider, key=None):
+    bucket = _buckets.get((provider, key))
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get((provider, key))
+            if bucket is None:
+                rate, burst = PROVIDER_RATE_LIMITS[provider]
+                if provider in _rate_overrides:
+                    rate = _rate_overrides[provider]
+                    burst = max(1, int(rate))
+                bucket = _buckets[(provider, key)] = TokenBucket(rate, burst)
+    return bucket
+
+
+def acquire(provider, timeout=None, key=None, deadline=None):
+    """
+    Wait for a call slot for `provider` (unknown providers are not limited).
+    `key` (e.g. the API app key) gives each account its own bucket.
+    `deadline` caps the wait so at least MIN_CALL_SEC is left for the call itself.
+
+    Returns:
+        seconds waited, or None if `timeout` would be exceeded
+
+    Raises:
+        DeadlineExceeded: the slot can't be had within the deadline
+    """
+    if provider not in PROVIDER_RATE_LIMITS:
+        waited = 0.0
+    else:
+        if deadline is not None:
+            budget = deadline.timeout(None, f'{provider} rate limit') - deadline_budget.MIN_CALL_SEC
+            timeout = budget if timeout is None else min(timeout, budget)
+        waited = _bucket(provider, key).acquire(timeout)
+        if waited is None:
+            if deadline is not None:
+                raise deadline_budget.DeadlineExceeded(
+                    f'Deadline exceeded waiting for {provider} rate limit '
+                    f'({deadline.elapsed():.1f}s of {deadline.budget_sec:g}s used)')
+            return None
+        if waited:
+            logger.debug(f'[RateLimit] {provider}: waited {waited * 1000:.0f}ms')
+    if _call_hook is not None:
+        _call_hook(provider)
+    return waited
+
+
+def configure(snapshot):
+    """Apply 'rate_limit_<provider>' overrides (requests/sec) from a config snapshot"""
+    for provider in PROVIDER_RATE_LIMITS:
+        value = snapshot.get(f'rate_limit_{provider}')
+        if value in (None, ''):
+            continue
+        try:
+            rate = float(value)
+        except (TypeError, ValueError):
+            logger.warning(f'[RateLimit] ⚠️ Invalid rate_limit_{provider}={value!r}')
+            continue
+        if rate > 0:
+            with _buckets_lock:
+                _rate_overrides[provider] = rate
+                buckets = [b for (p, _), b in _buckets.items() if p == provider]
+            for bucket in buckets:
+                bucket.set_rate(rate, burst=max(1, int(rate)))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Revenue Rollup Tables (daily_revenue / monthly_revenue)
+- 배송완료(delivered) 주문의 매출/순이익을 일/월 단위로 미리 집계
+- 주문 상태 변경과 같은 트랜잭션에서 증분 갱신 → 대시보드는 O(일수) 행만 읽음
+- 날짜 키는 기존 대시보드 쿼리와 동일하게 SQLite DATE()/strftime() 기준
+
+Usage:
+    python3 revenue_rollup.py --rebuild    # 전체 재집계 (backfill)
+"""
+import os
+import sys
+import sqlite3
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'dropship.db')
+
+_ADD_DAILY_SQL = '''
+    INSERT INTO daily_revenue (day, order_count, sales, profit, updated_at)
+    SELECT DATE(delivered_at), ?, ? * COALESCE(sale_price, 0), ? * COALESCE(net_profit, 0), CURRENT_TIMESTAMP
+    FROM orders
+    WHERE id = ? AND order_status = 'delivered' AND delivered_at IS NOT NULL
+    ON CONFLICT(day) DO UPDATE SET
+        order_count = order_count + excluded.order_count,
+        sales = sales + excluded.sales,
+        profit = profit + excluded.profit,
+        updated_at = excluded.updated_at
+'''
+
+_ADD_MONTHLY_SQL = '''
+    INSERT INTO monthly_revenue (month, order_count, sales, profit, updated_at)
+    SELECT strftime('%Y-%m', delivered_at), ?, ? * COALESCE(sale_price, 0), ? * COALESCE(net_profit, 0), CURRENT_TIMESTAMP
+    FROM orders
+    WHERE id = ? AND order_status = 'delivered' AND delivered_at IS NOT NULL
+    ON CONFLICT(month) DO UPDATE SET
+        order_count = order_count + excluded.order_count,
+        sales = sales + excluded.sales,
+        profit = profit + excluded.profit,
+        updated_at = excluded.updated_at
+'''
+
+
+def _apply(cursor, order_ids, sign):
+    params = [(sign, sign, sign, order_id) for order_id in order_ids]
+    if not params:
+        return
+    cursor.executemany(_ADD_DAILY_SQL, params)
+    cursor.executemany(_ADD_MONTHLY_SQL, params)
+
+
+def add_delivered_orders(cursor, order_ids):
+    """
+    Add delivered orders to the rollups.
+    Call AFTER the order row is marked delivered, inside the same transaction.
+    Orders that aren't delivered (or lack delivered_at) are ignored.
+    """
+    _apply(cursor, order_ids, 1)
+
+
+def remove_delivered_orders(cursor, order_ids):
+    """
+    Subtract delivered orders from the rollups.
+    Call BEFORE the order row leaves 'delivered' (or its amounts change).
+    """
+    _apply(cursor, order_ids, -1)
+
+
+def rebuild(cursor):
+    """Recompute both rollup tables from orders (backfill / repair; tables come from migrations.py)"""
+    cursor.execute('DELETE FROM daily_revenue')
+    cursor.execute('DELETE FROM monthly_revenue')
+    cursor.execute('''
+        INSERT INTO daily_revenue (day, order_count, sales, profit)
+        SELECT DATE(delivered_at), COUNT(*), COALESCE(SUM(sale_price), 0), COALESCE(SUM(net_profit), 0)
+        FROM orders
+        WHERE order_status = 'delivered' AND delivered_at IS NOT NULL
+        GROUP BY DATE(delivered_at)
+    ''')
+    cursor.execute('''
+        INSERT INTO monthly_revenue (month, order_count, sales, profit)
+        SELECT strftime('%Y-%m', delivered_at), COUNT(*), COALESCE(SUM(sale_price), 0), COALESCE(SUM(net_profit), 0)
+        FROM orders
+        WHERE order_status = 'delivered' AND delivered_at IS NOT NULL
+        GROUP BY strftime('%Y-%m', delivered_at)
+    ''')
+    cursor.execute('SELECT COUNT(*) FROM daily_revenue')
+    return cursor.fetchone()[0]
+
+
+if __name__ == '__main__':
+    if '--rebuild' not in sys.argv:
+        print(__doc__)
+        sys.exit(0)
+
+    # 스키마는 migrations.py에만 정의 → 미적용 migration부터 적용
+    from migrations import run_migrations
+    run_migrations(DB_PATH)
+
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        days = rebuild(conn.cursor())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    print(f'✅ Revenue rollups rebuilt: {days} day(s)')
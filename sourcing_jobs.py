@@ -0,0 +1,263 @@
+"""
+Background Sourcing Job Queue (sourcing_jobs table)
+- /api/sourcing/jobs 는 작업만 등록하고 job_id를 즉시 반환
+- 워커 스레드 풀이 DB 큐에서 작업을 가져가 실행 (BEGIN IMMEDIATE로 원자적 claim)
+- 각 단계가 끝날 때마다 stage / stage_stats 를 DB에 저장 → 진행률 조회, SSE 스트림
+- 상태가 DB에 있으므로 재시작해도 queued 작업은 그대로 실행됨
+- running 작업은 heartbeat를 갱신; 프로세스가 죽어서 heartbeat가 끊기면 다시 queued로 복구
+  (MAX_ATTEMPTS 초과 시 failed)
+
+Status: queued → running → completed | failed
+"""
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+
+import db_pool
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = 2               # 프로세스당 동시에 실행할 소싱 작업 수
+POLL_INTERVAL_SEC = 2.0       # 큐가 비었을 때 다시 확인하는 주기 (다른 프로세스가 넣은 작업)
+HEARTBEAT_INTERVAL_SEC = 15
+STALE_AFTER_SEC = 90          # heartbeat가 이보다 오래되면 죽은 워커로 간주
+MAX_ATTEMPTS = 3
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+TERMINAL_STATUSES = (STATUS_COMPLETED, STATUS_FAILED)
+
+_JSON_FIELDS = ('params_json', 'stage_stats_json', 'result_json')
+
+_start_lock = threading.Lock()
+_workers = []
+_workers_pid = None
+_wakeup = threading.Event()
+_running_ids = set()
+_running_lock = threading.Lock()
+
+_updated = threading.Condition()
+_update_seq = 0
+
+
+def _now():
+    return time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _notify():
+    global _update_seq
+    with _updated:
+        _update_seq += 1
+        _updated.notify_all()
+
+
+def wait_for_update(last_seq, timeout):
+    """
+    Wait until any job changed in this process after last_seq (or timeout).
+    Returns the current update sequence number.
+    """
+    with _updated:
+        if _update_seq == last_seq:
+            _updated.wait(timeout)
+        return _update_seq
+
+
+def submit(mode, keyword='', params=None, created_by=None):
+    """Queue a sourcing job; returns its id"""
+    job_id = uuid.uuid4().hex
+    with db_pool.transaction() as conn:
+        conn.execute('''
+            INSERT INTO sourcing_jobs (id, status, mode, keyword, params_json, stage, created_by,
+                                       created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (job_id, STATUS_QUEUED, mode, keyword,
+              json.dumps(params or {}, ensure_ascii=False), STATUS_QUEUED, created_by, _now(), _now()))
+    _wakeup.set()
+    _notify()
+    return job_id
+
+
+def _decode(row):
+    job = dict(row)
+    for field in _JSON_FIELDS:
+        value = job.pop(field, None)
+        job[field[:-len('_json')]] = json.loads(value) if value else None
+    return job
+
+
+def get_job(job_id):
+    conn = db_pool.get_connection()
+    try:
+        row = conn.execute('SELECT * FROM sourcing_jobs WHERE id = ?', (job_id,)).fetchone()
+    finally:
+        conn.close()
+    return _decode(row) if row else None
+
+
+def list_jobs(limit=20, created_by=None):
+    """Recent jobs without their (large) result payload"""
+    sql = '''
+        SELECT id, status, mode, keyword, stage, stage_stats_json, error, attempts,
+               created_at, started_at, finished_at
+        FROM sourcing_jobs
+    '''
+    params = []
+    if created_by is not None:
+        sql += ' WHERE created_by = ?'
+        params.append(created_by)
+    sql += ' ORDER BY created_at DESC, rowid DESC LIMIT ?'
+    params.append(limit)
+    conn = db_pool.get_connection()
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    return [_decode(row) for row in rows]
+
+
+def update_progress(job_id, stage, stage_stats=None):
+    """Persist the stage that just finished (and the funnel counts so far)"""
+    with db_pool.transaction() as conn:
+        conn.execute('''
+            UPDATE sourcing_jobs
+            SET stage = ?, stage_stats_json = COALESCE(?, stage_stats_json),
+                heartbeat_at = ?, updated_at = ?
+            WHERE id = ?
+        ''', (stage, json.dumps(stage_stats, ensure_ascii=False, default=str) if stage_stats is not None else None,
+              _now(), _now(), job_id))
+    _notify()
+
+
+def _finish(job_id, status, result=None, error=None):
+    with db_pool.transaction() as conn:
+        conn.execute('''
+            UPDATE sourcing_jobs
+            SET status = ?, stage = ?, result_json = ?, error = ?,
+                stage_stats_json = COALESCE(?, stage_stats_json),
+                finished_at = ?, updated_at = ?
+            WHERE id = ?
+        ''', (status, status,
+              json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+              error,
+              json.dumps(result.get('stage_stats'), ensure_ascii=False, default=str)
+              if isinstance(result, dict) and result.get('stage_stats') is not None else None,
+              _now(), _now(), job_id))
+    _notify()
+
+
+def _claim_next():
+    """Atomically move the oldest queued job to running (recovering dead workers' jobs first)"""
+    stale_before = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time() - STALE_AFTER_SEC))
+    with db_pool.transaction() as conn:
+        conn.execute('''
+            UPDATE sourcing_jobs
+            SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                error = CASE WHEN attempts >= ? THEN 'Worker stopped responding' ELSE error END,
+                finished_at = CASE WHEN attempts >= ? THEN ? ELSE finished_at END,
+                updated_at = ?
+            WHERE status = ? AND COALESCE(heartbeat_at, started_at) < ?
+        ''', (MAX_ATTEMPTS, STATUS_FAILED, STATUS_QUEUED, MAX_ATTEMPTS, MAX_ATTEMPTS, _now(), _now(),
+              STATUS_RUNNING, stale_before))
+        recovered = conn.execute('SELECT changes()').fetchone()[0]
+
+        row = conn.execute('''
+            SELECT * FROM sourcing_jobs WHERE status = ?
+            ORDER BY created_at, rowid LIMIT 1
+        ''', (STATUS_QUEUED,)).fetchone()
+        if row is None:
+            job = None
+        else:
+            conn.execute('''
+                UPDATE sourcing_jobs
+                SET status = ?, stage = 'started', attempts = attempts + 1,
+                    started_at = ?, heartbeat_at = ?, updated_at = ?, error = NULL
+                WHERE id = ?
+            ''', (STATUS_RUNNING, _now(), _now(), _now(), row['id']))
+            job = _decode(row)
+            job['status'] = STATUS_RUNNING
+    if recovered:
+        logger.warning(f'[Sourcing Jobs] ♻️ Recovered {recovered} job(s) from a dead worker')
+    if recovered or job:
+        _notify()
+    return job
+
+
+def _heartbeat_loop():
+    while True:
+        time.sleep(HEARTBEAT_INTERVAL_SEC)
+        with _running_lock:
+            ids = list(_running_ids)
+        if not ids:
+            continue
+        try:
+            with db_pool.transaction() as conn:
+                conn.executemany('UPDATE sourcing_jobs SET heartbeat_at = ? WHERE id = ?',
+                                 [(_now(), job_id) for job_id in ids])
+        except Exception as e:
+            logger.warning(f'[Sourcing Jobs] ⚠️ Heartbeat failed: {e}')
+
+
+def _worker_loop(runner):
+    while True:
+        try:
+            job = _claim_next()
+        except Exception as e:
+            logger.error(f'[Sourcing Jobs] ❌ Claim failed: {e}')
+            job = None
+
+        if job is None:
+            _wakeup.wait(POLL_INTERVAL_SEC)
+            _wakeup.clear()
+            continue
+
+        job_id = job['id']
+        with _running_lock:
+            _running_ids.add(job_id)
+        logger.info(f"[Sourcing Jobs] ▶️ {job_id} ({job['mode']}, '{job['keyword']}') attempt {job['attempts'] + 1}")
+        try:
+            result = runner(job, lambda stage, stage_stats=None: update_progress(job_id, stage, stage_stats))
+            if isinstance(result, dict) and result.get('success') is False:
+                _finish(job_id, STATUS_FAILED, result=result, error=result.get('error') or 'Sourcing failed')
+            else:
+                _finish(job_id, STATUS_COMPLETED, result=result)
+            logger.info(f'[Sourcing Jobs] ✅ {job_id} finished')
+        except Exception as e:
+            logger.exception(f'[Sourcing Jobs] ❌ {job_id} crashed: {e}')
+            try:
+                _finish(job_id, STATUS_FAILED, error=str(e))
+            except Exception:
+                pass  # heartbeat stops → recovered by _claim_next()
+        finally:
+            with _running_lock:
+                _running_ids.discard(job_id)
+
+
+def start_workers(runner, workers=JOB_WORKERS):
+    """
+    Start the worker pool once per process.
+
+    Args:
+        runner: runner(job, progress) → result dict; progress(stage, stage_stats)
+                persists intermediate state. A result with success=False marks
+                the job failed.
+    """
+    global _workers_pid
+    with _start_lock:
+        if _workers_pid == os.getpid() and any(t.is_alive() for t in _workers):
+            return
+        _workers.clear()
+        _workers_pid = os.getpid()
+        for idx in range(workers):
+            thread = threading.Thread(target=_worker_loop, args=(runner,),
+                                      name=f'sourcing-job-{idx}', daemon=True)
+            thread.start()
+            _workers.append(thread)
+        heartbeat = threading.Thread(target=_heartbeat_loop, name='sourcing-job-heartbeat', daemon=True)
+        heartbeat.start()
+        _workers.append(heartbeat)
+    logger.info(f'[Sourcing Jobs] ✅ {workers} worker(s) started')
@@ -0,0 +1,232 @@
+"""
+Per-Stage Latency Instrumentation
+- @instrumented('smart_sourcing') 로 감싼 파이프라인 안에서 begin('search') 처럼 단계 경계만 표시
+  (이전 단계는 자동 종료 → 긴 함수 본문을 들여쓰기 없이 계측)
+- 단계별 wall-clock(perf_counter), CPU(thread_time), 외부 API 호출 수, DB 쿼리 수(db_pool)를 기록
+  (외부 호출: http_client의 실제 HTTP 시도마다 + http_client를 거치지 않는 Gemini/OpenAI SDK는
+   rate_limiter.acquire 시점) → 결과 dict의 'timings'에 포함
+- 파이프라인이 작업 스레드를 쓰면 bind(func)로 감싸서 넘김 → 그 스레드의 호출/쿼리도 현재 단계에 집계
+- 최근 HISTOGRAM_WINDOW회 실행의 단계별 분포(p50/p95/p99)를 메모리에 보관 → /api/admin/metrics
+  (프로세스 단위 집계)
+"""
+import time
+import threading
+import functools
+from collections import deque
+
+import db_pool
+import http_client
+import rate_limiter
+
+HISTOGRAM_WINDOW = 500      # 단계별로 보관하는 최근 실행 수
+PERCENTILES = (50, 95, 99)
+
+# calls_by_provider 이름: http_client 호스트 → provider (목록에 없으면 호스트 그대로)
+HOST_PROVIDERS = {
+    'openapi.naver.com': 'naver',
+    'api.commerce.naver.com': 'naver_commerce',
+    'api-sg.aliexpress.com': 'aliexpress',
+    'api.taobao.com': 'aliexpress',
+    'api-gateway.coupang.com': 'coupang',
+    'api.openai.com': 'openai',
+    'api.scrapingant.com': 'scrapingant',
+}
+# SDK로 호출하는 provider (http_client 밖) → rate_limiter.acquire로 집계
+SDK_PROVIDERS = frozenset({'gemini', 'openai'})
+
+_local = threading.local()
+_histograms = {}            # (pipeline, stage) → deque of sample dicts
+_histograms_lock = threading.Lock()
+
+
+def _new_counters():
+    return {'outbound_calls': 0, 'db_queries': 0, 'calls_by_provider': {}}
+
+
+class StageTimer:
+    """
+    Wall/CPU time and call counters per stage of one pipeline run. Stages are
+    marked by the owning thread; counters may also come from bind()-ed workers.
+    """
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.stages = {}
+        self._current = None
+        self._counter_lock = threading.Lock()
+        self._started = (time.perf_counter(), time.thread_time())
+
+    def begin(self, name):
+        """End the current stage (if any) and start `name`"""
+        with self._counter_lock:
+            self._close()
+            self._current = (name, time.perf_counter(), time.thread_time(), _new_counters())
+
+    def note_call(self, provider):
+        with self._counter_lock:
+            if self._current:
+                counters = self._current[3]
+                counters['outbound_calls'] += 1
+                counters['calls_by_provider'][provider] = counters['calls_by_provider'].get(provider, 0) + 1
+
+    def note_query(self):
+        with self._counter_lock:
+            if self._current:
+                self._current[3]['db_queries'] += 1
+
+    def _close(self):
+        if self._current is None:
+            return
+        name, wall_start, cpu_start, counters = self._current
+        self._current = None
+        stage = self.stages.setdefault(name, {'wall_ms': 0.0, 'cpu_ms': 0.0, **_new_counters()})
+        stage['wall_ms'] += (time.perf_counter() - wall_start) * 1000
+        stage['cpu_ms'] += (time.thread_time() - cpu_start) * 1000
+        stage['outbound_calls'] += counters['outbound_calls']
+        stage['db_queries'] += counters['db_queries']
+        for provider, count in counters['calls_by_provider'].items():
+            stage['calls_by_provider'][provider] = stage['calls_by_provider'].get(provider, 0) + count
+
+    def finish(self):
+        """Close the last stage, feed the histograms and return the timings summary"""
+        with self._counter_lock:
+            self._close()
+        total = {
+            'wall_ms': (time.perf_counter() - self._started[0]) * 1000,
+            'cpu_ms': (time.thread_time() - self._started[1]) * 1000,
+            'outbound_calls': sum(s['outbound_calls'] for s in self.stages.values()),
+            'db_queries': sum(s['db_queries'] for s in self.stages.values()),
+        }
+        for stage in self.stages.values():
+            stage['wall_ms'] = round(stage['wall_ms'], 1)
+            stage['cpu_ms'] = round(stage['cpu_ms'], 1)
+        total['wall_ms'] = round(total['wall_ms'], 1)
+        total['cpu_ms'] = round(total['cpu_ms'], 1)
+
+        with _histograms_lock:
+            for name, stage in list(self.stages.items()) + [('total', total)]:
+                key = (self.pipeline, name)
+                if key not in _histograms:
+                    _histograms[key] = deque(maxlen=HISTOGRAM_WINDOW)
+                _histograms[key].append((stage['wall_ms'], stage['cpu_ms'],
+                                         stage['outbound_calls'], stage['db_queries']))
+        return {'stages': self.stages, 'total': total}
+
+
+def _current_timer():
+    return getattr(_local, 'timer', None)
+
+
+def begin(name):
+    """Mark the start of stage `name` in the current thread's pipeline run (no-op outside one)"""
+    timer = _current_timer()
+    if timer is not None:
+        timer.begin(name)
+
+
+def bind(func):
+    """
+    Wrap `func` (to run on a worker thread) so its outbound calls and DB queries
+    count toward the calling thread's current stage. No-op outside a pipeline run.
+    """
+    timer = _current_timer()
+    if timer is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = _current_timer()
+        _local.timer = timer
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.timer = previous
+    return wrapper
+
+
+def instrumented(pipeline):
+    """
+    Decorator: time one pipeline run per call. If the function returns a dict,
+    the summary is added to it as result['timings'].
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            previous = _current_timer()
+            timer = _local.timer = StageTimer(pipeline)
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                _local.timer = previous
+                timings = timer.finish()
+            if isinstance(result, dict):
+                result['timings'] = timings
+            return result
+        return wrapper
+    return decorator
+
+
+def _on_outbound_call(provider):
+    timer = _current_timer()
+    if timer is not None:
+        timer.note_call(provider)
+
+
+def _on_http_attempt(host):
+    _on_outbound_call(HOST_PROVIDERS.get(host, host))
+
+
+def _on_rate_limited_call(provider):
+    # HTTP 호출은 http_client 훅에서 이미 집계 → 이중 집계하지 않음
+    if provider in SDK_PROVIDERS:
+        _on_outbound_call(provider)
+
+
+def _on_db_query():
+    timer = _current_timer()
+    if timer is not None:
+        timer.note_query()
+
+
+http_client.set_call_hook(_on_http_attempt)
+rate_limiter.set_call_hook(_on_rate_limited_call)
+db_pool.set_query_hook(_on_db_query)
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def snapshot(pipeline=None):
+    """
+    Rolling latency distribution per stage.
+
+    Returns:
+        {pipeline: {stage: {'samples', 'wall_ms': {p50,p95,p99,max}, 'cpu_ms': {...},
+                            'avg_outbound_calls', 'avg_db_queries'}}}
+    """
+    with _histograms_lock:
+        items = [(key, list(samples)) for key, samples in _histograms.items()
+                 if pipeline is None or key[0] == pipeline]
+
+    result = {}
+    for (pipeline_name, stage), samples in items:
+        walls = sorted(s[0] for s in samples)
+        cpus = sorted(s[1] for s in samples)
+        result.setdefault(pipeline_name, {})[stage] = {
+            'samples': len(samples),
+            'wall_ms': {**{f'p{p}': _percentile(walls, p) for p in PERCENTILES}, 'max': walls[-1]},
+            'cpu_ms': {**{f'p{p}': _percentile(cpus, p) for p in PERCENTILES}, 'max': cpus[-1]},
+            'avg_outbound_calls': round(sum(s[2] for s in samples) / len(samples), 2),
+            'avg_db_queries': round(sum(s[3] for s in samples) / len(samples), 2),
+        }
+    return result
+
+
+def reset():
+    with _histograms_lock:
+        _histograms.clear()
@@ -0,0 +1,114 @@
+"""
+Cost-Ordered Stage Planner
+- 파이프라인 단계를 Stage(이름, 예상 비용, 실행 함수, 건너뛰기 조건, 재사용 키, 선행 단계)로 선언
+- 실행 순서: 선행 단계가 끝난 것 중 비용이 가장 낮은 단계부터 (같으면 선언 순서)
+  → 로컬 필터(금지어, 가격, 거절 목록, 중복)가 먼저 후보를 줄이고,
+    네트워크/LLM 단계는 살아남은 후보에만 실행
+- skip(ctx) 가 사유 문자열을 반환하면 실행하지 않음
+- reuse_key(ctx) 결과가 이미 있으면 (이전 단계 결과 또는 seed) 실행 대신 재사용
+- 단계별 결정(run/skipped/reused)과 건너뛰어서 아낀 호출 수를 summary()로 기록 → stage_stats['planner']
+- 각 단계는 stage_metrics.begin(name) 으로 계측됨
+"""
+import stage_metrics
+
+# 예상 비용 단위 (상대값)
+COST_LOCAL = 1        # 메모리 내 필터
+COST_DB = 10          # DB 조회
+COST_NETWORK = 50     # 외부 API 1회
+COST_LLM = 100        # LLM 요청
+
+
+class Stage:
+    def __init__(self, name, cost, run, skip=None, reuse_key=None, after=(), calls=None):
+        """
+        Args:
+            run: run(ctx) → result (stored as ctx['results'][name])
+            skip: skip(ctx) → reason string to skip, or None
+            reuse_key: reuse_key(ctx) → hashable key; a result already recorded
+                       under the same key is reused instead of running
+            after: names of stages that must finish (run/skip/reuse) first
+            calls: calls(ctx) → {'naver': 1, 'llm': 1, 'db': n, ...} this stage
+                   would make; counted as saved when it is skipped or reused
+        """
+        self.name = name
+        self.cost = cost
+        self.run = run
+        self.skip = skip
+        self.reuse_key = reuse_key
+        self.after = tuple(after)
+        self.calls = calls
+
+
+class StagePlanner:
+    def __init__(self, stages):
+        self.stages = list(stages)
+        names = {stage.name for stage in self.stages}
+        for stage in self.stages:
+            unknown = set(stage.after) - names
+            if unknown:
+                raise ValueError(f'{stage.name}: unknown dependencies {sorted(unknown)}')
+        self.decisions = []
+        self.saved = {}
+        self._reusable = {}
+
+    def seed(self, key, result):
+        """Make an already-known result available to stages with this reuse key"""
+        self._reusable[key] = result
+
+    def plan(self):
+        """Execution order: cheapest ready stage first (declaration order on ties)"""
+        order = []
+        done = set()
+        pending = list(self.stages)
+        while pending:
+            ready = [s for s in pending if all(dep in done for dep in s.after)]
+            if not ready:
+                raise ValueError(f'Dependency cycle among {[s.name for s in pending]}')
+            stage = min(ready, key=lambda s: (s.cost, pending.index(s)))
+            pending.remove(stage)
+            done.add(stage.name)
+            order.append(stage)
+        return order
+
+    def _count_saved(self, stage, ctx):
+        if stage.calls is None:
+            return {}
+        calls = stage.calls(ctx) or {}
+        for kind, count in calls.items():
+            self.saved[kind] = self.saved.get(kind, 0) + count
+        return calls
+
+    def run(self, ctx):
+        """Run every stage in plan order; returns ctx (results under ctx['results'])"""
+        results = ctx.setdefault('results', {})
+        for stage in self.plan():
+            decision = {'stage': stage.name, 'cost': stage.cost}
+
+            reason = stage.skip(ctx) if stage.skip else None
+            if reason:
+                decision.update(action='skipped', reason=reason, saved=self._count_saved(stage, ctx))
+                results[stage.name] = None
+                self.decisions.append(decision)
+                continue
+
+            key = stage.reuse_key(ctx) if stage.reuse_key else None
+            if key is not None and key in self._reusable:
+                decision.update(action='reused', saved=self._count_saved(stage, ctx))
+                results[stage.name] = self._reusable[key]
+                self.decisions.append(decision)
+                continue
+
+            stage_metrics.begin(stage.name)
+            results[stage.name] = stage.run(ctx)
+            if key is not None:
+                self._reusable[key] = results[stage.name]
+            decision['action'] = 'run'
+            self.decisions.append(decision)
+        return ctx
+
+    def summary(self):
+        return {
+            'order': [d['stage'] for d in self.decisions],
+            'decisions': self.decisions,
+            'saved_calls': self.saved,
+        }
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Compiled Keyword Matcher 테스트 (네트워크/DB 불필요)
+- first / find_all / partition == 기존 `keyword.lower() in text.lower()` 순차 검사
+- config override(JSON)가 바뀌면 재시작 없이 재컴파일, 잘못된 JSON이면 기본값 유지
+
+실행: python test_keyword_matcher.py  (또는 pytest test_keyword_matcher.py)
+"""
+
+import os
+import random
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import keyword_matcher
+
+DICTIONARY = {
+    'food': ['食品', 'Snack', '간식', 'tea'],
+    'brand': ['Apple', 'apple watch', 'Samsung', 'ple'],
+    'medical': ['의료', 'mask', 'ask', 'a'],
+}
+ALPHABET = ['a', 'p', 'l', 'e', 'S', 'k', 'm', 't', '食', '品', '간', '식', '의', '료', ' ', 'x']
+
+
+def _naive_first(dictionary, text):
+    folded = text.lower()
+    for category, keywords in dictionary.items():
+        for keyword in keywords:
+            if keyword.lower() in folded:
+                return (category, keyword)
+    return None
+
+
+def _naive_all(dictionary, text):
+    folded = text.lower()
+    hits = [(category, keyword)
+            for category, keywords in dictionary.items()
+            for keyword in keywords
+            if keyword.lower() in folded]
+    return sorted(hits, key=lambda hit: folded.find(hit[1].lower()) + len(hit[1]))
+
+
+def _random_texts(count=500, seed=7):
+    rng = random.Random(seed)
+    texts = ['', 'APPLE WATCH 간식', 'Samsung mask tea', '食品 snack', 'xxxx']
+    for _ in range(count):
+        texts.append(''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 24))))
+    return texts
+
+
+def test_first_matches_naive():
+    matcher = keyword_matcher.KeywordMatcher(DICTIONARY)
+    for text in _random_texts():
+        assert matcher.first(text) == _naive_first(DICTIONARY, text), text
+
+
+def test_find_all_matches_naive():
+    matcher = keyword_matcher.KeywordMatcher(DICTIONARY)
+    for text in _random_texts():
+        hits = matcher.find_all(text)
+        assert len(hits) == len(set(hits)), text
+        assert set(hits) == set(_naive_all(DICTIONARY, text)), text
+        # 텍스트에서 처음 끝나는 위치 순서
+        ends = [text.lower().find(keyword.lower()) + len(keyword) for _, keyword in hits]
+        assert ends == sorted(ends), text
+        assert matcher.contains_any(text) == bool(hits), text
+
+
+def test_partition_matches_naive():
+    matcher = keyword_matcher.KeywordMatcher(DICTIONARY)
+    items = [{'title': text} for text in _random_texts(200, seed=11)]
+    kept, rejected = matcher.partition(items, key=lambda item: item['title'])
+
+    expected_kept = [item for item in items if _naive_first(DICTIONARY, item['title']) is None]
+    expected_rejected = [(item, _naive_first(DICTIONARY, item['title']))
+                         for item in items if _naive_first(DICTIONARY, item['title']) is not None]
+    assert kept == expected_kept
+    assert rejected == expected_rejected
+
+
+def test_config_override_reload():
+    name = '_test_dictionary'
+    config = {}
+    saved_source = keyword_matcher._config_source
+    keyword_matcher.register(name, ['apple', 'samsung'], config_key='test_keywords_json')
+    keyword_matcher.set_config_source(lambda: config)
+    try:
+        matcher = keyword_matcher.get(name)
+        assert matcher.first('Samsung Galaxy') == (name, 'samsung')
+        assert keyword_matcher.get(name) is matcher  # 값이 그대로면 재컴파일 없음
+
+        config['test_keywords_json'] = '{"전자": ["xiaomi"]}'
+        assert keyword_matcher.get(name).first('Samsung Galaxy') is None
+        assert keyword_matcher.get(name).first('XIAOMI band') == ('전자', 'xiaomi')
+
+        config['test_keywords_json'] = '{not json'
+        assert keyword_matcher.get(name).first('Samsung Galaxy') == (name, 'samsung')
+
+        config['test_keywords_json'] = '  '
+        assert keyword_matcher.reload(name) == {name: 2}
+    finally:
+        keyword_matcher.set_config_source(saved_source)
+        with keyword_matcher._registry_lock:
+            keyword_matcher._registry.pop(name, None)
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
+    print('✅ 테스트 완료!')
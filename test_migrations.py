@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Versioned Schema Migrations 테스트 (네트워크 불필요, 임시 SQLite DB 사용)
+- 구 스키마 DB(schema_version 없음, init_db 시절 테이블 + 데이터)에 전체 적용 → 최신 버전
+- 재실행은 아무것도 적용하지 않음 (멱등), 데이터도 그대로
+- 009: 상세 콘텐츠가 sourced_product_content로 이동, 원래 컬럼은 NULL → compress_all 후에도 동일하게 읽힘
+- 007: daily/monthly_revenue가 기존 배송완료 주문으로 채워짐 (delivered_at NULL 주문 제외)
+
+실행: python test_migrations.py  (또는 pytest test_migrations.py)
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+import product_content
+
+ORDERS = [
+    # (order_number, sale_price, net_profit, order_status, delivered_at)
+    ('o1', 10000, 3000, 'delivered', '2026-09-30 23:10:00'),
+    ('o2', 25000, 7000, 'delivered', '2026-10-01 10:00:00'),
+    ('o3', 15000, 4000, 'delivered', '2026-10-01 18:30:00'),
+    ('o4', 99000, 9000, 'delivered', None),
+    ('o5', 50000, 5000, 'shipped', None),
+]
+
+
+class _LegacyDB:
+    """init_db 시절 DB: migration 001 테이블만 있고 schema_version 기록은 없음"""
+
+    def __enter__(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'legacy.db')
+        migrations.run_migrations(self.path, target_version=1)
+        conn = sqlite3.connect(self.path)
+        conn.execute('DROP TABLE schema_version')
+        conn.execute('''
+            INSERT INTO sourced_products (original_url, title_cn, description_kr, marketing_copy, processed_images_json)
+            VALUES ('http://x/1', 'Bicycle Phone Holder', '<p>상세페이지</p>', '마케팅 문구', '["a.jpg"]')
+        ''')
+        conn.execute("INSERT INTO sourced_products (original_url, title_cn) VALUES ('http://x/2', 'Car Charger')")
+        conn.executemany('''
+            INSERT INTO orders (order_number, marketplace, pccc, sale_price, net_profit, applied_exchange_rate,
+                                order_status, delivered_at)
+            VALUES (?, 'naver', 'P123', ?, ?, 190, ?, ?)
+        ''', ORDERS)
+        conn.commit()
+        conn.close()
+        return self.path
+
+    def __exit__(self, *exc):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+def _rows(path, sql):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_legacy_db_upgrade_is_idempotent():
+    with _LegacyDB() as path:
+        applied = migrations.run_migrations(path)
+        assert applied == [version for version, _, _ in migrations.MIGRATIONS]
+
+        conn = sqlite3.connect(path)
+        assert migrations.get_schema_version(conn) == migrations.LATEST_VERSION
+        conn.close()
+
+        snapshot = _rows(path, 'SELECT * FROM daily_revenue ORDER BY day')
+        assert migrations.run_migrations(path) == []
+        assert _rows(path, 'SELECT * FROM daily_revenue ORDER BY day') == snapshot
+        assert _rows(path, 'SELECT COUNT(*) FROM schema_version') == [(len(migrations.MIGRATIONS),)]
+
+
+def test_content_moved_to_side_table():
+    with _LegacyDB() as path:
+        migrations.run_migrations(path)
+
+        assert _rows(path, '''
+            SELECT description_kr, marketing_copy, market_analysis_json, processed_images_json
+            FROM sourced_products ORDER BY id
+        ''') == [(None, None, None, None)] * 2
+        assert _rows(path, "SELECT product_id, typeof(description_kr) FROM sourced_product_content") == [(1, 'text')]
+
+        conn = sqlite3.connect(path, isolation_level=None)
+        try:
+            assert product_content.compress_all(conn) == 1
+            assert product_content.compress_all(conn) == 0
+            cursor = conn.cursor()
+            assert _rows(path, 'SELECT typeof(description_kr) FROM sourced_product_content') == [('blob',)]
+            assert product_content.load_content(cursor, 1) == {
+                'description_kr': '<p>상세페이지</p>',
+                'marketing_copy': '마케팅 문구',
+                'market_analysis_json': None,
+                'processed_images_json': '["a.jpg"]',
+            }
+            assert product_content.load_content(cursor, 2)['description_kr'] is None
+        finally:
+            conn.close()
+
+
+def test_revenue_rollups_backfilled():
+    with _LegacyDB() as path:
+        migrations.run_migrations(path)
+
+        assert _rows(path, 'SELECT day, order_count, sales, profit FROM daily_revenue ORDER BY day') == [
+            ('2026-09-30', 1, 10000, 3000),
+            ('2026-10-01', 2, 40000, 11000),
+        ]
+        assert _rows(path, 'SELECT month, order_count, sales, profit FROM monthly_revenue ORDER BY month') == [
+            ('2026-09', 1, 10000, 3000),
+            ('2026-10', 2, 40000, 11000),
+        ]
+
+
+def test_partial_upgrade_resumes():
+    with _LegacyDB() as path:
+        assert migrations.run_migrations(path, target_version=6) == [1, 2, 3, 4, 5, 6]
+        assert migrations.run_migrations(path, target_version=6) == []
+        assert migrations.run_migrations(path) == list(range(7, migrations.LATEST_VERSION + 1))
+        assert _rows(path, 'SELECT COUNT(*) FROM sourced_product_content') == [(1,)]
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
+    print('✅ 테스트 완료!')
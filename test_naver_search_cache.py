@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Naver Search Payload Cache 테스트 (네트워크 불필요, _fetch를 가짜 함수로 교체)
+- 같은 키 동시 요청 → 네이버 호출 1회, 모든 호출자가 같은 결과 (single-flight)
+- 첫 호출자의 타임아웃/deadline 실패는 공유하지 않고 기다리던 호출자가 직접 재시도
+- 그 외 예외/오류 응답은 기다리던 호출자 모두에게 전달, 캐시에 저장하지 않음
+- 200 응답은 캐시 → 정규화된 같은 키워드 재조회는 호출 없이 새 객체 반환
+
+실행: python test_naver_search_cache.py  (또는 pytest test_naver_search_cache.py)
+"""
+
+import os
+import sys
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+import naver_search_cache
+from deadline import DeadlineExceeded
+
+PAYLOAD = '{"total": 1, "items": [{"title": "자전거 거치대", "lprice": "12900"}]}'
+FOLLOWERS = 4
+
+
+class _FakeFetch:
+    """Replaces naver_search_cache._fetch; first call may fail with `leader_error`"""
+
+    def __init__(self, leader_error=None, status=200, delay=0.2):
+        self.leader_error = leader_error
+        self.status = status
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, keyword, client_id, client_secret, display, sort, timeout, deadline):
+        with self._lock:
+            self.calls += 1
+            first = self.calls == 1
+        time.sleep(self.delay)
+        if first and self.leader_error is not None:
+            raise self.leader_error
+        return (200, PAYLOAD) if self.status == 200 else (self.status, None)
+
+    def __enter__(self):
+        naver_search_cache.clear()
+        self._saved = naver_search_cache._fetch
+        naver_search_cache._fetch = self
+        return self
+
+    def __exit__(self, *exc):
+        naver_search_cache._fetch = self._saved
+        naver_search_cache.clear()
+
+
+def _concurrent_search(keyword='자전거 거치대'):
+    """Leader starts first, followers join while its request is in flight → [(caller, result or exception)]"""
+    results = []
+    lock = threading.Lock()
+
+    def run(caller):
+        try:
+            result = naver_search_cache.search(keyword, 'id', 'secret')
+        except Exception as e:
+            result = e
+        with lock:
+            results.append((caller, result))
+
+    threads = [threading.Thread(target=run, args=('leader',))]
+    threads[0].start()
+    time.sleep(0.05)
+    for i in range(FOLLOWERS):
+        threads.append(threading.Thread(target=run, args=(f'follower{i}',)))
+        threads[-1].start()
+    for thread in threads:
+        thread.join(10)
+    assert len(results) == FOLLOWERS + 1
+    return dict(results)
+
+
+def test_single_flight_shares_one_request():
+    with _FakeFetch() as fetch:
+        before = naver_search_cache.get_stats()
+        results = _concurrent_search()
+        assert fetch.calls == 1
+        for result in results.values():
+            assert result == (200, {'total': 1, 'items': [{'title': '자전거 거치대', 'lprice': '12900'}]})
+        stats = naver_search_cache.get_stats()
+        assert stats['coalesced'] - before['coalesced'] == FOLLOWERS
+        assert stats['in_flight'] == 0
+
+
+def test_leader_timeout_followers_retry():
+    for error in (requests.exceptions.Timeout('leader read timeout'), DeadlineExceeded('leader budget')):
+        with _FakeFetch(leader_error=error) as fetch:
+            before = naver_search_cache.get_stats()
+            results = _concurrent_search()
+            assert results.pop('leader') is error
+            for result in results.values():
+                assert result[0] == 200, result
+            # 재시도한 follower 하나가 새 leader → 나머지는 그 결과 공유
+            assert fetch.calls == 2
+            stats = naver_search_cache.get_stats()
+            assert stats['follower_retries'] - before['follower_retries'] == FOLLOWERS
+            assert stats['entries'] == 1
+
+
+def test_leader_error_shared_not_cached():
+    error = ValueError('broken payload')
+    with _FakeFetch(leader_error=error) as fetch:
+        results = _concurrent_search()
+        assert fetch.calls == 1
+        assert all(result is error for result in results.values())
+        assert naver_search_cache.get_stats()['entries'] == 0
+
+    with _FakeFetch(status=429) as fetch:
+        results = _concurrent_search()
+        assert fetch.calls == 1
+        assert all(result == (429, None) for result in results.values())
+        assert naver_search_cache.get_stats()['entries'] == 0
+
+
+def test_cache_hit_returns_fresh_copy():
+    with _FakeFetch(delay=0) as fetch:
+        status, first = naver_search_cache.search('자전거 거치대', 'id', 'secret')
+        first['items'].clear()
+        status, second = naver_search_cache.search('  자전거 거치대 ', 'id', 'secret')
+        assert status == 200 and len(second['items']) == 1
+        assert fetch.calls == 1
+
+        naver_search_cache.search('자전거 거치대', 'id', 'secret', sort='asc')
+        assert fetch.calls == 2
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
+    print('✅ 테스트 완료!')
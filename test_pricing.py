@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Unified Pricing Engine 테스트 (네트워크/DB 불필요)
+- price_rows(배치) == price_one(단건), NumPy 경로 == 순수 Python 경로
+- 목표마진 + 수수료율 ≥ 100% 설정에서도 비정상 판매가가 나오지 않음
+
+실행: python test_pricing.py  (또는 pytest test_pricing.py)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pricing
+
+PRICES_CNY = [0, 0.5, 1, 7.3, 19.99, 42, 88.8, 150, 333.33, 999]
+MARKET_PRICES = [0, 5000, 12900, 25000, 39900, 59000, 99000, 150000, 210000, 350000]
+
+
+def _config(**overrides):
+    snapshot = {key: str(value) for key, value in overrides.items()}
+    return pricing.load_pricing_config(snapshot)
+
+
+def _python_rows(prices, config, **kwargs):
+    saved, pricing.np = pricing.np, None
+    try:
+        return pricing.price_rows(prices, config, **kwargs)
+    finally:
+        pricing.np = saved
+
+
+def test_batch_matches_single():
+    for marketplace in ('naver', 'coupang'):
+        config = _config()
+        rows = pricing.price_rows(PRICES_CNY, config, marketplace=marketplace)
+        for price, row in zip(PRICES_CNY, rows):
+            assert row == pricing.price_one(price, config, marketplace=marketplace), (marketplace, price)
+
+
+def test_batch_matches_single_with_market_price():
+    config = _config(customs_threshold_krw=150000)
+    rows = pricing.price_rows(PRICES_CNY, config, market_prices=MARKET_PRICES, price_factor=0.95)
+    for price, market, row in zip(PRICES_CNY, MARKET_PRICES, rows):
+        assert row == pricing.price_one(price, config, market_price=market, price_factor=0.95), (price, market)
+
+
+def test_numpy_matches_python():
+    if pricing.np is None:
+        return
+    for kwargs in ({}, {'marketplace': 'coupang'}, {'market_prices': MARKET_PRICES, 'price_factor': 0.9}):
+        config = _config(target_margin_rate=35)
+        assert pricing.price_rows(PRICES_CNY, config, **kwargs) == _python_rows(PRICES_CNY, config, **kwargs), kwargs
+
+
+def test_margin_leaving_no_room_for_fees():
+    # 94% + naver 6% → 분모 0: 목표마진이 제한되고 판매가는 양수, 정상 범위
+    config = _config(target_margin_rate=94)
+    assert config['target_margin_rate'] < 94
+    rows = pricing.price_rows(PRICES_CNY, config)
+    assert rows == _python_rows(PRICES_CNY, config)
+    for row in rows:
+        assert 0 < row['sale_price'] < 10 ** 9
+
+    # 검증을 거치지 않은 config: 판매가 0 → 마진 0 (필터에서 탈락)
+    raw = dict(pricing.PRICING_DEFAULTS, target_margin_rate=94.0)
+    for rows in (pricing.price_rows(PRICES_CNY, raw), _python_rows(PRICES_CNY, raw)):
+        for row in rows:
+            assert row['sale_price'] == 0 and row['margin'] == 0.0
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
+    print('✅ 테스트 완료!')
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Revenue Rollup 테스트 (네트워크 불필요, 임시 SQLite DB 사용)
+- 배송완료 → 집계 추가, 다시 confirmed/shipped → 집계에서 빠짐 (app.py 주문 라우트와 같은 순서)
+- 재배송완료는 새 날짜 버킷으로 이동, delivered_at NULL / 미배송 주문은 무시
+- 증분 갱신 결과 == rebuild() 전체 재집계 (0건 버킷 제외)
+
+실행: python test_revenue_rollup.py  (또는 pytest test_revenue_rollup.py)
+"""
+
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+import revenue_rollup
+
+
+class _TempDB:
+    def __enter__(self):
+        self.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(self.tmpdir, 'test.db')
+        migrations.run_migrations(path)
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        return self.conn.cursor()
+
+    def __exit__(self, *exc):
+        self.conn.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+def _create_order(cursor, number, sale_price=10000, net_profit=3000):
+    cursor.execute('''
+        INSERT INTO orders (order_number, marketplace, pccc, sale_price, net_profit, applied_exchange_rate)
+        VALUES (?, 'naver', 'P123', ?, ?, 190)
+    ''', (number, sale_price, net_profit))
+    return cursor.lastrowid
+
+
+def _deliver(cursor, order_id, delivered_at):
+    # deliver_order: 기존 집계 제거 → 상태 변경 → 집계 추가
+    revenue_rollup.remove_delivered_orders(cursor, [order_id])
+    cursor.execute("UPDATE orders SET order_status = 'delivered', delivered_at = ? WHERE id = ?",
+                   (delivered_at, order_id))
+    revenue_rollup.add_delivered_orders(cursor, [order_id])
+
+
+def _move_back(cursor, order_id, status):
+    # confirm_order / ship_order: 배송완료였던 주문만 집계에서 제거 후 상태 변경
+    cursor.execute('SELECT order_status FROM orders WHERE id = ?', (order_id,))
+    if cursor.fetchone()[0] == 'delivered':
+        revenue_rollup.remove_delivered_orders(cursor, [order_id])
+    cursor.execute('UPDATE orders SET order_status = ?, delivered_at = NULL WHERE id = ?', (status, order_id))
+
+
+def _daily(cursor):
+    cursor.execute('SELECT day, order_count, sales, profit FROM daily_revenue WHERE order_count != 0 ORDER BY day')
+    return cursor.fetchall()
+
+
+def _monthly(cursor):
+    cursor.execute('SELECT month, order_count, sales, profit FROM monthly_revenue WHERE order_count != 0 ORDER BY month')
+    return cursor.fetchall()
+
+
+def _all_rows(cursor):
+    cursor.execute('SELECT day, order_count, sales, profit FROM daily_revenue ORDER BY day')
+    daily = cursor.fetchall()
+    cursor.execute('SELECT month, order_count, sales, profit FROM monthly_revenue ORDER BY month')
+    return daily, cursor.fetchall()
+
+
+def test_deliver_then_move_back():
+    with _TempDB() as cursor:
+        first = _create_order(cursor, 'o1', 10000, 3000)
+        second = _create_order(cursor, 'o2', 20000, 5000)
+
+        revenue_rollup.add_delivered_orders(cursor, [first])  # 아직 pending → 무시
+        assert _daily(cursor) == []
+
+        _deliver(cursor, first, '2026-10-01 09:00:00')
+        _deliver(cursor, second, '2026-10-01 21:00:00')
+        assert _daily(cursor) == [('2026-10-01', 2, 30000, 8000)]
+        assert _monthly(cursor) == [('2026-10', 2, 30000, 8000)]
+
+        _move_back(cursor, first, 'confirmed')
+        assert _daily(cursor) == [('2026-10-01', 1, 20000, 5000)]
+        _move_back(cursor, second, 'shipped')
+        assert _daily(cursor) == [] and _monthly(cursor) == []
+        _move_back(cursor, second, 'shipped')  # 이미 빠진 주문은 다시 빼지 않음
+        assert _all_rows(cursor) == (
+            [('2026-10-01', 0, 0, 0)],
+            [('2026-10', 0, 0, 0)],
+        )
+
+        _deliver(cursor, first, '2026-10-02 10:00:00')
+        assert _daily(cursor) == [('2026-10-02', 1, 10000, 3000)]
+
+
+def test_redelivery_moves_bucket():
+    with _TempDB() as cursor:
+        order_id = _create_order(cursor, 'o1', 10000, 3000)
+        _deliver(cursor, order_id, '2026-09-30 23:00:00')
+        _deliver(cursor, order_id, '2026-10-01 01:00:00')
+        assert _daily(cursor) == [('2026-10-01', 1, 10000, 3000)]
+        assert _monthly(cursor) == [('2026-10', 1, 10000, 3000)]
+
+
+def test_missing_delivered_at_ignored():
+    with _TempDB() as cursor:
+        order_id = _create_order(cursor, 'o1')
+        cursor.execute("UPDATE orders SET order_status = 'delivered', delivered_at = NULL WHERE id = ?", (order_id,))
+        revenue_rollup.add_delivered_orders(cursor, [order_id])
+        assert _daily(cursor) == []
+        revenue_rollup.remove_delivered_orders(cursor, [order_id])
+        assert _all_rows(cursor) == ([], [])
+
+
+def test_incremental_matches_rebuild():
+    rng = random.Random(5)
+    with _TempDB() as cursor:
+        ids = [_create_order(cursor, f'o{i}', rng.randrange(1000, 90000), rng.randrange(-5000, 20000))
+               for i in range(60)]
+        for _ in range(400):
+            order_id = rng.choice(ids)
+            if rng.random() < 0.6:
+                _deliver(cursor, order_id, f'2026-{rng.randint(8, 10):02d}-{rng.randint(1, 28):02d} 12:00:00')
+            else:
+                _move_back(cursor, order_id, rng.choice(['confirmed', 'shipped']))
+
+        incremental = (_daily(cursor), _monthly(cursor))
+        revenue_rollup.rebuild(cursor)
+        assert (_daily(cursor), _monthly(cursor)) == incremental
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
+    print('✅ 테스트 완료!')
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Title Near-Duplicate Index 테스트 (네트워크 불필요, 임시 SQLite DB 사용)
+- 임계값 0.7 경계: Jaccard 7/10은 중복, 6/10은 중복 아님 (DB 인덱스 / 배치 인덱스 모두)
+- find_similar / BatchTitleIndex == 전체 카탈로그와 정확한 Jaccard 비교 (임계값 이상 누락 없음)
+- 상품 삭제 시 remove_titles 후에는 더 이상 매칭되지 않음
+
+실행: python test_title_index.py  (또는 pytest test_title_index.py)
+"""
+
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import migrations
+import title_index
+
+WORDS = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel', 'india',
+         'juliet', 'kilo', 'lima', 'mike', 'november', 'oscar', 'papa', 'quebec', 'romeo']
+
+BASE = WORDS[:8]
+AT_THRESHOLD = WORDS[:7] + WORDS[8:10]      # 공통 7 / 합집합 10 = 0.7
+BELOW_THRESHOLD = WORDS[:6] + WORDS[8:10]   # 공통 6 / 합집합 10 = 0.6
+
+
+def _title(words):
+    # 대소문자/숫자/불용어/3글자 단어는 키워드에서 제외되어야 함
+    return 'NEW ' + ' '.join(w.capitalize() for w in words) + ' for car 12V'
+
+
+class _TempDB:
+    def __enter__(self):
+        self.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(self.tmpdir, 'test.db')
+        migrations.run_migrations(path)
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        return self.conn.cursor()
+
+    def __exit__(self, *exc):
+        self.conn.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+def _insert(cursor, title, status='pending'):
+    cursor.execute("INSERT INTO sourced_products (original_url, title_cn, status) VALUES ('http://x', ?, ?)",
+                   (title, status))
+    product_id = cursor.lastrowid
+    title_index.index_title(cursor, product_id, title)
+    return product_id
+
+
+def test_keywords_and_jaccard():
+    assert title_index.extract_keywords(_title(BASE)) == frozenset(BASE)
+    base = title_index.extract_keywords(_title(BASE))
+    assert title_index.jaccard(base, title_index.extract_keywords(_title(AT_THRESHOLD))) == 0.7
+    assert title_index.jaccard(base, title_index.extract_keywords(_title(BELOW_THRESHOLD))) == 0.6
+    assert title_index.jaccard(frozenset(), frozenset()) == 0.0
+
+
+def test_find_similar_threshold():
+    with _TempDB() as cursor:
+        at_id = _insert(cursor, _title(AT_THRESHOLD))
+        _insert(cursor, _title(BELOW_THRESHOLD))
+
+        matches = title_index.find_similar(cursor, _title(BASE), limit=0)
+        assert [(m[0], m[2]) for m in matches] == [(at_id, 0.7)]
+
+        assert title_index.find_similar(cursor, _title(BASE), status='approved') == []
+        assert title_index.find_similar(cursor, _title(BASE), threshold=0.6, limit=0)[-1][2] == 0.6
+        assert title_index.find_similar(cursor, 'USB 12V 3A') == []
+
+        title_index.remove_titles(cursor, [at_id])
+        assert title_index.find_similar(cursor, _title(BASE)) == []
+
+
+def test_batch_index_threshold():
+    batch = title_index.BatchTitleIndex()
+    batch.add(_title(BELOW_THRESHOLD))
+    assert batch.find(_title(BASE)) is None
+    batch.add(_title(AT_THRESHOLD))
+    assert batch.find(_title(BASE)) == (_title(AT_THRESHOLD), 0.7)
+    assert batch.find(_title(AT_THRESHOLD)) == (_title(AT_THRESHOLD), 1.0)
+
+
+def test_matches_exact_jaccard():
+    rng = random.Random(3)
+    titles = []
+    for _ in range(300):
+        words = rng.sample(WORDS, rng.randint(3, 9))
+        titles.append(_title(words))
+    probes = [_title(rng.sample(WORDS, rng.randint(3, 9))) for _ in range(100)]
+
+    with _TempDB() as cursor:
+        ids = {_insert(cursor, title): title for title in titles}
+        cursor.execute('SELECT COUNT(*) FROM title_index_keywords')
+        assert cursor.fetchone()[0] == len(titles)
+        assert title_index.rebuild(cursor) == len(titles)
+
+        for probe in probes:
+            words = title_index.extract_keywords(probe)
+            expected = {product_id for product_id, title in ids.items()
+                        if title_index.jaccard(words, title_index.extract_keywords(title)) >= 0.7}
+            found = title_index.find_similar(cursor, probe, limit=0)
+            assert {m[0] for m in found} == expected, probe
+            assert all(m[2] >= 0.7 for m in found)
+
+    batch = title_index.BatchTitleIndex()
+    for title in titles:
+        batch.add(title)
+    for probe in probes:
+        words = title_index.extract_keywords(probe)
+        best = max(title_index.jaccard(words, title_index.extract_keywords(t)) for t in titles)
+        hit = batch.find(probe)
+        if best >= 0.7:
+            assert hit is not None and hit[1] == best, probe
+        else:
+            assert hit is None, probe
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'✅ {name}')
+    print('✅ 테스트 완료!')
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Title Near-Duplicate Index (MinHash + LSH, persisted in SQLite)
+- 중복 검사용 키워드 집합: 4글자 이상 영문 단어, 불용어 제외 (기존 calculate_title_similarity와 동일)
+- 상품 insert/delete 시 같은 트랜잭션에서 인덱스 갱신
+- 스키마 업그레이드 후 비어 있는 인덱스는 앱 기동 시 backfill_if_empty()가 한 번 채움
+- find_similar(): LSH 버킷이 겹치는 후보만 가져와서 정확한 Jaccard로 검증
+  → 카탈로그 전체와 비교하지 않음 (50k 상품에서도 ms 단위)
+
+LSH 파라미터: 20 bands × 3 rows (60 hashes)
+    P(후보 | Jaccard 0.7) ≈ 99.9%,  P(후보 | Jaccard 0.3) ≈ 42% (정확 검증으로 걸러짐)
+
+Usage:
+    python3 title_index.py --rebuild    # 전체 재색인
+"""
+import os
+import re
+import sys
+import random
+import sqlite3
+import hashlib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'dropship.db')
+
+SIMILARITY_THRESHOLD = 0.7  # 70% 이상 유사하면 중복
+
+# 불용어 목록 (의미 없는 단어)
+STOPWORDS = frozenset({
+    'for', 'with', 'and', 'the', 'from', 'tws', 'new', 'hot', 'sale',
+    'pro', 'mini', 'max', 'ultra', 'plus', 'lite'
+})
+
+LSH_BANDS = 20
+LSH_ROWS = 3
+NUM_HASHES = LSH_BANDS * LSH_ROWS
+
+_KEYWORD_RE = re.compile(r'\b[a-z]{4,}\b')
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: signatures must be identical across processes and restarts
+_rng = random.Random(20240611)
+_HASH_PARAMS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                for _ in range(NUM_HASHES)]
+
+
+def extract_keywords(title):
+    """핵심 키워드 추출 (4글자 이상, 알파벳만, 불용어 제외)"""
+    words = _KEYWORD_RE.findall((title or '').lower())
+    return frozenset(w for w in words if w not in STOPWORDS)
+
+
+def jaccard(words1, words2):
+    """Exact Jaccard similarity (0.0-1.0); empty sets never match"""
+    if not words1 or not words2:
+        return 0.0
+    return len(words1 & words2) / len(words1 | words2)
+
+
+def _word_hash(word):
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+def minhash(words):
+    """MinHash signature (NUM_HASHES ints) of a keyword set"""
+    hashed = [_word_hash(w) for w in words]
+    return [min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashed)
+            for a, b in _HASH_PARAMS]
+
+
+def band_keys(words):
+    """One signed 64-bit bucket key per LSH band (band number is mixed into the key)"""
+    if not words:
+        return []
+    signature = minhash(words)
+    keys = []
+    for band in range(LSH_BANDS):
+        chunk = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(repr((band, chunk)).encode('ascii'), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def remove_titles(cursor, product_ids):
+    """Drop products from the index (call in the same transaction as the DELETE)"""
+    params = [(product_id,) for product_id in product_ids]
+    cursor.executemany('DELETE FROM title_index_buckets WHERE product_id = ?', params)
+    cursor.executemany('DELETE FROM title_index_keywords WHERE product_id = ?', params)
+
+
+def index_title(cursor, product_id, title):
+    """(Re)index one product title (call in the same transaction as the INSERT/UPDATE)"""
+    remove_titles(cursor, [product_id])
+    words = extract_keywords(title)
+    if not words:
+        return
+    cursor.execute('INSERT INTO title_index_keywords (product_id, keywords) VALUES (?, ?)',
+                   (product_id, ' '.join(sorted(words))))
+    cursor.executemany('INSERT OR IGNORE INTO title_index_buckets (band_key, product_id) VALUES (?, ?)',
+                       [(key, product_id) for key in band_keys(words)])
+
+
+def find_similar(cursor, title, threshold=SIMILARITY_THRESHOLD, status=None, created_since=None, limit=1):
+    """
+    Indexed products whose title keywords have Jaccard >= threshold with `title`.
+
+    Args:
+        status / created_since: optional sourced_products filters (e.g. 'pending', 30 days)
+        limit: stop after this many matches (1 = "is there any duplicate?")
+
+    Returns:
+        list of (product_id, title_cn, similarity) sorted by similarity desc
+    """
+    words = extract_keywords(title)
+    keys = band_keys(words)
+    if not keys:
+        return []
+
+    sql = f'''
+        SELECT k.product_id, k.keywords, sp.title_cn
+        FROM title_index_keywords k
+        JOIN sourced_products sp ON sp.id = k.product_id
+        WHERE k.product_id IN (
+            SELECT DISTINCT product_id FROM title_index_buckets
+            WHERE band_key IN ({', '.join('?' for _ in keys)})
+        )
+    '''
+    params = list(keys)
+    if status is not None:
+        sql += ' AND sp.status = ?'
+        params.append(status)
+    if created_since is not None:
+        sql += ' AND sp.created_at >= ?'
+        params.append(created_since)
+    cursor.execute(sql, params)
+
+    matches = []
+    for product_id, keywords, title_cn in cursor.fetchall():
+        similarity = jaccard(words, frozenset(keywords.split()))
+        if similarity >= threshold:
+            matches.append((product_id, title_cn, similarity))
+    matches.sort(key=lambda m: m[2], reverse=True)
+    return matches[:limit] if limit else matches
+
+
+class BatchTitleIndex:
+    """In-memory LSH over the current sourcing batch (same signatures as the DB index)"""
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._buckets = {}
+        self._entries = []
+
+    def find(self, title):
+        """(title, similarity) of the best near-duplicate already added, or None"""
+        words = extract_keywords(title)
+        seen = set()
+        best = None
+        for key in band_keys(words):
+            for idx in self._buckets.get(key, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                other_title, other_words = self._entries[idx]
+                similarity = jaccard(words, other_words)
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (other_title, similarity)
+        return best
+
+    def add(self, title):
+        words = extract_keywords(title)
+        idx = len(self._entries)
+        self._entries.append((title, words))
+        for key in band_keys(words):
+            self._buckets.setdefault(key, []).append(idx)
+
+
+def rebuild(cursor, batch_size=1000):
+    """
+    Re-index every sourced_products title (backfill / repair). Returns indexed count.
+    Tables come from migrations.py (schema v12).
+    """
+    cursor.execute('DELETE FROM title_index_buckets')
+    cursor.execute('DELETE FROM title_index_keywords')
+
+    indexed = 0
+    last_id = 0
+    while True:
+        cursor.execute('SELECT id, title_cn FROM sourced_products WHERE id > ? ORDER BY id LIMIT ?',
+                       (last_id, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        keyword_rows, bucket_rows = [], []
+        for product_id, title in rows:
+            words = extract_keywords(title)
+            if words:
+                keyword_rows.append((product_id, ' '.join(sorted(words))))
+                bucket_rows.extend((key, product_id) for key in band_keys(words))
+        cursor.executemany('INSERT INTO title_index_keywords (product_id, keywords) VALUES (?, ?)', keyword_rows)
+        cursor.executemany('INSERT OR IGNORE INTO title_index_buckets (band_key, product_id) VALUES (?, ?)',
+                           bucket_rows)
+        indexed += len(keyword_rows)
+        last_id = rows[-1][0]
+    return indexed
+
+
+def backfill_if_empty(cursor):
+    """
+    Index every title once when the index is empty but products exist
+    (DBs upgraded to schema v12). Returns indexed count (0 = nothing to do).
+    """
+    cursor.execute('SELECT 1 FROM title_index_keywords LIMIT 1')
+    if cursor.fetchone():
+        return 0
+    cursor.execute('SELECT 1 FROM sourced_products WHERE title_cn IS NOT NULL LIMIT 1')
+    if not cursor.fetchone():
+        return 0
+    return rebuild(cursor)
+
+
+if __name__ == '__main__':
+    if '--rebuild' not in sys.argv:
+        print(__doc__)
+        sys.exit(0)
+
+    # 스키마는 migrations.py에만 정의 → 미적용 migration부터 적용
+    from migrations import run_migrations
+    run_migrations(DB_PATH)
+
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        count = rebuild(conn.cursor())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    print(f'✅ Title index rebuilt: {count} product(s)')
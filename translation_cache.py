@@ -0,0 +1,230 @@
+"""
+Two-Tier Translation Cache (in-memory LRU + SQLite translation_cache table)
+- 키: (direction, 정규화된 원문, provider)
+    direction: 'ko-en' (검색 키워드 한→영), 'en-ko' (상품명 영→한), 'title-keyword' (상품명 → 한국어 키워드)
+- AI(Gemini/OpenAI) 결과만 저장; 규칙 기반 폴백은 저장하지 않음 (AI 복구 후 더 좋은 번역을 받도록)
+- 조회: LRU → DB 순, TTL 지난 항목은 miss
+- warm_up(): 시작 시 최근에 많이 쓰인 항목을 LRU에 미리 적재 (+ 만료 행 정리)
+- hits/last_hit_at: 조회 경로에서 쓰기 잠금을 잡지 않도록 메모리에 모았다가 한 번에 기록
+  (put() 때, 조회 중엔 HIT_FLUSH_INTERVAL_SEC마다 한 번, 종료 시)
+- get_stats(): hit/miss 카운터 (/api/admin/metrics)
+"""
+import re
+import time
+import atexit
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import db_pool
+
+logger = logging.getLogger(__name__)
+
+LRU_MAX_ENTRIES = 5000
+DEFAULT_TTL_SEC = 30 * 24 * 3600     # 30일: 키워드 번역은 거의 바뀌지 않음
+WARM_UP_LIMIT = 2000
+PROVIDER_PREFERENCE = ('gemini', 'openai')  # 같은 원문에 여러 provider 결과가 있으면 앞쪽 우선
+HIT_FLUSH_INTERVAL_SEC = 60          # 조회 경로에서 hit 카운터를 DB에 반영하는 최소 간격
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+_lru = OrderedDict()   # (direction, source_norm) → (translated, provider, created_at)
+_lock = threading.Lock()
+_stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'writes': 0, 'expired': 0, 'warmed': 0,
+          'hit_flushes': 0}
+
+_pending_hits = {}     # (direction, source_norm, provider) → [count, last_hit_at]
+_flush_lock = threading.Lock()
+_last_hit_flush = time.monotonic()
+
+
+def normalize(text):
+    """NFKC + lower-case + collapsed whitespace ('  무선 이어폰 ' == '무선  이어폰')"""
+    return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFKC', str(text or ''))).strip().lower()
+
+
+def _provider_rank(provider):
+    return PROVIDER_PREFERENCE.index(provider) if provider in PROVIDER_PREFERENCE else len(PROVIDER_PREFERENCE)
+
+
+def _remember(key, translated, provider, created_at):
+    with _lock:
+        _lru[key] = (translated, provider, created_at)
+        _lru.move_to_end(key)
+        while len(_lru) > LRU_MAX_ENTRIES:
+            _lru.popitem(last=False)
+
+
+def _note_hit(key, provider, now):
+    """Caller holds _lock"""
+    pending = _pending_hits.setdefault(key + (provider,), [0, now])
+    pending[0] += 1
+    pending[1] = now
+
+
+def flush_hits(conn=None):
+    """Write the accumulated hit counters in one statement (inside `conn`'s transaction if given)"""
+    global _last_hit_flush
+    with _lock:
+        if not _pending_hits:
+            return 0
+        batch = [(count, last_hit, direction, source_norm, provider)
+                 for (direction, source_norm, provider), (count, last_hit) in _pending_hits.items()]
+        _pending_hits.clear()
+        _last_hit_flush = time.monotonic()
+    sql = '''
+        UPDATE translation_cache SET hits = hits + ?, last_hit_at = MAX(COALESCE(last_hit_at, 0), ?)
+        WHERE direction = ? AND source_norm = ? AND provider = ?
+    '''
+    try:
+        if conn is not None:
+            conn.executemany(sql, batch)
+        else:
+            with db_pool.transaction() as conn:
+                conn.executemany(sql, batch)
+        with _lock:
+            _stats['hit_flushes'] += 1
+    except Exception as e:
+        logger.warning(f'[TranslationCache] ⚠️ Hit counter flush failed ({len(batch)} entries): {e}')
+    return len(batch)
+
+
+def _maybe_flush_hits():
+    """At most one flush per HIT_FLUSH_INTERVAL_SEC from the read path; never waits for another flush"""
+    if time.monotonic() - _last_hit_flush < HIT_FLUSH_INTERVAL_SEC:
+        return
+    if not _flush_lock.acquire(blocking=False):
+        return
+    try:
+        if time.monotonic() - _last_hit_flush >= HIT_FLUSH_INTERVAL_SEC:
+            flush_hits()
+    finally:
+        _flush_lock.release()
+
+
+def get(direction, text, ttl=DEFAULT_TTL_SEC):
+    """Cached translation or None"""
+    source_norm = normalize(text)
+    if not source_norm:
+        return None
+    key = (direction, source_norm)
+    now = time.time()
+
+    hit = None
+    with _lock:
+        entry = _lru.get(key)
+        if entry is not None:
+            if entry[2] > now - ttl:
+                _lru.move_to_end(key)
+                _stats['memory_hits'] += 1
+                _note_hit(key, entry[1], now)
+                hit = entry[0]
+            else:
+                del _lru[key]
+                _stats['expired'] += 1
+    if hit is not None:
+        _maybe_flush_hits()
+        return hit
+
+    try:
+        conn = db_pool.get_connection()
+        try:
+            rows = conn.execute('''
+                SELECT provider, translated, created_at FROM translation_cache
+                WHERE direction = ? AND source_norm = ? AND created_at > ?
+            ''', (direction, source_norm, now - ttl)).fetchall()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning(f'[TranslationCache] ⚠️ DB lookup failed: {e}')
+        rows = None
+
+    if not rows:
+        with _lock:
+            _stats['misses'] += 1
+        return None
+
+    row = min(rows, key=lambda r: _provider_rank(r['provider']))
+    _remember(key, row['translated'], row['provider'], row['created_at'])
+    with _lock:
+        _stats['db_hits'] += 1
+        _note_hit(key, row['provider'], now)
+    _maybe_flush_hits()
+    return row['translated']
+
+
+def put(direction, text, translated, provider):
+    """Store an AI translation in both tiers"""
+    source_norm = normalize(text)
+    translated = (translated or '').strip()
+    if not source_norm or not translated:
+        return
+    now = time.time()
+    _remember((direction, source_norm), translated, provider, now)
+    try:
+        with db_pool.transaction() as conn:
+            conn.execute('''
+                INSERT INTO translation_cache (direction, source_norm, provider, translated, created_at, last_hit_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(direction, source_norm, provider) DO UPDATE SET
+                    translated = excluded.translated, created_at = excluded.created_at
+            ''', (direction, source_norm, provider, translated, now, now))
+            flush_hits(conn)   # 이미 쓰기 트랜잭션 중 → 모아둔 hit 카운터도 함께 기록
+        with _lock:
+            _stats['writes'] += 1
+    except Exception as e:
+        logger.warning(f'[TranslationCache] ⚠️ DB write failed: {e}')
+
+
+def warm_up(limit=WARM_UP_LIMIT, ttl=DEFAULT_TTL_SEC):
+    """
+    Drop expired rows, then load the most recently used entries into the LRU.
+    Returns the number of entries loaded.
+    """
+    now = time.time()
+    with db_pool.transaction() as conn:
+        conn.execute('DELETE FROM translation_cache WHERE created_at <= ?', (now - ttl,))
+    conn = db_pool.get_connection()
+    try:
+        rows = conn.execute('''
+            SELECT direction, source_norm, provider, translated, created_at FROM translation_cache
+            ORDER BY last_hit_at DESC LIMIT ?
+        ''', (min(limit, LRU_MAX_ENTRIES),)).fetchall()
+    finally:
+        conn.close()
+
+    # One entry per source text (preferred provider wins), loaded oldest first so
+    # the most recently used end up at the hot end of the LRU
+    best = {}
+    for row in rows:
+        key = (row['direction'], row['source_norm'])
+        if key not in best or _provider_rank(row['provider']) < _provider_rank(best[key]['provider']):
+            best[key] = row
+    for key in reversed(list(best)):
+        row = best[key]
+        _remember(key, row['translated'], row['provider'], row['created_at'])
+    with _lock:
+        _stats['warmed'] += len(best)
+    return len(best)
+
+
+def clear_memory():
+    with _lock:
+        _lru.clear()
+
+
+def get_stats():
+    with _lock:
+        stats = dict(_stats)
+        stats['memory_entries'] = len(_lru)
+        stats['pending_hits'] = len(_pending_hits)
+    lookups = stats['memory_hits'] + stats['db_hits'] + stats['misses']
+    stats['hit_rate'] = round((stats['memory_hits'] + stats['db_hits']) / lookups, 3) if lookups else None
+    return stats
+
+
+@atexit.register
+def _shutdown():
+    """Write hit counters that haven't been flushed yet"""
+    flush_hits()